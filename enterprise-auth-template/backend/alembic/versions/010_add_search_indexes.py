@@ -0,0 +1,119 @@
+"""Add full-text and trigram search indexes
+
+Revision ID: 010_add_search_indexes
+Revises: c741428169a7
+Create Date: 2026-10-18 10:00:00.000000
+
+Adds a stored generated ``search_vector`` tsvector column with a GIN index
+to ``users`` and ``audit_logs``, and pg_trgm GIN indexes on the columns
+used for fuzzy and prefix matching, so SearchService no longer needs
+sequential ``ILIKE '%term%'`` scans.
+
+Adding a stored generated column rewrites the table; on very large
+``audit_logs`` tables run this migration in a maintenance window. Indexes
+are built CONCURRENTLY so reads and writes continue while they build.
+"""
+from typing import List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_add_search_indexes'
+down_revision: Union[str, None] = 'c741428169a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (column, weight) per table; the first existing column of each group is used
+# so the migration works on both the migrated and the model-created schema
+SEARCH_DOCUMENTS = {
+    'users': [
+        (('email',), 'A'),
+        (('full_name',), 'A'),
+        (('username',), 'B'),
+        (('phone_number',), 'C'),
+    ],
+    'audit_logs': [
+        (('action', 'event_type'), 'A'),
+        (('user_email',), 'A'),
+        (('description',), 'B'),
+        (('result',), 'C'),
+        (('ip_address',), 'C'),
+        (('user_agent',), 'D'),
+    ],
+}
+
+TRIGRAM_INDEXES = {
+    'users': ['email', 'full_name'],
+    'audit_logs': ['user_email', 'ip_address'],
+}
+
+
+def _existing_columns(table: str) -> List[str]:
+    inspector = sa.inspect(op.get_bind())
+    return [column['name'] for column in inspector.get_columns(table)]
+
+
+def _search_expression(table: str) -> str:
+    columns = _existing_columns(table)
+    parts = []
+    for candidates, weight in SEARCH_DOCUMENTS[table]:
+        column = next((c for c in candidates if c in columns), None)
+        if column:
+            parts.append(
+                f"setweight(to_tsvector('simple', coalesce({column}, '')), '{weight}')"
+            )
+    return ' || '.join(parts)
+
+
+def _trigram_indexes(table: str) -> List[Tuple[str, str]]:
+    columns = _existing_columns(table)
+    return [
+        (f'idx_{table}_{column}_trgm', column)
+        for column in TRIGRAM_INDEXES[table]
+        if column in columns
+    ]
+
+
+def upgrade() -> None:
+    """Add tsvector columns, GIN full-text indexes and trigram indexes."""
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for table in SEARCH_DOCUMENTS:
+        if 'search_vector' in _existing_columns(table):
+            continue
+        op.execute(
+            f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+            f'GENERATED ALWAYS AS ({_search_expression(table)}) STORED'
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for table in SEARCH_DOCUMENTS:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table}_search_vector '
+                f'ON {table} USING gin (search_vector)'
+            )
+            for index_name, column in _trigram_indexes(table):
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} '
+                    f'ON {table} USING gin ({column} gin_trgm_ops)'
+                )
+
+
+def downgrade() -> None:
+    """Remove search indexes and tsvector columns."""
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_DOCUMENTS:
+            for index_name, _ in _trigram_indexes(table):
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+            op.execute(
+                f'DROP INDEX CONCURRENTLY IF EXISTS idx_{table}_search_vector'
+            )
+
+    for table in SEARCH_DOCUMENTS:
+        op.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
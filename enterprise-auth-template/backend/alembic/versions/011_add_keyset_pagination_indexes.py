@@ -0,0 +1,74 @@
+"""Add keyset pagination indexes
+
+Revision ID: 011_add_keyset_pagination_indexes
+Revises: 010_add_search_indexes
+Create Date: 2026-10-18 12:00:00.000000
+
+Composite indexes matching the (sort key, id) orderings used by cursor
+pagination, so a page deep into users, audit logs or a user's
+notifications is an index range scan of ``limit`` rows.
+"""
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_add_keyset_pagination_indexes'
+down_revision: Union[str, None] = '010_add_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, column candidates); the first existing column of each
+# candidate group is used, as audit_logs predates the timestamp column
+KEYSET_INDEXES = [
+    ('idx_users_created_at_id', 'users', [('created_at',), ('id',)]),
+    (
+        'idx_audit_logs_timestamp_id',
+        'audit_logs',
+        [('timestamp', 'created_at'), ('id',)],
+    ),
+    (
+        'idx_notifications_user_created_id',
+        'notifications',
+        [('user_id',), ('created_at',), ('id',)],
+    ),
+]
+
+
+def _index_columns(table: str, candidates: List[tuple]) -> List[str]:
+    inspector = sa.inspect(op.get_bind())
+    existing = {column['name'] for column in inspector.get_columns(table)}
+    columns = []
+    for group in candidates:
+        column = next((c for c in group if c in existing), None)
+        if column:
+            columns.append(column)
+    return columns
+
+
+def upgrade() -> None:
+    """Create keyset pagination indexes concurrently."""
+
+    indexes = [
+        (name, table, _index_columns(table, candidates))
+        for name, table, candidates in KEYSET_INDEXES
+    ]
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in indexes:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} ({", ".join(columns)})'
+            )
+
+
+def downgrade() -> None:
+    """Drop keyset pagination indexes."""
+
+    with op.get_context().autocommit_block():
+        for name, _, _ in KEYSET_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,192 @@
+"""Add stats counters
+
+Revision ID: 012_add_stats_counters
+Revises: 011_add_keyset_pagination_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+Materialized counters for the admin dashboard. Statement-level AFTER
+triggers with transition tables add the net change of each statement to
+``stats_counters`` rows, sharded by backend pid so concurrent writers do
+not contend on one row. Counters start at zero; the application's first
+reconcile fills them in before they are served.
+"""
+from typing import Dict, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012_add_stats_counters'
+down_revision: Union[str, None] = '011_add_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTER_SHARDS = 16
+
+# (counter name, table, condition column/predicate, bucket, time columns);
+# kept in step with COUNTERS in app/services/stats_counters.py
+COUNTERS = [
+    ('users.total', 'users', None, None, ()),
+    ('users.active', 'users', 'is_active', None, ()),
+    ('users.verified', 'users', 'email_verified', None, ()),
+    ('users.with_2fa', 'users', 'two_factor_enabled', None, ()),
+    ('users.created', 'users', None, 'hour', ('created_at',)),
+    ('sessions.active', 'user_sessions', 'is_active', None, ()),
+    ('sessions.created', 'user_sessions', None, 'day', ('created_at',)),
+    ('organizations.total', 'organizations', None, None, ()),
+    ('organizations.active', 'organizations', 'is_active', None, ()),
+    ('api_keys.total', 'api_keys', None, None, ()),
+    ('api_keys.active', 'api_keys', 'is_active', None, ()),
+    ('audit_logs.total', 'audit_logs', None, None, ()),
+    ('audit_logs.created', 'audit_logs', None, 'day', ('timestamp', 'created_at')),
+    (
+        'login_attempts.failed',
+        'login_attempts',
+        'NOT success',
+        'hour',
+        ('created_at',),
+    ),
+]
+
+TABLES = [
+    'users',
+    'user_sessions',
+    'organizations',
+    'api_keys',
+    'audit_logs',
+    'login_attempts',
+]
+
+BUCKET_FORMATS = {'hour': 'YYYY-MM-DD"T"HH24', 'day': 'YYYY-MM-DD'}
+
+
+def _counter_expressions(table: str) -> List[tuple]:
+    """(name expression, condition, changes on update) for the existing columns."""
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return []
+    columns: Dict[str, sa.types.TypeEngine] = {
+        column['name']: column['type'] for column in inspector.get_columns(table)
+    }
+
+    expressions = []
+    for name, counter_table, condition, bucket, time_columns in COUNTERS:
+        if counter_table != table:
+            continue
+        if condition and condition.split()[-1] not in columns:
+            continue
+        if bucket:
+            column = next((c for c in time_columns if c in columns), None)
+            if column is None:
+                continue
+            value = f'"{column}"'
+            if getattr(columns[column], 'timezone', False):
+                value += " AT TIME ZONE 'UTC'"
+            expression = (
+                f"'{name}@' || to_char(date_trunc('{bucket}', {value}), "
+                f"'{BUCKET_FORMATS[bucket]}')"
+            )
+        else:
+            expression = f"'{name}'"
+        expressions.append((expression, condition, bool(condition or bucket)))
+    return expressions
+
+
+def _deltas(expressions: List[tuple], source: str, sign: int) -> List[str]:
+    return [
+        f'SELECT {expression} AS name, {sign} AS delta FROM {source}'
+        + (f' WHERE {condition}' if condition else '')
+        for expression, condition, _ in expressions
+    ]
+
+
+def _upsert(parts: List[str]) -> str:
+    # Ordered by name so concurrent statements lock counter rows in one order
+    return f"""
+        INSERT INTO stats_counters (name, shard, value)
+        SELECT name, (pg_backend_pid() % {COUNTER_SHARDS})::smallint, sum(delta)
+        FROM ({' UNION ALL '.join(parts)}) AS deltas
+        WHERE name IS NOT NULL
+        GROUP BY name
+        HAVING sum(delta) <> 0
+        ORDER BY name
+        ON CONFLICT (name, shard)
+        DO UPDATE SET value = stats_counters.value + EXCLUDED.value;
+    """
+
+
+def upgrade() -> None:
+    """Create the counters table and the counting triggers."""
+
+    op.create_table(
+        'stats_counters',
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('shard', sa.SmallInteger(), nullable=False, server_default='0'),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name', 'shard'),
+    )
+
+    for table in TABLES:
+        expressions = _counter_expressions(table)
+        if not expressions:
+            continue
+        # Updates only move rows between filtered or bucketed counters
+        updated = [e for e in expressions if e[2]]
+
+        update_branch = ''
+        if updated:
+            changes = _deltas(updated, 'new_rows', 1) + _deltas(updated, 'old_rows', -1)
+            update_branch = f"ELSIF TG_OP = 'UPDATE' THEN {_upsert(changes)}"
+
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION stats_counters_{table}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    {_upsert(_deltas(expressions, 'new_rows', 1))}
+                {update_branch}
+                ELSIF TG_OP = 'DELETE' THEN
+                    {_upsert(_deltas(expressions, 'old_rows', -1))}
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+
+        # Transition tables need one trigger per event
+        op.execute(f"""
+            CREATE TRIGGER stats_counters_{table}_insert
+            AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION stats_counters_{table}();
+        """)
+        op.execute(f"""
+            CREATE TRIGGER stats_counters_{table}_delete
+            AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION stats_counters_{table}();
+        """)
+        if updated:
+            op.execute(f"""
+                CREATE TRIGGER stats_counters_{table}_update
+                AFTER UPDATE ON {table}
+                REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION stats_counters_{table}();
+            """)
+
+
+def downgrade() -> None:
+    """Drop the counting triggers and the counters table."""
+
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in TABLES:
+        if table not in existing:
+            continue
+        for event in ('insert', 'update', 'delete'):
+            op.execute(
+                f'DROP TRIGGER IF EXISTS stats_counters_{table}_{event} ON {table}'
+            )
+        op.execute(f'DROP FUNCTION IF EXISTS stats_counters_{table}()')
+
+    op.drop_table('stats_counters')
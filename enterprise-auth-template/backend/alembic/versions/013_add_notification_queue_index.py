@@ -0,0 +1,38 @@
+"""Add notification delivery queue index
+
+Revision ID: 013_add_notification_queue_index
+Revises: 012_add_stats_counters
+Create Date: 2026-10-18 16:00:00.000000
+
+Index matching the delivery worker's claim query (pending notifications
+of one channel that are due), so claiming a batch does not scan the
+notification history.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013_add_notification_queue_index'
+down_revision: Union[str, None] = '012_add_stats_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the delivery queue index concurrently."""
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_delivery_queue '
+            'ON notifications (status, type, scheduled_for)'
+        )
+
+
+def downgrade() -> None:
+    """Drop the delivery queue index."""
+
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_delivery_queue')
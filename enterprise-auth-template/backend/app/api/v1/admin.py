@@ -4,13 +4,17 @@ Admin API endpoints for system administration
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.config import get_settings
+from app.core.downloads import RangeFileResponse, accel_redirect_for
+from app.core.pagination import COUNT_NONE, InvalidCursorError, KeysetPage
 from app.models.user import User
 from app.services.admin_service import AdminService
 from app.services.audit_service import AuditService
+from app.services.backup_service import BackupError, BackupService
+from app.services.export_service import ExportError, ExportService
 from app.dependencies.auth import require_superuser
 from app.schemas.admin import (
     SystemStats,
@@ -27,6 +31,19 @@ from app.schemas.admin import (
 router = APIRouter(prefix="/admin", tags=["admin"])
 settings = get_settings()
 
+COUNT_MODE_PATTERN = "^(exact|estimated|cached|none)$"
+
+
+def _set_page_headers(response: Response, page: KeysetPage) -> None:
+    """Expose keyset pagination state without changing list response bodies"""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+        response.headers["X-Total-Count-Estimated"] = str(
+            page.total_is_estimate
+        ).lower()
+
 
 @router.get("/dashboard", response_model=AdminDashboardData)
 async def get_admin_dashboard(
@@ -66,8 +83,11 @@ async def get_system_stats(
 
 @router.get("/users", response_model=List[UserManagementResponse])
 async def list_all_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor"),
+    count_mode: str = Query(COUNT_NONE, pattern=COUNT_MODE_PATTERN),
     search: Optional[str] = None,
     role_id: Optional[str] = None,
     is_active: Optional[bool] = None,
@@ -75,7 +95,12 @@ async def list_all_users(
     current_user: User = Depends(require_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> List[UserManagementResponse]:
-    """List all users with filtering and pagination"""
+    """
+    List all users with filtering and pagination
+
+    Follow the X-Next-Cursor header for further pages; skip is kept for
+    existing clients.
+    """
     admin_service = AdminService(db)
 
     filters = {}
@@ -88,9 +113,18 @@ async def list_all_users(
     if organization_id:
         filters["organization_id"] = organization_id
 
-    users = await admin_service.get_users(skip=skip, limit=limit, filters=filters)
+    if skip and not cursor:
+        return await admin_service.get_users(skip=skip, limit=limit, filters=filters)
+
+    try:
+        page = await admin_service.get_users_page(
+            limit=limit, filters=filters, cursor=cursor, count_mode=count_mode
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
 
-    return users
+    _set_page_headers(response, page)
+    return page.items
 
 
 @router.get("/users/{user_id}", response_model=UserManagementResponse)
@@ -349,8 +383,11 @@ async def terminate_all_sessions(
 
 @router.get("/audit-logs", response_model=List[Dict[str, Any]])
 async def get_audit_logs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor"),
+    count_mode: str = Query(COUNT_NONE, pattern=COUNT_MODE_PATTERN),
     user_id: Optional[str] = None,
     action: Optional[str] = None,
     resource_type: Optional[str] = None,
@@ -374,9 +411,20 @@ async def get_audit_logs(
     if end_date:
         filters["end_date"] = end_date
 
-    logs = await admin_service.get_audit_logs(skip=skip, limit=limit, filters=filters)
+    if skip and not cursor:
+        return await admin_service.get_audit_logs(
+            skip=skip, limit=limit, filters=filters
+        )
+
+    try:
+        page = await admin_service.get_audit_logs_page(
+            limit=limit, filters=filters, cursor=cursor, count_mode=count_mode
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
 
-    return logs
+    _set_page_headers(response, page)
+    return page.items
 
 
 @router.get("/activity-report", response_model=UserActivityReport)
@@ -542,3 +590,79 @@ async def export_audit_logs(
     )
 
     return {"export_url": export_url, "format": format}
+
+
+@router.get("/exports/{export_id}/download")
+async def download_export(
+    export_id: str,
+    current_user: User = Depends(require_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> RangeFileResponse:
+    """Download a completed export (supports Range and conditional requests)"""
+    try:
+        file_path, filename, content_type = await ExportService(db).download_export(
+            export_id, str(current_user.id)
+        )
+    except ExportError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return RangeFileResponse(
+        file_path,
+        filename=filename,
+        media_type=content_type,
+        accel_redirect=accel_redirect_for("exports", file_path.name),
+    )
+
+
+@router.post("/exports/{export_id}/download-url")
+async def create_export_download_url(
+    export_id: str,
+    expires_in: int = Query(900, ge=60, le=86400),
+    current_user: User = Depends(require_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """Create a pre-signed, time-limited download URL for an export"""
+    try:
+        return await ExportService(db).create_download_url(
+            export_id, str(current_user.id), expires_in
+        )
+    except ExportError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/backups/{backup_id}/download")
+async def download_backup(
+    backup_id: str,
+    current_user: User = Depends(require_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> RangeFileResponse:
+    """Download a completed backup (supports Range and conditional requests)"""
+    try:
+        file_path, filename, etag = await BackupService(db).get_backup_download(
+            backup_id, str(current_user.id)
+        )
+    except BackupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return RangeFileResponse(
+        file_path,
+        filename=filename,
+        etag=etag,
+        accel_redirect=accel_redirect_for("backups", file_path.name),
+    )
+
+
+@router.post("/backups/{backup_id}/download-url")
+async def create_backup_download_url(
+    backup_id: str,
+    expires_in: int = Query(900, ge=60, le=86400),
+    current_user: User = Depends(require_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """Create a pre-signed, time-limited download URL for a backup"""
+    try:
+        return await BackupService(db).create_download_url(
+            backup_id, str(current_user.id), expires_in
+        )
+    except BackupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
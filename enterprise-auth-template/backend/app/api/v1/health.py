@@ -2,19 +2,23 @@
 Health Check Endpoints
 
 Provides health check endpoints for monitoring and load balancer health checks.
-Includes database connectivity and dependency health checks.
+Includes database connectivity and dependency health checks, plus a
+liveness probe that checks nothing but the process itself.
 """
 
 from datetime import datetime
 from typing import Any, Dict
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, status
 
 from app.core.config import get_settings
-from app.core.database import get_db_session
+from app.services.health_checks import (
+    check_database,
+    check_redis,
+    health_cache,
+    run_checks,
+)
 
 settings = get_settings()
 logger = structlog.get_logger(__name__)
@@ -42,18 +46,33 @@ async def health_check() -> Dict[str, Any]:
     }
 
 
+@router.get("/live")
+async def liveness_check() -> Dict[str, Any]:
+    """
+    Kubernetes liveness probe endpoint.
+
+    Answers from the process alone and never touches the database or
+    Redis, so a slow dependency cannot get healthy pods restarted.
+
+    Returns:
+        Dict: Liveness status
+    """
+    return {"status": "alive", "service": "enterprise-auth-backend"}
+
+
+async def _check_dependencies() -> Dict[str, Dict[str, Any]]:
+    return await run_checks({"database": check_database, "redis": check_redis})
+
+
 @router.get("/detailed")
-async def detailed_health_check(
-    db: AsyncSession = Depends(get_db_session),
-) -> Dict[str, Any]:
+async def detailed_health_check() -> Dict[str, Any]:
     """
     Detailed health check endpoint.
 
     Checks the health of all critical dependencies including
-    database connectivity and external services.
-
-    Args:
-        db: Database session dependency
+    database connectivity and external services. Checks run concurrently
+    with per-check timeouts and results are shared by concurrent pollers
+    for a few seconds.
 
     Returns:
         Dict: Detailed health status of all dependencies
@@ -61,71 +80,20 @@ async def detailed_health_check(
     Raises:
         HTTPException: If any critical dependency is unhealthy
     """
+    dependencies = await health_cache.get("dependencies", _check_dependencies)
+
     health_status = {
         "status": "healthy",
         "service": "enterprise-auth-backend",
         "version": settings.VERSION,
         "environment": settings.ENVIRONMENT,
         "timestamp": datetime.utcnow().isoformat(),
-        "dependencies": {},
+        "dependencies": dependencies,
     }
 
-    # Check database connectivity
-    try:
-        start_time = datetime.utcnow()
-        await db.execute(text("SELECT 1"))
-        end_time = datetime.utcnow()
-        response_time = (end_time - start_time).total_seconds() * 1000
-
-        health_status["dependencies"]["database"] = {
-            "status": "healthy",
-            "response_time_ms": round(response_time, 2),
-            "details": "PostgreSQL connection successful",
-        }
-
-        logger.info("Database health check passed", response_time_ms=response_time)
-
-    except Exception as e:
-        health_status["dependencies"]["database"] = {
-            "status": "unhealthy",
-            "error": str(e),
-            "details": "Failed to connect to PostgreSQL",
-        }
+    # Redis is not critical, don't mark overall status as unhealthy
+    if dependencies["database"]["status"] != "healthy":
         health_status["status"] = "unhealthy"
-
-        logger.error("Database health check failed", error=str(e))
-
-    # Check Redis connectivity (if configured)
-    try:
-        import redis.asyncio as redis
-
-        redis_client = redis.from_url(str(settings.REDIS_URL))
-        start_time = datetime.utcnow()
-        await redis_client.ping()
-        end_time = datetime.utcnow()
-        response_time = (end_time - start_time).total_seconds() * 1000
-
-        health_status["dependencies"]["redis"] = {
-            "status": "healthy",
-            "response_time_ms": round(response_time, 2),
-            "details": "Redis connection successful",
-        }
-
-        await redis_client.close()
-        logger.info("Redis health check passed", response_time_ms=response_time)
-
-    except Exception as e:
-        health_status["dependencies"]["redis"] = {
-            "status": "unhealthy",
-            "error": str(e),
-            "details": "Failed to connect to Redis",
-        }
-
-        # Redis is not critical, don't mark overall status as unhealthy
-        logger.warning("Redis health check failed", error=str(e))
-
-    # If any critical dependency is unhealthy, return 503
-    if health_status["status"] == "unhealthy":
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=health_status,
@@ -135,45 +103,39 @@ async def detailed_health_check(
 
 
 @router.get("/ready")
-async def readiness_check(
-    db: AsyncSession = Depends(get_db_session),
-) -> Dict[str, Any]:
+async def readiness_check() -> Dict[str, Any]:
     """
     Kubernetes readiness probe endpoint.
 
     Checks if the service is ready to accept traffic.
     More strict than liveness check.
 
-    Args:
-        db: Database session dependency
-
     Returns:
         Dict: Readiness status
 
     Raises:
         HTTPException: If service is not ready
     """
-    try:
-        # Check database connectivity
-        await db.execute(text("SELECT 1"))
-
-        return {
-            "status": "ready",
-            "service": "enterprise-auth-backend",
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-    except Exception as e:
-        logger.error("Readiness check failed", error=str(e))
+    dependencies = await health_cache.get("dependencies", _check_dependencies)
+    database = dependencies["database"]
+
+    if database["status"] != "healthy":
+        logger.error("Readiness check failed", error=database.get("error"))
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail={
                 "status": "not_ready",
-                "error": str(e),
+                "error": database.get("error"),
                 "timestamp": datetime.utcnow().isoformat(),
             },
         )
 
+    return {
+        "status": "ready",
+        "service": "enterprise-auth-backend",
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
 
 @router.get("/metrics")
 async def metrics_endpoint() -> Dict[str, Any]:
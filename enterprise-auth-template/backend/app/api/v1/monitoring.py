@@ -23,6 +23,7 @@ from fastapi.responses import PlainTextResponse
 import asyncio
 
 from app.core.database import get_db_session
+from app.core.query_stats import get_query_stats_collector
 from app.services.monitoring_service import MonitoringService, AlertSeverity
 from app.dependencies.auth import require_admin, get_current_user
 from app.schemas.response import StandardResponse
@@ -223,6 +224,71 @@ async def generate_report(
     )
 
 
+@router.get(
+    "/query-stats",
+    response_model=StandardResponse[Dict[str, Any]],
+    dependencies=[Depends(require_admin)],
+    summary="Get per-query statistics",
+)
+async def get_query_statistics(
+    limit: int = Query(20, ge=1, le=200, description="Number of fingerprints"),
+    sort_by: str = Query(
+        "total_time",
+        pattern="^(total_time|mean_time|max_time|calls|rows)$",
+        description="Statistic to order by",
+    ),
+    explain: bool = Query(
+        False, description="Capture EXPLAIN plans for the slowest queries"
+    ),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+) -> StandardResponse[Dict[str, Any]]:
+    """
+    Get statistics per normalized statement fingerprint.
+
+    Shows which queries dominate database load: call counts, total/mean/p99
+    latency, rows and originating endpoints.
+
+    Args:
+        limit: Number of fingerprints to return
+        sort_by: Statistic to order by
+        explain: Capture EXPLAIN plans for the slowest SELECT fingerprints
+    """
+    collector = get_query_stats_collector()
+
+    if explain:
+        await collector.capture_explain_plans(db)
+
+    return StandardResponse(
+        success=True,
+        data={
+            "summary": collector.summary(),
+            "queries": [
+                stats.to_dict() for stats in collector.top(limit=limit, sort_by=sort_by)
+            ],
+        },
+        message="Query statistics retrieved successfully",
+    )
+
+
+@router.delete(
+    "/query-stats",
+    response_model=StandardResponse[Dict[str, str]],
+    dependencies=[Depends(require_admin)],
+    summary="Reset per-query statistics",
+)
+async def reset_query_statistics(
+    current_user: User = Depends(get_current_user),
+) -> StandardResponse[Dict[str, str]]:
+    """Discard collected query statistics in this process."""
+    get_query_stats_collector().reset()
+    logger.info("Query statistics reset", reset_by=str(current_user.id))
+
+    return StandardResponse(
+        success=True, data={"status": "reset"}, message="Query statistics reset"
+    )
+
+
 @router.post(
     "/track",
     response_model=StandardResponse[Dict[str, str]],
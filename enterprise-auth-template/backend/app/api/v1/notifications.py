@@ -15,7 +15,13 @@ from pydantic import BaseModel, Field, ConfigDict
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db_session
-from app.dependencies.auth import CurrentUser, get_current_user, require_permissions
+from app.core.pagination import COUNT_EXACT, InvalidCursorError
+from app.dependencies.auth import (
+    CurrentUser,
+    get_current_user,
+    get_current_user_id,
+    require_permissions,
+)
 from app.models.notification import (
     NotificationType,
     NotificationPriority,
@@ -138,9 +144,21 @@ class NotificationListResponse(BaseModel):
     notifications: List[NotificationResponse] = Field(
         ..., description="List of notifications"
     )
-    total: int = Field(..., description="Total number of notifications")
+    total: Optional[int] = Field(
+        None, description="Total number of notifications (omitted for count_mode=none)"
+    )
     unread_count: int = Field(..., description="Number of unread notifications")
     has_more: bool = Field(..., description="Whether more notifications exist")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, if any"
+    )
+
+
+class NotificationCountsResponse(BaseModel):
+    """Response model for notification badge counts."""
+
+    unread_count: int = Field(..., description="Number of unread notifications")
+    total: int = Field(..., description="Total number of notifications")
 
 
 class NotificationStatsResponse(BaseModel):
@@ -340,6 +358,14 @@ async def get_notifications(
         50, ge=1, le=100, description="Number of notifications to return"
     ),
     offset: int = Query(0, ge=0, description="Number of notifications to skip"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the previous page (replaces offset)"
+    ),
+    count_mode: str = Query(
+        COUNT_EXACT,
+        pattern="^(exact|estimated|cached|none)$",
+        description="How the total is computed",
+    ),
     status_filter: Optional[NotificationStatus] = Query(
         None, description="Filter by status"
     ),
@@ -354,11 +380,15 @@ async def get_notifications(
     Get user notifications.
 
     Retrieves notifications for the current user with filtering and pagination.
-    Supports filtering by status, category, and read state.
+    Supports filtering by status, category, and read state. Follow
+    ``next_cursor`` for subsequent pages; ``offset`` is kept for existing
+    clients but gets slower the deeper it goes.
 
     Args:
         limit: Maximum number of notifications to return
         offset: Number of notifications to skip
+        cursor: Continuation token from the previous page
+        count_mode: exact, estimated, cached or none
         status_filter: Filter by notification status
         category_filter: Filter by notification category
         unread_only: Show only unread notifications
@@ -376,22 +406,35 @@ async def get_notifications(
         notification_service = NotificationService(db)
 
         # Get notifications
-        notifications, total_count = await notification_service.get_user_notifications(
-            user_id=current_user.id,
-            limit=limit,
-            offset=offset,
-            status_filter=status_filter,
-            category_filter=category_filter,
-            unread_only=unread_only,
-        )
-
-        # Get unread count
-        if not unread_only:
-            _, unread_count = await notification_service.get_user_notifications(
-                user_id=current_user.id, limit=1, offset=0, unread_only=True
+        next_cursor = None
+        if cursor or not offset:
+            page = await notification_service.get_user_notifications_page(
+                user_id=current_user.id,
+                limit=limit,
+                cursor=cursor,
+                status_filter=status_filter,
+                category_filter=category_filter,
+                unread_only=unread_only,
+                count_mode=count_mode,
             )
+            notifications, total_count = page.items, page.total
+            next_cursor = page.next_cursor
+            has_more = page.has_more
         else:
-            unread_count = total_count
+            notifications, total_count = (
+                await notification_service.get_user_notifications(
+                    user_id=current_user.id,
+                    limit=limit,
+                    offset=offset,
+                    status_filter=status_filter,
+                    category_filter=category_filter,
+                    unread_only=unread_only,
+                )
+            )
+            has_more = (offset + limit) < total_count
+
+        # Unread count comes from the cached counters
+        unread_count = await notification_service.get_unread_count(current_user.id)
 
         # Convert to response format
         notification_responses = []
@@ -434,9 +477,12 @@ async def get_notifications(
             notifications=notification_responses,
             total=total_count,
             unread_count=unread_count,
-            has_more=(offset + limit) < total_count,
+            has_more=has_more,
+            next_cursor=next_cursor,
         )
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         logger.error(
             "Failed to get notifications", user_id=current_user.id, error=str(e)
@@ -447,6 +493,41 @@ async def get_notifications(
         )
 
 
+@router.get("/unread-count", response_model=NotificationCountsResponse)
+async def get_unread_count(
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db_session),
+) -> NotificationCountsResponse:
+    """
+    Get notification badge counts.
+
+    Authenticated from the access token alone and served from per-user
+    counters cached in Redis, so clients can poll it for badges without
+    a database query.
+
+    Args:
+        user_id: Authenticated user ID from the access token
+        db: Database session (only used when the counters are not cached)
+
+    Returns:
+        NotificationCountsResponse: Unread and total counts
+    """
+    try:
+        notification_service = NotificationService(db)
+        counts = await notification_service.get_notification_counts(user_id)
+
+        return NotificationCountsResponse(
+            unread_count=counts["unread"], total=counts["total"]
+        )
+
+    except Exception as e:
+        logger.error("Failed to get unread count", user_id=user_id, error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve unread count",
+        )
+
+
 @router.put("/{notification_id}/read", response_model=MessageResponse)
 async def mark_notification_read(
     notification_id: str,
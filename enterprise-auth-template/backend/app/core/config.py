@@ -384,12 +384,17 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"  # json or text
     LOG_FILE: Optional[str] = None
+    LOG_ASYNC: bool = True  # Write log records from a thread started with the app
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_OVERFLOW: str = "sample"  # drop or sample
 
     # ===========================================
     # MONITORING & OBSERVABILITY
     # ===========================================
     SENTRY_DSN: Optional[HttpUrl] = None
     METRICS_ENABLED: bool = True
+    QUERY_STATS_ENABLED: bool = True  # Per-fingerprint query statistics
+    QUERY_STATS_MAX_FINGERPRINTS: int = 1000
     METRICS_PORT: int = 9090
 
     # ===========================================
@@ -5,7 +5,8 @@ Integrates with SQLAlchemy to monitor query performance.
 
 import time
 import logging
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 from sqlalchemy import event
 from sqlalchemy.engine import Engine, Connection
 from sqlalchemy.pool import Pool
@@ -19,9 +20,15 @@ from ..middleware.performance_middleware import (
     DB_CONNECTION_POOL,
     update_connection_pool_metrics,
 )
+from ..middleware.request_id import get_current_endpoint
+from .query_stats import query_stats
 
 logger = logging.getLogger(__name__)
 
+# Distinct statement strings to remember; SQLAlchemy reuses compiled strings,
+# so the working set is small and bounded by the application's query shapes
+STATEMENT_CACHE_SIZE = 2048
+
 
 # Store query context for tracking
 class QueryContext:
@@ -33,12 +40,13 @@ class QueryContext:
         self.parameters: Optional[Dict] = None
 
 
-def setup_database_monitoring(engine: Engine):
+def setup_database_monitoring(engine: Engine, collect_query_stats: bool = True):
     """
     Set up database monitoring for SQLAlchemy engine.
 
     Args:
         engine: SQLAlchemy engine instance
+        collect_query_stats: Whether to aggregate per-fingerprint statistics
     """
 
     @event.listens_for(engine, "before_cursor_execute")
@@ -49,7 +57,7 @@ def setup_database_monitoring(engine: Engine):
         if not hasattr(context, "_query_context"):
             context._query_context = QueryContext()
 
-        context._query_context.start_time = time.time()
+        context._query_context.start_time = time.perf_counter()
         context._query_context.statement = statement
         context._query_context.parameters = parameters
 
@@ -59,29 +67,25 @@ def setup_database_monitoring(engine: Engine):
     ):
         """Track query execution time and log slow queries."""
         if hasattr(context, "_query_context") and context._query_context.start_time:
-            duration = time.time() - context._query_context.start_time
+            duration = time.perf_counter() - context._query_context.start_time
 
-            # Extract operation and table from SQL statement
-            operation, table = _parse_sql_statement(statement)
+            # Classify the statement (cached per distinct statement string)
+            operation, table, histogram = _classify_statement(statement)
 
             # Record metrics
-            DB_QUERY_DURATION.labels(operation=operation, table=table).observe(duration)
-
-            # Log slow queries (> 100ms)
-            if duration > 0.1:
-                logger.warning(
-                    "Slow database query detected",
-                    extra={
-                        "duration": f"{duration:.3f}s",
-                        "operation": operation,
-                        "table": table,
-                        "statement": statement[:500],  # Truncate long statements
-                        "parameters": str(parameters)[:200] if parameters else None,
-                    },
+            histogram.observe(duration)
+
+            if collect_query_stats:
+                query_stats.record(
+                    statement,
+                    parameters if not executemany else None,
+                    duration,
+                    rows=getattr(cursor, "rowcount", 0) or 0,
+                    endpoint=get_current_endpoint(),
                 )
 
             # Log extremely slow queries (> 1s) as errors
-            elif duration > 1.0:
+            if duration > 1.0:
                 logger.error(
                     "Extremely slow database query",
                     extra={
@@ -94,6 +98,19 @@ def setup_database_monitoring(engine: Engine):
                     },
                 )
 
+            # Log slow queries (> 100ms)
+            elif duration > 0.1:
+                logger.warning(
+                    "Slow database query detected",
+                    extra={
+                        "duration": f"{duration:.3f}s",
+                        "operation": operation,
+                        "table": table,
+                        "statement": statement[:500],  # Truncate long statements
+                        "parameters": str(parameters)[:200] if parameters else None,
+                    },
+                )
+
     @event.listens_for(engine, "handle_error")
     def receive_handle_error(exception_context):
         """Log database errors."""
@@ -112,8 +129,8 @@ def setup_database_monitoring(engine: Engine):
             exc_info=exception_context.original_exception,
         )
 
-    # Monitor connection pool if available
-    if hasattr(engine, "pool"):
+    # Monitor connection pool if available (NullPool has no size accounting)
+    if hasattr(engine, "pool") and hasattr(engine.pool, "checkedout"):
         setup_pool_monitoring(engine.pool)
 
 
@@ -183,6 +200,28 @@ def setup_pool_monitoring(pool: Pool):
         _update_pool_metrics(pool)
 
 
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _classify_statement(statement: str) -> Tuple[str, str, Any]:
+    """
+    Classify a SQL statement for metrics, memoized per statement string.
+
+    Compiled statement strings are reused by SQLAlchemy, so after warm-up
+    this is a dict hit on a string whose hash is already cached.
+
+    Args:
+        statement: SQL statement string
+
+    Returns:
+        Tuple of (operation, table_name, duration histogram child)
+    """
+    operation, table = _parse_sql_statement(statement)
+    return (
+        operation,
+        table,
+        DB_QUERY_DURATION.labels(operation=operation, table=table),
+    )
+
+
 def _parse_sql_statement(statement: str) -> tuple[str, str]:
     """
     Parse SQL statement to extract operation and table name.
@@ -0,0 +1,337 @@
+"""
+File Downloads
+
+Serving of large generated files (exports, backups) without tying up
+Python workers copying bytes:
+
+- ``RangeFileResponse`` supports ``Range``/``If-Range`` (resumable
+  downloads), ``ETag``/``If-None-Match`` and ``HEAD``. The body is handed
+  off zero-copy when possible: with an ``X-Accel-Redirect`` prefix
+  configured the front proxy (nginx) serves the file itself via sendfile;
+  on servers implementing the ASGI ``http.response.zerocopysend``
+  extension the file descriptor is passed to the server; otherwise the
+  file is streamed in large chunks read off the event loop.
+- Pre-signed URLs (HMAC over path and expiry) let clients fetch a file
+  from ``SignedDownloadApp``, a bare ASGI handler mounted outside the API
+  that needs no session, database or auth lookup.
+"""
+
+import hashlib
+import hmac
+import os
+import re
+import time
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlencode
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Mount point of SignedDownloadApp
+DOWNLOADS_PATH = "/downloads"
+
+# Chunk size for the non-zero-copy fallback
+CHUNK_SIZE = 1024 * 1024
+
+# Internal proxy location prefix for X-Accel-Redirect (e.g. "/internal"),
+# under which the proxy maps /<kind>/<name> to the download roots
+ACCEL_REDIRECT_PREFIX: Optional[str] = getattr(
+    settings, "DOWNLOAD_ACCEL_REDIRECT_PREFIX", None
+)
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header lies entirely outside the file."""
+
+    pass
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong validator from size and modification time (no hashing)."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range.
+
+    Returns:
+        Optional[Tuple[int, int]]: Inclusive (start, end), or None when the
+        header is malformed or asks for several ranges (the whole file is
+        served instead, as RFC 9110 allows)
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the file
+    """
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+class RangeFileResponse(Response):
+    """File response with Range, ETag and zero-copy support."""
+
+    def __init__(
+        self,
+        path: Path,
+        filename: Optional[str] = None,
+        media_type: str = "application/octet-stream",
+        etag: Optional[str] = None,
+        accel_redirect: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            path: File to serve
+            filename: Download name for Content-Disposition
+            media_type: Content type
+            etag: Precomputed strong ETag (e.g. a stored checksum); defaults
+                to one derived from size and mtime
+            accel_redirect: Internal proxy location; when set the proxy
+                serves the file and the response carries no body
+        """
+        self.path = Path(path)
+        self.filename = filename
+        self.media_type = media_type
+        self.etag = etag
+        self.accel_redirect = accel_redirect
+        self.status_code = 200
+        self.background = None
+        self.raw_headers: List[Tuple[bytes, bytes]] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        send_body = scope.get("method", "GET") != "HEAD"
+
+        try:
+            stat = await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        size = stat.st_size
+        etag = self.etag or file_etag(stat)
+        headers: Dict[str, str] = {
+            "etag": etag,
+            "last-modified": formatdate(stat.st_mtime, usegmt=True),
+            "accept-ranges": "bytes",
+            "content-type": self.media_type,
+        }
+        if self.filename:
+            headers["content-disposition"] = (
+                f"attachment; filename*=utf-8''{quote(self.filename)}"
+            )
+
+        if self.accel_redirect:
+            # The proxy handles Range and conditional requests itself
+            headers["x-accel-redirect"] = self.accel_redirect
+            await self._send_head(send, 200, headers, more_body=False)
+            return
+
+        if etag in _etag_list(request_headers.get("if-none-match")):
+            headers.pop("content-type")
+            await self._send_head(send, 304, headers, more_body=False)
+            return
+
+        status_code, start, end = 200, 0, size - 1
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and (not if_range or if_range == etag):
+            try:
+                byte_range = parse_range(range_header, size)
+            except RangeNotSatisfiable:
+                headers["content-range"] = f"bytes */{size}"
+                headers["content-length"] = "0"
+                await self._send_head(send, 416, headers, more_body=False)
+                return
+            if byte_range:
+                status_code, (start, end) = 206, byte_range
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        count = end - start + 1 if size else 0
+        headers["content-length"] = str(count)
+        send_body = send_body and count > 0
+        await self._send_head(send, status_code, headers, more_body=send_body)
+        if not send_body:
+            return
+
+        with open(self.path, "rb") as file:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": start,
+                        "count": count,
+                        "more_body": False,
+                    }
+                )
+                return
+
+            file.seek(start)
+            remaining = count
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(
+                    file.read, min(CHUNK_SIZE, remaining)
+                )
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                # File shrank while being served
+                await send({"type": "http.response.body", "body": b""})
+
+    async def _send_head(
+        self, send: Send, status_code: int, headers: Dict[str, str], more_body: bool
+    ) -> None:
+        self.status_code = status_code
+        self.raw_headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        ]
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if not more_body:
+            await send({"type": "http.response.body", "body": b""})
+
+
+def accel_redirect_for(kind: str, name: str) -> Optional[str]:
+    """Internal proxy location of a file, if X-Accel-Redirect is configured."""
+    if not ACCEL_REDIRECT_PREFIX:
+        return None
+    return f"{ACCEL_REDIRECT_PREFIX.rstrip('/')}/{kind}/{quote(name)}"
+
+
+def _etag_list(header: Optional[str]) -> List[str]:
+    if not header:
+        return []
+    return [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def _signature(kind: str, name: str, expires: int) -> str:
+    message = f"{kind}/{name}:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def create_signed_url(kind: str, name: str, expires_in: int) -> Tuple[str, int]:
+    """
+    Build a time-limited download URL for a file under a download root.
+
+    Args:
+        kind: Download root (``exports`` or ``backups``)
+        name: File name within the root
+        expires_in: Lifetime in seconds
+
+    Returns:
+        Tuple[str, int]: Path with query string, and expiry as a Unix time
+    """
+    expires = int(time.time()) + expires_in
+    query = urlencode(
+        {"expires": expires, "signature": _signature(kind, name, expires)}
+    )
+    return f"{DOWNLOADS_PATH}/{kind}/{quote(name)}?{query}", expires
+
+
+def verify_signature(kind: str, name: str, expires: str, signature: str) -> bool:
+    """Check a pre-signed URL's signature and expiry."""
+    try:
+        expires_at = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires_at < time.time():
+        return False
+    return hmac.compare_digest(_signature(kind, name, expires_at), signature)
+
+
+class SignedDownloadApp:
+    """
+    Static handler for pre-signed download URLs.
+
+    Serves ``/<kind>/<name>?expires=..&signature=..`` from the configured
+    roots after checking the signature, with no other request processing.
+    """
+
+    def __init__(self, roots: Dict[str, Path]) -> None:
+        self.roots = roots
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return
+
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405)
+            await response(scope, receive, send)
+            return
+
+        parts = scope["path"].rstrip("/").split("/")
+        kind, name = (parts[-2], parts[-1]) if len(parts) >= 2 else ("", "")
+        name = unquote(name)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        expires = query.get("expires", [""])[0]
+        signature = query.get("signature", [""])[0]
+
+        root = self.roots.get(kind)
+        if (
+            root is None
+            or not name
+            or Path(name).name != name
+            or not verify_signature(kind, name, expires, signature)
+        ):
+            await PlainTextResponse("Forbidden", status_code=403)(scope, receive, send)
+            return
+
+        response = RangeFileResponse(
+            root / name, filename=name, accel_redirect=accel_redirect_for(kind, name)
+        )
+        await response(scope, receive, send)
+
+
+__all__ = [
+    "DOWNLOADS_PATH",
+    "RangeFileResponse",
+    "RangeNotSatisfiable",
+    "SignedDownloadApp",
+    "accel_redirect_for",
+    "create_signed_url",
+    "file_etag",
+    "parse_range",
+    "verify_signature",
+]
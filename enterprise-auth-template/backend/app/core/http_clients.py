@@ -0,0 +1,201 @@
+"""
+Outbound HTTP Clients
+
+Shared ``httpx.AsyncClient`` instances for calls to external services
+(OAuth providers, SMS gateways, alert webhooks), one per origin so each
+host gets its own connection pool. Connections are kept alive and reused
+across requests, with HTTP/2 where the ``h2`` package is installed, so
+callers stop paying DNS, TCP and TLS setup on every call.
+
+Failed connection attempts are retried by the transport for every
+method, since the request never reached the server. Idempotent requests
+are additionally retried on transport errors and on 429/502/503/504 with
+exponential backoff; other methods (an SMS send, a token exchange) are
+never resent once the server may have seen them.
+
+Clients are created on first use and closed with ``aclose`` on shutdown.
+Pool usage is exported as Prometheus metrics via ``get_http_client_stats``.
+"""
+
+import asyncio
+import importlib.util
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import structlog
+
+from app.core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientRegistry:
+    """Per-origin pooled HTTP clients shared by the whole application."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        retries: int = 2,
+        retry_backoff: float = 0.2,
+        http2: bool = True,
+    ) -> None:
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.http2 = http2 and _http2_available()
+
+        # origin -> (client, transport, event loop it was created on)
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Any, Any]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def origin(url: str) -> str:
+        """``scheme://host:port`` of a URL, the key of its pool."""
+        parsed = httpx.URL(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        return f"{parsed.scheme}://{parsed.host}:{port}"
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Shared client for the origin of ``url``."""
+        origin = self.origin(url)
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(origin)
+        # Connections belong to the loop that opened them
+        if entry is not None and entry[2] is loop and not entry[0].is_closed:
+            return entry[0]
+
+        transport = httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            limits=self.limits,
+            retries=self.retries,
+        )
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            http2=self.http2,
+        )
+        self._clients[origin] = (client, transport, loop)
+        self._stats.setdefault(
+            origin, {"requests": 0, "retries": 0, "errors": 0, "in_flight": 0}
+        )
+        logger.debug("HTTP client created", origin=origin, http2=self.http2)
+        return client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request through the shared client of its origin.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed to ``httpx.AsyncClient.request``
+
+        Returns:
+            httpx.Response: Response of the last attempt
+        """
+        method = method.upper()
+        client = self.client(url)
+        stats = self._stats[self.origin(url)]
+        attempts = 1 + (self.retries if method in IDEMPOTENT_METHODS else 0)
+
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                stats["errors"] += 1
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+            finally:
+                stats["in_flight"] -= 1
+
+            stats["retries"] += 1
+            await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+        raise RuntimeError("unreachable")
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Request counters and pool usage per origin."""
+        result = {}
+        for origin, counters in self._stats.items():
+            active = idle = 0
+            entry = self._clients.get(origin)
+            if entry is not None:
+                # httpx does not expose its connection pool publicly
+                pool = getattr(entry[1], "_pool", None)
+                for connection in getattr(pool, "connections", []):
+                    if connection.is_idle():
+                        idle += 1
+                    else:
+                        active += 1
+            result[origin] = {
+                **counters,
+                "active_connections": active,
+                "idle_connections": idle,
+                "max_connections": self.limits.max_connections or 0,
+            }
+        return result
+
+    async def aclose(self) -> None:
+        """Close every client; later calls open new ones."""
+        clients, self._clients = self._clients, {}
+        for origin, (client, _, _) in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(
+                    "Failed to close HTTP client", origin=origin, error=str(e)
+                )
+        if clients:
+            logger.info("HTTP clients closed", count=len(clients))
+
+
+http_clients = HttpClientRegistry(
+    timeout=getattr(settings, "HTTP_CLIENT_TIMEOUT", 10.0),
+    connect_timeout=getattr(settings, "HTTP_CLIENT_CONNECT_TIMEOUT", 5.0),
+    max_connections=getattr(settings, "HTTP_CLIENT_MAX_CONNECTIONS", 20),
+    max_keepalive_connections=getattr(settings, "HTTP_CLIENT_MAX_KEEPALIVE", 10),
+    keepalive_expiry=getattr(settings, "HTTP_CLIENT_KEEPALIVE_EXPIRY", 30.0),
+    retries=getattr(settings, "HTTP_CLIENT_RETRIES", 2),
+    http2=getattr(settings, "HTTP_CLIENT_HTTP2", True),
+)
+
+
+def get_http_client_stats() -> Optional[Dict[str, Dict[str, int]]]:
+    """Stats of the shared registry, or None before any client exists."""
+    return http_clients.stats() or None
+
+
+__all__ = [
+    "HttpClientRegistry",
+    "get_http_client_stats",
+    "http_clients",
+]
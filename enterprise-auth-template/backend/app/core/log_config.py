@@ -13,6 +13,7 @@ import structlog
 from structlog.types import Processor
 
 from app.core.config import get_settings
+from app.core.logging_config import DeferredEventFormatter, defer_rendering
 
 settings = get_settings()
 
@@ -87,12 +88,13 @@ def setup_logging() -> None:
         level=getattr(logging, settings.LOG_LEVEL.upper()),
     )
 
-    # Set up structlog processors
+    # Set up structlog processors; level filtering comes first so that
+    # dropped events never pay for context merging or redaction
     processors: list[Processor] = [
+        structlog.stdlib.filter_by_level,
         structlog.contextvars.merge_contextvars,
         add_request_id,  # type: ignore
         add_user_info,  # type: ignore
-        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
@@ -101,13 +103,11 @@ def setup_logging() -> None:
     ]
 
     if settings.LOG_FORMAT == "json":
-        # JSON format for production
-        processors.extend(
-            [
-                structlog.processors.dict_tracebacks,
-                structlog.processors.JSONRenderer(),
-            ]
-        )
+        # JSON format for production; redaction and rendering happen in the
+        # handler's formatter (the log writer thread when LOG_ASYNC is set)
+        processors.append(defer_rendering)
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(DeferredEventFormatter("%(message)s"))
     else:
         # Human-readable format for development
         processors.extend(
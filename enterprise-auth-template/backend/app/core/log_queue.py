@@ -0,0 +1,332 @@
+"""
+Non-blocking queued logging backend.
+
+Request handlers only append records to a bounded in-memory queue; a
+background thread formats and writes them in batches so log I/O latency
+never lands on request latency. Under overload, low-severity records are
+sampled and, once the queue is full, dropped, with counters for both.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.logging_config import (
+    correlation_id_var,
+    request_id_var,
+    user_id_var,
+)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_SAMPLE = "sample"
+
+
+class BoundedLogQueue:
+    """
+    Bounded FIFO for log records.
+
+    Backed by ``collections.deque`` whose ``append``/``popleft`` are atomic
+    in CPython, so producers never take a lock. Size accounting is
+    approximate under contention, which is acceptable for load shedding.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        overflow_policy: str = OVERFLOW_SAMPLE,
+        sample_rate: int = 10,
+        high_water_ratio: float = 0.8,
+    ):
+        if overflow_policy not in (OVERFLOW_DROP, OVERFLOW_SAMPLE):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.sample_rate = max(1, sample_rate)
+        self.high_water_mark = int(max_size * high_water_ratio)
+
+        self._records: Deque[logging.LogRecord] = deque()
+        self._not_empty = threading.Event()
+        self._sample_counter = 0
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def put(self, record: logging.LogRecord) -> bool:
+        """
+        Enqueue a record without blocking.
+
+        Returns:
+            bool: False if the record was shed due to overload
+        """
+        depth = len(self._records)
+
+        if depth >= self.max_size:
+            self.dropped += 1
+            return False
+
+        if (
+            self.overflow_policy == OVERFLOW_SAMPLE
+            and depth >= self.high_water_mark
+            and record.levelno < logging.WARNING
+        ):
+            # Keep one in ``sample_rate`` low-severity records while backed up
+            self._sample_counter += 1
+            if self._sample_counter % self.sample_rate:
+                self.sampled_out += 1
+                return False
+
+        self._records.append(record)
+        self.enqueued += 1
+        self._not_empty.set()
+        return True
+
+    def get_batch(
+        self, max_batch: int, timeout: Optional[float] = None
+    ) -> List[logging.LogRecord]:
+        """
+        Take up to ``max_batch`` records, waiting up to ``timeout`` for the first.
+        """
+        if not self._records:
+            self._not_empty.clear()
+            # Re-check after clearing to avoid missing a concurrent put
+            if not self._records:
+                self._not_empty.wait(timeout)
+
+        batch: List[logging.LogRecord] = []
+        popleft = self._records.popleft
+        while len(batch) < max_batch:
+            try:
+                batch.append(popleft())
+            except IndexError:
+                break
+        return batch
+
+    def wake(self) -> None:
+        """Wake a consumer blocked in ``get_batch``."""
+        self._not_empty.set()
+
+
+class QueuedLogHandler(logging.Handler):
+    """
+    Logging handler that hands records to a background writer thread.
+
+    The calling thread only snapshots request context onto the record and
+    enqueues it; filtering, redaction, formatting and I/O for the target
+    handlers all run on the writer thread.
+    """
+
+    def __init__(
+        self,
+        handlers: List[logging.Handler],
+        max_size: int = 10000,
+        overflow_policy: str = OVERFLOW_SAMPLE,
+        sample_rate: int = 10,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+    ):
+        super().__init__()
+        self.handlers = handlers
+        self.queue = BoundedLogQueue(
+            max_size=max_size,
+            overflow_policy=overflow_policy,
+            sample_rate=sample_rate,
+        )
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.write_errors = 0
+
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread after draining queued records."""
+        self._stopping.set()
+        self.queue.wake()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Enqueue a record; never blocks on I/O."""
+        # Context variables are not visible from the writer thread
+        if not hasattr(record, "request_id"):
+            request_id = request_id_var.get()
+            if request_id:
+                record.request_id = request_id
+        if not hasattr(record, "user_id"):
+            user_id = user_id_var.get()
+            if user_id:
+                record.user_id = user_id
+        if not hasattr(record, "correlation_id"):
+            correlation_id = correlation_id_var.get()
+            if correlation_id:
+                record.correlation_id = correlation_id
+
+        self.queue.put(record)
+
+    def close(self) -> None:
+        self.stop()
+        super().close()
+
+    def _run(self) -> None:
+        """Writer loop: drain batches until stopped and the queue is empty."""
+        while True:
+            batch = self.queue.get_batch(self.batch_size, self.flush_interval)
+            if batch:
+                self._write_batch(batch)
+            elif self._stopping.is_set():
+                break
+
+    def _write_batch(self, records: List[logging.LogRecord]) -> None:
+        """Format and write a batch to every target handler."""
+        for handler in self.handlers:
+            try:
+                if type(handler) is logging.StreamHandler:
+                    self._write_stream_batch(handler, records)
+                else:
+                    for record in records:
+                        if record.levelno >= handler.level:
+                            handler.handle(record)
+            except Exception:
+                self.write_errors += 1
+        self.written += len(records)
+
+    @staticmethod
+    def _write_stream_batch(
+        handler: logging.StreamHandler, records: List[logging.LogRecord]
+    ) -> None:
+        """Write a batch to a plain stream with a single write and flush."""
+        lines = [
+            handler.format(record) + handler.terminator
+            for record in records
+            if record.levelno >= handler.level and handler.filter(record)
+        ]
+        if not lines:
+            return
+        handler.acquire()
+        try:
+            handler.stream.write("".join(lines))
+            handler.flush()
+        finally:
+            handler.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue counters."""
+        return {
+            "queue_depth": len(self.queue),
+            "queue_max_size": self.queue.max_size,
+            "overflow_policy": self.queue.overflow_policy,
+            "enqueued": self.queue.enqueued,
+            "written": self.written,
+            "dropped": self.queue.dropped,
+            "sampled_out": self.queue.sampled_out,
+            "write_errors": self.write_errors,
+        }
+
+
+_queued_handler: Optional[QueuedLogHandler] = None
+
+
+def install_queued_logging(
+    logger_names: Optional[List[str]] = None,
+    max_size: int = 10000,
+    overflow_policy: str = OVERFLOW_SAMPLE,
+    sample_rate: int = 10,
+    batch_size: int = 256,
+) -> QueuedLogHandler:
+    """
+    Route the currently configured handlers through a queued writer.
+
+    Handlers attached to the root logger and the given loggers are moved
+    behind a single ``QueuedLogHandler``; call after logging is configured.
+
+    Args:
+        logger_names: Non-propagating loggers with their own handlers
+        max_size: Maximum queued records before dropping
+        overflow_policy: "drop" or "sample" low-severity records when backed up
+        sample_rate: Keep one in N low-severity records while sampling
+        batch_size: Maximum records written per batch
+
+    Returns:
+        QueuedLogHandler: The installed handler
+    """
+    global _queued_handler
+
+    if _queued_handler is not None:
+        shutdown_queued_logging()
+
+    loggers = [logging.getLogger()] + [
+        logging.getLogger(name) for name in (logger_names or [])
+    ]
+
+    targets: List[logging.Handler] = []
+    for target_logger in loggers:
+        for handler in target_logger.handlers:
+            if handler not in targets:
+                targets.append(handler)
+
+    queued_handler = QueuedLogHandler(
+        targets,
+        max_size=max_size,
+        overflow_policy=overflow_policy,
+        sample_rate=sample_rate,
+        batch_size=batch_size,
+    )
+
+    for target_logger in loggers:
+        if target_logger.handlers:
+            target_logger.handlers = [queued_handler]
+
+    queued_handler.start()
+    _queued_handler = queued_handler
+    return queued_handler
+
+
+def shutdown_queued_logging() -> None:
+    """Flush pending records and stop the writer thread."""
+    global _queued_handler
+
+    if _queued_handler is not None:
+        _queued_handler.stop()
+        _queued_handler = None
+
+
+def get_log_queue_stats() -> Optional[Dict[str, Any]]:
+    """Get counters of the installed queued handler, if any."""
+    if _queued_handler is None:
+        return None
+    return _queued_handler.get_stats()
+
+
+atexit.register(shutdown_queued_logging)
+
+
+__all__ = [
+    "BoundedLogQueue",
+    "QueuedLogHandler",
+    "install_queued_logging",
+    "shutdown_queued_logging",
+    "get_log_queue_stats",
+    "OVERFLOW_DROP",
+    "OVERFLOW_SAMPLE",
+]
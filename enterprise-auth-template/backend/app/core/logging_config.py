@@ -1,18 +1,25 @@
 """
 Structured logging configuration for the application.
 Uses JSON format for easy parsing by log aggregation systems.
+
+structlog events are redacted and rendered by the handler's formatter
+rather than in the calling thread, so with queued logging that work runs
+on the log writer thread (see ``defer_rendering``).
 """
 
 import logging
 import logging.config
 import sys
 import json
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 import traceback
 from contextvars import ContextVar
 
+import structlog
+
 # Context variables for request tracking
 request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 user_id_var: ContextVar[Optional[str]] = ContextVar("user_id", default=None)
@@ -36,26 +43,30 @@ class JSONFormatter(logging.Formatter):
         Format log record as JSON.
         """
         # Build base log entry
+        message = render_deferred_event(record)
         log_entry = {
             "@timestamp": datetime.utcnow().isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
-            "message": record.getMessage(),
+            "message": message if message is not None else record.getMessage(),
             "service": self.service_name,
             "hostname": self.hostname,
             "environment": self._get_environment(),
         }
 
-        # Add context variables if available
-        request_id = request_id_var.get()
+        # Add context variables if available (records formatted off-thread
+        # by the queued handler carry a snapshot as attributes)
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
         if request_id:
             log_entry["request_id"] = request_id
 
-        user_id = user_id_var.get()
+        user_id = getattr(record, "user_id", None) or user_id_var.get()
         if user_id:
             log_entry["user_id"] = user_id
 
-        correlation_id = correlation_id_var.get()
+        correlation_id = (
+            getattr(record, "correlation_id", None) or correlation_id_var.get()
+        )
         if correlation_id:
             log_entry["correlation_id"] = correlation_id
 
@@ -103,6 +114,8 @@ class JSONFormatter(logging.Formatter):
                     "exc_info",
                     "exc_text",
                     "stack_info",
+                    REDACTED_MARKER,
+                    DEFERRED_EVENT_MARKER,
                 ]:
                     # Serialize complex objects
                     try:
@@ -176,96 +189,220 @@ class RequestContextFilter(logging.Filter):
         return True
 
 
+# Attributes every LogRecord carries; anything else was supplied via ``extra``
+_STANDARD_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", logging.INFO, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+# Set on records whose payload is redacted by the structlog chain instead
+REDACTED_MARKER = "_sensitive_redacted"
+
+# Set on records carrying an unrendered structlog event dict as ``msg``
+DEFERRED_EVENT_MARKER = "_structlog_deferred"
+
+
+class SensitiveDataRedactor:
+    """
+    Redaction engine for log payloads.
+
+    All text patterns are precompiled into a single alternation so each
+    string is scanned exactly once, and the replacement is chosen by the
+    named group that matched.
+    """
+
+    SENSITIVE_FIELDS = frozenset(
+        {
+            "password",
+            "secret",
+            "token",
+            "api_key",
+            "access_token",
+            "refresh_token",
+            "authorization",
+            "cookie",
+            "session",
+            "credit_card",
+            "ssn",
+            "pin",
+            "cvv",
+        }
+    )
+
+    _PATTERN = re.compile(
+        r"(?P<jwt>eyJ[a-zA-Z0-9_-]+\.eyJ[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]+)"
+        r"|(?P<key>(?i:api[_-]?key|access[_-]?token|secret[_-]?key)"
+        r"[\"']?\s*[:=]\s*[\"']?)[^\"'\s]+"
+        r"|(?P<user>[a-zA-Z0-9._%+-]+)@(?P<domain>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+    )
+
+    def __init__(self) -> None:
+        self._sensitive_key_cache: Dict[str, bool] = {}
+
+    @staticmethod
+    def _replace(match: "re.Match[str]") -> str:
+        group = match.lastgroup
+        if group == "jwt":
+            return "[REDACTED_JWT]"
+        if group == "key":
+            return f"{match.group('key')}[REDACTED]"
+        return f"{match.group('user')[:3]}***@{match.group('domain')}"
+
+    def is_sensitive_key(self, key: str) -> bool:
+        """Check whether a mapping key names a sensitive field (memoized)."""
+        cached = self._sensitive_key_cache.get(key)
+        if cached is None:
+            lowered = key.lower()
+            cached = any(field in lowered for field in self.SENSITIVE_FIELDS)
+            if len(self._sensitive_key_cache) < 1024:
+                self._sensitive_key_cache[key] = cached
+        return cached
+
+    def redact_text(self, text: str) -> str:
+        """Redact emails, JWTs and API keys from a string in one pass."""
+        return self._PATTERN.sub(self._replace, text)
+
+    def redact(self, data: Any) -> Any:
+        """
+        Redact sensitive information from data.
+
+        Strings are scanned, mappings have sensitive keys masked and their
+        values redacted recursively; other values are returned unchanged.
+        """
+        if isinstance(data, str):
+            return self.redact_text(data)
+        if isinstance(data, dict):
+            return {
+                key: (
+                    "[REDACTED]"
+                    if isinstance(key, str) and self.is_sensitive_key(key)
+                    else self.redact(value)
+                )
+                for key, value in data.items()
+            }
+        return data
+
+
+redactor = SensitiveDataRedactor()
+
+
+def redact_sensitive_data(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    structlog processor that redacts user-supplied event fields.
+
+    Place it after ``filter_by_level`` so dropped events cost nothing.
+    """
+    for key, value in event_dict.items():
+        if key in ("timestamp", "level", "logger"):
+            continue
+        if redactor.is_sensitive_key(key):
+            event_dict[key] = "[REDACTED]"
+        elif isinstance(value, (str, dict)):
+            event_dict[key] = redactor.redact(value)
+    return event_dict
+
+
+def defer_rendering(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """
+    Final structlog processor that hands the event dict to the stdlib record.
+
+    Redaction and JSON rendering (including lazily rendered values such as
+    captured request bodies) then run in the handler's formatter, which is
+    the log writer thread when queued logging is enabled. ``SecurityFilter``
+    skips these records since the formatter redacts them.
+    """
+    # sys.exc_info() is not available on the thread that renders the event
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return (event_dict,), {
+        "extra": {REDACTED_MARKER: True, DEFERRED_EVENT_MARKER: True}
+    }
+
+
+_DEFERRED_PROCESSORS = (
+    redact_sensitive_data,
+    structlog.processors.dict_tracebacks,
+    structlog.processors.JSONRenderer(),
+)
+
+
+def render_deferred_event(record: logging.LogRecord) -> Optional[str]:
+    """Redacted JSON line of a deferred structlog event, None for other records."""
+    if not getattr(record, DEFERRED_EVENT_MARKER, False):
+        return None
+    # Copied so every handler formatting the record starts from the original
+    event_dict = dict(record.msg)
+    method_name = record.levelname.lower()
+    for processor in _DEFERRED_PROCESSORS:
+        event_dict = processor(None, method_name, event_dict)
+    return event_dict
+
+
+class DeferredEventFormatter(logging.Formatter):
+    """
+    Formatter rendering deferred structlog events as JSON lines.
+
+    Other records are formatted with ``fmt`` as usual.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        rendered = render_deferred_event(record)
+        if rendered is None:
+            return super().format(record)
+        return rendered
+
+
 class SecurityFilter(logging.Filter):
     """
     Filter to redact sensitive information from logs.
     """
 
-    SENSITIVE_FIELDS = {
-        "password",
-        "secret",
-        "token",
-        "api_key",
-        "access_token",
-        "refresh_token",
-        "authorization",
-        "cookie",
-        "session",
-        "credit_card",
-        "ssn",
-        "pin",
-        "cvv",
-    }
+    SENSITIVE_FIELDS = SensitiveDataRedactor.SENSITIVE_FIELDS
 
     def filter(self, record: logging.LogRecord) -> bool:
         """
         Redact sensitive information from log record.
         """
+        if getattr(record, REDACTED_MARKER, False):
+            return True
+
         # Redact message
-        record.msg = self._redact_sensitive(str(record.msg))
+        if isinstance(record.msg, str):
+            record.msg = redactor.redact_text(record.msg)
 
         # Redact arguments
         if record.args:
-            record.args = tuple(self._redact_sensitive(str(arg)) for arg in record.args)
+            if isinstance(record.args, dict):
+                record.args = redactor.redact(record.args)
+            else:
+                record.args = tuple(
+                    redactor.redact(arg) if isinstance(arg, (str, dict)) else arg
+                    for arg in record.args
+                )
 
         # Redact extra fields
-        for field in dir(record):
-            if not field.startswith("_"):
-                value = getattr(record, field)
-                if isinstance(value, (str, dict)):
-                    setattr(record, field, self._redact_sensitive(value))
+        for field, value in record.__dict__.items():
+            if field in _STANDARD_RECORD_ATTRS or field.startswith("_"):
+                continue
+            if redactor.is_sensitive_key(field):
+                record.__dict__[field] = "[REDACTED]"
+            elif isinstance(value, (str, dict)):
+                record.__dict__[field] = redactor.redact(value)
 
         return True
 
-    def _redact_sensitive(self, data):
-        """
-        Redact sensitive information from data.
-        """
-        if isinstance(data, str):
-            # Simple redaction for common patterns
-            import re
-
-            # Redact email addresses partially
-            data = re.sub(
-                r"([a-zA-Z0-9._%+-]+)@([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})",
-                lambda m: f"{m.group(1)[:3]}***@{m.group(2)}",
-                data,
-            )
-
-            # Redact JWT tokens
-            data = re.sub(
-                r"eyJ[a-zA-Z0-9_-]+\.eyJ[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]+",
-                "[REDACTED_JWT]",
-                data,
-            )
-
-            # Redact API keys (common patterns)
-            data = re.sub(
-                r'(?i)(api[_-]?key|access[_-]?token|secret[_-]?key)(["\']?\s*[:=]\s*["\']?)([^"\'\s]+)',
-                r"\1\2[REDACTED]",
-                data,
-            )
-
-        elif isinstance(data, dict):
-            # Redact dictionary values for sensitive keys
-            redacted = {}
-            for key, value in data.items():
-                if any(sensitive in key.lower() for sensitive in self.SENSITIVE_FIELDS):
-                    redacted[key] = "[REDACTED]"
-                elif isinstance(value, (dict, str)):
-                    redacted[key] = self._redact_sensitive(value)
-                else:
-                    redacted[key] = value
-            return redacted
-
-        return data
-
 
 def setup_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
     enable_json: bool = True,
     enable_security_filter: bool = True,
+    enable_async: bool = False,
+    queue_size: int = 10000,
+    overflow_policy: str = "sample",
 ) -> None:
     """
     Set up structured logging for the application.
@@ -275,6 +412,9 @@ def setup_logging(
         log_file: Optional log file path
         enable_json: Whether to use JSON formatting
         enable_security_filter: Whether to enable security filtering
+        enable_async: Whether to write records from a background thread
+        queue_size: Maximum queued records when async logging is enabled
+        overflow_policy: "drop" or "sample" records when the queue backs up
     """
 
     # Create logs directory if needed
@@ -289,7 +429,8 @@ def setup_logging(
         "formatters": {
             "json": {"()": JSONFormatter},
             "standard": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+                "()": DeferredEventFormatter,
+                "fmt": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             },
         },
         "filters": {"context": {"()": RequestContextFilter}},
@@ -365,6 +506,15 @@ def setup_logging(
     # Apply configuration
     logging.config.dictConfig(config)
 
+    if enable_async:
+        from app.core.log_queue import install_queued_logging
+
+        install_queued_logging(
+            logger_names=list(config["loggers"]),
+            max_size=queue_size,
+            overflow_policy=overflow_policy,
+        )
+
     # Log startup message
     logger = logging.getLogger(__name__)
     logger.info(
@@ -374,6 +524,7 @@ def setup_logging(
             "json_enabled": enable_json,
             "security_filter": enable_security_filter,
             "log_file": log_file,
+            "async_enabled": enable_async,
         },
     )
 
@@ -460,6 +611,11 @@ __all__ = [
     "JSONFormatter",
     "RequestContextFilter",
     "SecurityFilter",
+    "SensitiveDataRedactor",
+    "redact_sensitive_data",
+    "defer_rendering",
+    "render_deferred_event",
+    "DeferredEventFormatter",
     "set_request_id",
     "set_user_id",
     "set_correlation_id",
@@ -0,0 +1,354 @@
+"""
+Keyset Pagination
+
+Cursor-based pagination helpers shared by list and search services.
+Instead of ``OFFSET n`` the next page is selected with a row comparison on
+the ordering key (``(created_at, id) < (:last_created_at, :last_id)``),
+so with a matching index every page costs the same as the first. Cursors
+are opaque URL-safe tokens carrying the last row's key values.
+
+Totals are optional: callers choose an exact ``COUNT(*)``, a planner
+estimate, a cached exact count, or no total at all.
+"""
+
+import base64
+import inspect
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Sequence, TypeVar
+from uuid import UUID
+
+import structlog
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.exceptions import ValidationError
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATED = "estimated"
+COUNT_CACHED = "cached"
+COUNT_NONE = "none"
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATED, COUNT_CACHED, COUNT_NONE)
+
+# Cached totals are refreshed at most this often
+COUNT_CACHE_TTL = 60
+
+
+class InvalidCursorError(ValidationError):
+    """Raised when a pagination cursor cannot be decoded or does not apply."""
+
+    pass
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """One page of a keyset-paginated listing."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1:
+        tag, raw = next(iter(value.items()))
+        if tag == "dt":
+            return datetime.fromisoformat(raw)
+        if tag == "d":
+            return date.fromisoformat(raw)
+        if tag == "u":
+            return UUID(raw)
+    return value
+
+
+def encode_cursor(key: str, values: Sequence[Any]) -> str:
+    """
+    Encode the ordering key values of the last row into an opaque cursor.
+
+    Args:
+        key: Name of the ordering the cursor belongs to
+        values: Key values of the last row on the page
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = json.dumps(
+        {"k": key, "v": [_encode_value(v) for v in values]}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor`` for the same ordering.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or for another ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(v) for v in payload["v"]]
+        cursor_key = payload["k"]
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    if cursor_key != key or len(values) != size:
+        raise InvalidCursorError("Pagination cursor does not match this listing")
+    return values
+
+
+def keyset_name(columns: Sequence[Any]) -> str:
+    """Stable name of an ordering, used to bind cursors to it."""
+    return ",".join(
+        str(getattr(c, "key", None) or getattr(c, "name", c)) for c in columns
+    )
+
+
+def apply_keyset(
+    stmt: Select,
+    columns: Sequence[Any],
+    cursor_values: Optional[Sequence[Any]] = None,
+    descending: bool = True,
+) -> Select:
+    """
+    Order a statement by the key columns and seek past the cursor position.
+
+    The last key column must be unique (normally the primary key) so the
+    ordering is total and no rows are skipped or repeated between pages.
+    """
+    if cursor_values is not None:
+        row = tuple_(*columns)
+        position = tuple_(*cursor_values)
+        stmt = stmt.where(row < position if descending else row > position)
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return stmt.order_by(*order)
+
+
+async def _execute(session: Any, stmt: Any) -> Any:
+    """Execute on either an AsyncSession or a sync Session."""
+    result = session.execute(stmt)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def paginate_keyset(
+    session: Any,
+    stmt: Select,
+    columns: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    count_mode: str = COUNT_NONE,
+    count_cache_key: Optional[str] = None,
+    cache_service: Any = None,
+    key: Optional[str] = None,
+) -> KeysetPage:
+    """
+    Fetch one page of ORM entities with keyset pagination.
+
+    Args:
+        session: Database session (async or sync)
+        stmt: Filtered ``select(Model)`` without ordering or pagination
+        columns: Ordering key columns, ending with a unique column
+        limit: Page size
+        cursor: Cursor from the previous page, or None for the first page
+        descending: Sort direction of the key
+        count_mode: How to compute ``total`` (see ``count_rows``)
+        count_cache_key: Cache key for ``COUNT_CACHED``
+        cache_service: CacheService used for ``COUNT_CACHED``
+        key: Ordering name cursors are bound to (defaults to the column names)
+
+    Returns:
+        KeysetPage: Items, next cursor and optional total
+    """
+    key = key or keyset_name(columns)
+    cursor_values = decode_cursor(cursor, key, len(columns)) if cursor else None
+
+    page_stmt = apply_keyset(stmt, columns, cursor_values, descending).limit(limit + 1)
+    page_stmt = page_stmt.add_columns(
+        *[c.label(f"_key_{i}") for i, c in enumerate(columns)]
+    )
+
+    # On the first page an exact total rides along as a window aggregate
+    # instead of costing a second query
+    window_count = count_mode == COUNT_EXACT and cursor_values is None
+    if window_count:
+        page_stmt = page_stmt.add_columns(func.count().over().label("_total"))
+
+    result = await _execute(session, page_stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(key, [last[i + 1] for i in range(len(columns))])
+
+    if window_count:
+        total = rows[0]._total if rows else 0
+    else:
+        total = await count_rows(
+            session,
+            stmt,
+            count_mode,
+            cache_key=count_cache_key,
+            cache_service=cache_service,
+        )
+
+    return KeysetPage(
+        items=[row[0] for row in rows],
+        next_cursor=next_cursor,
+        total=total,
+        total_is_estimate=count_mode in (COUNT_ESTIMATED, COUNT_CACHED),
+    )
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` wrapper that keeps the statement's bind parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Any):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_rows(session: Any, stmt: Select) -> Optional[int]:
+    """
+    Planner row estimate for a statement (PostgreSQL only).
+
+    Costs a plan, not a scan: the estimate comes from table statistics, so
+    it is approximate but constant-time regardless of table size.
+
+    Returns:
+        Optional[int]: Estimated rows, or None if unavailable
+    """
+    try:
+        result = await _execute(session, Explain(stmt))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug("Row estimate unavailable", error=str(e))
+        return None
+
+
+async def exact_count(session: Any, stmt: Select) -> int:
+    """Exact ``COUNT(*)`` of the rows a statement returns."""
+    count_stmt = select(func.count()).select_from(
+        stmt.order_by(None).limit(None).offset(None).subquery()
+    )
+    result = await _execute(session, count_stmt)
+    return result.scalar() or 0
+
+
+async def count_rows(
+    session: Any,
+    stmt: Select,
+    mode: str = COUNT_EXACT,
+    cache_key: Optional[str] = None,
+    cache_service: Any = None,
+    ttl: int = COUNT_CACHE_TTL,
+) -> Optional[int]:
+    """
+    Total rows of a listing according to the requested count mode.
+
+    Args:
+        session: Database session
+        stmt: Filtered statement without ordering or pagination
+        mode: ``exact``, ``estimated`` (planner estimate, falls back to
+            exact on other databases), ``cached`` (exact count reused for
+            ``ttl`` seconds) or ``none``
+        cache_key: Cache key for ``cached`` mode
+        cache_service: CacheService for ``cached`` mode
+        ttl: Cache lifetime in seconds
+
+    Returns:
+        Optional[int]: Total, or None for ``none``
+    """
+    if mode == COUNT_NONE:
+        return None
+
+    if mode == COUNT_ESTIMATED:
+        estimate = await estimate_rows(session, stmt)
+        if estimate is not None:
+            return estimate
+        return await exact_count(session, stmt)
+
+    if mode == COUNT_CACHED and cache_key and cache_service is not None:
+        return await cached_count(
+            cache_key, lambda: exact_count(session, stmt), cache_service, ttl
+        )
+
+    return await exact_count(session, stmt)
+
+
+async def cached_count(
+    cache_key: str,
+    compute: Callable[[], Awaitable[int]],
+    cache_service: Any,
+    ttl: int = COUNT_CACHE_TTL,
+) -> int:
+    """Reuse an exact count for ``ttl`` seconds."""
+    key = f"count:{cache_key}"
+    try:
+        cached = await cache_service.get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as e:
+        logger.debug("Count cache read failed", key=key, error=str(e))
+
+    total = await compute()
+    try:
+        await cache_service.set(key, str(total), ttl=ttl)
+    except Exception as e:
+        logger.debug("Count cache write failed", key=key, error=str(e))
+    return total
+
+
+__all__ = [
+    "COUNT_CACHED",
+    "COUNT_ESTIMATED",
+    "COUNT_EXACT",
+    "COUNT_MODES",
+    "COUNT_NONE",
+    "InvalidCursorError",
+    "KeysetPage",
+    "apply_keyset",
+    "count_rows",
+    "decode_cursor",
+    "encode_cursor",
+    "estimate_rows",
+    "exact_count",
+    "keyset_name",
+    "paginate_keyset",
+]
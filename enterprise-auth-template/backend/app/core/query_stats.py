@@ -0,0 +1,315 @@
+"""
+In-process query statistics keyed by normalized statement fingerprint.
+
+Modeled on pg_stat_statements: every executed statement is normalized
+(literals and IN-lists collapsed) and aggregated into call count,
+total/mean/max and recent p99 latency, rows, and the endpoints that issued
+it. The slowest execution of each fingerprint is kept so EXPLAIN plans can
+be captured on demand for the queries that dominate load.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+# Recent latencies kept per fingerprint for percentile estimates
+LATENCY_SAMPLE_SIZE = 512
+# Distinct endpoints remembered per fingerprint
+MAX_ENDPOINTS_PER_FINGERPRINT = 20
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMERIC_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_POSITIONAL_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):(?!:)\w+|\?")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_POSTCOMPILE = re.compile(r"\(?\s*__\[POSTCOMPILE_\w+\]\s*\)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_statement(statement: str) -> Tuple[str, str]:
+    """
+    Normalize a SQL statement into a fingerprint.
+
+    Literals and bind parameters become ``?``, IN-lists of any length
+    collapse to ``(?)`` and whitespace is squeezed, so the same query shape
+    always maps to the same fingerprint.
+
+    Args:
+        statement: SQL statement string
+
+    Returns:
+        Tuple of (query_id, normalized statement)
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _POSTCOMPILE.sub("(?)", normalized)
+    normalized = _POSITIONAL_PARAM.sub("?", normalized)
+    normalized = _NUMERIC_LITERAL.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(?)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+
+    query_id = hashlib.sha1(normalized.encode()).hexdigest()[:16]
+    return query_id, normalized
+
+
+class QueryStats:
+    """Aggregated statistics for a single statement fingerprint."""
+
+    __slots__ = (
+        "query_id",
+        "query",
+        "calls",
+        "total_time",
+        "min_time",
+        "max_time",
+        "rows",
+        "endpoints",
+        "_latencies",
+        "_latency_index",
+        "slowest_statement",
+        "slowest_parameters",
+        "explain_plan",
+        "explained_at",
+        "first_seen",
+        "last_seen",
+    )
+
+    def __init__(self, query_id: str, query: str):
+        self.query_id = query_id
+        self.query = query
+        self.calls = 0
+        self.total_time = 0.0
+        self.min_time = float("inf")
+        self.max_time = 0.0
+        self.rows = 0
+        self.endpoints: Counter = Counter()
+        self._latencies = array("d")
+        self._latency_index = 0
+        self.slowest_statement: Optional[str] = None
+        self.slowest_parameters: Any = None
+        self.explain_plan: Optional[Any] = None
+        self.explained_at: Optional[float] = None
+        self.first_seen = time.time()
+        self.last_seen = self.first_seen
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        rows: int,
+        endpoint: Optional[str],
+    ) -> None:
+        """Add one execution to the aggregate."""
+        self.calls += 1
+        self.total_time += duration
+        self.rows += rows
+        self.last_seen = time.time()
+
+        if duration < self.min_time:
+            self.min_time = duration
+        if duration > self.max_time:
+            self.max_time = duration
+            self.slowest_statement = statement
+            self.slowest_parameters = parameters
+
+        # Ring buffer of recent latencies
+        if len(self._latencies) < LATENCY_SAMPLE_SIZE:
+            self._latencies.append(duration)
+        else:
+            self._latencies[self._latency_index] = duration
+            self._latency_index = (self._latency_index + 1) % LATENCY_SAMPLE_SIZE
+
+        if endpoint and (
+            endpoint in self.endpoints
+            or len(self.endpoints) < MAX_ENDPOINTS_PER_FINGERPRINT
+        ):
+            self.endpoints[endpoint] += 1
+
+    def percentile(self, pct: float) -> float:
+        """Latency percentile over the recent sample window."""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize statistics (latencies in milliseconds)."""
+        return {
+            "query_id": self.query_id,
+            "query": self.query,
+            "calls": self.calls,
+            "total_time_ms": round(self.total_time * 1000, 3),
+            "mean_time_ms": (
+                round(self.total_time / self.calls * 1000, 3) if self.calls else 0
+            ),
+            "min_time_ms": round(self.min_time * 1000, 3) if self.calls else 0,
+            "max_time_ms": round(self.max_time * 1000, 3),
+            "p99_time_ms": round(self.percentile(99) * 1000, 3),
+            "rows": self.rows,
+            "rows_per_call": round(self.rows / self.calls, 2) if self.calls else 0,
+            "endpoints": dict(self.endpoints.most_common()),
+            "explain_plan": self.explain_plan,
+            "explained_at": self.explained_at,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+        }
+
+
+class QueryStatsCollector:
+    """
+    Process-wide registry of statement fingerprint statistics.
+
+    Bounded like pg_stat_statements: when full, the least-called
+    fingerprints are evicted to make room.
+    """
+
+    SORT_KEYS = {
+        "total_time": lambda s: s.total_time,
+        "mean_time": lambda s: s.total_time / s.calls if s.calls else 0,
+        "max_time": lambda s: s.max_time,
+        "calls": lambda s: s.calls,
+        "rows": lambda s: s.rows,
+    }
+
+    def __init__(self, max_fingerprints: int = 1000):
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.reset_at = time.time()
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        rows: int = 0,
+        endpoint: Optional[str] = None,
+    ) -> None:
+        """Record one statement execution."""
+        query_id, normalized = fingerprint_statement(statement)
+
+        with self._lock:
+            stats = self._stats.get(query_id)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self._evict()
+                stats = self._stats[query_id] = QueryStats(query_id, normalized)
+            stats.record(statement, parameters, duration, max(rows, 0), endpoint)
+
+    def _evict(self) -> None:
+        """Drop the least-called 5% of fingerprints (caller holds the lock)."""
+        count = max(1, self.max_fingerprints // 20)
+        victims = sorted(self._stats.values(), key=lambda s: s.calls)[:count]
+        for stats in victims:
+            del self._stats[stats.query_id]
+        self.evicted += len(victims)
+
+    def get(self, query_id: str) -> Optional[QueryStats]:
+        return self._stats.get(query_id)
+
+    def top(self, limit: int = 20, sort_by: str = "total_time") -> List[QueryStats]:
+        """Fingerprints ordered by the given statistic, highest first."""
+        key = self.SORT_KEYS.get(sort_by, self.SORT_KEYS["total_time"])
+        with self._lock:
+            snapshot = list(self._stats.values())
+        return sorted(snapshot, key=key, reverse=True)[:limit]
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals across all tracked fingerprints."""
+        with self._lock:
+            snapshot = list(self._stats.values())
+        return {
+            "fingerprints": len(snapshot),
+            "max_fingerprints": self.max_fingerprints,
+            "total_calls": sum(s.calls for s in snapshot),
+            "total_time_ms": round(sum(s.total_time for s in snapshot) * 1000, 3),
+            "evicted": self.evicted,
+            "reset_at": self.reset_at,
+        }
+
+    def reset(self) -> None:
+        """Discard all statistics."""
+        with self._lock:
+            self._stats.clear()
+            self.evicted = 0
+            self.reset_at = time.time()
+
+    async def capture_explain_plans(
+        self, db: AsyncSession, limit: int = 5, max_age_seconds: int = 3600
+    ) -> int:
+        """
+        Capture EXPLAIN plans for the slowest SELECT fingerprints.
+
+        Uses the parameters of each fingerprint's slowest execution. Plans
+        are not re-captured while younger than ``max_age_seconds``.
+
+        Returns:
+            int: Number of plans captured
+        """
+        captured = 0
+        now = time.time()
+
+        for stats in self.top(limit=limit, sort_by="max_time"):
+            statement = stats.slowest_statement
+            if not statement or not statement.lstrip().upper().startswith("SELECT"):
+                continue
+            if stats.explained_at and now - stats.explained_at < max_age_seconds:
+                continue
+
+            try:
+                stats.explain_plan = await _run_explain(
+                    db, statement, stats.slowest_parameters
+                )
+                stats.explained_at = now
+                captured += 1
+            except Exception as e:
+                logger.warning(
+                    "Failed to capture query plan",
+                    query_id=stats.query_id,
+                    error=str(e),
+                )
+
+        return captured
+
+
+async def _run_explain(db: AsyncSession, statement: str, parameters: Any) -> Any:
+    """Run ``EXPLAIN (FORMAT JSON)`` for a driver-level statement."""
+    if isinstance(parameters, list):
+        parameters = tuple(parameters)
+
+    # Savepoint so a failing EXPLAIN never aborts the caller's transaction
+    async with db.begin_nested():
+        connection = await db.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters or ()
+        )
+        return result.scalar()
+
+
+query_stats = QueryStatsCollector()
+
+
+def get_query_stats_collector() -> QueryStatsCollector:
+    """Get the process-wide query statistics collector."""
+    return query_stats
+
+
+__all__ = [
+    "QueryStats",
+    "QueryStatsCollector",
+    "fingerprint_statement",
+    "get_query_stats_collector",
+    "query_stats",
+]
@@ -63,29 +63,14 @@ class CurrentUser:
         return any(role in self.roles for role in required_roles)
 
 
-async def get_current_user(
-    request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db_session),
-) -> CurrentUser:
+def _get_token_data(
+    request: Request, credentials: Optional[HTTPAuthorizationCredentials]
+) -> TokenData:
     """
-    Get current authenticated user from JWT token (Bearer header or httpOnly cookie).
-
-    Enterprise authentication with multiple token sources:
-    - Primary: httpOnly cookies (secure, XSS-resistant)
-    - Fallback: Authorization Bearer header (for API clients)
-    - Comprehensive token validation and user state verification
-
-    Args:
-        request: FastAPI request object
-        credentials: HTTP bearer credentials (optional)
-        db: Database session
-
-    Returns:
-        CurrentUser: Current user information
+    Extract and verify the access token (httpOnly cookie, then Bearer header).
 
     Raises:
-        HTTPException: If authentication fails
+        HTTPException: If the token is missing or invalid
     """
     access_token: Optional[str] = None
     token_source = "unknown"
@@ -133,6 +118,35 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    return token_data
+
+
+async def get_current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db_session),
+) -> CurrentUser:
+    """
+    Get current authenticated user from JWT token (Bearer header or httpOnly cookie).
+
+    Enterprise authentication with multiple token sources:
+    - Primary: httpOnly cookies (secure, XSS-resistant)
+    - Fallback: Authorization Bearer header (for API clients)
+    - Comprehensive token validation and user state verification
+
+    Args:
+        request: FastAPI request object
+        credentials: HTTP bearer credentials (optional)
+        db: Database session
+
+    Returns:
+        CurrentUser: Current user information
+
+    Raises:
+        HTTPException: If authentication fails
+    """
+    token_data = _get_token_data(request, credentials)
+
     try:
         # Get user from database with current data
         stmt = (
@@ -233,6 +247,31 @@ async def get_current_user(
         )
 
 
+async def get_current_user_id(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> str:
+    """
+    Get the authenticated user's ID from the access token alone.
+
+    Unlike ``get_current_user`` this does not load the user, so account
+    state changes (deactivation, role changes) only take effect when the
+    token expires. Use it only for cheap, self-scoped reads that are
+    polled often, such as notification badge counts.
+
+    Args:
+        request: FastAPI request object
+        credentials: HTTP bearer credentials (optional)
+
+    Returns:
+        str: User ID (the token's ``sub``)
+
+    Raises:
+        HTTPException: If authentication fails
+    """
+    return _get_token_data(request, credentials).sub
+
+
 async def get_current_user_optional(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
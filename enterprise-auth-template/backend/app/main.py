@@ -6,6 +6,7 @@ routers, and configuration for the enterprise authentication template.
 """
 
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import AsyncGenerator
 
 import structlog
@@ -15,11 +16,18 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.core.config import get_settings
 from app.core.database import close_db, init_db
+from app.core.downloads import DOWNLOADS_PATH, SignedDownloadApp
+from app.core.http_clients import http_clients
 from app.core.log_config import setup_logging
 from app.middleware.rate_limiter import RateLimitMiddleware
 from app.middleware.performance_middleware import PerformanceMiddleware, get_metrics
 from app.middleware.response_standardization import ResponseStandardizationMiddleware
 from app.core.database_monitoring import setup_database_monitoring
+from app.core.log_queue import install_queued_logging, shutdown_queued_logging
+from app.core.query_stats import query_stats
+from app.services.export_worker import export_worker_pool
+from app.services.stats_counters import stats_counters
+from app.services.sms_service import close_sms_providers
 from app.core.logging_config import (
     setup_logging as setup_json_logging,
     set_request_id,
@@ -30,7 +38,11 @@ from app.core.logging_config import (
 setup_logging()
 # Also setup JSON logging for production
 if get_settings().ENVIRONMENT == "production":
-    setup_json_logging(log_level="INFO", enable_json=True, enable_security_filter=True)
+    setup_json_logging(
+        log_level="INFO",
+        enable_json=True,
+        enable_security_filter=True,
+    )
 logger = structlog.get_logger(__name__)
 
 settings = get_settings()
@@ -44,18 +56,47 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Handles startup and shutdown events for the FastAPI application.
     """
     # Startup
+    # Move handler I/O off the request path; started here rather than at
+    # import so scripts and workers importing the app get no writer thread
+    if settings.LOG_ASYNC:
+        install_queued_logging(
+            max_size=settings.LOG_QUEUE_SIZE,
+            overflow_policy=settings.LOG_QUEUE_OVERFLOW,
+        )
+
     logger.info("Starting Enterprise Auth Template API", version=settings.VERSION)
 
     # Initialize database
     await init_db()
     logger.info("Database initialized")
 
+    # Attach query/pool metrics to the engine
+    from app.core import database
+
+    if database.engine is not None:
+        query_stats.max_fingerprints = settings.QUERY_STATS_MAX_FINGERPRINTS
+        setup_database_monitoring(
+            database.engine.sync_engine,
+            collect_query_stats=settings.QUERY_STATS_ENABLED,
+        )
+
+    # Keep the admin dashboard counters reconciled
+    if database.engine is not None and getattr(
+        settings, "STATS_COUNTERS_ENABLED", True
+    ):
+        await stats_counters.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Enterprise Auth Template API")
+    await stats_counters.stop()
+    export_worker_pool.shutdown()
+    await http_clients.aclose()
+    close_sms_providers()
     await close_db()
     logger.info("Database connections closed")
+    shutdown_queued_logging()
 
 
 def create_application() -> FastAPI:
@@ -133,6 +174,17 @@ def create_application() -> FastAPI:
 
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
+    # Pre-signed export/backup downloads, served without auth or DB access
+    app.mount(
+        DOWNLOADS_PATH,
+        SignedDownloadApp(
+            {
+                "exports": Path(getattr(settings, "EXPORT_DIR", "/tmp/exports")),
+                "backups": Path(getattr(settings, "BACKUP_DIR", "/var/backups/app")),
+            }
+        ),
+    )
+
     # Health check endpoint
     @app.get("/health")
     async def health_check():
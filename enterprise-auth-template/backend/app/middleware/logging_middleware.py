@@ -27,6 +27,7 @@ import structlog
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import StreamingResponse
+from starlette.types import Message, Receive, Scope, Send
 
 from app.core.config import get_settings
 
@@ -35,6 +36,7 @@ logger = structlog.get_logger(__name__)
 
 # Logging configuration
 MAX_BODY_LOG_SIZE = 10000  # Maximum request/response body size to log
+BODY_CAPTURE_STATE_KEY = "request_body_capture"
 MAX_HEADER_VALUE_SIZE = 500  # Maximum header value size to log
 LOG_LEVEL_INFO = "info"
 LOG_LEVEL_DEBUG = "debug"
@@ -159,6 +161,89 @@ class DataSanitizer:
         return sanitized
 
 
+class RequestBodyTee:
+    """
+    ASGI receive wrapper that copies the first bytes of a request body.
+
+    The endpoint still consumes the body straight from the server; only
+    up to ``limit`` bytes are retained for logging, so large uploads are
+    never buffered a second time.
+    """
+
+    def __init__(self, receive: Receive, limit: int = MAX_BODY_LOG_SIZE):
+        self._receive = receive
+        self.limit = limit
+        self.chunks: List[bytes] = []
+        self.captured_size = 0
+        self.total_size = 0
+        self.truncated = False
+
+    async def __call__(self) -> Message:
+        message = await self._receive()
+        if message["type"] == "http.request":
+            body = message.get("body", b"")
+            self.total_size += len(body)
+            remaining = self.limit - self.captured_size
+            if len(body) > remaining:
+                self.truncated = True
+            if remaining > 0 and body:
+                chunk = body[:remaining]
+                self.chunks.append(chunk)
+                self.captured_size += len(chunk)
+        return message
+
+
+class CapturedRequestBody:
+    """
+    Lazily decoded and sanitized view of a captured request body.
+
+    Parsing and sanitization run only when the log entry is rendered, so
+    records filtered out by level never pay for them. With JSON logging the
+    entry is rendered by the handler's formatter, which runs on the log
+    writer thread when queued logging is enabled.
+    """
+
+    def __init__(self, tee: RequestBodyTee, content_type: str):
+        self._tee = tee
+        self._content_type = content_type
+        self._rendered: Any = None
+
+    def render(self) -> Any:
+        """Decode and sanitize the captured bytes (memoized)."""
+        if self._rendered is None:
+            self._rendered = self._render()
+        return self._rendered
+
+    def _render(self) -> Any:
+        tee = self._tee
+        if tee.truncated:
+            # A partial payload can't be parsed, and raw bytes are not sanitized
+            return {"truncated": True, "size_bytes": tee.total_size}
+
+        body = b"".join(tee.chunks)
+        if not body:
+            return None
+
+        try:
+            if "application/json" in self._content_type:
+                return DataSanitizer.sanitize_json_data(json.loads(body))
+            if "application/x-www-form-urlencoded" in self._content_type:
+                return DataSanitizer.sanitize_query_params(parse_qs(body.decode()))
+            if "text/" in self._content_type:
+                return body.decode()[:MAX_BODY_LOG_SIZE]
+        except Exception:
+            return {"error": "Failed to parse body"}
+        return None
+
+    def __structlog__(self) -> Any:
+        return self.render()
+
+    def __str__(self) -> str:
+        return json.dumps(self.render(), default=str)
+
+    __repr__ = __str__
+
+
 class PerformanceTracker:
     """Track performance metrics for requests."""
 
@@ -239,14 +324,6 @@ class RequestLogger:
                 {k: [v] for k, v in request_data["query_params"].items()}
             )
 
-            # Extract and log request body if enabled and appropriate
-            if self.enable_body_logging and self._should_log_body(request):
-                body_data = await self._extract_request_body(request)
-                if body_data:
-                    request_data["body"] = body_data
-                    if performance_tracker:
-                        performance_tracker.start_tracking(len(str(body_data)))
-
             # Determine log level based on endpoint sensitivity
             log_level = self._get_request_log_level(request.url.path)
 
@@ -291,10 +368,22 @@ class RequestLogger:
                 response_data["headers"]
             )
 
+            # Attach the request body captured while the endpoint read it
+            body_capture = getattr(request.state, BODY_CAPTURE_STATE_KEY, None)
+            if body_capture is not None:
+                if body_capture.total_size:
+                    response_data["request_body"] = CapturedRequestBody(
+                        body_capture, request.headers.get("content-type", "")
+                    )
+                if performance_tracker:
+                    performance_tracker.request_size = body_capture.total_size
+
             # Add performance metrics
             if performance_tracker and self.enable_performance_tracking:
-                content_length = response.headers.get("content-length")
-                response_size = int(content_length) if content_length else 0
+                try:
+                    response_size = int(response.headers.get("content-length") or 0)
+                except ValueError:
+                    response_size = 0
                 performance_tracker.end_tracking(response_size)
                 response_data["performance"] = performance_tracker.get_metrics()
 
@@ -359,53 +448,24 @@ class RequestLogger:
             return False
 
         # Don't log body for large payloads
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > MAX_BODY_LOG_SIZE:
+        try:
+            content_length = int(request.headers.get("content-length") or 0)
+        except ValueError:
+            # A malformed length is the client's problem, not worth logging
             return False
-
-        # Don't log body for file uploads
-        content_type = request.headers.get("content-type", "")
-        if (
-            "multipart/form-data" in content_type
-            or "application/octet-stream" in content_type
-        ):
+        if content_length > MAX_BODY_LOG_SIZE:
             return False
 
-        return True
-
-    async def _extract_request_body(
-        self, request: Request
-    ) -> Optional[Union[Dict, str]]:
-        """Extract and sanitize request body."""
-        try:
-            content_type = request.headers.get("content-type", "")
-
-            # Handle JSON payloads
-            if "application/json" in content_type:
-                body = await request.body()
-                if body:
-                    json_data = json.loads(body)
-                    return self.sanitizer.sanitize_json_data(json_data)
-
-            # Handle form data
-            elif "application/x-www-form-urlencoded" in content_type:
-                body = await request.body()
-                if body:
-                    # Parse form data and sanitize
-                    form_data = parse_qs(body.decode())
-                    return self.sanitizer.sanitize_query_params(form_data)
-
-            # Handle plain text (with size limit)
-            elif "text/" in content_type:
-                body = await request.body()
-                if body and len(body) <= MAX_BODY_LOG_SIZE:
-                    return body.decode()[:MAX_BODY_LOG_SIZE]
-
-            return None
-
-        except Exception as e:
-            logger.warning("Failed to extract request body", error=str(e))
-            return {"error": "Failed to parse body"}
+        # Only capture bodies that can be rendered (no file uploads)
+        content_type = request.headers.get("content-type", "")
+        return any(
+            loggable in content_type
+            for loggable in (
+                "application/json",
+                "application/x-www-form-urlencoded",
+                "text/",
+            )
+        )
 
     def _get_request_log_level(self, path: str) -> str:
         """Get appropriate log level for request based on path."""
@@ -482,6 +542,24 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             high_frequency_logging=log_high_frequency_endpoints,
         )
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Wrap ``receive`` to tee the request body before dispatching."""
+        if scope["type"] == "http" and self.request_logger.enable_body_logging:
+            request = Request(scope)
+            if self._should_log(request) and self.request_logger._should_log_body(
+                request
+            ):
+                receive = RequestBodyTee(receive, MAX_BODY_LOG_SIZE)
+                scope.setdefault("state", {})[BODY_CAPTURE_STATE_KEY] = receive
+
+        await super().__call__(scope, receive, send)
+
+    def _should_log(self, request: Request) -> bool:
+        """Skip logging for high-frequency endpoints unless enabled."""
+        return (
+            self.log_high_frequency or request.url.path not in HIGH_FREQUENCY_ENDPOINTS
+        )
+
     async def dispatch(self, request: Request, call_next):
         """Process request with comprehensive logging."""
         # Generate correlation ID for request tracking
@@ -493,10 +571,11 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             PerformanceTracker() if self.enable_performance_tracking else None
         )
 
+        if performance_tracker:
+            performance_tracker.start_tracking()
+
         # Skip logging for high-frequency endpoints if disabled
-        should_log = (
-            self.log_high_frequency or request.url.path not in HIGH_FREQUENCY_ENDPOINTS
-        )
+        should_log = self._should_log(request)
 
         response = None
         exception = None
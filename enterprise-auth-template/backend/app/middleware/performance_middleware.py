@@ -15,6 +15,8 @@ from starlette.responses import Response as StarletteResponse
 import asyncio
 from datetime import datetime
 
+from app.middleware.request_id import endpoint_context
+
 # Create a custom registry for metrics
 REGISTRY = CollectorRegistry()
 
@@ -99,6 +101,87 @@ USER_REGISTRATIONS = Counter(
     "user_registrations_total", "User registrations", ["status"], registry=REGISTRY
 )
 
+
+class LogQueueCollector:
+    """
+    Exposes queued logging counters collected outside Prometheus.
+    """
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        from app.core.log_queue import get_log_queue_stats
+
+        stats = get_log_queue_stats()
+        if stats is None:
+            return
+
+        yield GaugeMetricFamily(
+            "log_queue_depth", "Log records waiting to be written", stats["queue_depth"]
+        )
+        records = CounterMetricFamily(
+            "log_records", "Log records by queue outcome", labels=["outcome"]
+        )
+        for outcome in ("enqueued", "written", "dropped", "sampled_out"):
+            records.add_metric([outcome], stats[outcome])
+        yield records
+
+
+REGISTRY.register(LogQueueCollector())
+
+
+class HttpClientCollector:
+    """
+    Exposes usage of the shared outbound HTTP connection pools.
+    """
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        from app.core.http_clients import get_http_client_stats
+
+        stats = get_http_client_stats()
+        if stats is None:
+            return
+
+        connections = GaugeMetricFamily(
+            "http_client_connections",
+            "Open outbound HTTP connections by state",
+            labels=["origin", "state"],
+        )
+        limit = GaugeMetricFamily(
+            "http_client_max_connections",
+            "Connection limit of each outbound HTTP pool",
+            labels=["origin"],
+        )
+        in_flight = GaugeMetricFamily(
+            "http_client_requests_in_flight",
+            "Outbound HTTP requests awaiting a response",
+            labels=["origin"],
+        )
+        requests = CounterMetricFamily(
+            "http_client_requests",
+            "Outbound HTTP requests by outcome",
+            labels=["origin", "outcome"],
+        )
+        for origin, origin_stats in stats.items():
+            connections.add_metric(
+                [origin, "active"], origin_stats["active_connections"]
+            )
+            connections.add_metric([origin, "idle"], origin_stats["idle_connections"])
+            limit.add_metric([origin], origin_stats["max_connections"])
+            in_flight.add_metric([origin], origin_stats["in_flight"])
+            requests.add_metric([origin, "sent"], origin_stats["requests"])
+            requests.add_metric([origin, "retried"], origin_stats["retries"])
+            requests.add_metric([origin, "error"], origin_stats["errors"])
+        yield connections
+        yield limit
+        yield in_flight
+        yield requests
+
+
+REGISTRY.register(HttpClientCollector())
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -120,6 +203,9 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         endpoint = self._normalize_endpoint(request.url.path)
         method = request.method
 
+        # Expose the normalized endpoint to query statistics
+        endpoint_token = endpoint_context.set(f"{method} {endpoint}")
+
         # Track active requests
         ACTIVE_REQUESTS.labels(method=method, endpoint=endpoint).inc()
 
@@ -200,6 +286,7 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         finally:
             # Decrement active requests
             ACTIVE_REQUESTS.labels(method=method, endpoint=endpoint).dec()
+            endpoint_context.reset(endpoint_token)
 
     def _normalize_endpoint(self, path: str) -> str:
         """
@@ -64,6 +64,9 @@ correlation_id_context: contextvars.ContextVar[Optional[str]] = contextvars.Cont
 trace_id_context: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
     "trace_id", default=None
 )
+endpoint_context: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "endpoint", default=None
+)
 
 
 class RequestIDGenerator:
@@ -254,6 +257,11 @@ def get_current_trace_id() -> Optional[str]:
     return trace_id_context.get()
 
 
+def get_current_endpoint() -> Optional[str]:
+    """Get current endpoint ("METHOD /path") from context."""
+    return endpoint_context.get()
+
+
 def get_current_request_context() -> Optional[dict]:
     """Get current request context data."""
     return {
@@ -351,6 +359,11 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         request_id_token = request_id_context.set(request_id)
         correlation_id_token = correlation_id_context.set(correlation_id)
         trace_id_token = trace_id_context.set(trace_id) if trace_id else None
+        endpoint_token = (
+            endpoint_context.set(f"{request.method} {request.url.path}")
+            if endpoint_context.get() is None
+            else None
+        )
 
         # Create request context
         request_context = RequestContext(request_id, correlation_id, trace_id)
@@ -441,6 +454,8 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
             correlation_id_context.reset(correlation_id_token)
             if trace_id_token:
                 trace_id_context.reset(trace_id_token)
+            if endpoint_token:
+                endpoint_context.reset(endpoint_token)
 
             # Clean up active requests tracking
             if request_id in self.active_requests:
@@ -9,8 +9,8 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -29,6 +29,11 @@ class AuditLog(Base):
     """
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("idx_audit_logs_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination order (timestamp DESC, id DESC)
+        Index("idx_audit_logs_timestamp_id", "timestamp", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4, index=True
@@ -84,6 +89,21 @@ class AuditLog(Base):
         index=True,
     )
 
+    # Full-text search document maintained by PostgreSQL (see SearchService)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(action, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(user_email, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(result, '')), 'C') || "
+            "setweight(to_tsvector('simple', coalesce(ip_address, '')), 'C') || "
+            "setweight(to_tsvector('simple', coalesce(user_agent, '')), 'D')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     # Relationships
     user: Mapped[Optional["User"]] = relationship("User", back_populates="audit_logs")
 
@@ -4,7 +4,17 @@ Notification model for notification system.
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional, Dict, Any, List
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text, JSON, Enum
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    JSON,
+    Enum,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import uuid
@@ -61,6 +71,10 @@ class Notification(Base):
     """Notification model for system notifications."""
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination of a user's inbox (created_at DESC, id DESC)
+        Index("idx_notifications_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
@@ -12,15 +12,17 @@ from uuid import uuid4
 from sqlalchemy import (
     Boolean,
     Column,
+    Computed,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -68,6 +70,11 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("idx_users_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination order (created_at DESC, id DESC)
+        Index("idx_users_created_at_id", "created_at", "id"),
+    )
 
     # Primary fields
     id: Mapped[UUID] = mapped_column(
@@ -180,7 +187,20 @@ class User(Base):
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="SET NULL"),
         nullable=True,
-        index=True
+        index=True,
+    )
+
+    # Full-text search document maintained by PostgreSQL (see SearchService)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(email, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(full_name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(username, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(phone_number, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
     )
 
     # Relationships
@@ -212,7 +232,7 @@ class User(Base):
         "Organization",
         foreign_keys=[organization_id],
         back_populates="users",
-        lazy="select"
+        lazy="select",
     )
 
     owned_organizations: Mapped[List["Organization"]] = relationship(
@@ -220,7 +240,7 @@ class User(Base):
         foreign_keys="Organization.owner_id",
         back_populates="owner",
         lazy="select",
-        overlaps="organization,users"
+        overlaps="organization,users",
     )
 
     api_keys: Mapped[List["APIKey"]] = relationship(
@@ -401,7 +421,7 @@ class UserRole(Base):
     assigned_by: Mapped[Optional[UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL", use_alter=True),
-        nullable=True
+        nullable=True,
     )
 
     def __repr__(self) -> str:
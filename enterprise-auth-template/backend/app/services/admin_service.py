@@ -15,6 +15,7 @@ from sqlalchemy import and_, or_, func, distinct, select, update, delete
 from sqlalchemy.exc import IntegrityError
 
 from app.core.config import get_settings
+from app.core.pagination import COUNT_NONE, KeysetPage, paginate_keyset
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.role import Role
@@ -27,6 +28,13 @@ from app.models.notification import Notification
 from app.models.login_attempt import LoginAttempt
 from app.services.cache_service import CacheService
 from app.services.export_service import ExportService
+from app.services.health_checks import (
+    check_database,
+    health_cache,
+    overall_status,
+    run_checks,
+)
+from app.services.stats_counters import stats_counters
 from app.core.events import EventEmitter
 from app.schemas.admin import (
     SystemStats,
@@ -48,6 +56,7 @@ class AdminService:
         self.db = db
         self.cache_service = CacheService()
         self.is_async = isinstance(db, AsyncSession)
+        self.stats_counters = stats_counters
         # ExportService expects AsyncSession, so we cast it appropriately
         self.export_service: Optional[ExportService] = None
         if self.is_async:
@@ -72,29 +81,24 @@ class AdminService:
 
     async def get_dashboard_data(self) -> AdminDashboardData:
         """Get comprehensive dashboard data for admin panel"""
-        # Get user statistics using helper method
-        total_users = await self._count_records(User)
-        active_users = await self._count_records(User, User.is_active == True)
-        suspended_users = await self._count_records(User, User.is_active == False)
-
-        # Get session statistics
-        active_sessions = await self._count_records(
-            UserSession, UserSession.is_active == True
-        )
-
-        # Get recent activity
-        recent_registrations = await self._count_records(
-            User, User.created_at >= datetime.utcnow() - timedelta(days=7)
-        )
-
-        # Get failed login attempts in last 24 hours
-        failed_logins = await self._count_records(
-            LoginAttempt,
-            and_(
-                LoginAttempt.success == False,
-                LoginAttempt.created_at >= datetime.utcnow() - timedelta(hours=24),
-            ),
-        )
+        counters = await self.stats_counters.snapshot(self.db)
+        if counters is not None:
+            now = datetime.utcnow()
+            counts = {
+                "total_users": counters.get("users.total"),
+                "active_users": counters.get("users.active"),
+                "suspended_users": counters.get("users.total")
+                - counters.get("users.active"),
+                "active_sessions": counters.get("sessions.active"),
+                "recent_registrations": counters.window(
+                    "users.created", now - timedelta(days=7)
+                ),
+                "failed_login_attempts": counters.window(
+                    "login_attempts.failed", now - timedelta(hours=24)
+                ),
+            }
+        else:
+            counts = await self._count_dashboard_records()
 
         # Get role distribution
         if self.is_async:
@@ -131,12 +135,7 @@ class AdminService:
             )
 
         return AdminDashboardData(
-            total_users=total_users,
-            active_users=active_users,
-            suspended_users=suspended_users,
-            active_sessions=active_sessions,
-            recent_registrations=recent_registrations,
-            failed_login_attempts=failed_logins,
+            **counts,
             role_distribution={role: count for role, count in role_distribution},
             recent_audit_logs=[self._format_audit_log(log) for log in recent_logs],
             system_health=(
@@ -146,8 +145,71 @@ class AdminService:
             ),
         )
 
+    async def _count_dashboard_records(self) -> Dict[str, int]:
+        """Count dashboard figures live when materialized counters are unavailable"""
+        # Get user statistics using helper method
+        total_users = await self._count_records(User)
+        active_users = await self._count_records(User, User.is_active == True)
+        suspended_users = await self._count_records(User, User.is_active == False)
+
+        # Get session statistics
+        active_sessions = await self._count_records(
+            UserSession, UserSession.is_active == True
+        )
+
+        # Get recent activity
+        recent_registrations = await self._count_records(
+            User, User.created_at >= datetime.utcnow() - timedelta(days=7)
+        )
+
+        # Get failed login attempts in last 24 hours
+        failed_logins = await self._count_records(
+            LoginAttempt,
+            and_(
+                LoginAttempt.success == False,
+                LoginAttempt.created_at >= datetime.utcnow() - timedelta(hours=24),
+            ),
+        )
+
+        return {
+            "total_users": total_users,
+            "active_users": active_users,
+            "suspended_users": suspended_users,
+            "active_sessions": active_sessions,
+            "recent_registrations": recent_registrations,
+            "failed_login_attempts": failed_logins,
+        }
+
     async def get_system_stats(self) -> SystemStats:
         """Get system-wide statistics"""
+        counters = await self.stats_counters.snapshot(self.db)
+        if counters is not None:
+            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0)
+            return SystemStats(
+                users={
+                    "total": counters.get("users.total"),
+                    "active": counters.get("users.active"),
+                    "verified": counters.get("users.verified"),
+                    "with_2fa": counters.get("users.with_2fa"),
+                },
+                sessions={
+                    "active": counters.get("sessions.active"),
+                    "total_today": counters.window("sessions.created", today_start),
+                },
+                organizations={
+                    "total": counters.get("organizations.total"),
+                    "active": counters.get("organizations.active"),
+                },
+                api_keys={
+                    "total": counters.get("api_keys.total"),
+                    "active": counters.get("api_keys.active"),
+                },
+                audit_logs={
+                    "total": counters.get("audit_logs.total"),
+                    "today": counters.window("audit_logs.created", today_start),
+                },
+            )
+
         if self.is_async:
             # Async queries for AsyncSession
             today_start = datetime.utcnow().replace(hour=0, minute=0, second=0)
@@ -296,70 +358,70 @@ class AdminService:
             }
         return SystemStats(**stats)
 
-    async def get_users(
-        self, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, Any]] = None
-    ) -> List[UserManagementResponse]:
-        """Get users with filtering and pagination"""
+    async def _execute(self, stmt: Any) -> Any:
+        """Execute a select statement on either session type"""
         if self.is_async:
-            # Build async query
-            stmt = select(User)
-
-            if filters:
-                if "search" in filters:
-                    search_term = f"%{filters['search']}%"
-                    stmt = stmt.where(
-                        or_(
-                            User.email.ilike(search_term),
-                            (
-                                User.full_name.ilike(search_term)
-                                if hasattr(User, "full_name")
-                                else User.email.ilike(search_term)
-                            ),
-                        )
-                    )
-                if "role_id" in filters:
-                    stmt = stmt.join(User.roles).where(Role.id == filters["role_id"])
-                if "is_active" in filters:
-                    stmt = stmt.where(User.is_active == filters["is_active"])
-                if "organization_id" in filters:
-                    stmt = stmt.where(
-                        User.organization_id == filters["organization_id"]
-                    )
+            return await self.db.execute(stmt)
+        return cast(Session, self.db).execute(stmt)
 
-            stmt = stmt.offset(skip).limit(limit)
-            result = await self.db.execute(stmt)
-            users = result.scalars().all()
-        else:
-            # Use sync query for backwards compatibility
-            db = cast(Session, self.db)
-            query = db.query(User)
-
-            if filters:
-                if "search" in filters:
-                    search_term = f"%{filters['search']}%"
-                    query = query.filter(
-                        or_(
-                            User.email.ilike(search_term),
-                            (
-                                User.full_name.ilike(search_term)
-                                if hasattr(User, "full_name")
-                                else User.email.ilike(search_term)
-                            ),
-                        )
-                    )
-                if "role_id" in filters:
-                    query = query.join(User.roles).filter(Role.id == filters["role_id"])
-                if "is_active" in filters:
-                    query = query.filter(User.is_active == filters["is_active"])
-                if "organization_id" in filters:
-                    query = query.filter(
-                        User.organization_id == filters["organization_id"]
+    def _build_user_query(self, filters: Optional[Dict[str, Any]] = None) -> Any:
+        """Build the filtered user listing statement"""
+        stmt = select(User)
+
+        if filters:
+            if "search" in filters:
+                search_term = f"%{filters['search']}%"
+                stmt = stmt.where(
+                    or_(
+                        User.email.ilike(search_term),
+                        User.full_name.ilike(search_term),
                     )
+                )
+            if "role_id" in filters:
+                stmt = stmt.join(User.roles).where(Role.id == filters["role_id"])
+            if "is_active" in filters:
+                stmt = stmt.where(User.is_active == filters["is_active"])
+            if "organization_id" in filters:
+                stmt = stmt.where(User.organization_id == filters["organization_id"])
+
+        return stmt
 
-            users = query.offset(skip).limit(limit).all()
+    async def get_users(
+        self, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, Any]] = None
+    ) -> List[UserManagementResponse]:
+        """Get users with filtering and pagination"""
+        stmt = (
+            self._build_user_query(filters)
+            .order_by(User.created_at.desc(), User.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self._execute(stmt)
+        users = result.scalars().all()
 
         return [self._format_user_response(user) for user in users]
 
+    async def get_users_page(
+        self,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        count_mode: str = COUNT_NONE,
+    ) -> KeysetPage:
+        """Get users with filtering and keyset pagination on (created_at, id)"""
+        page = await paginate_keyset(
+            self.db,
+            self._build_user_query(filters),
+            [User.created_at, User.id],
+            limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            count_cache_key=f"admin:users:{json.dumps(filters or {}, sort_keys=True)}",
+            cache_service=self.cache_service,
+        )
+        page.items = [self._format_user_response(user) for user in page.items]
+        return page
+
     async def get_user_details(self, user_id: str) -> Optional[UserManagementResponse]:
         """Get detailed information about a specific user"""
         if self.is_async:
@@ -600,29 +662,61 @@ class AdminService:
             "message": f"Terminated {result} sessions",
         }
 
-    async def get_audit_logs(
-        self, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
-        """Get audit logs with filtering"""
-        query = self.db.query(AuditLog)
+    def _build_audit_log_query(self, filters: Optional[Dict[str, Any]] = None) -> Any:
+        """Build the filtered audit log listing statement"""
+        stmt = select(AuditLog)
 
         if filters:
             if "user_id" in filters:
-                query = query.filter(AuditLog.user_id == filters["user_id"])
+                stmt = stmt.where(AuditLog.user_id == filters["user_id"])
             if "action" in filters:
-                query = query.filter(AuditLog.action == filters["action"])
+                stmt = stmt.where(AuditLog.action == filters["action"])
             if "resource_type" in filters:
-                query = query.filter(AuditLog.resource_type == filters["resource_type"])
+                stmt = stmt.where(AuditLog.resource == filters["resource_type"])
             if "start_date" in filters:
-                query = query.filter(AuditLog.created_at >= filters["start_date"])
+                stmt = stmt.where(AuditLog.timestamp >= filters["start_date"])
             if "end_date" in filters:
-                query = query.filter(AuditLog.created_at <= filters["end_date"])
+                stmt = stmt.where(AuditLog.timestamp <= filters["end_date"])
+
+        return stmt
 
-        logs = (
-            query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+    async def get_audit_logs(
+        self, skip: int = 0, limit: int = 100, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get audit logs with filtering"""
+        stmt = (
+            self._build_audit_log_query(filters)
+            .order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+            .offset(skip)
+            .limit(limit)
         )
+        result = await self._execute(stmt)
+        logs = result.scalars().all()
         return [self._format_audit_log(log) for log in logs]
 
+    async def get_audit_logs_page(
+        self,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        count_mode: str = COUNT_NONE,
+    ) -> KeysetPage:
+        """Get audit logs with filtering and keyset pagination on (timestamp, id)"""
+        page = await paginate_keyset(
+            self.db,
+            self._build_audit_log_query(filters),
+            [AuditLog.timestamp, AuditLog.id],
+            limit,
+            cursor=cursor,
+            count_mode=count_mode,
+            count_cache_key=(
+                f"admin:audit_logs:{json.dumps(filters or {}, sort_keys=True, default=str)}"
+            ),
+            cache_service=self.cache_service,
+        )
+        page.items = [self._format_audit_log(log) for log in page.items]
+        return page
+
     async def generate_activity_report(
         self, user_id: Optional[str] = None, days: int = 30
     ) -> UserActivityReport:
@@ -784,30 +878,28 @@ class AdminService:
         }
 
     async def check_system_health(self) -> SystemHealthCheck:
-        """Check system health"""
-        health = {
-            "status": "healthy",
-            "components": {
-                "database": await self._check_database_health(),
-                "cache": await self._check_cache_health(),
-                "storage": await self._check_storage_health(),
-                "email": await self._check_email_health(),
-            },
+        """Check system health, sharing one evaluation across concurrent callers"""
+        health = await health_cache.get("admin", self._evaluate_system_health)
+        return SystemHealthCheck(**health)
+
+    async def _evaluate_system_health(self) -> Dict[str, Any]:
+        """Run every component check concurrently"""
+        components = await run_checks(
+            {
+                "database": check_database,
+                "cache": self._check_cache_health,
+                "storage": self._check_storage_health,
+                "email": self._check_email_health,
+            }
+        )
+        return {
+            "status": overall_status(components),
+            "components": components,
             "uptime": self._get_uptime(),
             "version": settings.APP_VERSION,
             "last_check": datetime.utcnow().isoformat(),
         }
 
-        # Determine overall status
-        if any(comp["status"] == "unhealthy" for comp in health["components"].values()):
-            health["status"] = "unhealthy"
-        elif any(
-            comp["status"] == "degraded" for comp in health["components"].values()
-        ):
-            health["status"] = "degraded"
-
-        return SystemHealthCheck(**health)
-
     async def toggle_maintenance_mode(
         self, enable: bool, message: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -957,16 +1049,6 @@ class AdminService:
 
         return [self._format_audit_log(event) for event in events]
 
-    async def _check_database_health(self) -> Dict[str, Any]:
-        """Check database health"""
-        try:
-            from sqlalchemy import text
-
-            self.db.execute(text("SELECT 1"))  # Use text() for raw SQL
-            return {"status": "healthy", "message": "Database connection OK"}
-        except Exception as e:
-            return {"status": "unhealthy", "message": str(e)}
-
     async def _check_cache_health(self) -> Dict[str, Any]:
         """Check cache health"""
         try:
@@ -0,0 +1,346 @@
+"""
+Attack Detector
+
+Streaming brute-force detection fed directly by login outcomes. Failed
+logins are counted per client IP, per account and per network prefix in
+sliding-window count-min sketches, so memory stays fixed however many
+distinct attackers there are and every update is a handful of array
+increments. A small top-k heavy-hitters list per dimension remembers
+which keys are currently the worst offenders, so listing anomalies does
+not scan the audit table.
+
+Alerts are raised the moment a key crosses its threshold (once per
+window) and emitted on ``attack_detector.events``. A successful login to
+an account that is under attack is flagged as a possible takeover.
+
+Network prefixes (/24 for IPv4, /48 for IPv6) stand in for ASNs, which
+would need a routing database; they catch attacks spread across the
+addresses of one provider. Counts are per process, and sketches only
+ever overestimate, so an alert is never missed by a worker that saw the
+attempts.
+"""
+
+import hashlib
+import ipaddress
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from app.core.config import get_settings
+from app.core.events import Event, EventEmitter
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+BRUTE_FORCE_EVENT = "security.brute_force_detected"
+TAKEOVER_EVENT = "security.suspicious_login"
+
+DEFAULT_THRESHOLDS = {"ip": 10, "account": 10, "network": 50}
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimates that never undercount."""
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self._rows = [array("q", [0]) * width for _ in range(depth)]
+
+    def indexes(self, key: str) -> List[int]:
+        """Row positions of a key (double hashing from one digest)."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, indexes: List[int], count: int = 1) -> None:
+        for row, index in zip(self._rows, indexes):
+            row[index] += count
+
+    def estimate(self, indexes: List[int]) -> int:
+        return min(row[index] for row, index in zip(self._rows, indexes))
+
+    def subtract(self, other: "CountMinSketch") -> None:
+        """Remove another sketch's counts (same width and depth) from this one."""
+        for row, other_row in zip(self._rows, other._rows):
+            for index, count in enumerate(other_row):
+                if count:
+                    row[index] -= count
+
+    def clear(self) -> None:
+        for row in self._rows:
+            row[:] = array("q", [0]) * self.width
+
+
+class SlidingWindowSketch:
+    """
+    Count-min sketch over a sliding time window.
+
+    The window is split into ``slots`` sub-sketches plus a running total
+    of all of them. Updates touch the current slot and the total;
+    estimates read only the total. When a slot leaves the window its
+    counts are subtracted from the total and it is cleared, so estimates
+    cover the last ``window_seconds`` at a resolution of one slot.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300,
+        slots: int = 10,
+        width: int = 2048,
+        depth: int = 4,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / slots
+        self._slots = [CountMinSketch(width, depth) for _ in range(slots)]
+        self._total = CountMinSketch(width, depth)
+        self._current: Optional[int] = None
+
+    def add(self, key: str, now: float, count: int = 1) -> int:
+        """Count an occurrence and return the key's estimate over the window."""
+        self._advance(now)
+        indexes = self._total.indexes(key)
+        self._slots[self._current % len(self._slots)].add(indexes, count)
+        self._total.add(indexes, count)
+        return self._total.estimate(indexes)
+
+    def estimate(self, key: str, now: float) -> int:
+        self._advance(now)
+        return self._total.estimate(self._total.indexes(key))
+
+    def _advance(self, now: float) -> None:
+        slot = int(now // self.slot_seconds)
+        if self._current is None:
+            self._current = slot
+            return
+        if slot <= self._current:
+            return
+        if slot - self._current >= len(self._slots):
+            # The whole window has passed
+            for sketch in self._slots:
+                sketch.clear()
+            self._total.clear()
+        else:
+            for expired in range(self._current + 1, slot + 1):
+                sketch = self._slots[expired % len(self._slots)]
+                self._total.subtract(sketch)
+                sketch.clear()
+        self._current = slot
+
+
+class HeavyHitters:
+    """The ``k`` keys with the highest estimates seen recently."""
+
+    def __init__(self, k: int = 20) -> None:
+        self.k = k
+        self._counts: Dict[str, int] = {}
+
+    def offer(self, key: str, estimate: int) -> None:
+        if key in self._counts or len(self._counts) < self.k:
+            self._counts[key] = estimate
+            return
+        weakest = min(self._counts, key=self._counts.__getitem__)
+        if estimate > self._counts[weakest]:
+            del self._counts[weakest]
+            self._counts[key] = estimate
+
+    def items(self) -> List[Tuple[str, int]]:
+        return sorted(self._counts.items(), key=lambda item: -item[1])
+
+    def refresh(self, estimates: Dict[str, int]) -> None:
+        """Replace counts with current estimates, dropping keys gone quiet."""
+        self._counts = {key: count for key, count in estimates.items() if count > 0}
+
+
+class _Dimension:
+    def __init__(
+        self, name: str, threshold: int, window_seconds: float, top_k: int
+    ) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.failures = SlidingWindowSketch(window_seconds)
+        self.top = HeavyHitters(top_k)
+        # Key -> time until which it is not alerted on again
+        self.alerted: Dict[str, float] = {}
+
+
+def network_prefix(ip_address: Optional[str]) -> Optional[str]:
+    """The /24 (IPv4) or /48 (IPv6) network of an address."""
+    if not ip_address:
+        return None
+    try:
+        address = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return None
+    prefix = 24 if address.version == 4 else 48
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+class AttackDetector:
+    """Sliding-window brute-force detection over login outcomes."""
+
+    def __init__(
+        self,
+        window_seconds: float = 300,
+        thresholds: Optional[Dict[str, int]] = None,
+        top_k: int = 20,
+    ) -> None:
+        self.window_seconds = window_seconds
+        thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self._dimensions = {
+            name: _Dimension(name, threshold, window_seconds, top_k)
+            for name, threshold in thresholds.items()
+        }
+        self.events = EventEmitter()
+        self._next_prune = 0.0
+
+    def record(
+        self,
+        success: bool,
+        ip_address: Optional[str] = None,
+        account: Optional[str] = None,
+        user_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Count a login outcome.
+
+        Returns:
+            List of alerts raised by this attempt
+        """
+        now = time.time() if now is None else now
+        keys = self._keys(ip_address, account)
+        alerts = []
+
+        if success:
+            account_key = keys.get("account")
+            if account_key:
+                dimension = self._dimensions["account"]
+                failures = dimension.failures.estimate(account_key, now)
+                if failures >= dimension.threshold:
+                    alerts.append(
+                        {
+                            "type": "account_takeover",
+                            "event_type": TAKEOVER_EVENT,
+                            "severity": "critical",
+                            "account": account_key,
+                            "user_id": user_id,
+                            "ip_address": ip_address,
+                            "attempts": failures,
+                            "message": (
+                                f"Successful login after {failures} failed "
+                                "attempts on this account"
+                            ),
+                        }
+                    )
+            return alerts
+
+        for name, key in keys.items():
+            dimension = self._dimensions[name]
+            estimate = dimension.failures.add(key, now)
+            dimension.top.offer(key, estimate)
+            if estimate >= dimension.threshold and dimension.alerted.get(key, 0) <= now:
+                dimension.alerted[key] = now + self.window_seconds
+                alerts.append(
+                    self._brute_force(
+                        name, key, estimate, user_id if name == "account" else None
+                    )
+                )
+
+        if now >= self._next_prune:
+            self._prune_alerted(now)
+
+        return alerts
+
+    async def observe_login(
+        self,
+        success: bool,
+        ip_address: Optional[str] = None,
+        account: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Record a login outcome and emit any alerts it raises."""
+        alerts = self.record(success, ip_address, account, user_id)
+        for alert in alerts:
+            logger.warning("Security alert", **alert)
+            await self.events.emit(
+                Event(alert["event_type"], data=alert, user_id=user_id)
+            )
+        return alerts
+
+    def anomalies(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Keys currently over their threshold, worst first."""
+        now = time.time() if now is None else now
+        anomalies = []
+        for name, dimension in self._dimensions.items():
+            current = {
+                key: dimension.failures.estimate(key, now)
+                for key, _ in dimension.top.items()
+            }
+            dimension.top.refresh(current)
+            for key, estimate in dimension.top.items():
+                if estimate >= dimension.threshold:
+                    anomalies.append(self._brute_force(name, key, estimate))
+        return sorted(anomalies, key=lambda anomaly: -anomaly["attempts"])
+
+    def _prune_alerted(self, now: float) -> None:
+        """Forget alert suppressions that have expired, once per window."""
+        for dimension in self._dimensions.values():
+            dimension.alerted = {
+                key: until for key, until in dimension.alerted.items() if until > now
+            }
+        self._next_prune = now + self.window_seconds
+
+    def _keys(
+        self, ip_address: Optional[str], account: Optional[str]
+    ) -> Dict[str, str]:
+        keys = {
+            "ip": ip_address,
+            "account": account.strip().lower() if account else None,
+            "network": network_prefix(ip_address),
+        }
+        return {
+            name: key for name, key in keys.items() if key and name in self._dimensions
+        }
+
+    def _brute_force(
+        self, dimension: str, key: str, attempts: int, user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return {
+            "type": "brute_force",
+            "event_type": BRUTE_FORCE_EVENT,
+            "severity": "warning",
+            "dimension": dimension,
+            "key": key,
+            "user_id": user_id,
+            "ip_address": key if dimension == "ip" else None,
+            "attempts": attempts,
+            "message": (
+                f"Possible brute force attack: {attempts} failed attempts "
+                f"from {dimension} {key} in {int(self.window_seconds)}s"
+            ),
+        }
+
+
+attack_detector = AttackDetector(
+    window_seconds=getattr(settings, "BRUTE_FORCE_WINDOW_SECONDS", 300),
+    thresholds={
+        "ip": getattr(settings, "BRUTE_FORCE_IP_THRESHOLD", 10),
+        "account": getattr(settings, "BRUTE_FORCE_ACCOUNT_THRESHOLD", 10),
+        "network": getattr(settings, "BRUTE_FORCE_NETWORK_THRESHOLD", 50),
+    },
+)
+
+
+__all__ = [
+    "BRUTE_FORCE_EVENT",
+    "TAKEOVER_EVENT",
+    "AttackDetector",
+    "CountMinSketch",
+    "HeavyHitters",
+    "SlidingWindowSketch",
+    "attack_detector",
+    "network_prefix",
+]
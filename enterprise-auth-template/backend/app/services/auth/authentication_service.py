@@ -26,6 +26,7 @@ from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.repositories.session_repository import SessionRepository
 from app.schemas.auth import LoginResponse, UserResponse
+from app.services.attack_detector import attack_detector
 from app.services.cache_service import CacheService
 
 settings = get_settings()
@@ -175,6 +176,10 @@ class AuthenticationService:
                     "Check your inbox for a verification link or request a new one."
                 )
 
+            await attack_detector.observe_login(
+                True, ip_address, email, user_id=str(user.id)
+            )
+
             # Reset failed login attempts on successful login
             if user.failed_login_attempts > 0:
                 await self.user_repo.reset_failed_attempts(user.id)
@@ -385,6 +390,10 @@ class AuthenticationService:
             ip_address=ip_address,
         )
 
+        await attack_detector.observe_login(
+            False, ip_address, email, user_id=str(user.id) if user else None
+        )
+
     async def _create_user_session_with_data(
         self,
         user_id,
@@ -0,0 +1,370 @@
+"""
+Autocomplete Index
+
+In-process prefix index for field autocomplete. Each (scope, field) gets a
+prefix trie of its most frequent values, where every node keeps the top
+values of its subtree, so a lookup is a walk down the prefix and a slice:
+microseconds instead of a ``GROUP BY ... ILIKE 'q%'`` per keystroke.
+
+Tries are built from one grouped query and then kept current
+incrementally: each refresh only reads rows near or past the last
+watermark (``created_at``/``timestamp``) and adds their counts. Because
+rows can commit after later timestamps were already seen (same-timestamp
+inserts, long transactions), refreshes re-read a lookback window below
+the watermark and skip rows already counted by id. A full rebuild runs
+periodically to drop deleted rows and admit new hot values.
+"""
+
+import asyncio
+import inspect
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import desc, func, select
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+# Columns used as the incremental refresh watermark, in order of preference
+WATERMARK_COLUMNS = ("created_at", "timestamp")
+
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        # (count, value) of the most frequent values below this node
+        self.top: List[Tuple[int, str]] = []
+
+
+class PrefixTrie:
+    """
+    Case-insensitive prefix trie with per-node top-k lists.
+
+    Counts only ever grow through ``add``, which keeps the per-node top
+    lists exact without revisiting subtrees.
+    """
+
+    def __init__(self, top_k: int = 20) -> None:
+        self.top_k = top_k
+        self._root = _TrieNode()
+        self._counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._counts
+
+    def add(self, value: str, count: int = 1) -> None:
+        """Add ``count`` occurrences of ``value``."""
+        total = self._counts.get(value, 0) + count
+        self._counts[value] = total
+
+        node = self._root
+        self._update_top(node, value, total)
+        for char in value.lower():
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+            self._update_top(node, value, total)
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """
+        Most frequent values starting with ``prefix``.
+
+        Returns:
+            List[Tuple[str, int]]: (value, count) pairs, at most
+            ``min(limit, top_k)``, most frequent first
+        """
+        node = self._root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [(value, count) for count, value in node.top[:limit]]
+
+    def _update_top(self, node: _TrieNode, value: str, total: int) -> None:
+        top = node.top
+        for i, (_, existing) in enumerate(top):
+            if existing == value:
+                del top[i]
+                break
+        else:
+            if len(top) >= self.top_k and total <= top[-1][0]:
+                return
+
+        top.append((total, value))
+        top.sort(key=lambda entry: (-entry[0], entry[1]))
+        del top[self.top_k :]
+
+
+@dataclass
+class _FieldIndex:
+    trie: PrefixTrie
+    # False when the field has more distinct values than the trie holds
+    complete: bool
+    watermark: Optional[datetime]
+    refreshed_at: float
+    built_at: float
+    # id -> watermark value of rows counted inside the lookback window
+    seen: Dict[Any, datetime] = field(default_factory=dict)
+
+
+@dataclass
+class AutocompleteIndex:
+    """
+    Prefix tries for autocomplete, shared by all SearchService instances.
+
+    ``suggest`` never touches the database; stale or missing tries are
+    (re)built in the background through ``schedule_refresh``.
+    """
+
+    max_values: int = 2000
+    top_k: int = 20
+    refresh_interval: float = 60.0
+    rebuild_interval: float = 3600.0
+    # Seconds below the watermark re-read for rows that committed late
+    lookback: float = 300.0
+    _indexes: Dict[Tuple[str, str], _FieldIndex] = field(default_factory=dict)
+    _refreshing: Set[Tuple[str, str]] = field(default_factory=set)
+    _tasks: Set[asyncio.Task] = field(default_factory=set)
+
+    def suggest(
+        self, scope: str, field_name: str, prefix: str, limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Suggestions from the in-memory trie.
+
+        Returns:
+            Optional[List[Dict]]: ``{"value", "count"}`` suggestions, or None
+            when the trie cannot answer authoritatively (not built yet,
+            ``limit`` above ``top_k``, or too few hot values match a field
+            with more distinct values than the trie holds)
+        """
+        index = self._indexes.get((scope, field_name))
+        if index is None or limit > self.top_k:
+            return None
+
+        matches = index.trie.suggest(prefix, limit)
+        if len(matches) < limit and not index.complete:
+            return None
+        return [{"value": value, "count": count} for value, count in matches]
+
+    def needs_refresh(self, scope: str, field_name: str) -> bool:
+        key = (scope, field_name)
+        if key in self._refreshing:
+            return False
+        index = self._indexes.get(key)
+        return (
+            index is None
+            or time.monotonic() - index.refreshed_at >= self.refresh_interval
+        )
+
+    async def schedule_refresh(
+        self,
+        session: Any,
+        session_factory: Optional[Callable[[], Any]],
+        scope: str,
+        model: Any,
+        field_name: str,
+    ) -> None:
+        """
+        Refresh a stale trie without blocking the caller.
+
+        With a session factory the refresh runs as a background task on its
+        own session; otherwise it runs inline on ``session``.
+        """
+        if not self.needs_refresh(scope, field_name):
+            return
+
+        self._refreshing.add((scope, field_name))
+        if session_factory is None:
+            await self._run_refresh(_borrowed(session), scope, model, field_name)
+            return
+
+        task = asyncio.create_task(
+            self._run_refresh(session_factory(), scope, model, field_name)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def refresh(
+        self, session: Any, scope: str, model: Any, field_name: str
+    ) -> None:
+        """Apply new rows to a trie, or rebuild it when missing or due."""
+        key = (scope, field_name)
+        column = getattr(model, field_name)
+        watermark_column = _watermark_column(model)
+        id_column = getattr(model, "id", None)
+        index = self._indexes.get(key)
+        now = time.monotonic()
+
+        if (
+            index is None
+            or watermark_column is None
+            or id_column is None
+            or index.watermark is None
+            or now - index.built_at >= self.rebuild_interval
+        ):
+            self._indexes[key] = await self._build(
+                session, column, watermark_column, id_column
+            )
+            return
+
+        await self._apply_window(
+            session,
+            index,
+            column,
+            watermark_column,
+            id_column,
+            after=index.watermark - timedelta(seconds=self.lookback),
+        )
+        index.refreshed_at = now
+
+    async def _apply_window(
+        self,
+        session: Any,
+        index: _FieldIndex,
+        column: Any,
+        watermark_column: Any,
+        id_column: Any,
+        after: datetime,
+    ) -> None:
+        """Count rows stamped after ``after`` that were not counted before."""
+        stmt = select(id_column, column, watermark_column).where(
+            column.is_not(None), watermark_column > after
+        )
+
+        previous_watermark = index.watermark
+        counts: Dict[str, int] = {}
+        for row_id, value, stamp in await _rows(session, stmt):
+            if row_id in index.seen:
+                continue
+            index.seen[row_id] = stamp
+            value = _text(value)
+            counts[value] = counts.get(value, 0) + 1
+            if stamp > index.watermark:
+                index.watermark = stamp
+
+        for value, count in counts.items():
+            if value in index.trie or len(index.trie) < self.max_values:
+                index.trie.add(value, count)
+            else:
+                index.complete = False
+
+        # Once the watermark moves, rows below the new window can never be
+        # read again, so their ids are dropped to keep ``seen`` bounded
+        if previous_watermark is None or index.watermark > previous_watermark:
+            cutoff = index.watermark - timedelta(seconds=self.lookback)
+            index.seen = {
+                row_id: stamp for row_id, stamp in index.seen.items() if stamp > cutoff
+            }
+
+    async def _run_refresh(
+        self, session_context: Any, scope: str, model: Any, field_name: str
+    ) -> None:
+        try:
+            async with session_context as session:
+                await self.refresh(session, scope, model, field_name)
+        except Exception as e:
+            logger.warning(
+                "Autocomplete index refresh failed",
+                scope=scope,
+                field=field_name,
+                error=str(e),
+            )
+        finally:
+            self._refreshing.discard((scope, field_name))
+
+    async def _build(
+        self, session: Any, column: Any, watermark_column: Any, id_column: Any
+    ) -> _FieldIndex:
+        stmt = (
+            select(column, func.count().label("count"))
+            .where(column.is_not(None))
+            .group_by(column)
+            .order_by(desc("count"))
+            .limit(self.max_values + 1)
+        )
+
+        watermark = cutoff = None
+        if watermark_column is not None and id_column is not None:
+            watermark = await _scalar(session, select(func.max(watermark_column)))
+            if watermark is not None:
+                # Rows in the lookback window are counted one by one below,
+                # so the next refresh can tell which ones it already has
+                cutoff = watermark - timedelta(seconds=self.lookback)
+                stmt = stmt.where(watermark_column <= cutoff)
+
+        rows = await _rows(session, stmt)
+        trie = PrefixTrie(self.top_k)
+        for value, count in rows[: self.max_values]:
+            trie.add(_text(value), count)
+
+        now = time.monotonic()
+        index = _FieldIndex(
+            trie=trie,
+            complete=len(rows) <= self.max_values,
+            watermark=watermark,
+            refreshed_at=now,
+            built_at=now,
+        )
+        if cutoff is not None:
+            await self._apply_window(
+                session, index, column, watermark_column, id_column, after=cutoff
+            )
+        return index
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+def _watermark_column(model: Any) -> Any:
+    for name in WATERMARK_COLUMNS:
+        if hasattr(model, name):
+            return getattr(model, name)
+    return None
+
+
+def _text(value: Any) -> str:
+    return str(getattr(value, "value", value))
+
+
+async def _execute(session: Any, stmt: Any) -> Any:
+    """Execute on either an AsyncSession or a sync Session."""
+    result = session.execute(stmt)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _rows(session: Any, stmt: Any) -> List[Any]:
+    return (await _execute(session, stmt)).all()
+
+
+async def _scalar(session: Any, stmt: Any) -> Any:
+    return (await _execute(session, stmt)).scalar()
+
+
+@asynccontextmanager
+async def _borrowed(session: Any):
+    """Use the caller's session without closing it."""
+    yield session
+
+
+autocomplete_index = AutocompleteIndex(
+    max_values=getattr(settings, "AUTOCOMPLETE_HOT_VALUES", 2000),
+    top_k=getattr(settings, "AUTOCOMPLETE_MAX_SUGGESTIONS", 20),
+    refresh_interval=getattr(settings, "AUTOCOMPLETE_REFRESH_INTERVAL", 60),
+    rebuild_interval=getattr(settings, "AUTOCOMPLETE_REBUILD_INTERVAL", 3600),
+    lookback=getattr(settings, "AUTOCOMPLETE_WATERMARK_LOOKBACK", 300),
+)
@@ -0,0 +1,263 @@
+"""
+Backup Pipeline
+
+Single-pass streaming stages for database backups. A dump is read from
+``pg_dump``'s stdout and pushed chunk by chunk through compression, the
+encryption stage and an incremental SHA-256 straight into the final file;
+restores run the same stages in reverse into ``psql``'s stdin. Nothing is
+staged in intermediate files and the checksum needs no extra read.
+
+Compression is multi-threaded zstd when the ``zstandard`` package is
+installed and gzip otherwise. Restores detect the format from the file
+header, so gzip backups written by earlier versions stay restorable.
+"""
+
+import asyncio
+import hashlib
+import os
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Protocol
+
+# Size of the chunks read from pg_dump and from backup files
+CHUNK_SIZE = 1024 * 1024
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class Compression:
+    """Backup compression formats."""
+
+    ZSTD = "zstd"
+    GZIP = "gzip"
+    NONE = "none"
+
+
+SUFFIXES = {Compression.ZSTD: ".zst", Compression.GZIP: ".gz", Compression.NONE: ""}
+
+
+def _zstandard():
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return zstandard
+
+
+def resolve_compression(preferred: str) -> str:
+    """Use zstd only when the zstandard package is available."""
+    if preferred == Compression.ZSTD and _zstandard() is None:
+        return Compression.GZIP
+    return preferred
+
+
+def backup_filename(stem: str, compression: str, encrypted: bool) -> str:
+    """File name of a backup, e.g. ``full_backup_..._1a2b3c4d.sql.zst.enc``."""
+    return f"{stem}.sql{SUFFIXES[compression]}{'.enc' if encrypted else ''}"
+
+
+class _Stage:
+    """A streaming transform; ``flush`` returns whatever is still buffered."""
+
+    def process(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _CodecStage(_Stage):
+    """Adapter for zlib/zstandard compressobj and decompressobj objects."""
+
+    def __init__(self, codec, method: str) -> None:
+        self._codec = codec
+        self._method = getattr(codec, method)
+
+    def process(self, data: bytes) -> bytes:
+        return self._method(data) if data else b""
+
+    def flush(self) -> bytes:
+        return self._codec.flush() if hasattr(self._codec, "flush") else b""
+
+
+def _compress_stage(compression: str, level: int, threads: int) -> _Stage:
+    if compression == Compression.ZSTD:
+        zstandard = _zstandard()
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+        return _CodecStage(compressor.compressobj(), "compress")
+    if compression == Compression.GZIP:
+        # wbits=31: gzip container, readable by gzip/gunzip
+        return _CodecStage(zlib.compressobj(level, zlib.DEFLATED, 31), "compress")
+    return _Stage()
+
+
+def _decompress_stage(header: bytes) -> _Stage:
+    if header.startswith(ZSTD_MAGIC):
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to restore zstd backups")
+        return _CodecStage(zstandard.ZstdDecompressor().decompressobj(), "decompress")
+    if header.startswith(GZIP_MAGIC):
+        return _CodecStage(zlib.decompressobj(31), "decompress")
+    return _Stage()
+
+
+def _encryption_stage(encrypt: bool) -> _Stage:
+    # Placeholder kept from the file-based flow: encrypted backups are only
+    # marked with ".enc". A cipher slots in here without touching the pipeline.
+    return _Stage()
+
+
+_decryption_stage = _encryption_stage
+
+
+def encode_block(data: bytes, compression: str, level: int = 6) -> bytes:
+    """Compress a self-contained block (e.g. one deduplicated chunk)."""
+    stage = _compress_stage(compression, level, threads=0)
+    return stage.process(data) + stage.flush()
+
+
+def decode_block(data: bytes) -> bytes:
+    """Decompress a block written by ``encode_block``, detecting its format."""
+    stage = _decompress_stage(data)
+    return stage.process(data) + stage.flush()
+
+
+class DumpWriter(Protocol):
+    """Sink for raw dump output (BackupWriter or the deduplicating writer)."""
+
+    def write(self, chunk: bytes) -> None: ...
+
+    def close(self) -> str: ...
+
+    def abort(self) -> None: ...
+
+
+class BackupWriter:
+    """
+    Compress, encrypt, hash and write a backup in one pass.
+
+    Output goes to ``<path>.part`` and is renamed into place by ``close``,
+    so a failed or cancelled dump never leaves a truncated backup behind.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compression: str = Compression.ZSTD,
+        level: int = 6,
+        threads: int = -1,
+        encrypt: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.bytes_in = 0
+        self.bytes_written = 0
+        self._partial = self.path.with_name(self.path.name + ".part")
+        self._stages: List[_Stage] = [
+            _compress_stage(compression, level, threads),
+            _encryption_stage(encrypt),
+        ]
+        self._sha256 = hashlib.sha256()
+        self._file = open(self._partial, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        """Push a chunk of raw dump output through the pipeline."""
+        self.bytes_in += len(chunk)
+        for stage in self._stages:
+            chunk = stage.process(chunk)
+        self._emit(chunk)
+
+    def close(self) -> str:
+        """Flush every stage, move the file into place and return its SHA-256."""
+        data = b""
+        for stage in self._stages:
+            data = stage.process(data) + stage.flush()
+        self._emit(data)
+        self._file.close()
+        os.replace(self._partial, self.path)
+        return self._sha256.hexdigest()
+
+    def abort(self) -> None:
+        """Discard the partial file."""
+        self._file.close()
+        self._partial.unlink(missing_ok=True)
+
+    def _emit(self, data: bytes) -> None:
+        if data:
+            self._sha256.update(data)
+            self._file.write(data)
+            self.bytes_written += len(data)
+
+
+def read_backup(
+    path: Path, encrypted: bool = False, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield the plain SQL of a backup file, decrypting and decompressing it."""
+    decrypt = _decryption_stage(encrypted)
+    decompress: Optional[_Stage] = None
+
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            data = decrypt.process(chunk) if chunk else decrypt.flush()
+            if decompress is None:
+                decompress = _decompress_stage(data)
+            data = decompress.process(data)
+            if data:
+                yield data
+            if not chunk:
+                break
+
+    if decompress is not None:
+        tail = decompress.flush()
+        if tail:
+            yield tail
+
+
+async def write_stream(stream: asyncio.StreamReader, writer: DumpWriter) -> None:
+    """Copy a subprocess' stdout into a writer, encoding off the loop."""
+    while True:
+        chunk = await stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        await asyncio.to_thread(writer.write, chunk)
+
+
+async def feed_stream(chunks: Iterator[bytes], stdin: asyncio.StreamWriter) -> int:
+    """
+    Write decoded backup chunks into a subprocess' stdin.
+
+    Returns:
+        int: Number of bytes written
+
+    Raises:
+        BrokenPipeError, ConnectionResetError: If the subprocess exits early
+    """
+    total = 0
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            stdin.write(chunk)
+            await stdin.drain()
+            total += len(chunk)
+    finally:
+        stdin.close()
+    return total
+
+
+__all__ = [
+    "CHUNK_SIZE",
+    "BackupWriter",
+    "Compression",
+    "DumpWriter",
+    "backup_filename",
+    "decode_block",
+    "encode_block",
+    "feed_stream",
+    "read_backup",
+    "resolve_compression",
+    "write_stream",
+]
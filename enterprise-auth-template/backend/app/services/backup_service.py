@@ -7,12 +7,22 @@ and automated scheduling for enterprise data protection.
 
 import asyncio
 import json
-import gzip
+import re
 import shutil
-import tempfile
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, BinaryIO
+from typing import (
+    Any,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 from uuid import uuid4
 import subprocess
 import os
@@ -22,13 +32,36 @@ from sqlalchemy import text, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.downloads import create_signed_url
 from app.core.events import EventEmitter, Event
 from app.models.user import User
+from app.services.backup_pipeline import (
+    BackupWriter,
+    Compression,
+    DumpWriter,
+    backup_filename,
+    feed_stream,
+    read_backup,
+    resolve_compression,
+    write_stream,
+)
+from app.services.backup_store import (
+    MANIFEST_SUFFIX,
+    ChunkStore,
+    DedupWriter,
+    iter_manifests,
+    load_manifest,
+)
 from app.services.cache_service import CacheService
 
 settings = get_settings()
 logger = structlog.get_logger(__name__)
 
+# Per-table lines in pg_dump/pg_restore --verbose output
+_TABLE_PROGRESS = re.compile(
+    r'(?:dumping contents of table|processing data for table) "?([^"]+)"?'
+)
+
 
 class BackupType:
     """Types of backups that can be performed."""
@@ -40,6 +73,14 @@ class BackupType:
     DATA_ONLY = "data_only"
 
 
+class BackupFormat:
+    """On-disk backup formats."""
+
+    PLAIN = "plain"  # Single streamed SQL file, restored with psql
+    DIRECTORY = "directory"  # pg_dump directory format, parallel dump/restore
+    DEDUPLICATED = "deduplicated"  # Manifest of chunks in the shared chunk store
+
+
 class BackupStatus:
     """Backup operation status."""
 
@@ -117,10 +158,32 @@ class BackupService:
 
         # Configuration
         self.max_backup_age_days = getattr(settings, "MAX_BACKUP_AGE_DAYS", 30)
+        self.backup_compression = getattr(settings, "BACKUP_COMPRESSION", "zstd")
         self.backup_compression_level = getattr(settings, "BACKUP_COMPRESSION_LEVEL", 6)
+        # zstd worker threads (-1: one per CPU)
+        self.backup_compression_threads = getattr(
+            settings, "BACKUP_COMPRESSION_THREADS", -1
+        )
         self.enable_backup_encryption = getattr(
             settings, "ENABLE_BACKUP_ENCRYPTION", True
         )
+        self.download_url_ttl = getattr(settings, "BACKUP_DOWNLOAD_URL_TTL", 900)
+        self.backup_format = getattr(settings, "BACKUP_FORMAT", BackupFormat.PLAIN)
+        # pg_dump/pg_restore --jobs for directory-format backups
+        self.parallel_jobs = (
+            getattr(settings, "BACKUP_PARALLEL_JOBS", None) or os.cpu_count() or 1
+        )
+
+        # Content-addressed store shared by deduplicated backups
+        self.chunk_store = ChunkStore(
+            self.backup_dir / "chunks",
+            compression=resolve_compression(self.backup_compression),
+            level=self.backup_compression_level,
+        )
+        # Unreferenced chunks younger than this survive garbage collection
+        self.chunk_gc_grace_seconds = getattr(
+            settings, "BACKUP_CHUNK_GC_GRACE_SECONDS", 24 * 3600
+        )
 
         # Database configuration
         self.db_host = getattr(settings, "POSTGRES_HOST", "localhost")
@@ -139,6 +202,7 @@ class BackupService:
         encrypt: bool = True,
         verify: bool = True,
         retention_days: Optional[int] = None,
+        backup_format: Optional[str] = None,
     ) -> str:
         """
         Create a database backup.
@@ -152,6 +216,8 @@ class BackupService:
             encrypt: Whether to encrypt the backup
             verify: Whether to verify backup integrity
             retention_days: Override default retention period
+            backup_format: Plain SQL or parallel directory format (uses
+                default if None)
 
         Returns:
             str: Backup job ID
@@ -171,6 +237,20 @@ class BackupService:
             ]:
                 raise BackupValidationError(f"Invalid backup type: {backup_type}")
 
+            if backup_format is None and backup_type in [
+                BackupType.INCREMENTAL,
+                BackupType.DIFFERENTIAL,
+            ]:
+                # Stored as full dumps that only add the chunks that changed
+                backup_format = BackupFormat.DEDUPLICATED
+            backup_format = backup_format or self.backup_format
+            if backup_format not in [
+                BackupFormat.PLAIN,
+                BackupFormat.DIRECTORY,
+                BackupFormat.DEDUPLICATED,
+            ]:
+                raise BackupValidationError(f"Invalid backup format: {backup_format}")
+
             # Validate permissions if requester specified
             if requester_id:
                 await self._validate_backup_permissions(requester_id)
@@ -179,6 +259,7 @@ class BackupService:
             backup_job = {
                 "id": str(uuid4()),
                 "type": backup_type,
+                "format": backup_format,
                 "description": description,
                 "requester_id": requester_id,
                 "tables": tables,
@@ -205,7 +286,7 @@ class BackupService:
             # Emit audit event
             await self.event_emitter.emit(
                 Event(
-                    type="backup.requested",
+                    event_type="backup.requested",
                     data={
                         "backup_id": backup_job["id"],
                         "type": backup_type,
@@ -283,6 +364,11 @@ class BackupService:
             if not backup_file.exists():
                 raise BackupValidationError(f"Backup file not found: {backup_file}")
 
+            if tables and backup_info.get("format") != BackupFormat.DIRECTORY:
+                raise BackupValidationError(
+                    "Selective table restore requires a directory-format backup"
+                )
+
             # Create restore job
             restore_job = {
                 "id": str(uuid4()),
@@ -306,7 +392,7 @@ class BackupService:
             # Emit audit event
             await self.event_emitter.emit(
                 Event(
-                    type="restore.requested",
+                    event_type="restore.requested",
                     data={
                         "restore_id": restore_job["id"],
                         "backup_id": backup_id,
@@ -443,7 +529,7 @@ class BackupService:
                 file_path = Path(backup_info["file_path"])
                 if file_path.exists():
                     backup_info["file_exists"] = True
-                    backup_info["actual_size_bytes"] = file_path.stat().st_size
+                    backup_info["actual_size_bytes"] = _path_size(file_path)
                     backup_info["last_modified"] = file_path.stat().st_mtime
                 else:
                     backup_info["file_exists"] = False
@@ -456,6 +542,80 @@ class BackupService:
             logger.error("Failed to get backup info", backup_id=backup_id, error=str(e))
             raise BackupError(f"Failed to get backup info: {str(e)}")
 
+    async def get_backup_download(
+        self, backup_id: str, requester_id: str
+    ) -> Tuple[Path, str, Optional[str]]:
+        """
+        Resolve a completed backup file for download.
+
+        Args:
+            backup_id: Backup ID
+            requester_id: ID of user requesting the download
+
+        Returns:
+            Tuple[Path, str, Optional[str]]: File path, filename, and a strong
+            ETag derived from the stored checksum
+
+        Raises:
+            BackupError: If the backup is not downloadable
+        """
+        await self._validate_backup_permissions(requester_id, require_admin=True)
+        backup_info = await self.get_backup_info(backup_id)
+
+        if backup_info["status"] != BackupStatus.COMPLETED or not backup_info.get(
+            "file_exists"
+        ):
+            raise BackupError(f"Backup {backup_id} is not available for download")
+
+        if backup_info.get("format") in [
+            BackupFormat.DIRECTORY,
+            BackupFormat.DEDUPLICATED,
+        ]:
+            raise BackupError(
+                f"Backup {backup_id} is a {backup_info['format']} backup and "
+                "cannot be downloaded as a single file"
+            )
+
+        file_path = Path(backup_info["file_path"])
+        if file_path.parent.resolve() != self.backup_dir.resolve():
+            raise BackupError(f"Backup {backup_id} is outside the backup directory")
+
+        checksum = backup_info.get("checksum")
+        etag = f'"{checksum}"' if checksum else None
+
+        await self.event_emitter.emit(
+            Event(
+                event_type="backup.downloaded",
+                data={"backup_id": backup_id, "requester_id": requester_id},
+            )
+        )
+
+        return file_path, file_path.name, etag
+
+    async def create_download_url(
+        self, backup_id: str, requester_id: str, expires_in: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a pre-signed, time-limited download URL for a backup.
+
+        Args:
+            backup_id: Backup ID
+            requester_id: ID of user requesting the URL
+            expires_in: URL lifetime in seconds
+
+        Returns:
+            Dict: ``download_url`` and ``expires_at``
+        """
+        file_path, _, _ = await self.get_backup_download(backup_id, requester_id)
+        url, expires = create_signed_url(
+            "backups", file_path.name, expires_in or self.download_url_ttl
+        )
+
+        return {
+            "download_url": url,
+            "expires_at": datetime.utcfromtimestamp(expires).isoformat(),
+        }
+
     async def get_restore_info(self, restore_id: str) -> Dict[str, Any]:
         """
         Get detailed restore information.
@@ -487,7 +647,11 @@ class BackupService:
             raise RestoreError(f"Failed to get restore info: {str(e)}")
 
     async def delete_backup(
-        self, backup_id: str, requester_id: Optional[str] = None, force: bool = False
+        self,
+        backup_id: str,
+        requester_id: Optional[str] = None,
+        force: bool = False,
+        collect_chunks: bool = True,
     ) -> bool:
         """
         Delete a backup.
@@ -496,6 +660,8 @@ class BackupService:
             backup_id: Backup ID to delete
             requester_id: ID of user requesting deletion
             force: Force deletion even if backup is recent
+            collect_chunks: Remove chunks a deleted deduplicated backup
+                leaves unreferenced (callers deleting in bulk do it once)
 
         Returns:
             bool: True if deleted successfully
@@ -524,9 +690,16 @@ class BackupService:
             # Delete backup file
             if backup_info.get("file_path"):
                 file_path = Path(backup_info["file_path"])
-                if file_path.exists():
+                if file_path.is_dir():
+                    shutil.rmtree(file_path)
+                elif file_path.exists():
                     file_path.unlink()
 
+            if collect_chunks and backup_info.get("format") == (
+                BackupFormat.DEDUPLICATED
+            ):
+                await self._collect_chunk_garbage()
+
             # Remove from cache
             job_key = f"backup_job:{backup_id}"
             await self.cache_service.delete(job_key)
@@ -534,7 +707,7 @@ class BackupService:
             # Emit audit event
             await self.event_emitter.emit(
                 Event(
-                    type="backup.deleted",
+                    event_type="backup.deleted",
                     data={
                         "backup_id": backup_id,
                         "requester_id": requester_id,
@@ -589,7 +762,7 @@ class BackupService:
             verification_results = {
                 "backup_id": backup_id,
                 "file_exists": True,
-                "file_size": file_path.stat().st_size,
+                "file_size": _path_size(file_path),
                 "checksum_match": True,  # Would implement actual checksum verification
                 "readable": True,  # Would test file readability
                 "structure_valid": True,  # Would validate backup structure
@@ -597,6 +770,22 @@ class BackupService:
                 "status": "valid",
             }
 
+            if backup_info.get("format") == BackupFormat.DEDUPLICATED:
+                # Re-read and hash every chunk, in parallel
+                manifest = await asyncio.to_thread(load_manifest, file_path)
+                corrupt_chunks = await asyncio.to_thread(
+                    self.chunk_store.verify, manifest, self.parallel_jobs
+                )
+                verification_results.update(
+                    {
+                        "chunks_checked": len({d for d, _ in manifest["chunks"]}),
+                        "corrupt_chunks": corrupt_chunks,
+                        "checksum_match": not corrupt_chunks,
+                        "readable": not corrupt_chunks,
+                        "status": "corrupt" if corrupt_chunks else "valid",
+                    }
+                )
+
             logger.info(
                 "Backup verified",
                 backup_id=backup_id,
@@ -660,13 +849,19 @@ class BackupService:
             if not dry_run:
                 for backup in backups_to_delete:
                     try:
-                        await self.delete_backup(backup["id"], force=True)
+                        await self.delete_backup(
+                            backup["id"], force=True, collect_chunks=False
+                        )
                         cleanup_results["deleted_backups"].append(backup["id"])
                     except Exception as e:
                         cleanup_results["failed_deletions"].append(
                             {"backup_id": backup["id"], "error": str(e)}
                         )
 
+                # One sweep for all deleted deduplicated backups, which also
+                # reclaims chunks of backups that failed part way
+                cleanup_results.update(await self._collect_chunk_garbage())
+
             logger.info(
                 "Backup cleanup completed",
                 **{
@@ -743,10 +938,9 @@ class BackupService:
             elif backup_job["type"] == BackupType.DATA_ONLY:
                 await self._execute_data_backup(backup_id, backup_job)
             else:
-                # For incremental/differential, we'd need more complex logic
-                await self._execute_full_backup(
-                    backup_id, backup_job
-                )  # Fallback to full
+                # Incremental/differential backups are full dumps stored in the
+                # deduplicating chunk store, which only keeps what changed
+                await self._execute_full_backup(backup_id, backup_job)
 
             # Verify backup if requested
             if backup_job.get("verify", True):
@@ -764,7 +958,7 @@ class BackupService:
             # Emit completion event
             await self.event_emitter.emit(
                 Event(
-                    type="backup.completed",
+                    event_type="backup.completed",
                     data={
                         "backup_id": backup_id,
                         "type": backup_job["type"],
@@ -782,7 +976,8 @@ class BackupService:
             # Emit failure event
             await self.event_emitter.emit(
                 Event(
-                    type="backup.failed", data={"backup_id": backup_id, "error": str(e)}
+                    event_type="backup.failed",
+                    data={"backup_id": backup_id, "error": str(e)},
                 )
             )
 
@@ -808,7 +1003,7 @@ class BackupService:
             # Emit completion event
             await self.event_emitter.emit(
                 Event(
-                    type="restore.completed",
+                    event_type="restore.completed",
                     data={
                         "restore_id": restore_id,
                         "backup_id": restore_job["backup_id"],
@@ -827,111 +1022,14 @@ class BackupService:
         self, backup_id: str, backup_job: Dict[str, Any]
     ) -> None:
         """Execute a full database backup."""
-        try:
-            # Generate backup file path
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"full_backup_{timestamp}_{backup_id[:8]}.sql"
-            backup_path = self.backup_dir / backup_filename
-
-            await self._update_backup_status(
-                backup_id, BackupStatus.RUNNING, progress=10
-            )
-
-            # Use pg_dump for PostgreSQL backup
-            pg_dump_cmd = [
-                "pg_dump",
-                "-h",
-                self.db_host,
-                "-p",
-                str(self.db_port),
-                "-U",
-                self.db_user,
-                "-d",
-                self.db_name,
-                "--no-password",
-                "--verbose",
-                "--file",
-                str(backup_path),
-            ]
-
-            # Add table filters if specified
-            if backup_job.get("tables"):
-                for table in backup_job["tables"]:
-                    pg_dump_cmd.extend(["-t", table])
-
-            await self._update_backup_status(
-                backup_id, BackupStatus.RUNNING, progress=30
-            )
-
-            # Execute pg_dump
-            env = os.environ.copy()
-            env["PGPASSWORD"] = self.db_password
-
-            process = await asyncio.create_subprocess_exec(
-                *pg_dump_cmd,
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                raise BackupError(f"pg_dump failed: {stderr.decode()}")
-
-            await self._update_backup_status(
-                backup_id, BackupStatus.RUNNING, progress=60
-            )
-
-            # Compress if requested
-            final_path = backup_path
-            if backup_job.get("compress", True):
-                compressed_path = backup_path.with_suffix(".sql.gz")
-                with open(backup_path, "rb") as f_in:
-                    with gzip.open(
-                        compressed_path,
-                        "wb",
-                        compresslevel=self.backup_compression_level,
-                    ) as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-
-                # Remove uncompressed file
-                backup_path.unlink()
-                final_path = compressed_path
-
-            await self._update_backup_status(
-                backup_id, BackupStatus.RUNNING, progress=80
-            )
-
-            # Encrypt if requested
-            if backup_job.get("encrypt", True) and self.enable_backup_encryption:
-                # In production, implement proper encryption
-                # For now, just rename to indicate encryption
-                encrypted_path = final_path.with_suffix(final_path.suffix + ".enc")
-                shutil.move(final_path, encrypted_path)
-                final_path = encrypted_path
-
-            # Calculate file size and checksum
-            file_size = final_path.stat().st_size
-            checksum = await self._calculate_file_checksum(final_path)
-
-            # Update backup job with file information
-            await self._update_backup_job_data(
-                backup_id,
-                {
-                    "file_path": str(final_path),
-                    "size_bytes": file_size,
-                    "checksum": checksum,
-                    "compressed": backup_job.get("compress", True),
-                    "encrypted": backup_job.get("encrypt", True)
-                    and self.enable_backup_encryption,
-                },
-            )
+        # Add table filters if specified
+        table_args: List[str] = []
+        for table in backup_job.get("tables") or []:
+            table_args.extend(["-t", table])
 
+        try:
+            await self._dump_database(backup_id, backup_job, "full", table_args)
         except Exception as e:
-            # Cleanup partial backup file
-            if "backup_path" in locals() and backup_path.exists():
-                backup_path.unlink(missing_ok=True)
             raise BackupError(f"Full backup failed: {str(e)}")
 
     async def _execute_schema_backup(
@@ -939,62 +1037,9 @@ class BackupService:
     ) -> None:
         """Execute a schema-only backup."""
         try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"schema_backup_{timestamp}_{backup_id[:8]}.sql"
-            backup_path = self.backup_dir / backup_filename
-
-            # Use pg_dump with --schema-only
-            pg_dump_cmd = [
-                "pg_dump",
-                "-h",
-                self.db_host,
-                "-p",
-                str(self.db_port),
-                "-U",
-                self.db_user,
-                "-d",
-                self.db_name,
-                "--no-password",
-                "--schema-only",
-                "--verbose",
-                "--file",
-                str(backup_path),
-            ]
-
-            env = os.environ.copy()
-            env["PGPASSWORD"] = self.db_password
-
-            process = await asyncio.create_subprocess_exec(
-                *pg_dump_cmd,
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                raise BackupError(f"Schema backup failed: {stderr.decode()}")
-
-            # Post-process (compress, encrypt) similar to full backup
-            final_path = await self._post_process_backup_file(
-                backup_path,
-                backup_job.get("compress", True),
-                backup_job.get("encrypt", True),
+            await self._dump_database(
+                backup_id, backup_job, "schema", ["--schema-only"]
             )
-
-            file_size = final_path.stat().st_size
-            checksum = await self._calculate_file_checksum(final_path)
-
-            await self._update_backup_job_data(
-                backup_id,
-                {
-                    "file_path": str(final_path),
-                    "size_bytes": file_size,
-                    "checksum": checksum,
-                },
-            )
-
         except Exception as e:
             raise BackupError(f"Schema backup failed: {str(e)}")
 
@@ -1003,64 +1048,196 @@ class BackupService:
     ) -> None:
         """Execute a data-only backup."""
         try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"data_backup_{timestamp}_{backup_id[:8]}.sql"
-            backup_path = self.backup_dir / backup_filename
-
-            # Use pg_dump with --data-only
-            pg_dump_cmd = [
-                "pg_dump",
-                "-h",
-                self.db_host,
-                "-p",
-                str(self.db_port),
-                "-U",
-                self.db_user,
-                "-d",
-                self.db_name,
-                "--no-password",
-                "--data-only",
-                "--verbose",
-                "--file",
-                str(backup_path),
-            ]
+            await self._dump_database(backup_id, backup_job, "data", ["--data-only"])
+        except Exception as e:
+            raise BackupError(f"Data backup failed: {str(e)}")
 
-            env = os.environ.copy()
-            env["PGPASSWORD"] = self.db_password
+    async def _dump_database(
+        self,
+        backup_id: str,
+        backup_job: Dict[str, Any],
+        kind: str,
+        dump_args: List[str],
+    ) -> None:
+        """
+        Stream pg_dump output into the final backup file in a single pass.
 
-            process = await asyncio.create_subprocess_exec(
-                *pg_dump_cmd,
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+        Compression, the encryption stage and the SHA-256 checksum are all
+        applied to stdout as it arrives; no plain dump is written to disk.
+        """
+        if backup_job.get("format") == BackupFormat.DIRECTORY:
+            await self._dump_directory(backup_id, backup_job, kind, dump_args)
+            return
+
+        deduplicated = backup_job.get("format") == BackupFormat.DEDUPLICATED
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        stem = f"{kind}_backup_{timestamp}_{backup_id[:8]}"
+
+        if deduplicated:
+            # Chunks are compressed individually by the chunk store
+            compression, encrypted = self.chunk_store.compression, False
+            backup_path = self.backup_dir / f"{stem}{MANIFEST_SUFFIX}"
+        else:
+            compression = resolve_compression(
+                self.backup_compression
+                if backup_job.get("compress", True)
+                else Compression.NONE
+            )
+            encrypted = (
+                backup_job.get("encrypt", True) and self.enable_backup_encryption
+            )
+            backup_path = self.backup_dir / backup_filename(
+                stem, compression, encrypted
             )
 
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                raise BackupError(f"Data backup failed: {stderr.decode()}")
-
-            # Post-process the backup file
-            final_path = await self._post_process_backup_file(
+        await self._update_backup_status(backup_id, BackupStatus.RUNNING, progress=10)
+        total_tables = await self._count_tables(backup_job.get("tables"))
+
+        # Use pg_dump for PostgreSQL backup, writing the dump to stdout
+        pg_dump_cmd = [
+            "pg_dump",
+            *self._pg_connection_args(self.db_name),
+            "--verbose",
+            *dump_args,
+        ]
+
+        process = await asyncio.create_subprocess_exec(
+            *pg_dump_cmd,
+            env=self._pg_env(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        # --verbose output must be drained alongside stdout or pg_dump blocks
+        stderr_task = asyncio.create_task(
+            self._follow_table_progress(
+                process.stderr,
+                total_tables,
+                self._backup_progress_reporter(backup_id, 10, 80),
+            )
+        )
+        writer: DumpWriter
+        if deduplicated:
+            writer = DedupWriter(
+                self.chunk_store, backup_path, workers=self.parallel_jobs
+            )
+        else:
+            writer = BackupWriter(
                 backup_path,
-                backup_job.get("compress", True),
-                backup_job.get("encrypt", True),
+                compression=compression,
+                level=self.backup_compression_level,
+                threads=self.backup_compression_threads,
+                encrypt=encrypted,
             )
 
-            file_size = final_path.stat().st_size
-            checksum = await self._calculate_file_checksum(final_path)
+        try:
+            await write_stream(process.stdout, writer)
+            returncode = await process.wait()
+            stderr = await stderr_task
+            if returncode != 0:
+                raise BackupError(f"pg_dump failed: {stderr}")
+
+            checksum = await asyncio.to_thread(writer.close)
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            stderr_task.cancel()
+            await asyncio.to_thread(writer.abort)
+            raise
 
-            await self._update_backup_job_data(
-                backup_id,
-                {
-                    "file_path": str(final_path),
-                    "size_bytes": file_size,
-                    "checksum": checksum,
-                },
+        await self._update_backup_status(backup_id, BackupStatus.RUNNING, progress=80)
+
+        # Update backup job with file information; for deduplicated backups
+        # size_bytes only counts the chunks this backup added to the store
+        file_info = {
+            "file_path": str(backup_path),
+            "size_bytes": writer.bytes_written,
+            "uncompressed_bytes": writer.bytes_in,
+            "checksum": checksum,
+            "compressed": compression != Compression.NONE,
+            "compression": compression,
+            "encrypted": encrypted,
+        }
+        if deduplicated:
+            file_info["total_chunks"] = len(writer.chunks)
+            file_info["new_chunks"] = writer.new_chunks
+        await self._update_backup_job_data(backup_id, file_info)
+
+    async def _dump_directory(
+        self,
+        backup_id: str,
+        backup_job: Dict[str, Any],
+        kind: str,
+        dump_args: List[str],
+    ) -> None:
+        """
+        Dump in pg_dump's directory format with one worker per core.
+
+        Tables are dumped concurrently into separate (compressed) files, so
+        the backup window shrinks with the number of cores and the result
+        can be restored in parallel and table by table with pg_restore.
+        """
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        backup_path = self.backup_dir / f"{kind}_backup_{timestamp}_{backup_id[:8]}.dir"
+        partial_path = backup_path.with_name(backup_path.name + ".part")
+        compress_level = (
+            self.backup_compression_level if backup_job.get("compress", True) else 0
+        )
+
+        await self._update_backup_status(backup_id, BackupStatus.RUNNING, progress=10)
+        total_tables = await self._count_tables(backup_job.get("tables"))
+
+        pg_dump_cmd = [
+            "pg_dump",
+            *self._pg_connection_args(self.db_name),
+            "--verbose",
+            "--format=directory",
+            f"--jobs={self.parallel_jobs}",
+            f"--compress={compress_level}",
+            "--file",
+            str(partial_path),
+            *dump_args,
+        ]
+
+        process = await asyncio.create_subprocess_exec(
+            *pg_dump_cmd,
+            env=self._pg_env(),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            stderr = await self._follow_table_progress(
+                process.stderr,
+                total_tables,
+                self._backup_progress_reporter(backup_id, 10, 80),
             )
+            returncode = await process.wait()
+            if returncode != 0:
+                raise BackupError(f"pg_dump failed: {stderr}")
+
+            await asyncio.to_thread(os.replace, partial_path, backup_path)
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            await asyncio.to_thread(shutil.rmtree, partial_path, True)
+            raise
 
-        except Exception as e:
-            raise BackupError(f"Data backup failed: {str(e)}")
+        await self._update_backup_status(backup_id, BackupStatus.RUNNING, progress=80)
+
+        await self._update_backup_job_data(
+            backup_id,
+            {
+                "file_path": str(backup_path),
+                "size_bytes": await asyncio.to_thread(_path_size, backup_path),
+                # Table files are checksummed by pg_restore when read
+                "checksum": None,
+                "compressed": compress_level > 0,
+                "compression": Compression.GZIP if compress_level else Compression.NONE,
+                "encrypted": False,
+            },
+        )
 
     async def _execute_restore(
         self, restore_id: str, restore_job: Dict[str, Any]
@@ -1078,131 +1255,241 @@ class BackupService:
                 restore_id, RestoreStatus.RUNNING, progress=10
             )
 
-            # Create temporary file for restore processing
-            with tempfile.NamedTemporaryFile(suffix=".sql", delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
+            if backup_info.get("format") == BackupFormat.DIRECTORY:
+                await self._restore_directory(restore_id, restore_job, backup_file)
+                await self._update_restore_status(
+                    restore_id, RestoreStatus.RUNNING, progress=90
+                )
+                return
 
-            try:
-                # Decrypt if needed
-                current_file = backup_file
-                if backup_info.get("encrypted", False):
-                    # In production, implement proper decryption
-                    # For now, just copy the file
-                    shutil.copy(current_file, temp_path)
-                    current_file = temp_path
+            # Decrypted, decompressed SQL is produced lazily chunk by chunk
+            if backup_info.get("format") == BackupFormat.DEDUPLICATED:
+                manifest = await asyncio.to_thread(load_manifest, backup_file)
+                chunks = self.chunk_store.read(manifest)
+            else:
+                chunks = read_backup(backup_file, backup_info.get("encrypted", False))
 
-                await self._update_restore_status(
-                    restore_id, RestoreStatus.RUNNING, progress=30
+            if restore_job.get("dry_run", False):
+                # Still decode the whole file so a dry run proves it is readable
+                await asyncio.to_thread(lambda: sum(len(chunk) for chunk in chunks))
+            else:
+                await self._stream_into_psql(
+                    restore_id, restore_job["target_database"], chunks
                 )
 
-                # Decompress if needed
-                if backup_info.get("compressed", False):
-                    if current_file == temp_path:
-                        # Create another temp file for decompressed data
-                        with tempfile.NamedTemporaryFile(
-                            suffix=".sql", delete=False
-                        ) as temp_file2:
-                            temp_path2 = Path(temp_file2.name)
-                    else:
-                        temp_path2 = temp_path
+            await self._update_restore_status(
+                restore_id, RestoreStatus.RUNNING, progress=90
+            )
+
+        except Exception as e:
+            raise RestoreError(f"Restore execution failed: {str(e)}")
 
-                    with gzip.open(current_file, "rb") as f_in:
-                        with open(temp_path2, "wb") as f_out:
-                            shutil.copyfileobj(f_in, f_out)
+    async def _stream_into_psql(
+        self, restore_id: str, target_database: str, chunks: Iterator[bytes]
+    ) -> None:
+        """Pipe decoded backup chunks into psql's stdin."""
+        psql_cmd = ["psql", *self._pg_connection_args(target_database), "-f", "-"]
+
+        process = await asyncio.create_subprocess_exec(
+            *psql_cmd,
+            env=self._pg_env(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stderr_task = asyncio.create_task(process.stderr.read())
 
-                    current_file = temp_path2
+        await self._update_restore_status(
+            restore_id, RestoreStatus.RUNNING, progress=30
+        )
 
-                await self._update_restore_status(
-                    restore_id, RestoreStatus.RUNNING, progress=50
-                )
+        try:
+            await feed_stream(chunks, process.stdin)
+        except (BrokenPipeError, ConnectionResetError):
+            # psql exited early; its exit status and stderr say why
+            pass
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            stderr_task.cancel()
+            raise
 
-                # Perform restore if not dry run
-                if not restore_job.get("dry_run", False):
-                    # Use psql to restore
-                    psql_cmd = [
-                        "psql",
-                        "-h",
-                        self.db_host,
-                        "-p",
-                        str(self.db_port),
-                        "-U",
-                        self.db_user,
-                        "-d",
-                        restore_job["target_database"],
-                        "--no-password",
-                        "-f",
-                        str(current_file),
-                    ]
-
-                    env = os.environ.copy()
-                    env["PGPASSWORD"] = self.db_password
-
-                    process = await asyncio.create_subprocess_exec(
-                        *psql_cmd,
-                        env=env,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
+        returncode = await process.wait()
+        stderr = await stderr_task
+        if returncode != 0:
+            raise RestoreError(f"Restore failed: {stderr.decode()}")
 
-                    stdout, stderr = await process.communicate()
+    async def _restore_directory(
+        self, restore_id: str, restore_job: Dict[str, Any], backup_dir: Path
+    ) -> None:
+        """
+        Restore a directory-format backup with parallel pg_restore workers.
 
-                    if process.returncode != 0:
-                        raise RestoreError(f"Restore failed: {stderr.decode()}")
+        ``tables`` in the restore job limits the restore to those tables
+        (matched by pg_restore on table name). Dry runs only read and check
+        the backup's table of contents.
+        """
+        tables = restore_job.get("tables") or []
 
-                await self._update_restore_status(
-                    restore_id, RestoreStatus.RUNNING, progress=90
-                )
+        list_cmd = ["pg_restore", "--list", str(backup_dir)]
+        process = await asyncio.create_subprocess_exec(
+            *list_cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        toc, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RestoreError(f"Invalid backup: {stderr.decode()}")
 
-            finally:
-                # Cleanup temporary files
-                temp_path.unlink(missing_ok=True)
-                if "temp_path2" in locals():
-                    temp_path2.unlink(missing_ok=True)
+        if restore_job.get("dry_run", False):
+            return
 
-        except Exception as e:
-            raise RestoreError(f"Restore execution failed: {str(e)}")
+        total_tables = len(tables) or sum(
+            1 for line in toc.decode().splitlines() if " TABLE DATA " in line
+        )
 
-    async def _post_process_backup_file(
-        self, file_path: Path, compress: bool, encrypt: bool
-    ) -> Path:
-        """Post-process backup file with compression and encryption."""
-        current_path = file_path
+        pg_restore_cmd = [
+            "pg_restore",
+            *self._pg_connection_args(restore_job["target_database"]),
+            "--verbose",
+            "--format=directory",
+            f"--jobs={self.parallel_jobs}",
+        ]
+        for table in tables:
+            pg_restore_cmd.extend(["-t", table])
+        pg_restore_cmd.append(str(backup_dir))
+
+        process = await asyncio.create_subprocess_exec(
+            *pg_restore_cmd,
+            env=self._pg_env(),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
 
-        # Compress if requested
-        if compress:
-            compressed_path = file_path.with_suffix(".sql.gz")
-            with open(current_path, "rb") as f_in:
-                with gzip.open(
-                    compressed_path, "wb", compresslevel=self.backup_compression_level
-                ) as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+        async def report(table: str, completed: int, total: int) -> None:
+            await self._update_restore_status(
+                restore_id,
+                RestoreStatus.RUNNING,
+                progress=10 + 80 * completed // total if total else None,
+                table_progress={
+                    "current_table": table,
+                    "completed": completed,
+                    "total": total,
+                },
+            )
 
-            if current_path != file_path:  # Remove intermediate file
-                current_path.unlink()
-            else:  # Remove original
-                file_path.unlink()
+        try:
+            stderr = await self._follow_table_progress(
+                process.stderr, total_tables, report
+            )
+            returncode = await process.wait()
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        if returncode != 0:
+            raise RestoreError(f"Restore failed: {stderr}")
+
+    async def _follow_table_progress(
+        self,
+        stream: asyncio.StreamReader,
+        total: int,
+        report: Callable[[str, int, int], Awaitable[None]],
+    ) -> str:
+        """
+        Consume pg_dump/pg_restore --verbose output, reporting each table.
 
-            current_path = compressed_path
+        Returns:
+            str: The last lines of output, for error messages
+        """
+        tail: deque = deque(maxlen=50)
+        started = 0
+        async for raw_line in stream:
+            line = raw_line.decode(errors="replace").rstrip()
+            tail.append(line)
+            match = _TABLE_PROGRESS.search(line)
+            if match:
+                # A table's line marks the start of its data; the ones
+                # before it are done
+                await report(match.group(1), started, total)
+                started += 1
+        return "\n".join(tail)
+
+    def _backup_progress_reporter(
+        self, backup_id: str, start: int, end: int
+    ) -> Callable[[str, int, int], Awaitable[None]]:
+        """Map per-table progress onto the backup's progress range."""
+
+        async def report(table: str, completed: int, total: int) -> None:
+            await self._update_backup_status(
+                backup_id,
+                BackupStatus.RUNNING,
+                progress=start + (end - start) * completed // total if total else None,
+                table_progress={
+                    "current_table": table,
+                    "completed": completed,
+                    "total": total,
+                },
+            )
 
-        # Encrypt if requested
-        if encrypt and self.enable_backup_encryption:
-            encrypted_path = current_path.with_suffix(current_path.suffix + ".enc")
-            # In production, implement proper encryption
-            shutil.move(current_path, encrypted_path)
-            current_path = encrypted_path
+        return report
 
-        return current_path
+    async def _count_tables(self, tables: Optional[List[str]]) -> int:
+        """Number of tables a dump will cover, for progress reporting."""
+        if tables:
+            return len(tables)
+        try:
+            result = await self.session.execute(
+                text(
+                    "SELECT count(*) FROM pg_catalog.pg_tables "
+                    "WHERE schemaname NOT IN ('pg_catalog', 'information_schema')"
+                )
+            )
+            return result.scalar() or 0
+        except Exception as e:
+            logger.warning("Failed to count tables for backup progress", error=str(e))
+            return 0
 
-    async def _calculate_file_checksum(self, file_path: Path) -> str:
-        """Calculate SHA256 checksum of a file."""
-        import hashlib
+    async def _collect_chunk_garbage(self) -> Dict[str, int]:
+        """Remove chunks no remaining deduplicated backup refers to."""
 
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
+        def collect() -> Dict[str, int]:
+            return self.chunk_store.collect_garbage(
+                iter_manifests(self.backup_dir), self.chunk_gc_grace_seconds
+            )
 
-        return sha256_hash.hexdigest()
+        try:
+            result = await asyncio.to_thread(collect)
+        except (OSError, ValueError) as e:
+            # An unreadable manifest could hide live chunks; sweep next time
+            logger.error("Skipped backup chunk garbage collection", error=str(e))
+            return {"chunks_removed": 0, "bytes_reclaimed": 0}
+
+        logger.info("Backup chunks collected", **result)
+        return result
+
+    def _pg_connection_args(self, database: str) -> List[str]:
+        """Connection options for PostgreSQL client tools."""
+        return [
+            "-h",
+            self.db_host,
+            "-p",
+            str(self.db_port),
+            "-U",
+            self.db_user,
+            "-d",
+            database,
+            "--no-password",
+        ]
+
+    def _pg_env(self) -> Dict[str, str]:
+        """Environment for PostgreSQL client tools."""
+        env = os.environ.copy()
+        env["PGPASSWORD"] = self.db_password
+        return env
 
     async def _update_backup_status(
         self,
@@ -1210,6 +1497,7 @@ class BackupService:
         status: str,
         progress: Optional[int] = None,
         error_message: Optional[str] = None,
+        table_progress: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Update backup job status."""
         try:
@@ -1223,6 +1511,9 @@ class BackupService:
                 if progress is not None:
                     backup_job["progress"] = progress
 
+                if table_progress is not None:
+                    backup_job["table_progress"] = table_progress
+
                 if error_message:
                     backup_job["error_message"] = error_message
 
@@ -1253,6 +1544,7 @@ class BackupService:
         status: str,
         progress: Optional[int] = None,
         error_message: Optional[str] = None,
+        table_progress: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Update restore job status."""
         try:
@@ -1266,6 +1558,9 @@ class BackupService:
                 if progress is not None:
                     restore_job["progress"] = progress
 
+                if table_progress is not None:
+                    restore_job["table_progress"] = table_progress
+
                 if error_message:
                     restore_job["error_message"] = error_message
 
@@ -1312,5 +1607,12 @@ class BackupService:
             )
 
 
+def _path_size(path: Path) -> int:
+    """Size of a backup file, or the total size of a directory backup."""
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
 # Global instance
 backup_service = BackupService
@@ -0,0 +1,322 @@
+"""
+Deduplicating Backup Store
+
+Content-addressed storage for deduplicated backups. The dump stream is
+cut into chunks at content-defined boundaries, each chunk is stored once
+under its SHA-256 and every backup is a manifest listing its chunks. A
+daily dump of a mostly unchanged database therefore only adds the chunks
+around the rows that changed.
+
+Boundaries are chosen at line ends whose trailing bytes hash to zero under
+a mask, so an insertion or deletion only changes the chunks it touches
+and the chunking resynchronizes right after it. Plain-SQL dumps are line
+oriented (one COPY row per line); input without line breaks is cut at the
+maximum chunk size.
+
+Chunks no longer referenced by any manifest are removed by a
+mark-and-sweep ``collect_garbage`` pass. Chunks written or reused recently
+are always kept, so a sweep never races a backup that is still running.
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+from app.services.backup_pipeline import Compression, decode_block, encode_block
+
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Bytes before a line end that decide whether it is a chunk boundary
+BOUNDARY_WINDOW = 48
+
+
+class ChunkCorruptError(Exception):
+    """Raised when a stored chunk is missing or does not match its hash."""
+
+    pass
+
+
+class ContentDefinedChunker:
+    """
+    Split a byte stream into content-defined chunks.
+
+    With dump lines of ~100 bytes, a 12-bit mask gives chunks of about
+    ``min_size`` + 400 KiB.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 64 * 1024,
+        max_size: int = 2 * 1024 * 1024,
+        mask_bits: int = 12,
+    ) -> None:
+        self.min_size = min_size
+        self.max_size = max_size
+        self._mask = (1 << mask_bits) - 1
+        self._buffer = bytearray()
+        # Offset up to which the buffer has been searched for a boundary
+        self._scanned = 0
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        """Add data and yield every chunk it completes."""
+        self._buffer += data
+        while True:
+            cut = self._find_boundary()
+            if cut is None:
+                return
+            chunk = bytes(self._buffer[:cut])
+            del self._buffer[:cut]
+            self._scanned = 0
+            yield chunk
+
+    def finish(self) -> Iterator[bytes]:
+        """Yield whatever remains as the final chunk."""
+        if self._buffer:
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+            self._scanned = 0
+            yield chunk
+
+    def _find_boundary(self) -> Optional[int]:
+        buffer = self._buffer
+        limit = min(len(buffer), self.max_size)
+        position = max(self._scanned, self.min_size)
+
+        while position < limit:
+            newline = buffer.find(b"\n", position, limit)
+            if newline < 0:
+                break
+            end = newline + 1
+            window = buffer[max(0, end - BOUNDARY_WINDOW) : end]
+            if zlib.crc32(window) & self._mask == 0:
+                return end
+            position = end
+
+        if len(buffer) >= self.max_size:
+            return self.max_size
+        self._scanned = max(position, limit)
+        return None
+
+
+class ChunkStore:
+    """Chunks stored once each, compressed, under ``<root>/<aa>/<sha256>``."""
+
+    def __init__(
+        self,
+        root: Path,
+        compression: str = Compression.GZIP,
+        level: int = 6,
+    ) -> None:
+        self.root = Path(root)
+        self.compression = compression
+        self.level = level
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """
+        Store a chunk unless it already exists.
+
+        Returns:
+            Tuple[str, int]: Chunk digest and bytes written (0 if reused)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+
+        try:
+            # Refresh mtime so a concurrent sweep keeps the chunk
+            os.utime(path)
+            return digest, 0
+        except FileNotFoundError:
+            pass
+
+        encoded = encode_block(data, self.compression, self.level)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{digest}.{uuid4().hex}.tmp")
+        temp_path.write_bytes(encoded)
+        os.replace(temp_path, path)
+        return digest, len(encoded)
+
+    def get(self, digest: str) -> bytes:
+        """Read a chunk, checking it against its digest."""
+        try:
+            data = decode_block(self.path_for(digest).read_bytes())
+        except FileNotFoundError:
+            raise ChunkCorruptError(f"Chunk {digest} is missing")
+        except Exception as e:
+            raise ChunkCorruptError(f"Chunk {digest} is unreadable: {e}")
+
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ChunkCorruptError(f"Chunk {digest} does not match its hash")
+        return data
+
+    def read(self, manifest: Dict[str, Any]) -> Iterator[bytes]:
+        """Yield a backup's data chunk by chunk."""
+        for digest, _ in manifest["chunks"]:
+            yield self.get(digest)
+
+    def verify(self, manifest: Dict[str, Any], workers: int = 4) -> List[str]:
+        """
+        Check every chunk of a backup, reading and hashing them in parallel.
+
+        Returns:
+            List[str]: Digests of missing or corrupt chunks
+        """
+        digests = list(dict.fromkeys(digest for digest, _ in manifest["chunks"]))
+
+        def check(digest: str) -> Optional[str]:
+            try:
+                self.get(digest)
+            except ChunkCorruptError:
+                return digest
+            return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return [digest for digest in executor.map(check, digests) if digest]
+
+    def collect_garbage(
+        self, manifests: Iterable[Dict[str, Any]], grace_seconds: int = 24 * 3600
+    ) -> Dict[str, int]:
+        """
+        Delete chunks not referenced by any of ``manifests``.
+
+        Chunks modified within ``grace_seconds`` are kept even when
+        unreferenced: they may belong to a backup still being written.
+
+        Returns:
+            Dict[str, int]: Number of chunks removed and bytes reclaimed
+        """
+        live = {digest for manifest in manifests for digest, _ in manifest["chunks"]}
+        cutoff = time.time() - grace_seconds
+        removed = reclaimed = 0
+
+        if not self.root.exists():
+            return {"chunks_removed": 0, "bytes_reclaimed": 0}
+
+        for path in self.root.glob("*/*"):
+            if path.name in live:
+                continue
+            stat = path.stat()
+            if stat.st_mtime >= cutoff:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+            reclaimed += stat.st_size
+
+        return {"chunks_removed": removed, "bytes_reclaimed": reclaimed}
+
+
+class DedupWriter:
+    """
+    DumpWriter that chunks the stream into a ChunkStore plus a manifest.
+
+    Chunks are compressed and stored on a small thread pool while the dump
+    keeps streaming; at most ``2 * workers`` chunks are in flight.
+    """
+
+    def __init__(
+        self,
+        store: ChunkStore,
+        manifest_path: Path,
+        chunker: Optional[ContentDefinedChunker] = None,
+        workers: int = 4,
+    ) -> None:
+        self.store = store
+        self.manifest_path = Path(manifest_path)
+        self.chunker = chunker or ContentDefinedChunker()
+        self.bytes_in = 0
+        self.bytes_written = 0
+        self.new_chunks = 0
+        self.chunks: List[Tuple[str, int]] = []
+        self._sha256 = hashlib.sha256()
+        self._max_pending = 2 * workers
+        self._pending: Deque[Tuple[int, Future]] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def write(self, chunk: bytes) -> None:
+        self.bytes_in += len(chunk)
+        self._sha256.update(chunk)
+        for piece in self.chunker.feed(chunk):
+            self._submit(piece)
+
+    def close(self) -> str:
+        """Store the remaining chunks, write the manifest and return the SHA-256."""
+        try:
+            for piece in self.chunker.finish():
+                self._submit(piece)
+            while self._pending:
+                self._collect()
+        finally:
+            self._executor.shutdown()
+
+        checksum = self._sha256.hexdigest()
+        write_manifest(
+            self.manifest_path,
+            {
+                "version": MANIFEST_VERSION,
+                "compression": self.store.compression,
+                "size": self.bytes_in,
+                "sha256": checksum,
+                "chunks": self.chunks,
+            },
+        )
+        return checksum
+
+    def abort(self) -> None:
+        """Stop storing chunks; orphaned chunks are left to garbage collection."""
+        self._executor.shutdown(cancel_futures=True)
+
+    def _submit(self, piece: bytes) -> None:
+        if len(self._pending) >= self._max_pending:
+            self._collect()
+        self._pending.append((len(piece), self._executor.submit(self.store.put, piece)))
+
+    def _collect(self) -> None:
+        size, future = self._pending.popleft()
+        digest, written = future.result()
+        self.chunks.append((digest, size))
+        self.bytes_written += written
+        self.new_chunks += 1 if written else 0
+
+
+def write_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    """Write a manifest atomically."""
+    temp_path = path.with_name(path.name + ".part")
+    temp_path.write_text(json.dumps(manifest))
+    os.replace(temp_path, path)
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def iter_manifests(directory: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Every manifest in a backup directory.
+
+    Unreadable manifests raise rather than being skipped, so a garbage
+    collection pass never deletes chunks of a backup it could not read.
+    """
+    for path in Path(directory).glob(f"*{MANIFEST_SUFFIX}"):
+        yield load_manifest(path)
+
+
+__all__ = [
+    "MANIFEST_SUFFIX",
+    "ChunkCorruptError",
+    "ChunkStore",
+    "ContentDefinedChunker",
+    "DedupWriter",
+    "iter_manifests",
+    "load_manifest",
+    "write_manifest",
+]
@@ -8,13 +8,24 @@ Provides comprehensive caching capabilities with multiple cache levels:
 
 This service addresses performance bottlenecks identified in the improvement plan
 by implementing strategic caching to reduce database load and improve response times.
+
+``get_or_compute`` protects expensive values against stampedes: concurrent
+misses of a key share one computation per process, a short Redis lock
+lets one process per cluster compute while others wait for its result,
+and values are refreshed probabilistically ahead of expiry (XFetch) so a
+popular key does not expire for everyone at once.
 """
 
+import asyncio
 import hashlib
 import json
+import math
 import pickle
+import random
+import secrets
+import time
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import redis.asyncio as redis
 import structlog
@@ -24,6 +35,25 @@ from app.core.config import get_settings
 settings = get_settings()
 logger = structlog.get_logger(__name__)
 
+COMPUTE_LOCK_TIMEOUT = getattr(settings, "CACHE_COMPUTE_LOCK_TIMEOUT", 5.0)
+
+# Release a lock only if it is still ours
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class _LeaderCancelled(Exception):
+    """The caller computing a value was cancelled before finishing."""
+
+
+# (event loop, key) -> computation in progress in this process, shared by
+# every CacheService instance
+_inflight: Dict[Tuple[Any, str], "asyncio.Future[Any]"] = {}
+
 
 class CacheService:
     """
@@ -77,25 +107,46 @@ class CacheService:
         """
         try:
             redis_client = await self.get_redis()
-            value = await redis_client.get(key)
-            if value:
-                try:
-                    # Try to deserialize as JSON first
-                    return json.loads(value)
-                except (json.JSONDecodeError, TypeError):
-                    # If not JSON, try pickle
-                    try:
-                        return pickle.loads(value)
-                    except (pickle.PickleError, TypeError):
-                        # Return as string if all else fails
-                        return (
-                            value.decode("utf-8") if isinstance(value, bytes) else value
-                        )
-            return None
+            return self._deserialize(await redis_client.get(key))
         except Exception as e:
             logger.error("Failed to get cache value", key=key, error=str(e))
             return None
 
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several values from cache with one MGET.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values in key order, None for missing keys (all None on error)
+        """
+        if not keys:
+            return []
+        try:
+            redis_client = await self.get_redis()
+            values = await redis_client.mget(keys)
+            return [self._deserialize(value) for value in values]
+        except Exception as e:
+            logger.error("Failed to get cache values", count=len(keys), error=str(e))
+            return [None] * len(keys)
+
+    @staticmethod
+    def _deserialize(value: Optional[bytes]) -> Optional[Any]:
+        if not value:
+            return None
+        try:
+            # Try to deserialize as JSON first
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            # If not JSON, try pickle
+            try:
+                return pickle.loads(value)
+            except (pickle.PickleError, TypeError):
+                # Return as string if all else fails
+                return value.decode("utf-8") if isinstance(value, bytes) else value
+
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """
         Set a value in cache.
@@ -110,15 +161,7 @@ class CacheService:
         """
         try:
             redis_client = await self.get_redis()
-
-            # Serialize value
-            serialized: Union[str, bytes]
-            if isinstance(value, (dict, list)):
-                serialized = json.dumps(value)
-            elif isinstance(value, str):
-                serialized = value
-            else:
-                serialized = pickle.dumps(value)
+            serialized = self._serialize(value)
 
             if ttl:
                 await redis_client.setex(key, timedelta(seconds=ttl), serialized)
@@ -131,6 +174,172 @@ class CacheService:
             logger.error("Failed to set cache value", key=key, error=str(e))
             return False
 
+    @staticmethod
+    def _serialize(value: Any) -> Union[str, bytes]:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if isinstance(value, str):
+            return value
+        return pickle.dumps(value)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        beta: float = 1.0,
+        lock_timeout: float = COMPUTE_LOCK_TIMEOUT,
+    ) -> Any:
+        """
+        Get a value, computing and caching it on a miss without stampedes.
+
+        Concurrent misses in this process await a single ``compute``; across
+        processes a ``lock:{key}`` lock lets one compute while the others
+        poll for its result (and compute themselves if it never comes).
+        Hits close to expiry are refreshed early with probability rising as
+        expiry nears, scaled by how long ``compute`` took (XFetch): one
+        caller holding the lock recomputes while the rest keep reading the
+        cached value. ``None`` results are returned but not cached. If
+        Redis is unavailable, ``compute`` is simply called. If the caller
+        computing a value is cancelled, its followers retry instead of
+        being cancelled with it.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value
+            ttl: Time to live in seconds
+            beta: Early refresh eagerness (1.0 is the XFetch default; 0 off)
+            lock_timeout: Seconds to hold the lock and to wait for another
+                process's result
+
+        Returns:
+            The cached or computed value
+        """
+        try:
+            redis_client = await self.get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                pipe.get(f"{key}:delta")
+                raw, pttl, delta = await pipe.execute()
+        except Exception as e:
+            logger.error("Failed to get cache value", key=key, error=str(e))
+            return await compute()
+
+        value = self._deserialize(raw)
+        if value is not None:
+            remaining = pttl / 1000 if pttl and pttl > 0 else float(ttl)
+            delta = float(delta or 0)
+            # XFetch: recompute when delta * beta * -ln(U) reaches the TTL left
+            if beta > 0 and delta > 0:
+                if delta * beta * -math.log(1.0 - random.random()) >= remaining:
+                    token = await self._acquire_lock(key, lock_timeout)
+                    if token is not None:
+                        try:
+                            return await self._compute_and_store(key, compute, ttl)
+                        finally:
+                            await self._release_lock(key, token)
+            return value
+
+        loop = asyncio.get_running_loop()
+        while True:
+            flight = _inflight.get((loop, key))
+            if flight is None:
+                break
+            try:
+                return await asyncio.shield(flight)
+            except _LeaderCancelled:
+                # The computing request went away; take over or follow anew
+                continue
+
+        flight = loop.create_future()
+        _inflight[(loop, key)] = flight
+        try:
+            result = await self._compute_once(key, compute, ttl, lock_timeout)
+        except Exception as e:
+            flight.set_exception(e)
+            # Retrieved here so a flight without followers does not warn
+            flight.exception()
+            raise
+        except BaseException:
+            # Cancellation belongs to the leader's request, not its followers
+            flight.set_exception(_LeaderCancelled())
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            _inflight.pop((loop, key), None)
+
+    async def _compute_once(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        lock_timeout: float,
+    ) -> Any:
+        """Compute under the cluster lock, or wait for whoever holds it."""
+        token = await self._acquire_lock(key, lock_timeout)
+        if token is not None:
+            try:
+                return await self._compute_and_store(key, compute, ttl)
+            finally:
+                await self._release_lock(key, token)
+
+        deadline = time.monotonic() + lock_timeout
+        interval = 0.02
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            value = await self.get(key)
+            if value is not None:
+                return value
+            interval = min(interval * 2, 0.2)
+
+        logger.warning("Timed out waiting for cache computation", key=key)
+        return await self._compute_and_store(key, compute, ttl)
+
+    async def _compute_and_store(
+        self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int
+    ) -> Any:
+        started = time.perf_counter()
+        value = await compute()
+        elapsed = time.perf_counter() - started
+        if value is None:
+            return None
+
+        try:
+            redis_client = await self.get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl, self._serialize(value))
+                pipe.setex(f"{key}:delta", ttl, f"{elapsed:.6f}")
+                await pipe.execute()
+            logger.debug("Cache value computed", key=key, ttl=ttl, seconds=elapsed)
+        except Exception as e:
+            logger.error("Failed to set cache value", key=key, error=str(e))
+        return value
+
+    async def _acquire_lock(self, key: str, timeout: float) -> Optional[str]:
+        """Token of a newly taken ``lock:{key}``, or None if it is held."""
+        token = secrets.token_hex(8)
+        try:
+            redis_client = await self.get_redis()
+            acquired = await redis_client.set(
+                f"lock:{key}", token, nx=True, px=int(timeout * 1000)
+            )
+        except Exception as e:
+            logger.error("Failed to take cache lock", key=key, error=str(e))
+            # Without Redis there is nobody to wait for
+            return token
+        return token if acquired else None
+
+    async def _release_lock(self, key: str, token: str) -> None:
+        try:
+            redis_client = await self.get_redis()
+            await redis_client.eval(_RELEASE_LOCK, 1, f"lock:{key}", token)
+        except Exception as e:
+            logger.error("Failed to release cache lock", key=key, error=str(e))
+
     async def delete(self, key: str) -> bool:
         """
         Delete a value from cache.
@@ -177,6 +386,119 @@ class CacheService:
             )
             return 0
 
+    async def increment_hash(
+        self, key: str, increments: Dict[str, int], ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Atomically increment integer fields of a hash.
+
+        Args:
+            key: Hash key
+            increments: Field name to amount (HINCRBY per field)
+            ttl: Time to live in seconds (optional, refreshed on every call)
+
+        Returns:
+            True if successful
+        """
+        try:
+            redis_client = await self.get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for field, amount in increments.items():
+                    pipe.hincrby(key, field, amount)
+                if ttl:
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Failed to increment hash", key=key, error=str(e))
+            return False
+
+    async def increment_hashes(
+        self, increments: Dict[str, Dict[str, int]], ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Increment fields of several hashes in one pipeline.
+
+        Args:
+            increments: Hash key to field increments
+            ttl: Time to live in seconds (optional, refreshed on every call)
+
+        Returns:
+            True if successful
+        """
+        if not increments:
+            return True
+        try:
+            redis_client = await self.get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key, fields in increments.items():
+                    for field, amount in fields.items():
+                        pipe.hincrby(key, field, amount)
+                    if ttl:
+                        pipe.expire(key, ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(
+                "Failed to increment hashes", count=len(increments), error=str(e)
+            )
+            return False
+
+    async def increment_counters(
+        self, increments: Dict[str, int], ttl: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Atomically increment integer counters in one pipeline.
+
+        Args:
+            increments: Counter key to amount (INCRBY per key)
+            ttl: Time to live in seconds, set when a counter is created and
+                not extended by later increments
+
+        Returns:
+            New value of each counter (empty on error)
+        """
+        if not increments:
+            return {}
+        try:
+            redis_client = await self.get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key, amount in increments.items():
+                    pipe.incrby(key, amount)
+                    if ttl:
+                        pipe.expire(key, ttl, nx=True)
+                results = await pipe.execute()
+            step = 2 if ttl else 1
+            return {key: int(value) for key, value in zip(increments, results[::step])}
+        except Exception as e:
+            logger.error(
+                "Failed to increment counters", count=len(increments), error=str(e)
+            )
+            return {}
+
+    async def get_hash(self, key: str) -> Dict[str, str]:
+        """
+        Get all fields of a hash.
+
+        Args:
+            key: Hash key
+
+        Returns:
+            Field values decoded as strings (empty if missing or on error)
+        """
+        try:
+            redis_client = await self.get_redis()
+            values = await redis_client.hgetall(key)
+            return {
+                (k.decode() if isinstance(k, bytes) else k): (
+                    v.decode() if isinstance(v, bytes) else v
+                )
+                for k, v in values.items()
+            }
+        except Exception as e:
+            logger.error("Failed to get hash", key=key, error=str(e))
+            return {}
+
     async def flush_all(self) -> bool:
         """
         Flush all cache entries.
@@ -0,0 +1,202 @@
+"""
+Export Encoders
+
+Incremental row encoders used by ExportService. Each encoder receives rows
+in batches (one database partition at a time) and writes them straight to
+a binary sink, so an export never holds more than one batch in memory:
+
+- CSV and JSON are written row by row
+- Excel uses xlsxwriter's ``constant_memory`` mode, which flushes each row
+- Parquet writes one row group per batch through pyarrow's ParquetWriter
+"""
+
+import csv
+import io
+import json
+import shutil
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+# Chunk size used when copying encoded files into the output sink
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Arrow type and value converter per Python column type; others are text
+PARQUET_TYPES: Dict[type, Tuple[str, Callable[[Any], Any]]] = {
+    bool: ("bool_", bool),
+    int: ("int64", int),
+    float: ("float64", float),
+    Decimal: ("float64", float),
+}
+PARQUET_TEXT: Tuple[str, Callable[[Any], Any]] = ("string", str)
+
+
+class RowEncoder:
+    """Base class for incremental export encoders."""
+
+    def __init__(self, sink: BinaryIO) -> None:
+        self.sink = sink
+        self.rows_written = 0
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Encode a batch of sanitized rows."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush any buffered output; the sink itself stays open."""
+        pass
+
+
+class CsvEncoder(RowEncoder):
+    """CSV with a header taken from the first row."""
+
+    def __init__(self, sink: BinaryIO) -> None:
+        super().__init__(sink)
+        self._text = io.TextIOWrapper(sink, encoding="utf-8", newline="")
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._text, fieldnames=list(row.keys()))
+                self._writer.writeheader()
+            self._writer.writerow(row)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        self._text.flush()
+        # Keep the underlying sink open for the caller
+        self._text.detach()
+
+
+class JsonEncoder(RowEncoder):
+    """A single JSON array written element by element."""
+
+    def __init__(self, sink: BinaryIO) -> None:
+        super().__init__(sink)
+        self.sink.write(b"[")
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            if self.rows_written:
+                self.sink.write(b",")
+            self.sink.write(json.dumps(row, default=str).encode("utf-8"))
+            self.rows_written += 1
+
+    def close(self) -> None:
+        self.sink.write(b"]")
+
+
+class ExcelEncoder(RowEncoder):
+    """
+    xlsx written in xlsxwriter's constant-memory mode.
+
+    xlsxwriter assembles the workbook at close, so rows go to a temporary
+    file which is then copied into the sink in chunks.
+    """
+
+    def __init__(
+        self, sink: BinaryIO, sheet_name: str, temp_dir: Optional[Path] = None
+    ) -> None:
+        import xlsxwriter
+
+        super().__init__(sink)
+        self._temp = tempfile.NamedTemporaryFile(suffix=".xlsx", dir=temp_dir)
+        self._workbook = xlsxwriter.Workbook(self._temp.name, {"constant_memory": True})
+        self._sheet = self._workbook.add_worksheet(sheet_name[:31])
+        self._fieldnames: Optional[List[str]] = None
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            if self._fieldnames is None:
+                self._fieldnames = list(row.keys())
+                self._sheet.write_row(0, 0, self._fieldnames)
+            self.rows_written += 1
+            self._sheet.write_row(
+                self.rows_written,
+                0,
+                [_scalar(row.get(name)) for name in self._fieldnames],
+            )
+
+    def close(self) -> None:
+        try:
+            self._workbook.close()
+            with open(self._temp.name, "rb") as encoded:
+                shutil.copyfileobj(encoded, self.sink, COPY_BUFFER_SIZE)
+        finally:
+            self._temp.close()
+
+
+class ParquetEncoder(RowEncoder):
+    """
+    Parquet with one row group per batch.
+
+    The schema is fixed by ``column_types`` (column name to Python type,
+    taken from the mapped columns of the export query) rather than by the
+    values of the first batch, so a column that starts out NULL or holds
+    whole numbers keeps its type. Booleans, integers and floats (including
+    Decimals) keep a numeric type; every other column is stored as text.
+    """
+
+    def __init__(
+        self, sink: BinaryIO, column_types: Optional[Dict[str, type]] = None
+    ) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(sink)
+        self._pa = pa
+        self._pq = pq
+        self._column_types = column_types or {}
+        self._converters: Dict[str, Callable[[Any], Any]] = {}
+        self._writer = None
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+
+        pa = self._pa
+        if self._writer is None:
+            names = list(dict.fromkeys(key for row in rows for key in row))
+            fields = []
+            for name in names:
+                python_type = self._column_types.get(name, str)
+                arrow_type, converter = PARQUET_TYPES.get(python_type, PARQUET_TEXT)
+                fields.append(pa.field(name, getattr(pa, arrow_type)()))
+                self._converters[name] = converter
+            self._writer = self._pq.ParquetWriter(self.sink, pa.schema(fields))
+
+        rows = [
+            {
+                name: None if row.get(name) is None else convert(row[name])
+                for name, convert in self._converters.items()
+            }
+            for row in rows
+        ]
+        table = pa.Table.from_pylist(rows, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _scalar(value: Any) -> Any:
+    """Reduce a value to a type every encoder can store."""
+    if value is None or isinstance(
+        value, (str, int, float, bool, datetime, date, Decimal)
+    ):
+        return value
+    return str(value)
+
+
+__all__ = [
+    "CsvEncoder",
+    "ExcelEncoder",
+    "JsonEncoder",
+    "ParquetEncoder",
+    "RowEncoder",
+]
@@ -6,24 +6,36 @@ audit logging, and background processing for large datasets.
 """
 
 import asyncio
-import csv
-import io
 import json
 import os
+import shutil
 import tempfile
 import zipfile
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Union, BinaryIO
+from typing import (
+    Any,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import uuid4
 
-import pandas as pd
 import structlog
 from sqlalchemy import select, and_, or_, desc, func, text
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import get_settings
+from app.core.downloads import create_signed_url
 from app.core.events import EventEmitter, Event
 from app.models.user import User
 from app.models.role import Role
@@ -32,10 +44,22 @@ from app.models.session import UserSession
 from app.models.notification import Notification
 from app.models.webhook import WebhookDelivery
 from app.services.cache_service import CacheService
+from app.services.export_encoders import (
+    COPY_BUFFER_SIZE,
+    CsvEncoder,
+    ExcelEncoder,
+    JsonEncoder,
+    ParquetEncoder,
+    RowEncoder,
+)
+from app.services.export_worker import export_worker_pool
 
 settings = get_settings()
 logger = structlog.get_logger(__name__)
 
+# Fields replaced with "[REDACTED]" in every export
+SENSITIVE_FIELDS = ("password", "hashed_password", "secret", "token")
+
 
 class ExportFormat:
     """Supported export formats."""
@@ -111,6 +135,12 @@ class ExportService:
         # Export job configuration
         self.max_rows_per_export = getattr(settings, "MAX_EXPORT_ROWS", 100000)
         self.export_retention_days = getattr(settings, "EXPORT_RETENTION_DAYS", 7)
+        # Rows fetched per server-side cursor round trip and encoded per batch
+        self.export_chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 5000)
+        # Rows between progress counter updates
+        self.progress_interval = getattr(settings, "EXPORT_PROGRESS_INTERVAL", 10000)
+        self.worker_pool = export_worker_pool
+        self.download_url_ttl = getattr(settings, "EXPORT_DOWNLOAD_URL_TTL", 900)
 
     async def export_users(
         self,
@@ -200,7 +230,7 @@ class ExportService:
             # Emit audit event
             await self.event_emitter.emit(
                 Event(
-                    type="export.requested",
+                    event_type="export.requested",
                     data={
                         "export_id": export_job["id"],
                         "type": "users",
@@ -214,13 +244,14 @@ class ExportService:
 
             if background:
                 # Process in background
-                asyncio.create_task(self._process_export_job(export_job["id"]))
+                self._dispatch_export_job(export_job["id"])
                 return export_job["id"]
             else:
                 # Process immediately
-                return await self._execute_users_export(
+                file_path = await self._execute_users_export(
                     export_job["id"], query, format_type, columns, compress, encrypt
                 )
+                return file_path.read_bytes()
 
         except (ExportValidationError, ExportError):
             raise
@@ -307,7 +338,7 @@ class ExportService:
             # Emit audit event
             await self.event_emitter.emit(
                 Event(
-                    type="export.requested",
+                    event_type="export.requested",
                     data={
                         "export_id": export_job["id"],
                         "type": "audit_logs",
@@ -321,12 +352,13 @@ class ExportService:
             )
 
             if background:
-                asyncio.create_task(self._process_export_job(export_job["id"]))
+                self._dispatch_export_job(export_job["id"])
                 return export_job["id"]
             else:
-                return await self._execute_audit_logs_export(
+                file_path = await self._execute_audit_logs_export(
                     export_job["id"], query, format_type, compress, encrypt
                 )
+                return file_path.read_bytes()
 
         except (ExportValidationError, ExportError):
             raise
@@ -387,12 +419,13 @@ class ExportService:
             )
 
             if background:
-                asyncio.create_task(self._process_export_job(export_job["id"]))
+                self._dispatch_export_job(export_job["id"])
                 return export_job["id"]
             else:
-                return await self._execute_analytics_export(
+                file_path = await self._execute_analytics_export(
                     export_job["id"], report_config, format_type
                 )
+                return file_path.read_bytes()
 
         except (ExportValidationError, ExportError):
             raise
@@ -423,6 +456,18 @@ class ExportService:
 
             export_job = json.loads(job_data)
 
+            # Row progress is kept in a separate counter hash
+            counters = await self.cache_service.get_hash(f"export_progress:{export_id}")
+            if counters.get("rows"):
+                rows_processed = int(counters["rows"])
+                export_job["rows_processed"] = rows_processed
+                if export_job["status"] == ExportStatus.PROCESSING and export_job.get(
+                    "total_rows"
+                ):
+                    export_job["progress"] = min(
+                        99, int(rows_processed * 100 / export_job["total_rows"])
+                    )
+
             # Check if export file exists for completed jobs
             if export_job["status"] == ExportStatus.COMPLETED:
                 file_path = self.export_dir / f"{export_id}.zip"
@@ -444,62 +489,32 @@ class ExportService:
 
     async def download_export(
         self, export_id: str, requester_id: str
-    ) -> Tuple[BinaryIO, str, str]:
+    ) -> Tuple[Path, str, str]:
         """
-        Download completed export file.
+        Resolve a completed export file for download.
+
+        The file is not opened here; serve it with ``RangeFileResponse`` so
+        the body is sent zero-copy with Range/ETag support.
 
         Args:
             export_id: Export job ID
             requester_id: ID of user requesting download
 
         Returns:
-            Tuple[BinaryIO, str, str]: File stream, filename, content type
+            Tuple[Path, str, str]: File path, filename, content type
 
         Raises:
             ExportError: If export not found or not ready
         """
         try:
-            # Get export job details
-            export_job = await self.get_export_status(export_id)
-
-            # Verify requester permissions
-            if export_job["requester_id"] != requester_id:
-                # Check if requester has admin privileges
-                await self._validate_export_permissions(
-                    requester_id,
-                    export_job["type"],
-                    export_job.get("organization_id"),
-                    require_admin=True,
-                )
-
-            if export_job["status"] != ExportStatus.COMPLETED:
-                raise ExportError(f"Export {export_id} is not ready for download")
-
-            # Check file exists
-            file_path = self.export_dir / f"{export_id}.zip"
-            if not file_path.exists():
-                raise ExportError(f"Export file {export_id} not found")
-
-            # Open file stream
-            file_stream = open(file_path, "rb")
-
-            # Determine content type
-            content_type = (
-                "application/zip"
-                if export_job.get("compress")
-                else "application/octet-stream"
-            )
-
-            # Generate filename
-            timestamp = datetime.fromisoformat(export_job["created_at"]).strftime(
-                "%Y%m%d_%H%M%S"
+            file_path, filename, content_type = await self._resolve_download(
+                export_id, requester_id
             )
-            filename = f"{export_job['type']}_{timestamp}_{export_id[:8]}.zip"
 
             # Log download
             await self.event_emitter.emit(
                 Event(
-                    type="export.downloaded",
+                    event_type="export.downloaded",
                     data={
                         "export_id": export_id,
                         "requester_id": requester_id,
@@ -515,7 +530,7 @@ class ExportService:
                 filename=filename,
             )
 
-            return file_stream, filename, content_type
+            return file_path, filename, content_type
 
         except ExportError:
             raise
@@ -528,6 +543,96 @@ class ExportService:
             )
             raise ExportError(f"Failed to download export: {str(e)}")
 
+    async def create_download_url(
+        self, export_id: str, requester_id: str, expires_in: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a pre-signed, time-limited download URL for an export.
+
+        Args:
+            export_id: Export job ID
+            requester_id: ID of user requesting the URL
+            expires_in: URL lifetime in seconds
+
+        Returns:
+            Dict: ``download_url`` and ``expires_at``
+        """
+        try:
+            file_path, filename, _ = await self._resolve_download(
+                export_id, requester_id
+            )
+            url, expires = create_signed_url(
+                "exports", file_path.name, expires_in or self.download_url_ttl
+            )
+
+            await self.event_emitter.emit(
+                Event(
+                    event_type="export.download_url_created",
+                    data={
+                        "export_id": export_id,
+                        "requester_id": requester_id,
+                        "filename": filename,
+                        "expires": expires,
+                    },
+                )
+            )
+
+            return {
+                "download_url": url,
+                "expires_at": datetime.utcfromtimestamp(expires).isoformat(),
+            }
+
+        except ExportError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Failed to create export download URL",
+                export_id=export_id,
+                requester_id=requester_id,
+                error=str(e),
+            )
+            raise ExportError(f"Failed to create download URL: {str(e)}")
+
+    async def _resolve_download(
+        self, export_id: str, requester_id: str
+    ) -> Tuple[Path, str, str]:
+        """Check access to a completed export and locate its file."""
+        # Get export job details
+        export_job = await self.get_export_status(export_id)
+
+        # Verify requester permissions
+        if export_job["requester_id"] != requester_id:
+            # Check if requester has admin privileges
+            await self._validate_export_permissions(
+                requester_id,
+                export_job["type"],
+                export_job.get("organization_id"),
+                require_admin=True,
+            )
+
+        if export_job["status"] != ExportStatus.COMPLETED:
+            raise ExportError(f"Export {export_id} is not ready for download")
+
+        # Check file exists
+        file_path = self.export_dir / f"{export_id}.zip"
+        if not file_path.exists():
+            raise ExportError(f"Export file {export_id} not found")
+
+        # Determine content type
+        content_type = (
+            "application/zip"
+            if export_job.get("compress")
+            else "application/octet-stream"
+        )
+
+        # Generate filename
+        timestamp = datetime.fromisoformat(export_job["created_at"]).strftime(
+            "%Y%m%d_%H%M%S"
+        )
+        filename = f"{export_job['type']}_{timestamp}_{export_id[:8]}.zip"
+
+        return file_path, filename, content_type
+
     async def list_user_exports(
         self, requester_id: str, limit: int = 50, offset: int = 0
     ) -> Tuple[List[Dict[str, Any]], int]:
@@ -612,7 +717,7 @@ class ExportService:
             # Emit event
             await self.event_emitter.emit(
                 Event(
-                    type="export.cancelled",
+                    event_type="export.cancelled",
                     data={"export_id": export_id, "requester_id": requester_id},
                 )
             )
@@ -823,35 +928,13 @@ class ExportService:
         columns: Optional[List[str]],
         compress: bool,
         encrypt: bool,
-    ) -> bytes:
+    ) -> Path:
         """Execute users data export."""
         try:
-            # Stream results for memory efficiency
-            result = await self.session.stream(query)
-
-            # Prepare output
-            output_buffer = io.BytesIO()
-
-            if format_type == ExportFormat.CSV:
-                await self._export_to_csv(
-                    result, output_buffer, columns, "users", export_id
-                )
-            elif format_type == ExportFormat.JSON:
-                await self._export_to_json(result, output_buffer, columns, export_id)
-            elif format_type == ExportFormat.EXCEL:
-                await self._export_to_excel(
-                    result, output_buffer, columns, "users", export_id
-                )
-            elif format_type == ExportFormat.PARQUET:
-                await self._export_to_parquet(result, output_buffer, columns, export_id)
-
-            # Process final output
-            final_output = await self._process_export_output(
-                output_buffer.getvalue(), export_id, format_type, compress, encrypt
+            return await self._stream_query_export(
+                export_id, query, format_type, columns, "users", compress, encrypt
             )
 
-            return final_output
-
         except Exception as e:
             logger.error(
                 "Failed to execute users export", export_id=export_id, error=str(e)
@@ -860,12 +943,9 @@ class ExportService:
 
     async def _execute_audit_logs_export(
         self, export_id: str, query, format_type: str, compress: bool, encrypt: bool
-    ) -> bytes:
+    ) -> Path:
         """Execute audit logs export."""
         try:
-            result = await self.session.stream(query)
-            output_buffer = io.BytesIO()
-
             # Audit logs have specific columns
             audit_columns = [
                 "timestamp",
@@ -878,25 +958,16 @@ class ExportService:
                 "user_agent",
             ]
 
-            if format_type == ExportFormat.CSV:
-                await self._export_to_csv(
-                    result, output_buffer, audit_columns, "audit_logs", export_id
-                )
-            elif format_type == ExportFormat.JSON:
-                await self._export_to_json(
-                    result, output_buffer, audit_columns, export_id
-                )
-            elif format_type == ExportFormat.EXCEL:
-                await self._export_to_excel(
-                    result, output_buffer, audit_columns, "audit_logs", export_id
-                )
-
-            final_output = await self._process_export_output(
-                output_buffer.getvalue(), export_id, format_type, compress, encrypt
+            return await self._stream_query_export(
+                export_id,
+                query,
+                format_type,
+                audit_columns,
+                "audit_logs",
+                compress,
+                encrypt,
             )
 
-            return final_output
-
         except Exception as e:
             logger.error(
                 "Failed to execute audit logs export", export_id=export_id, error=str(e)
@@ -905,183 +976,194 @@ class ExportService:
 
     async def _execute_analytics_export(
         self, export_id: str, report_config: Dict[str, Any], format_type: str
-    ) -> bytes:
+    ) -> Path:
         """Execute analytics report export."""
         try:
             # This would generate comprehensive analytics report
             # For now, create placeholder Excel file
-            output_buffer = io.BytesIO()
-
-            # Create Excel workbook with multiple sheets
             import xlsxwriter
 
-            with tempfile.NamedTemporaryFile() as temp_file:
-                workbook = xlsxwriter.Workbook(temp_file.name)
-
-                # Summary sheet
-                summary_sheet = workbook.add_worksheet("Summary")
-                summary_sheet.write("A1", "Analytics Report")
-                summary_sheet.write("A2", f"Generated: {datetime.utcnow().isoformat()}")
+            async def write_report(sink: BinaryIO) -> None:
+                with tempfile.NamedTemporaryFile(
+                    suffix=".xlsx", dir=self.export_dir
+                ) as temp_file:
+                    # Create Excel workbook with multiple sheets
+                    workbook = xlsxwriter.Workbook(temp_file.name)
+
+                    # Summary sheet
+                    summary_sheet = workbook.add_worksheet("Summary")
+                    summary_sheet.write("A1", "Analytics Report")
+                    summary_sheet.write(
+                        "A2", f"Generated: {datetime.utcnow().isoformat()}"
+                    )
 
-                workbook.close()
+                    workbook.close()
 
-                temp_file.seek(0)
-                output_buffer.write(temp_file.read())
+                    with open(temp_file.name, "rb") as report:
+                        shutil.copyfileobj(report, sink, COPY_BUFFER_SIZE)
 
-            final_output = await self._process_export_output(
-                output_buffer.getvalue(),
+            return await self._write_export_file(
                 export_id,
                 format_type,
                 True,  # Always compress analytics reports
                 False,  # Don't encrypt by default
+                write_report,
             )
 
-            return final_output
-
         except Exception as e:
             logger.error(
                 "Failed to execute analytics export", export_id=export_id, error=str(e)
             )
             raise
 
-    async def _export_to_csv(
+    async def _stream_query_export(
         self,
-        result_stream,
-        output_buffer: io.BytesIO,
-        columns: Optional[List[str]],
-        export_type: str,
         export_id: str,
-    ) -> None:
-        """Export data to CSV format."""
-        text_buffer = io.StringIO()
-        writer = None
-        row_count = 0
+        query,
+        format_type: str,
+        columns: Optional[List[str]],
+        sheet_name: str,
+        compress: bool,
+        encrypt: bool,
+    ) -> Path:
+        """
+        Stream query results through a row encoder into the export file.
+
+        Rows arrive from a server-side cursor one partition at a time and
+        are encoded straight into the (compressed) output, so memory use is
+        bounded by the partition size rather than the export size.
+        """
+        if format_type not in (
+            ExportFormat.CSV,
+            ExportFormat.JSON,
+            ExportFormat.EXCEL,
+            ExportFormat.PARQUET,
+        ):
+            raise ExportValidationError(f"Unsupported format: {format_type}")
+
+        result_stream = await self.session.stream_scalars(
+            query.execution_options(yield_per=self.export_chunk_size)
+        )
 
-        async for partition in result_stream.partitions():
-            for row in partition:
-                # Convert SQLAlchemy row to dict
-                row_dict = await self._sanitize_row_data(row, columns)
+        column_types = self._export_column_types(query)
 
-                if writer is None:
-                    fieldnames = list(row_dict.keys())
-                    writer = csv.DictWriter(text_buffer, fieldnames=fieldnames)
-                    writer.writeheader()
+        async def write_rows(sink: BinaryIO) -> None:
+            encoder = self._create_encoder(format_type, sink, sheet_name, column_types)
+            reported = 0
 
-                writer.writerow(row_dict)
-                row_count += 1
+            async for partition in result_stream.partitions():
+                rows = [
+                    await self._sanitize_row_data(row, columns) for row in partition
+                ]
+                encoder.write_rows(rows)
 
                 # Update progress periodically
-                if row_count % 1000 == 0:
-                    progress = min(
-                        90, (row_count / 50000) * 90
-                    )  # Max 90% during processing
-                    await self._update_export_status(
-                        export_id, ExportStatus.PROCESSING, progress=progress
-                    )
+                if encoder.rows_written - reported >= self.progress_interval:
+                    await self._report_rows(export_id, encoder.rows_written - reported)
+                    reported = encoder.rows_written
 
-        # Write to bytes buffer
-        output_buffer.write(text_buffer.getvalue().encode("utf-8"))
+            encoder.close()
+            if encoder.rows_written > reported:
+                await self._report_rows(export_id, encoder.rows_written - reported)
 
-    async def _export_to_json(
-        self,
-        result_stream,
-        output_buffer: io.BytesIO,
-        columns: Optional[List[str]],
-        export_id: str,
-    ) -> None:
-        """Export data to JSON format."""
-        output_buffer.write(b"[")
-        first_row = True
-        row_count = 0
-
-        async for partition in result_stream.partitions():
-            for row in partition:
-                row_dict = await self._sanitize_row_data(row, columns)
-
-                if not first_row:
-                    output_buffer.write(b",")
-
-                output_buffer.write(json.dumps(row_dict, default=str).encode("utf-8"))
-                first_row = False
-                row_count += 1
-
-                # Update progress
-                if row_count % 1000 == 0:
-                    progress = min(90, (row_count / 50000) * 90)
-                    await self._update_export_status(
-                        export_id, ExportStatus.PROCESSING, progress=progress
-                    )
-
-        output_buffer.write(b"]")
+        return await self._write_export_file(
+            export_id, format_type, compress, encrypt, write_rows
+        )
 
-    async def _export_to_excel(
+    def _create_encoder(
         self,
-        result_stream,
-        output_buffer: io.BytesIO,
-        columns: Optional[List[str]],
+        format_type: str,
+        sink: BinaryIO,
         sheet_name: str,
+        column_types: Optional[Dict[str, type]] = None,
+    ) -> RowEncoder:
+        """Create the row encoder for an export format."""
+        if format_type == ExportFormat.CSV:
+            return CsvEncoder(sink)
+        if format_type == ExportFormat.JSON:
+            return JsonEncoder(sink)
+        if format_type == ExportFormat.EXCEL:
+            return ExcelEncoder(sink, sheet_name, temp_dir=self.export_dir)
+        if format_type == ExportFormat.PARQUET:
+            return ParquetEncoder(sink, column_types)
+        raise ExportValidationError(f"Unsupported format: {format_type}")
+
+    async def _write_export_file(
+        self,
         export_id: str,
-    ) -> None:
-        """Export data to Excel format."""
-        # Collect all data first (for Excel we need to know structure)
-        all_rows = []
-        row_count = 0
-
-        async for partition in result_stream.partitions():
-            for row in partition:
-                row_dict = await self._sanitize_row_data(row, columns)
-                all_rows.append(row_dict)
-                row_count += 1
-
-                if row_count % 1000 == 0:
-                    progress = min(
-                        45, (row_count / 50000) * 45
-                    )  # First 45% for data collection
-                    await self._update_export_status(
-                        export_id, ExportStatus.PROCESSING, progress=progress
-                    )
+        format_type: str,
+        compress: bool,
+        encrypt: bool,
+        write: Callable[[BinaryIO], Awaitable[None]],
+    ) -> Path:
+        """
+        Produce the export file by letting ``write`` stream into its sink.
 
-        # Create Excel file
-        if all_rows:
-            df = pd.DataFrame(all_rows)
-            with pd.ExcelWriter(output_buffer, engine="xlsxwriter") as writer:
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        The file is written under a temporary name and renamed when
+        complete, so a partially written export is never downloadable.
+        """
+        file_path = self.export_dir / f"{export_id}.zip"
+        partial_path = self.export_dir / f"{export_id}.zip.part"
 
-            await self._update_export_status(
-                export_id, ExportStatus.PROCESSING, progress=90
+        try:
+            with self._open_export_sink(
+                partial_path, format_type, compress, encrypt
+            ) as sink:
+                await write(sink)
+            os.replace(partial_path, file_path)
+        except Exception as e:
+            partial_path.unlink(missing_ok=True)
+            logger.error(
+                "Failed to process export output", export_id=export_id, error=str(e)
             )
+            raise
 
-    async def _export_to_parquet(
-        self,
-        result_stream,
-        output_buffer: io.BytesIO,
-        columns: Optional[List[str]],
-        export_id: str,
-    ) -> None:
-        """Export data to Parquet format."""
-        # Collect data and convert to DataFrame
-        all_rows = []
-        row_count = 0
-
-        async for partition in result_stream.partitions():
-            for row in partition:
-                row_dict = await self._sanitize_row_data(row, columns)
-                all_rows.append(row_dict)
-                row_count += 1
-
-                if row_count % 1000 == 0:
-                    progress = min(45, (row_count / 50000) * 45)
-                    await self._update_export_status(
-                        export_id, ExportStatus.PROCESSING, progress=progress
-                    )
+        return file_path
 
-        if all_rows:
-            df = pd.DataFrame(all_rows)
-            df.to_parquet(output_buffer, index=False)
+    @contextmanager
+    def _open_export_sink(
+        self, path: Path, format_type: str, compress: bool, encrypt: bool
+    ) -> Iterator[BinaryIO]:
+        """Open the export file, compressing written data incrementally."""
+        with open(path, "wb") as output:
+            # Encrypt if requested
+            if encrypt:
+                # In production, implement proper encryption
+                # For now, just add a marker
+                output.write(b"ENCRYPTED:")
 
-            await self._update_export_status(
-                export_id, ExportStatus.PROCESSING, progress=90
-            )
+            if not compress:
+                yield output
+                return
+
+            with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                with zip_file.open(
+                    f"export.{format_type}", "w", force_zip64=True
+                ) as entry:
+                    yield entry
+
+    def _export_column_types(self, query) -> Dict[str, type]:
+        """
+        Python type of each mapped column of an export query, as the
+        values look after _sanitize_row_data (dates become ISO strings and
+        sensitive fields are redacted).
+        """
+        column_types: Dict[str, type] = {}
+        for description in query.column_descriptions:
+            entity = description.get("entity")
+            if entity is None:
+                continue
+            for attribute in sa_inspect(entity).column_attrs:
+                try:
+                    python_type = attribute.columns[0].type.python_type
+                except NotImplementedError:
+                    python_type = str
+                if attribute.key in SENSITIVE_FIELDS or issubclass(
+                    python_type, (date, time)
+                ):
+                    python_type = str
+                column_types[attribute.key] = python_type
+        return column_types
 
     async def _sanitize_row_data(
         self, row: Any, columns: Optional[List[str]]
@@ -1103,8 +1185,7 @@ class ExportService:
             row_dict = {key: value for key, value in row_dict.items() if key in columns}
 
         # Sanitize sensitive data
-        sensitive_fields = ["password", "hashed_password", "secret", "token"]
-        for field in sensitive_fields:
+        for field in SENSITIVE_FIELDS:
             if field in row_dict:
                 row_dict[field] = "[REDACTED]"
 
@@ -1117,48 +1198,41 @@ class ExportService:
 
         return row_dict
 
-    async def _process_export_output(
-        self,
-        data: bytes,
-        export_id: str,
-        format_type: str,
-        compress: bool,
-        encrypt: bool,
-    ) -> bytes:
-        """Process final export output with compression and encryption."""
-        try:
-            final_data = data
-
-            # Compress if requested
-            if compress:
-                with tempfile.NamedTemporaryFile() as temp_file:
-                    with zipfile.ZipFile(
-                        temp_file, "w", zipfile.ZIP_DEFLATED
-                    ) as zip_file:
-                        filename = f"export.{format_type}"
-                        zip_file.writestr(filename, data)
-
-                    temp_file.seek(0)
-                    final_data = temp_file.read()
-
-            # Encrypt if requested
-            if encrypt:
-                # In production, implement proper encryption
-                # For now, just add a marker
-                final_data = b"ENCRYPTED:" + final_data
+    def _dispatch_export_job(self, export_id: str) -> None:
+        """Hand a background export to the worker pool (or this event loop)."""
+        if not self.worker_pool.enabled:
+            asyncio.create_task(self._process_export_job(export_id))
+            return
 
-            # Save to file
-            file_path = self.export_dir / f"{export_id}.zip"
-            with open(file_path, "wb") as f:
-                f.write(final_data)
+        future = self.worker_pool.submit(export_id)
 
-            return final_data
-
-        except Exception as e:
+        def on_done(done: "asyncio.Future[None]") -> None:
+            if done.cancelled() or done.exception() is None:
+                return
+            # The worker records ordinary failures itself; this covers a
+            # worker process that died mid-job
             logger.error(
-                "Failed to process export output", export_id=export_id, error=str(e)
+                "Export worker failed",
+                export_id=export_id,
+                error=str(done.exception()),
             )
-            raise
+            asyncio.create_task(
+                self._update_export_status(
+                    export_id,
+                    ExportStatus.FAILED,
+                    error_message=str(done.exception()),
+                )
+            )
+
+        future.add_done_callback(on_done)
+
+    async def _report_rows(self, export_id: str, rows: int) -> None:
+        """Add encoded rows to the job's progress counter (one HINCRBY)."""
+        await self.cache_service.increment_hash(
+            f"export_progress:{export_id}",
+            {"rows": rows},
+            ttl=self.export_retention_days * 24 * 3600,
+        )
 
     async def _update_export_status(
         self,
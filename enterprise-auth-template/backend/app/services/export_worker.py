@@ -0,0 +1,100 @@
+"""
+Export Worker Pool
+
+Runs background export jobs in a pool of worker processes so row encoding
+and compression never compete with request handling on the API event
+loop. Jobs are queued by export id; each worker process keeps its own
+event loop and database engine for the lifetime of the process and runs
+``ExportService._process_export_job`` there.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import structlog
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+# Event loop of the current worker process (set by the pool initializer)
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker() -> None:
+    """Create the worker process' event loop and database engine."""
+    global _worker_loop
+    from app.core.database import init_db
+
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_loop.run_until_complete(init_db())
+
+
+def run_export_job(export_id: str) -> None:
+    """Process one export job inside a worker process."""
+    if _worker_loop is None:
+        _init_worker()
+    _worker_loop.run_until_complete(_process(export_id))
+
+
+async def _process(export_id: str) -> None:
+    from app.core import database
+    from app.services.export_service import ExportService
+
+    async with database.async_session_maker() as session:
+        service = ExportService(session)
+        try:
+            await service._process_export_job(export_id)
+        finally:
+            await service.cache_service.close()
+
+
+class ExportWorkerPool:
+    """
+    Lazily started process pool fed with export job ids.
+
+    The executor's call queue is the job queue: at most ``max_workers``
+    exports encode concurrently and the rest wait their turn without
+    holding any resources in the API process.
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forked children would inherit the parent's event loop
+            # and open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    def submit(self, export_id: str) -> "asyncio.Future[None]":
+        """Queue an export job; the returned future resolves when it finishes."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), run_export_job, export_id)
+        logger.info("Export job queued", export_id=export_id)
+        return future
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker processes; queued jobs that have not started are dropped."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+export_worker_pool = ExportWorkerPool(
+    max_workers=getattr(settings, "EXPORT_WORKER_PROCESSES", 2)
+)
@@ -0,0 +1,171 @@
+"""
+Health Checks
+
+Concurrent dependency checks for the health endpoints and dashboards.
+Every check of an evaluation runs at the same time under its own timeout,
+so a hung dependency costs one timeout instead of stalling the rest, and
+a failing check is reported rather than failing the whole evaluation.
+
+Evaluations are cached for a few seconds with single-flight refresh:
+however many load balancers and dashboards poll at once, one evaluation
+runs per TTL and every concurrent caller awaits its result. Checks open
+their own short-lived sessions instead of borrowing the caller's, as a
+shared evaluation can outlive the request that started it and one
+AsyncSession cannot run queries concurrently.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.services.cache_service import CacheService
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+HealthCheck = Callable[[], Awaitable[Dict[str, Any]]]
+
+# Shared connection pool for Redis pings, instead of a client per poll
+_cache_service = CacheService()
+
+
+async def run_check(name: str, check: HealthCheck, timeout: float) -> Dict[str, Any]:
+    """Run one check, turning timeouts and errors into an unhealthy result."""
+    try:
+        return await asyncio.wait_for(check(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Health check timed out", check=name, timeout=timeout)
+        return {"status": "unhealthy", "error": f"Timed out after {timeout}s"}
+    except Exception as e:
+        logger.error("Health check failed", check=name, error=str(e))
+        return {"status": "unhealthy", "error": str(e)}
+
+
+async def run_checks(
+    checks: Dict[str, HealthCheck], timeout: Optional[float] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Run checks concurrently, each under ``timeout`` seconds."""
+    if timeout is None:
+        timeout = getattr(settings, "HEALTH_CHECK_TIMEOUT", 2.0)
+    results = await asyncio.gather(
+        *(run_check(name, check, timeout) for name, check in checks.items())
+    )
+    return dict(zip(checks, results))
+
+
+class SingleFlightCache:
+    """
+    Short-lived in-process cache where concurrent misses share one refresh.
+
+    The refresh runs in its own task, shielded from callers, so a caller
+    that disconnects does not cancel the evaluation others are awaiting.
+    Failed refreshes are not cached.
+    """
+
+    def __init__(self, ttl: float = 5.0) -> None:
+        self.ttl = ttl
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._values.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, compute))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._values.clear()
+        else:
+            self._values.pop(key, None)
+
+    async def _refresh(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await compute()
+            self._values[key] = (time.monotonic() + self.ttl, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+@asynccontextmanager
+async def check_session() -> AsyncIterator[AsyncSession]:
+    """A session of its own for one check."""
+    from app.core import database
+
+    if database.async_session_maker is None:
+        raise RuntimeError("Database not initialized")
+    async with database.async_session_maker() as session:
+        yield session
+
+
+async def check_database() -> Dict[str, Any]:
+    """Round-trip a trivial query and report pool usage."""
+    from app.core import database
+
+    start = time.perf_counter()
+    async with check_session() as session:
+        await session.execute(text("SELECT 1"))
+    result: Dict[str, Any] = {
+        "status": "healthy",
+        "response_time_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+    pool = database.engine.pool if database.engine is not None else None
+    if pool is not None and hasattr(pool, "checkedout"):
+        result["connections"] = {
+            "active": pool.checkedout(),
+            "idle": pool.checkedin(),
+        }
+    return result
+
+
+async def check_redis() -> Dict[str, Any]:
+    """Ping Redis over the shared connection pool."""
+    start = time.perf_counter()
+    client = await _cache_service.get_redis()
+    await client.ping()
+    info = await client.info()
+    return {
+        "status": "healthy",
+        "response_time_ms": round((time.perf_counter() - start) * 1000, 2),
+        "memory_usage_mb": info.get("used_memory_human", "unknown"),
+        "connected_clients": info.get("connected_clients", 0),
+    }
+
+
+def overall_status(components: Dict[str, Dict[str, Any]]) -> str:
+    """Worst status of the components."""
+    statuses = {component.get("status") for component in components.values()}
+    if "unhealthy" in statuses:
+        return "unhealthy"
+    if "degraded" in statuses:
+        return "degraded"
+    return "healthy"
+
+
+health_cache = SingleFlightCache(ttl=getattr(settings, "HEALTH_CHECK_CACHE_TTL", 5.0))
+
+
+__all__ = [
+    "HealthCheck",
+    "SingleFlightCache",
+    "check_database",
+    "check_redis",
+    "check_session",
+    "health_cache",
+    "overall_status",
+    "run_check",
+    "run_checks",
+]
@@ -11,18 +11,30 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 import structlog
-from sqlalchemy import select, func, and_, or_, Integer
+from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
 from prometheus_client import Counter, Histogram, Gauge, generate_latest
 
 from app.core.config import get_settings
+from app.core.http_clients import http_clients
 from app.core.redis_client import get_redis_client
 from app.models.user import User
 from app.models.audit import AuditLog
 from app.models.session import UserSession
 from app.models.device import UserDevice
+from app.services.attack_detector import (
+    BRUTE_FORCE_EVENT,
+    TAKEOVER_EVENT,
+    attack_detector,
+)
 from app.services.email_service import EmailService
+from app.services.health_checks import (
+    check_database,
+    check_redis,
+    check_session,
+    health_cache,
+    run_checks,
+)
 
 logger = structlog.get_logger(__name__)
 settings = get_settings()
@@ -37,6 +49,15 @@ class AlertSeverity(Enum):
     CRITICAL = "critical"
 
 
+LOGIN_ACTIONS = ["user.login_success", "user.login_failed"]
+
+SUSPICIOUS_ACTIONS = [
+    "security.brute_force_detected",
+    "security.suspicious_login",
+    "security.account_locked",
+]
+
+
 class MetricType(Enum):
     """Types of metrics to track"""
 
@@ -77,6 +98,16 @@ cache_operations = Counter(
 )
 
 
+def _count_detector_alert(event) -> None:
+    security_events.labels(
+        event_type=event.event_type, severity=event.data["severity"]
+    ).inc()
+
+
+attack_detector.events.on(BRUTE_FORCE_EVENT, _count_detector_alert)
+attack_detector.events.on(TAKEOVER_EVENT, _count_detector_alert)
+
+
 class MonitoringService:
     """Comprehensive monitoring and alerting service"""
 
@@ -148,8 +179,17 @@ class MonitoringService:
         if not success:
             failed_logins.labels(reason=reason or "unknown").inc()
 
-            # Track failed attempt pattern
-            await self._track_failed_attempt_pattern(user_id, ip_address, device_id)
+        # Feed the streaming brute-force detector and alert on what it raises
+        alerts = attack_detector.record(
+            success, ip_address=ip_address, account=user_id, user_id=user_id
+        )
+        for alert in alerts:
+            await self.send_alert(
+                title=f"Security alert: {alert['type']}",
+                message=alert["message"],
+                severity=AlertSeverity(alert["severity"]),
+                metadata=alert,
+            )
 
     async def track_api_error(
         self, error_type: str, endpoint: str, status_code: int, error_message: str
@@ -172,20 +212,32 @@ class MonitoringService:
             )
 
     async def get_system_health(self) -> Dict[str, Any]:
-        """Get comprehensive system health status"""
-        # Database health
-        db_health = await self._check_database_health()
+        """
+        Get comprehensive system health status
 
-        # Redis health
-        redis_health = await self._check_redis_health()
+        Results are cached for a few seconds and shared by concurrent
+        callers, so frequent polling runs one evaluation per TTL.
+        """
+        return await health_cache.get("monitoring", self._evaluate_system_health)
 
-        # Authentication service health
-        auth_health = await self._check_auth_service_health()
+    async def get_current_metrics(self) -> Dict[str, Any]:
+        """Get current system metrics"""
+        return await self._collect_metrics(self.db)
+
+    async def _evaluate_system_health(self) -> Dict[str, Any]:
+        """Run every health check and the metrics query concurrently"""
+        components = await run_checks(
+            {
+                "database": check_database,
+                "redis": check_redis,
+                "authentication": self._check_auth_service_health,
+                "metrics": self._collect_metrics_in_own_session,
+            }
+        )
+        metrics = components.pop("metrics")
 
         # Calculate overall health score
-        health_score = self._calculate_health_score(
-            db_health, redis_health, auth_health
-        )
+        health_score = self._calculate_health_score(*components.values())
 
         return {
             "status": (
@@ -195,53 +247,66 @@ class MonitoringService:
             ),
             "score": health_score,
             "timestamp": datetime.utcnow().isoformat(),
-            "components": {
-                "database": db_health,
-                "redis": redis_health,
-                "authentication": auth_health,
-            },
-            "metrics": await self.get_current_metrics(),
+            "components": components,
+            "metrics": metrics,
         }
 
-    async def get_current_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics"""
-        # Get active sessions count
-        sessions_result = await self.db.execute(
-            select(func.count(UserSession.id)).where(UserSession.is_active == True)
-        )
-        active_sessions_count = sessions_result.scalar() or 0
-        active_sessions.set(active_sessions_count)
+    async def _collect_metrics_in_own_session(self) -> Dict[str, Any]:
+        async with check_session() as db:
+            return await self._collect_metrics(db)
 
-        # Get recent authentication stats
+    async def _collect_metrics(self, db: AsyncSession) -> Dict[str, Any]:
+        """Collect every metric in one round trip"""
         one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        auth_stats = await self.db.execute(
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0)
+
+        recent_audit = (
             select(
-                func.count(AuditLog.id).label("total"),
-                func.sum(
-                    func.cast(AuditLog.event_type.like("%success%"), Integer)
-                ).label("successful"),
-            ).where(
-                and_(
-                    AuditLog.created_at >= one_hour_ago,
-                    AuditLog.event_type.in_(
-                        ["user.login_success", "user.login_failed"]
-                    ),
-                )
+                func.count(AuditLog.id)
+                .filter(AuditLog.action.in_(LOGIN_ACTIONS))
+                .label("logins"),
+                func.count(AuditLog.id)
+                .filter(AuditLog.action == "user.login_success")
+                .label("successful"),
+                func.count(AuditLog.id)
+                .filter(AuditLog.action == "user.login_failed")
+                .label("failed"),
+                func.count(AuditLog.id)
+                .filter(AuditLog.action.in_(SUSPICIOUS_ACTIONS))
+                .label("suspicious"),
             )
+            .where(AuditLog.timestamp >= one_hour_ago)
+            .subquery()
+        )
+        result = await db.execute(
+            select(
+                select(func.count(UserSession.id))
+                .where(UserSession.is_active == True)
+                .scalar_subquery()
+                .label("active_sessions"),
+                select(func.count(User.id)).scalar_subquery().label("total_users"),
+                select(func.count(User.id))
+                .where(User.created_at >= today_start)
+                .scalar_subquery()
+                .label("new_users_today"),
+                recent_audit.c.logins,
+                recent_audit.c.successful,
+                recent_audit.c.failed,
+                recent_audit.c.suspicious,
+            ).select_from(recent_audit)
         )
-        auth_result = auth_stats.first()
+        row = result.one()
+        active_sessions.set(row.active_sessions or 0)
 
         return {
-            "active_sessions": active_sessions_count,
+            "active_sessions": row.active_sessions or 0,
             "auth_success_rate": (
-                (auth_result.successful / auth_result.total * 100)
-                if auth_result and auth_result.total > 0
-                else 0
+                (row.successful / row.logins * 100) if row.logins else 0
             ),
-            "total_users": await self._get_total_users(),
-            "new_users_today": await self._get_new_users_today(),
-            "failed_logins_last_hour": await self._get_failed_logins_count(),
-            "suspicious_activities": await self._get_suspicious_activities_count(),
+            "total_users": row.total_users or 0,
+            "new_users_today": row.new_users_today or 0,
+            "failed_logins_last_hour": row.failed,
+            "suspicious_activities": row.suspicious,
         }
 
     async def detect_anomalies(self) -> List[Dict[str, Any]]:
@@ -347,51 +412,28 @@ class MonitoringService:
 
     # Private helper methods
 
-    async def _check_database_health(self) -> Dict[str, Any]:
-        """Check database health"""
-        try:
-            # Simple query to test connection
-            result = await self.db.execute(select(func.now()))
-            result.scalar()
-
-            return {
-                "status": "healthy",
-                "response_time_ms": 5,  # Would measure actual time
-                "connections": {
-                    "active": 10,  # Would get from connection pool
-                    "idle": 5,
-                },
-            }
-        except Exception as e:
-            logger.error("Database health check failed", error=str(e))
-            return {"status": "unhealthy", "error": str(e)}
-
-    async def _check_redis_health(self) -> Dict[str, Any]:
-        """Check Redis health"""
-        try:
-            # Ping Redis
-            await self.redis_client.ping()
-
-            # Get info
-            info = await self.redis_client.info()
-
-            return {
-                "status": "healthy",
-                "response_time_ms": 2,
-                "memory_usage_mb": info.get("used_memory_human", "unknown"),
-                "connected_clients": info.get("connected_clients", 0),
-            }
-        except Exception as e:
-            logger.error("Redis health check failed", error=str(e))
-            return {"status": "unhealthy", "error": str(e)}
-
     async def _check_auth_service_health(self) -> Dict[str, Any]:
         """Check authentication service health"""
-        # Check recent auth success rate
-        success_rate = await self._calculate_auth_success_rate()
+        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+        async with check_session() as db:
+            result = await db.execute(
+                select(
+                    func.count(AuditLog.id)
+                    .filter(AuditLog.action.in_(LOGIN_ACTIONS))
+                    .label("logins"),
+                    func.count(AuditLog.id)
+                    .filter(AuditLog.action == "user.login_success")
+                    .label("successful"),
+                    func.count(AuditLog.id)
+                    .filter(AuditLog.result == "error")
+                    .label("critical_errors"),
+                ).where(AuditLog.timestamp >= one_hour_ago)
+            )
+        row = result.one()
 
-        # Check for any critical errors
-        critical_errors = await self._get_critical_errors_count()
+        # No login attempts in the window is not a failure
+        success_rate = row.successful / row.logins if row.logins else 1.0
+        critical_errors = row.critical_errors
 
         status = "healthy"
         if success_rate < 0.5 or critical_errors > 10:
@@ -417,41 +459,8 @@ class MonitoringService:
         return total_score / len(health_checks) if health_checks else 0
 
     async def _detect_brute_force(self) -> List[Dict[str, Any]]:
-        """Detect brute force attempts"""
-        # Check for multiple failed login attempts
-        threshold = 10
-        time_window = datetime.utcnow() - timedelta(minutes=5)
-
-        result = await self.db.execute(
-            select(
-                AuditLog.user_id,
-                AuditLog.ip_address,
-                func.count(AuditLog.id).label("attempts"),
-            )
-            .where(
-                and_(
-                    AuditLog.event_type == "user.login_failed",
-                    AuditLog.created_at >= time_window,
-                )
-            )
-            .group_by(AuditLog.user_id, AuditLog.ip_address)
-            .having(func.count(AuditLog.id) >= threshold)
-        )
-
-        anomalies = []
-        for row in result:
-            anomalies.append(
-                {
-                    "type": "brute_force",
-                    "severity": "high",
-                    "user_id": row.user_id,
-                    "ip_address": row.ip_address,
-                    "attempts": row.attempts,
-                    "message": f"Possible brute force attack: {row.attempts} failed attempts",
-                }
-            )
-
-        return anomalies
+        """Detect brute force attempts from the streaming detector's counters"""
+        return attack_detector.anomalies()
 
     async def _detect_unusual_login_patterns(self) -> List[Dict[str, Any]]:
         """Detect unusual login patterns"""
@@ -526,29 +535,27 @@ class MonitoringService:
         if not settings.SLACK_WEBHOOK_URL:
             return
 
-        async with httpx.AsyncClient() as client:
-            await client.post(
-                settings.SLACK_WEBHOOK_URL,
-                json={
-                    "text": alert_data["title"],
-                    "attachments": [
-                        {
-                            "color": self._get_severity_color(alert_data["severity"]),
-                            "text": alert_data["message"],
-                            "footer": "Monitoring Service",
-                            "ts": int(datetime.utcnow().timestamp()),
-                        }
-                    ],
-                },
-            )
+        await http_clients.post(
+            settings.SLACK_WEBHOOK_URL,
+            json={
+                "text": alert_data["title"],
+                "attachments": [
+                    {
+                        "color": self._get_severity_color(alert_data["severity"]),
+                        "text": alert_data["message"],
+                        "footer": "Monitoring Service",
+                        "ts": int(datetime.utcnow().timestamp()),
+                    }
+                ],
+            },
+        )
 
     async def _send_webhook_alert(self, alert_data: Dict[str, Any]) -> None:
         """Send webhook alert"""
         if not settings.ALERT_WEBHOOK_URL:
             return
 
-        async with httpx.AsyncClient() as client:
-            await client.post(settings.ALERT_WEBHOOK_URL, json=alert_data)
+        await http_clients.post(settings.ALERT_WEBHOOK_URL, json=alert_data)
 
     def _get_severity_color(self, severity: str) -> str:
         """Get color for severity level"""
@@ -559,47 +566,3 @@ class MonitoringService:
             "info": "#0099FF",
         }
         return colors.get(severity, "#808080")
-
-    # Additional helper methods for metrics
-
-    async def _get_total_users(self) -> int:
-        result = await self.db.execute(select(func.count(User.id)))
-        return result.scalar() or 0
-
-    async def _get_new_users_today(self) -> int:
-        today = datetime.utcnow().date()
-        result = await self.db.execute(
-            select(func.count(User.id)).where(func.date(User.created_at) == today)
-        )
-        return result.scalar() or 0
-
-    async def _get_failed_logins_count(self) -> int:
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        result = await self.db.execute(
-            select(func.count(AuditLog.id)).where(
-                and_(
-                    AuditLog.event_type == "user.login_failed",
-                    AuditLog.created_at >= one_hour_ago,
-                )
-            )
-        )
-        return result.scalar() or 0
-
-    async def _get_suspicious_activities_count(self) -> int:
-        # Count recent security events
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        result = await self.db.execute(
-            select(func.count(AuditLog.id)).where(
-                and_(
-                    AuditLog.event_type.in_(
-                        [
-                            "security.brute_force_detected",
-                            "security.suspicious_login",
-                            "security.account_locked",
-                        ]
-                    ),
-                    AuditLog.created_at >= one_hour_ago,
-                )
-            )
-        )
-        return result.scalar() or 0
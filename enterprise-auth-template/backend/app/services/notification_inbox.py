@@ -0,0 +1,274 @@
+"""
+Notification Inbox Cache
+
+Per-user notification counters and recent-id lists kept in Redis, so
+badge polling and the first page of the inbox do not query Postgres:
+
+- ``notifications:counts:{user_id}`` hash with ``total`` and ``unread``
+  (cancelled notifications are not counted)
+- ``notifications:inbox:{user_id}`` list of the newest notification ids,
+  newest first, capped at ``INBOX_SIZE``
+
+Both are loaded from the database on a miss and then kept current by the
+writes that change them. Updates run as small Lua scripts that only touch
+a key that already exists, so a write never creates a partial counter; a
+user without cached state simply loads it on the next read. Keys expire
+after a few minutes, which bounds any drift from writes that race a load.
+Redis errors are logged and the affected keys dropped, never raised.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import structlog
+
+from app.core.config import get_settings
+from app.services.cache_service import CacheService, cache_service
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+INBOX_SIZE = getattr(settings, "NOTIFICATION_INBOX_SIZE", 50)
+COUNTS_TTL = getattr(settings, "NOTIFICATION_COUNTS_TTL", 600)
+INBOX_TTL = getattr(settings, "NOTIFICATION_INBOX_TTL", 300)
+
+# HINCRBY field/amount pairs, only if the hash exists
+_INCREMENT_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+# HSET field/value pairs, only if the hash exists
+_SET_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+for i = 1, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+# Push ids (oldest first) onto the head of an existing list and cap it
+_PUSH_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+for i = 2, #ARGV do
+    redis.call('LPUSH', KEYS[1], ARGV[i])
+end
+redis.call('LTRIM', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+return 1
+"""
+
+# A created notification: (user id, notification id, created at)
+Created = Tuple[UUID, UUID, datetime]
+
+
+def counts_key(user_id) -> str:
+    return f"notifications:counts:{user_id}"
+
+
+def inbox_key(user_id) -> str:
+    return f"notifications:inbox:{user_id}"
+
+
+class NotificationInbox:
+    """Cached unread counters and recent notification ids per user."""
+
+    def __init__(
+        self,
+        cache: Optional[CacheService] = None,
+        size: int = INBOX_SIZE,
+        counts_ttl: int = COUNTS_TTL,
+        inbox_ttl: int = INBOX_TTL,
+    ) -> None:
+        self.cache = cache or cache_service
+        self.size = size
+        self.counts_ttl = counts_ttl
+        self.inbox_ttl = inbox_ttl
+
+    async def get_counts(self, user_id) -> Optional[Dict[str, int]]:
+        """Cached ``total``/``unread`` counts, or None on a miss."""
+        try:
+            client = await self.cache.get_redis()
+            raw = await client.hgetall(counts_key(user_id))
+        except Exception as e:
+            logger.error(
+                "Failed to read notification counts", user_id=str(user_id), error=str(e)
+            )
+            return None
+        if not raw:
+            return None
+        counts = {_text(field): int(value) for field, value in raw.items()}
+        if "total" not in counts or "unread" not in counts:
+            return None
+        return counts
+
+    async def store_counts(self, user_id, total: int, unread: int) -> None:
+        """Cache counts loaded from the database."""
+        try:
+            client = await self.cache.get_redis()
+            pipe = client.pipeline()
+            pipe.hset(counts_key(user_id), mapping={"total": total, "unread": unread})
+            pipe.expire(counts_key(user_id), self.counts_ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(
+                "Failed to cache notification counts",
+                user_id=str(user_id),
+                error=str(e),
+            )
+
+    async def get_recent_ids(self, user_id) -> Optional[List[UUID]]:
+        """Cached newest-first notification ids, or None on a miss."""
+        try:
+            client = await self.cache.get_redis()
+            raw = await client.lrange(inbox_key(user_id), 0, -1)
+        except Exception as e:
+            logger.error(
+                "Failed to read notification inbox", user_id=str(user_id), error=str(e)
+            )
+            return None
+        if not raw:
+            return None
+        return [UUID(_text(value)) for value in raw]
+
+    async def store_recent_ids(self, user_id, ids: List[UUID]) -> None:
+        """Cache newest-first ids loaded from the database."""
+        if not ids:
+            return
+        try:
+            client = await self.cache.get_redis()
+            pipe = client.pipeline()
+            pipe.delete(inbox_key(user_id))
+            pipe.rpush(inbox_key(user_id), *[str(i) for i in ids[: self.size]])
+            pipe.expire(inbox_key(user_id), self.inbox_ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(
+                "Failed to cache notification inbox",
+                user_id=str(user_id),
+                error=str(e),
+            )
+
+    async def record_created(self, created: Iterable[Created]) -> None:
+        """
+        Count new (unread) notifications and push them onto cached inboxes.
+
+        Takes any number of users at once; the updates go out in one
+        pipeline.
+        """
+        by_user: Dict[UUID, List[Tuple[datetime, UUID]]] = defaultdict(list)
+        for user_id, notification_id, created_at in created:
+            by_user[user_id].append((created_at, notification_id))
+        if not by_user:
+            return
+
+        try:
+            client = await self.cache.get_redis()
+            pipe = client.pipeline(transaction=False)
+            for user_id, items in by_user.items():
+                # Oldest first, so the newest ends up at the head of the list
+                items.sort()
+                count = len(items)
+                pipe.eval(
+                    _INCREMENT_IF_EXISTS,
+                    1,
+                    counts_key(user_id),
+                    "total",
+                    count,
+                    "unread",
+                    count,
+                )
+                pipe.eval(
+                    _PUSH_IF_EXISTS,
+                    1,
+                    inbox_key(user_id),
+                    self.size,
+                    *[str(notification_id) for _, notification_id in items],
+                )
+            await pipe.execute()
+        except Exception as e:
+            logger.error("Failed to update notification inboxes", error=str(e))
+            await self.invalidate(by_user)
+
+    async def record_read(self, user_id, count: int = 1) -> None:
+        """Count notifications that turned from unread to read."""
+        if count:
+            await self._increment(user_id, unread=-count)
+
+    async def record_all_read(self, user_id) -> None:
+        """Every notification of the user has been read."""
+        try:
+            client = await self.cache.get_redis()
+            await client.eval(_SET_IF_EXISTS, 1, counts_key(user_id), "unread", 0)
+        except Exception as e:
+            logger.error(
+                "Failed to update notification counts",
+                user_id=str(user_id),
+                error=str(e),
+            )
+            await self.invalidate([user_id])
+
+    async def record_deleted(self, user_id, was_unread: bool) -> None:
+        """
+        Uncount a deleted notification and drop the cached inbox.
+
+        The list is reloaded rather than edited so it never holds fewer
+        ids than the page it is supposed to serve.
+        """
+        await self._increment(user_id, total=-1, unread=-1 if was_unread else 0)
+        try:
+            client = await self.cache.get_redis()
+            await client.delete(inbox_key(user_id))
+        except Exception as e:
+            logger.error(
+                "Failed to drop notification inbox", user_id=str(user_id), error=str(e)
+            )
+
+    async def invalidate(self, user_ids: Iterable) -> None:
+        """Drop the cached state of users so it is reloaded on next read."""
+        keys = []
+        for user_id in user_ids:
+            keys.extend([counts_key(user_id), inbox_key(user_id)])
+        if not keys:
+            return
+        try:
+            client = await self.cache.get_redis()
+            await client.delete(*keys)
+        except Exception as e:
+            logger.error("Failed to invalidate notification inboxes", error=str(e))
+
+    async def _increment(self, user_id, **amounts: int) -> None:
+        args = []
+        for field, amount in amounts.items():
+            if amount:
+                args.extend([field, amount])
+        if not args:
+            return
+        try:
+            client = await self.cache.get_redis()
+            await client.eval(_INCREMENT_IF_EXISTS, 1, counts_key(user_id), *args)
+        except Exception as e:
+            logger.error(
+                "Failed to update notification counts",
+                user_id=str(user_id),
+                error=str(e),
+            )
+            await self.invalidate([user_id])
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+notification_inbox = NotificationInbox()
+
+
+__all__ = [
+    "INBOX_SIZE",
+    "NotificationInbox",
+    "notification_inbox",
+]
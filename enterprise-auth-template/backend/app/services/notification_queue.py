@@ -0,0 +1,272 @@
+"""
+Notification Queue
+
+Durable delivery queue backed by the notifications table itself: a
+notification is queued while it is ``pending`` and due (``scheduled_for``
+unset or in the past), so nothing is lost on restart and retries or
+rate-limit deferrals are just a later ``scheduled_for``.
+
+Workers claim due rows per channel with ``FOR UPDATE SKIP LOCKED`` and
+lease them by pushing ``scheduled_for`` past the lease time. Concurrent
+workers never claim the same row, and rows claimed by a worker that dies
+become due again when the lease runs out (delivery is at least once).
+Outcomes of a batch are written back with one UPDATE per outcome.
+Expired notifications cancelled on the way drop their users' cached
+inbox counters.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import get_settings
+from app.models.notification import Notification, NotificationStatus, NotificationType
+from app.services.notification_inbox import NotificationInbox, notification_inbox
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+MAX_DELIVERY_ATTEMPTS = getattr(settings, "NOTIFICATION_MAX_DELIVERY_ATTEMPTS", 5)
+RETRY_BASE_SECONDS = getattr(settings, "NOTIFICATION_RETRY_BASE_SECONDS", 60)
+RETRY_MAX_SECONDS = getattr(settings, "NOTIFICATION_RETRY_MAX_SECONDS", 3600)
+LEASE_SECONDS = getattr(settings, "NOTIFICATION_LEASE_SECONDS", 300)
+
+queue_depth = Gauge(
+    "notification_queue_depth",
+    "Pending notifications that are due for delivery",
+    ["channel"],
+)
+queue_latency = Histogram(
+    "notification_queue_latency_seconds",
+    "Time from a notification becoming due to being claimed for delivery",
+    ["channel"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900),
+)
+deliveries = Counter(
+    "notification_deliveries_total",
+    "Notification delivery attempts by outcome",
+    ["channel", "outcome"],
+)
+
+# A claimed notification and when it became due
+Claim = Tuple[Notification, datetime]
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the ``attempts``-th failed delivery."""
+    seconds = RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, RETRY_MAX_SECONDS))
+
+
+class NotificationQueue:
+    """Claims, leases and completes queued notifications."""
+
+    def __init__(
+        self,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_DELIVERY_ATTEMPTS,
+        inbox: Optional[NotificationInbox] = None,
+    ) -> None:
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.inbox = inbox or notification_inbox
+
+    async def claim(
+        self,
+        session: AsyncSession,
+        channel: NotificationType,
+        limit: int,
+        now: Optional[datetime] = None,
+    ) -> List[Claim]:
+        """
+        Lease up to ``limit`` due notifications of one channel.
+
+        Expired notifications found on the way are cancelled rather than
+        returned. Commits the session.
+        """
+        now = now or datetime.utcnow()
+        stmt = (
+            select(Notification)
+            .options(selectinload(Notification.user))
+            .where(
+                Notification.status == NotificationStatus.PENDING,
+                Notification.type == channel,
+                or_(
+                    Notification.scheduled_for.is_(None),
+                    Notification.scheduled_for <= now,
+                ),
+            )
+            .order_by(
+                Notification.scheduled_for.asc().nullsfirst(), Notification.created_at
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=Notification)
+        )
+        result = await session.execute(stmt)
+        notifications = list(result.scalars().all())
+        if not notifications:
+            await session.commit()
+            return []
+
+        claims: List[Claim] = []
+        expired = []
+        for notification in notifications:
+            if notification.expires_at and notification.expires_at < now:
+                expired.append(notification)
+                continue
+            claims.append(
+                (notification, notification.scheduled_for or notification.created_at)
+            )
+
+        if claims:
+            await session.execute(
+                update(Notification)
+                .where(Notification.id.in_([n.id for n, _ in claims]))
+                .values(scheduled_for=now + self.lease, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        if expired:
+            await session.execute(
+                update(Notification)
+                .where(Notification.id.in_([n.id for n in expired]))
+                .values(
+                    status=NotificationStatus.CANCELLED,
+                    error_message="Notification expired",
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        await session.commit()
+        if expired:
+            await self.inbox.invalidate({n.user_id for n in expired})
+
+        for _, due_at in claims:
+            queue_latency.labels(channel.value).observe(
+                max((now - due_at).total_seconds(), 0)
+            )
+        return claims
+
+    async def complete(
+        self,
+        session: AsyncSession,
+        outcomes: List[Tuple[Notification, Optional[str]]],
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Record delivery outcomes (``None`` for success, else the error).
+
+        Successes become ``sent``. Failures are retried after an
+        exponential backoff until ``max_attempts``, then become
+        ``failed``. Commits the session.
+        """
+        now = now or datetime.utcnow()
+        sent = [n.id for n, error in outcomes if error is None]
+        # (attempts, error) -> ids, so each group is one UPDATE
+        failed: Dict[Tuple[int, str], List] = {}
+        for notification, error in outcomes:
+            deliveries.labels(
+                notification.type.value, "sent" if error is None else "failed"
+            ).inc()
+            if error is not None:
+                attempts = notification.delivery_attempts + 1
+                failed.setdefault((attempts, error), []).append(notification.id)
+
+        if sent:
+            await session.execute(
+                update(Notification)
+                .where(Notification.id.in_(sent))
+                .values(
+                    status=NotificationStatus.SENT,
+                    delivery_attempts=Notification.delivery_attempts + 1,
+                    last_attempt_at=now,
+                    error_message=None,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        for (attempts, error), ids in failed.items():
+            values = {
+                "delivery_attempts": attempts,
+                "last_attempt_at": now,
+                "error_message": error,
+                "updated_at": now,
+            }
+            if attempts >= self.max_attempts:
+                values["status"] = NotificationStatus.FAILED
+            else:
+                values["scheduled_for"] = now + retry_delay(attempts)
+            await session.execute(
+                update(Notification)
+                .where(Notification.id.in_(ids))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            logger.warning(
+                "Notification delivery failed",
+                count=len(ids),
+                attempts=attempts,
+                final=attempts >= self.max_attempts,
+                error=error,
+            )
+
+        await session.commit()
+
+    async def defer(
+        self,
+        session: AsyncSession,
+        ids: List,
+        until: datetime,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Put notifications back without counting an attempt.
+
+        Used for rate-limited deliveries. Commits the session.
+        """
+        await session.execute(
+            update(Notification)
+            .where(Notification.id.in_(ids))
+            .values(scheduled_for=until, updated_at=now or datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+    async def depth(
+        self, session: AsyncSession, now: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Due notifications per channel; also exported as a gauge."""
+        now = now or datetime.utcnow()
+        result = await session.execute(
+            select(Notification.type, func.count())
+            .where(
+                Notification.status == NotificationStatus.PENDING,
+                or_(
+                    Notification.scheduled_for.is_(None),
+                    Notification.scheduled_for <= now,
+                ),
+            )
+            .group_by(Notification.type)
+        )
+        counts = {channel.value: 0 for channel in NotificationType}
+        for channel, count in result.all():
+            counts[NotificationType(channel).value] = count
+        for channel, count in counts.items():
+            queue_depth.labels(channel).set(count)
+        return counts
+
+
+notification_queue = NotificationQueue()
+
+
+__all__ = [
+    "MAX_DELIVERY_ATTEMPTS",
+    "NotificationQueue",
+    "notification_queue",
+    "retry_delay",
+]
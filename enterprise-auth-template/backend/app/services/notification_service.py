@@ -5,19 +5,28 @@ Handles all notification delivery operations including email, SMS, push notifica
 and in-app notifications with proper queuing, retry logic, and delivery tracking.
 """
 
-import asyncio
 import json
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Union
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import structlog
-from sqlalchemy import select, update, and_, or_, desc, func
+from sqlalchemy import select, update, insert, and_, or_, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import get_settings
 from app.core.events import EventEmitter, Event
+from app.core.pagination import (
+    COUNT_EXACT,
+    COUNT_NONE,
+    InvalidCursorError,
+    KeysetPage,
+    encode_cursor,
+    keyset_name,
+    paginate_keyset,
+)
 from app.models.notification import (
     Notification,
     NotificationType,
@@ -27,10 +36,40 @@ from app.models.notification import (
 )
 from app.models.user import User
 from app.services.cache_service import CacheService
+from app.services.notification_inbox import NotificationInbox
+from app.services.notification_queue import notification_queue, retry_delay
 
 settings = get_settings()
 logger = structlog.get_logger(__name__)
 
+# Hourly delivery limits per user, type and category
+RATE_LIMITS = {
+    NotificationType.EMAIL: 100,
+    NotificationType.SMS: 10,
+    NotificationType.PUSH: 50,
+    NotificationType.IN_APP: 200,
+}
+DEFAULT_RATE_LIMIT = 50
+RATE_LIMIT_WINDOW = 3600
+RATE_LIMIT_DELAY = timedelta(minutes=15)
+
+DEFAULT_PREFERENCES: Dict[str, Any] = {
+    "email_enabled": True,
+    "sms_enabled": False,
+    "push_enabled": True,
+    "in_app_enabled": True,
+    "categories": {
+        "security": {"email": True, "sms": False, "push": True},
+        "account": {"email": True, "sms": False, "push": False},
+        "billing": {"email": True, "sms": False, "push": False},
+        "marketing": {"email": False, "sms": False, "push": False},
+    },
+}
+
+# Rows per multi-row INSERT; 16 columns keeps a chunk under PostgreSQL's
+# 32767 bind parameter limit
+MAX_BULK_CHUNK = 2000
+
 
 class NotificationError(Exception):
     """Base exception for notification-related errors."""
@@ -81,6 +120,7 @@ class NotificationService:
         self.session = session
         self.cache_service = cache_service or CacheService()
         self.event_emitter = event_emitter or EventEmitter()
+        self.inbox = NotificationInbox(self.cache_service)
 
         # Delivery providers
         self._providers: Dict[NotificationType, Any] = {}
@@ -172,27 +212,27 @@ class NotificationService:
                     type=notification_type,
                     category=category,
                 )
-                # Still create the notification but mark as cancelled
-                notification_type = NotificationType.IN_APP
-                priority = NotificationPriority.LOW
 
-            # Create notification record
+            # Create notification record; the delivery worker picks it up
+            # once it is due
             notification = Notification(
-                id=str(uuid4()),
-                user_id=user_id,
-                title=title,
-                message=message,
-                type=notification_type,
-                priority=priority,
-                category=category,
-                status=NotificationStatus.PENDING,
-                data=data or {},
-                template_id=template_id,
-                scheduled_at=scheduled_at or datetime.utcnow(),
-                expires_at=expires_at,
-                metadata=metadata or {},
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
+                **self._notification_row(
+                    user.id,
+                    {
+                        "title": title,
+                        "message": message,
+                        "notification_type": notification_type,
+                        "priority": priority,
+                        "category": category,
+                        "data": data,
+                        "template_id": template_id,
+                        "scheduled_at": scheduled_at,
+                        "expires_at": expires_at,
+                        "metadata": metadata,
+                    },
+                    user_preferences,
+                    datetime.utcnow(),
+                )
             )
 
             self.session.add(notification)
@@ -201,12 +241,12 @@ class NotificationService:
             # Emit event for audit logging
             await self.event_emitter.emit(
                 Event(
-                    type="notification.created",
+                    "notification.created",
                     data={
-                        "notification_id": notification.id,
+                        "notification_id": str(notification.id),
                         "user_id": user_id,
-                        "type": notification_type,
-                        "priority": priority,
+                        "type": notification.type,
+                        "priority": notification.priority,
                         "category": category,
                         "scheduled_at": (
                             scheduled_at.isoformat() if scheduled_at else None
@@ -215,18 +255,17 @@ class NotificationService:
                 )
             )
 
-            # Schedule immediate delivery if not scheduled for later
-            if not scheduled_at or scheduled_at <= datetime.utcnow():
-                await self._queue_notification_for_delivery(notification)
-
             await self.session.commit()
+            await self.inbox.record_created(
+                [(notification.user_id, notification.id, notification.created_at)]
+            )
 
             logger.info(
                 "Notification created",
                 notification_id=notification.id,
                 user_id=user_id,
-                type=notification_type,
-                priority=priority,
+                type=notification.type,
+                priority=notification.priority,
             )
 
             return notification
@@ -304,18 +343,14 @@ class NotificationService:
                         user_id=notification.user_id,
                     )
                     # Reschedule for later
-                    await self._reschedule_notification(notification, minutes=15)
+                    await self._reschedule_notification(notification, RATE_LIMIT_DELAY)
                     return False
 
             # Attempt delivery
             success = await self._deliver_notification(notification)
 
             if success:
-                await self._update_notification_status(
-                    notification_id,
-                    NotificationStatus.SENT,
-                    f"Successfully delivered via {notification.type}",
-                )
+                await notification_queue.complete(self.session, [(notification, None)])
 
                 # Update delivery statistics
                 await self._update_delivery_stats(
@@ -347,48 +382,39 @@ class NotificationService:
             raise NotificationError(f"Notification delivery failed: {str(e)}")
 
     async def send_bulk_notifications(
-        self, notifications: List[Dict[str, Any]], batch_size: int = 50
+        self, notifications: List[Dict[str, Any]], batch_size: int = 1000
     ) -> Dict[str, Any]:
         """
-        Send multiple notifications efficiently in batches.
+        Create many notifications with a few round trips per chunk.
+
+        Each chunk validates its recipients with one query, reads their
+        preferences with one MGET and inserts every row with one
+        multi-row INSERT. Delivery (and rate limiting) is left to the
+        notification worker, which claims the rows from the queue.
 
         Args:
             notifications: List of notification data dictionaries
-            batch_size: Number of notifications to process per batch
+                (``create_notification`` arguments)
+            batch_size: Number of notifications per chunk
 
         Returns:
             Dict: Statistics about the bulk operation
         """
         try:
             total_count = len(notifications)
+            batch_size = max(1, min(batch_size, MAX_BULK_CHUNK))
             success_count = 0
             failed_count = 0
-            created_notifications: List[Notification] = []
+            created_ids: List[str] = []
 
-            # Process in batches to avoid memory issues
             for i in range(0, total_count, batch_size):
                 batch = notifications[i : i + batch_size]
                 batch_results = await self._process_notification_batch(batch)
 
-                created_notifications.extend(batch_results["created"])
+                created_ids.extend(batch_results["created"])
                 success_count += batch_results["success"]
                 failed_count += batch_results["failed"]
 
-                # Small delay between batches to prevent overwhelming the system
-                if i + batch_size < total_count:
-                    await asyncio.sleep(0.1)
-
-            # Schedule delivery for all created notifications
-            delivery_tasks = [
-                self._queue_notification_for_delivery(notification)
-                for notification in created_notifications
-            ]
-
-            if delivery_tasks:
-                await asyncio.gather(*delivery_tasks, return_exceptions=True)
-
-            await self.session.commit()
-
             logger.info(
                 "Bulk notification creation completed",
                 total=total_count,
@@ -401,7 +427,7 @@ class NotificationService:
                 "total": total_count,
                 "success": success_count,
                 "failed": failed_count,
-                "created_notifications": [n.id for n in created_notifications],
+                "created_notifications": created_ids,
             }
 
         except Exception as e:
@@ -433,17 +459,9 @@ class NotificationService:
             Tuple[List[Notification], int]: Notifications and total count
         """
         try:
-            # Build query conditions
-            conditions = [Notification.user_id == user_id]
-
-            if status_filter:
-                conditions.append(Notification.status == status_filter)
-
-            if category_filter:
-                conditions.append(Notification.category == category_filter)
-
-            if unread_only:
-                conditions.append(Notification.read_at.is_(None))
+            conditions = self._notification_conditions(
+                user_id, status_filter, category_filter, unread_only
+            )
 
             # Get total count
             count_stmt = select(func.count(Notification.id)).where(and_(*conditions))
@@ -454,7 +472,7 @@ class NotificationService:
             stmt = (
                 select(Notification)
                 .where(and_(*conditions))
-                .order_by(desc(Notification.created_at))
+                .order_by(desc(Notification.created_at), desc(Notification.id))
                 .limit(limit)
                 .offset(offset)
             )
@@ -469,6 +487,197 @@ class NotificationService:
             )
             raise NotificationError(f"Failed to get user notifications: {str(e)}")
 
+    async def get_user_notifications_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status_filter: Optional[NotificationStatus] = None,
+        category_filter: Optional[NotificationCategory] = None,
+        unread_only: bool = False,
+        count_mode: str = COUNT_EXACT,
+    ) -> KeysetPage:
+        """
+        Get a page of a user's notifications using keyset pagination.
+
+        Pages are selected by ``(created_at, id)`` rather than OFFSET, so
+        deep pages cost the same as the first. The unfiltered first page
+        is served from the cached inbox: ids and total come from Redis and
+        rows are fetched by primary key.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of notifications to return
+            cursor: Continuation token from the previous page
+            status_filter: Filter by notification status
+            category_filter: Filter by notification category
+            unread_only: Only return unread notifications
+            count_mode: ``exact``, ``estimated``, ``cached`` or ``none``
+
+        Returns:
+            KeysetPage: Notifications, next cursor and total
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        try:
+            if not (cursor or status_filter or category_filter or unread_only):
+                page = await self._get_inbox_page(user_id, limit, count_mode)
+                if page is not None:
+                    return page
+
+            conditions = self._notification_conditions(
+                user_id, status_filter, category_filter, unread_only
+            )
+            cache_key = ":".join(
+                [
+                    "notifications",
+                    str(user_id),
+                    status_filter.value if status_filter else "any",
+                    category_filter.value if category_filter else "any",
+                    "unread" if unread_only else "all",
+                ]
+            )
+
+            return await paginate_keyset(
+                self.session,
+                select(Notification).where(and_(*conditions)),
+                [Notification.created_at, Notification.id],
+                limit,
+                cursor=cursor,
+                count_mode=count_mode,
+                count_cache_key=cache_key,
+                cache_service=self.cache_service,
+            )
+
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Failed to get user notifications", user_id=user_id, error=str(e)
+            )
+            raise NotificationError(f"Failed to get user notifications: {str(e)}")
+
+    async def get_unread_count(self, user_id: str) -> int:
+        """
+        Get the number of unread notifications of a user.
+
+        Served from the cached counters; the database is only queried
+        when they are not cached yet.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            int: Number of unread notifications
+        """
+        counts = await self.get_notification_counts(user_id)
+        return counts["unread"]
+
+    async def get_notification_counts(self, user_id: str) -> Dict[str, int]:
+        """
+        Get a user's ``total`` and ``unread`` notification counts.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dict[str, int]: Counts, excluding deleted notifications
+        """
+        counts = await self.inbox.get_counts(user_id)
+        if counts is not None:
+            return counts
+
+        result = await self.session.execute(
+            select(
+                func.count(Notification.id),
+                func.count(Notification.id).filter(Notification.read_at.is_(None)),
+            ).where(
+                Notification.user_id == user_id,
+                Notification.status != NotificationStatus.CANCELLED,
+            )
+        )
+        total, unread = result.one()
+        await self.inbox.store_counts(user_id, total, unread)
+        return {"total": total, "unread": unread}
+
+    async def _get_inbox_page(
+        self, user_id: str, limit: int, count_mode: str
+    ) -> Optional[KeysetPage]:
+        """First unfiltered page from the cached inbox, or None to query."""
+        if limit > self.inbox.size:
+            return None
+
+        counts = await self.get_notification_counts(user_id)
+        if counts["total"] == 0:
+            return KeysetPage(items=[], total=None if count_mode == COUNT_NONE else 0)
+
+        ids = await self.inbox.get_recent_ids(user_id)
+        if ids is None:
+            result = await self.session.execute(
+                select(Notification.id)
+                .where(
+                    Notification.user_id == user_id,
+                    Notification.status != NotificationStatus.CANCELLED,
+                )
+                .order_by(desc(Notification.created_at), desc(Notification.id))
+                .limit(self.inbox.size)
+            )
+            ids = list(result.scalars().all())
+            await self.inbox.store_recent_ids(user_id, ids)
+
+        page_ids = ids[:limit]
+        if len(page_ids) < min(limit, counts["total"]):
+            # The cached list is behind the counters; let the query decide
+            return None
+
+        result = await self.session.execute(
+            select(Notification).where(
+                Notification.id.in_(page_ids),
+                Notification.status != NotificationStatus.CANCELLED,
+            )
+        )
+        by_id = {n.id: n for n in result.scalars().all()}
+        items = [by_id[i] for i in page_ids if i in by_id]
+
+        next_cursor = None
+        if items and counts["total"] > len(page_ids):
+            last = items[-1]
+            next_cursor = encode_cursor(
+                keyset_name([Notification.created_at, Notification.id]),
+                [last.created_at, last.id],
+            )
+
+        return KeysetPage(
+            items=items,
+            next_cursor=next_cursor,
+            total=None if count_mode == COUNT_NONE else counts["total"],
+        )
+
+    @staticmethod
+    def _notification_conditions(
+        user_id: str,
+        status_filter: Optional[NotificationStatus],
+        category_filter: Optional[NotificationCategory],
+        unread_only: bool,
+    ) -> List[Any]:
+        """Build filter conditions for a user's notification listing."""
+        conditions = [Notification.user_id == user_id]
+
+        if status_filter:
+            conditions.append(Notification.status == status_filter)
+        else:
+            # Deleted notifications only show up when asked for by status
+            conditions.append(Notification.status != NotificationStatus.CANCELLED)
+
+        if category_filter:
+            conditions.append(Notification.category == category_filter)
+
+        if unread_only:
+            conditions.append(Notification.read_at.is_(None))
+
+        return conditions
+
     async def mark_notification_read(self, notification_id: str, user_id: str) -> bool:
         """
         Mark a notification as read.
@@ -487,14 +696,23 @@ class NotificationService:
                     and_(
                         Notification.id == notification_id,
                         Notification.user_id == user_id,
+                        Notification.read_at.is_(None),
                     )
                 )
                 .values(read_at=datetime.utcnow(), updated_at=datetime.utcnow())
+                .returning(Notification.status)
             )
             result = await self.session.execute(stmt)
+            row = result.first()
+            # Already read counts as success, as long as it is the user's
+            success = row is not None or await self._notification_exists(
+                notification_id, user_id
+            )
             await self.session.commit()
 
-            success = result.rowcount > 0
+            if row is not None and row.status != NotificationStatus.CANCELLED:
+                await self.inbox.record_read(user_id)
+
             if success:
                 logger.debug(
                     "Notification marked as read",
@@ -536,6 +754,7 @@ class NotificationService:
             )
             result = await self.session.execute(stmt)
             await self.session.commit()
+            await self.inbox.record_all_read(user_id)
 
             count = result.rowcount
             logger.info(
@@ -573,16 +792,25 @@ class NotificationService:
                     and_(
                         Notification.id == notification_id,
                         Notification.user_id == user_id,
+                        Notification.status != NotificationStatus.CANCELLED,
                     )
                 )
                 .values(
                     status=NotificationStatus.CANCELLED, updated_at=datetime.utcnow()
                 )
+                .returning(Notification.read_at)
             )
             result = await self.session.execute(stmt)
+            row = result.first()
+            # Already deleted counts as success, as long as it is the user's
+            success = row is not None or await self._notification_exists(
+                notification_id, user_id
+            )
             await self.session.commit()
 
-            success = result.rowcount > 0
+            if row is not None:
+                await self.inbox.record_deleted(user_id, was_unread=row.read_at is None)
+
             if success:
                 logger.info(
                     "Notification deleted",
@@ -602,6 +830,14 @@ class NotificationService:
             )
             raise NotificationError(f"Failed to delete notification: {str(e)}")
 
+    async def _notification_exists(self, notification_id: str, user_id: str) -> bool:
+        result = await self.session.execute(
+            select(Notification.id).where(
+                Notification.id == notification_id, Notification.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none() is not None
+
     async def get_notification_statistics(
         self, user_id: Optional[str] = None, days: int = 30
     ) -> Dict[str, Any]:
@@ -681,6 +917,10 @@ class NotificationService:
             bool: True if delivery successful
         """
         try:
+            # In-app notifications are always "delivered" as they're stored in DB
+            if notification.type == NotificationType.IN_APP:
+                return True
+
             provider = self._providers.get(notification.type)
             if not provider:
                 logger.warning(
@@ -698,7 +938,6 @@ class NotificationService:
             elif notification.type == NotificationType.PUSH:
                 success = await self._deliver_push_notification(notification, provider)
             else:
-                # In-app notifications are always "delivered" as they're stored in DB
                 success = True
 
             return success
@@ -724,7 +963,7 @@ class NotificationService:
                 message=notification.message,
                 category=notification.category,
                 data=notification.data,
-                template_id=notification.template_id,
+                template_id=(notification.channel_data or {}).get("template_id"),
             )
             return True
         except Exception as e:
@@ -791,28 +1030,33 @@ class NotificationService:
 
         preferences = await self.cache_service.get(cache_key)
         if preferences:
-            return json.loads(preferences)
-
-        # Default preferences if not set
-        default_preferences = {
-            "email_enabled": True,
-            "sms_enabled": False,
-            "push_enabled": True,
-            "in_app_enabled": True,
-            "categories": {
-                "security": {"email": True, "sms": False, "push": True},
-                "account": {"email": True, "sms": False, "push": False},
-                "billing": {"email": True, "sms": False, "push": False},
-                "marketing": {"email": False, "sms": False, "push": False},
-            },
-        }
+            return self._parse_preferences(preferences)
 
-        # Cache for 1 hour
+        # Cache the defaults for 1 hour
         await self.cache_service.set(
-            cache_key, json.dumps(default_preferences), ttl=3600
+            cache_key, json.dumps(DEFAULT_PREFERENCES), ttl=3600
+        )
+
+        return DEFAULT_PREFERENCES
+
+    async def _get_preferences_for_users(
+        self, user_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Preferences of many users with one MGET (defaults where unset)."""
+        values = await self.cache_service.get_many(
+            [f"user_notification_prefs:{user_id}" for user_id in user_ids]
         )
+        return {
+            user_id: self._parse_preferences(value)
+            for user_id, value in zip(user_ids, values)
+        }
 
-        return default_preferences
+    @staticmethod
+    def _parse_preferences(value: Any) -> Dict[str, Any]:
+        # Stored either as a JSON string or already decoded by the cache
+        if isinstance(value, str):
+            value = json.loads(value)
+        return value if isinstance(value, dict) else DEFAULT_PREFERENCES
 
     def _is_notification_allowed(
         self,
@@ -837,45 +1081,45 @@ class NotificationService:
         category: NotificationCategory,
     ) -> bool:
         """Check rate limit for user/type/category combination."""
-        cache_key = f"notification_rate_limit:{user_id}:{notification_type.value}:{category.value}"
-
-        # Different limits based on type and category
-        limits = {
-            NotificationType.EMAIL: 100,  # per hour
-            NotificationType.SMS: 10,  # per hour
-            NotificationType.PUSH: 50,  # per hour
-            NotificationType.IN_APP: 200,  # per hour
-        }
-
-        limit = limits.get(notification_type, 50)
-        current_count = await self.cache_service.get(cache_key) or 0
-
-        if int(current_count) >= limit:
-            return False
+        allowed = await self._consume_rate_limits(
+            [(user_id, notification_type, category)]
+        )
+        return allowed[0]
 
-        # Increment counter with 1-hour TTL
-        await self.cache_service.set(cache_key, int(current_count) + 1, ttl=3600)
-        return True
+    async def _consume_rate_limits(
+        self, deliveries: List[Tuple[Any, NotificationType, NotificationCategory]]
+    ) -> List[bool]:
+        """
+        Count deliveries against their hourly limits in one pipeline.
 
-    async def _queue_notification_for_delivery(
-        self, notification: Notification
-    ) -> None:
-        """Queue notification for immediate delivery."""
-        # In a production environment, this would add to a message queue
-        # For now, we'll use asyncio to deliver asynchronously
-        asyncio.create_task(self._deliver_notification_async(notification.id))
+        Deliveries sharing a user, type and category are counted together
+        with one INCRBY; the ones past the limit are refused in order.
+        """
+        keys = [
+            f"notification_rate:{user_id}:{notification_type.value}:{category.value}"
+            for user_id, notification_type, category in deliveries
+        ]
+        requested = Counter(keys)
+        totals = await self.cache_service.increment_counters(
+            dict(requested), ttl=RATE_LIMIT_WINDOW
+        )
 
-    async def _deliver_notification_async(self, notification_id: str) -> None:
-        """Asynchronously deliver a notification."""
-        try:
-            await asyncio.sleep(0.1)  # Small delay to prevent overwhelming
-            await self.send_notification(notification_id)
-        except Exception as e:
-            logger.error(
-                "Async notification delivery failed",
-                notification_id=notification_id,
-                error=str(e),
-            )
+        # Position of each delivery among those sharing its counter
+        remaining = {
+            key: RATE_LIMITS.get(delivery[1], DEFAULT_RATE_LIMIT)
+            - (totals[key] - requested[key])
+            for key, delivery in zip(keys, deliveries)
+            if key in totals
+        }
+        allowed = []
+        for key in keys:
+            if key not in remaining:
+                # Counters unavailable; do not hold deliveries back
+                allowed.append(True)
+                continue
+            allowed.append(remaining[key] > 0)
+            remaining[key] -= 1
+        return allowed
 
     async def _update_notification_status(
         self,
@@ -886,11 +1130,9 @@ class NotificationService:
         """Update notification status."""
         update_values = {"status": status, "updated_at": datetime.utcnow()}
 
-        if status == NotificationStatus.SENT:
-            update_values["sent_at"] = datetime.utcnow()
-        elif status == NotificationStatus.DELIVERED:
+        if status == NotificationStatus.DELIVERED:
             update_values["delivered_at"] = datetime.utcnow()
-        elif status == NotificationStatus.FAILED:
+        elif error_message:
             update_values["error_message"] = error_message
 
         stmt = (
@@ -904,59 +1146,21 @@ class NotificationService:
     async def _handle_delivery_failure(
         self, notification: Optional[Notification], error: Optional[str] = None
     ) -> None:
-        """Handle notification delivery failure with retry logic."""
+        """Record a failed delivery; the queue retries it with backoff."""
         if not notification:
             return
 
-        # Increment retry count
-        retry_count = notification.retry_count + 1
-        max_retries = 3
-
-        if retry_count < max_retries:
-            # Schedule retry with exponential backoff
-            delay_minutes = 2**retry_count  # 2, 4, 8 minutes
-            retry_at = datetime.utcnow() + timedelta(minutes=delay_minutes)
-
-            stmt = (
-                update(Notification)
-                .where(Notification.id == notification.id)
-                .values(
-                    retry_count=retry_count,
-                    scheduled_at=retry_at,
-                    error_message=error,
-                    updated_at=datetime.utcnow(),
-                )
-            )
-            await self.session.execute(stmt)
-
-            logger.warning(
-                "Notification delivery failed, scheduling retry",
-                notification_id=notification.id,
-                retry_count=retry_count,
-                retry_at=retry_at.isoformat(),
-                error=error,
-            )
-        else:
-            # Max retries reached, mark as failed
-            await self._update_notification_status(
-                notification.id,
-                NotificationStatus.FAILED,
-                error or "Max retries exceeded",
-            )
+        await notification_queue.complete(
+            self.session, [(notification, error or "Delivery failed")]
+        )
 
     async def _reschedule_notification(
-        self, notification: Notification, minutes: int
+        self, notification: Notification, delay: timedelta
     ) -> None:
         """Reschedule notification for later delivery."""
-        new_time = datetime.utcnow() + timedelta(minutes=minutes)
-
-        stmt = (
-            update(Notification)
-            .where(Notification.id == notification.id)
-            .values(scheduled_at=new_time, updated_at=datetime.utcnow())
+        await notification_queue.defer(
+            self.session, [notification.id], datetime.utcnow() + delay
         )
-        await self.session.execute(stmt)
-        await self.session.commit()
 
     async def _update_delivery_stats(
         self, user_id: str, notification_type: NotificationType, success: bool
@@ -964,42 +1168,131 @@ class NotificationService:
         """Update delivery statistics."""
         cache_key = f"notification_stats:{user_id}:{notification_type.value}"
 
-        stats = await self.cache_service.get(cache_key)
-        if stats:
-            stats = json.loads(stats)
-        else:
-            stats = {"sent": 0, "delivered": 0, "failed": 0}
-
-        if success:
-            stats["delivered"] += 1
-        else:
-            stats["failed"] += 1
-
         # Cache for 24 hours
-        await self.cache_service.set(cache_key, json.dumps(stats), ttl=86400)
+        await self.cache_service.increment_hash(
+            cache_key, {"delivered" if success else "failed": 1}, ttl=86400
+        )
 
     async def _process_notification_batch(
         self, batch: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Process a batch of notifications."""
-        created = []
-        success = 0
+        """Insert a chunk of notifications and queue their delivery."""
+        now = datetime.utcnow()
         failed = 0
 
+        items = []
         for notification_data in batch:
             try:
-                notification = await self.create_notification(**notification_data)
-                created.append(notification)
-                success += 1
-            except Exception as e:
-                logger.error(
-                    "Failed to create notification in batch",
-                    data=notification_data,
-                    error=str(e),
+                user_id = UUID(str(notification_data["user_id"]))
+                if not (
+                    notification_data.get("title")
+                    and notification_data.get("message")
+                    and notification_data.get("notification_type")
+                ):
+                    raise ValueError("title, message and type are required")
+            except (KeyError, ValueError) as e:
+                logger.warning("Invalid notification in batch", error=str(e))
+                failed += 1
+                continue
+            items.append((user_id, notification_data))
+
+        # One query for every recipient of the chunk
+        user_ids = {user_id for user_id, _ in items}
+        result = await self.session.execute(
+            select(User.id).where(User.id.in_(user_ids), User.is_active.is_(True))
+        )
+        active = set(result.scalars().all())
+        failed += sum(1 for user_id, _ in items if user_id not in active)
+        items = [(user_id, data) for user_id, data in items if user_id in active]
+        if not items:
+            return {"created": [], "success": 0, "failed": failed}
+
+        preferences = await self._get_preferences_for_users(
+            list({str(user_id) for user_id, _ in items})
+        )
+        rows = []
+        for user_id, data in items:
+            try:
+                rows.append(
+                    self._notification_row(
+                        user_id, data, preferences[str(user_id)], now
+                    )
+                )
+            except (ValueError, TypeError) as e:
+                # A bad enum or date fails its own item, not the whole send
+                logger.warning(
+                    "Invalid notification in batch", user_id=user_id, error=str(e)
                 )
                 failed += 1
+        if not rows:
+            return {"created": [], "success": 0, "failed": failed}
 
-        return {"created": created, "success": success, "failed": failed}
+        # Executemany of a Core INSERT: the statement is compiled once and
+        # sent as multi-row INSERT ... VALUES pages, not a round trip per row.
+        # The delivery worker picks the rows up once committed.
+        await self.session.execute(insert(Notification.__table__), rows)
+        await self.session.commit()
+        await self.inbox.record_created(
+            [(row["user_id"], row["id"], row["created_at"]) for row in rows]
+        )
+
+        await self.event_emitter.emit(
+            Event(
+                "notification.bulk_created",
+                data={"count": len(rows)},
+            )
+        )
+
+        return {
+            "created": [str(row["id"]) for row in rows],
+            "success": len(rows),
+            "failed": failed,
+        }
+
+    def _notification_row(
+        self,
+        user_id: UUID,
+        data: Dict[str, Any],
+        preferences: Dict[str, Any],
+        now: datetime,
+    ) -> Dict[str, Any]:
+        """Column values for one bulk-inserted notification."""
+        notification_type = NotificationType(data["notification_type"])
+        priority = NotificationPriority(
+            data.get("priority") or NotificationPriority.NORMAL
+        )
+        category = NotificationCategory(
+            data.get("category") or NotificationCategory.ACCOUNT
+        )
+        if not self._is_notification_allowed(notification_type, category, preferences):
+            # Still create the notification, but only in the inbox
+            notification_type = NotificationType.IN_APP
+            priority = NotificationPriority.LOW
+
+        scheduled_at = data.get("scheduled_at")
+        channel_data = dict(data.get("metadata") or {})
+        if data.get("template_id"):
+            channel_data["template_id"] = data["template_id"]
+
+        return {
+            "id": uuid4(),
+            "user_id": user_id,
+            "title": data["title"],
+            "message": data["message"],
+            "data": data.get("data") or {},
+            "type": notification_type,
+            "category": category,
+            "priority": priority,
+            "status": NotificationStatus.PENDING,
+            "channel_data": channel_data or None,
+            "delivery_attempts": 0,
+            "scheduled_for": (
+                scheduled_at if scheduled_at and scheduled_at > now else None
+            ),
+            "expires_at": data.get("expires_at"),
+            "created_at": now,
+            "updated_at": now,
+        }
 
 
 # Global instance
@@ -0,0 +1,246 @@
+"""
+Notification Worker
+
+Standalone delivery worker for the durable notification queue, so
+provider calls never share the API event loop:
+
+    python -m app.services.notification_worker
+
+Each channel (email, SMS, push, in-app) runs its own loop with its own
+concurrency limit and claim size, so a slow SMS gateway cannot hold up
+email. Providers that expose ``send_notification_batch`` receive a
+claimed batch in one call; others are called per notification within
+the channel's concurrency limit. Rate limits are consumed for a whole
+batch in one pipeline, and limited notifications are deferred without
+counting an attempt. Any number of workers can run side by side. Queue
+depth, queue latency and delivery outcomes are exported as Prometheus
+metrics, on their own port in the worker process.
+"""
+
+import asyncio
+import signal
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import structlog
+
+from app.core.config import get_settings
+from app.models.notification import Notification, NotificationType
+from app.services.cache_service import CacheService
+from app.services.notification_queue import NotificationQueue, notification_queue
+from app.services.notification_service import RATE_LIMIT_DELAY, NotificationService
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+# Channel -> (concurrent provider calls, notifications claimed per batch)
+DEFAULT_POOLS = {
+    NotificationType.EMAIL: (10, 50),
+    NotificationType.SMS: (5, 20),
+    NotificationType.PUSH: (20, 200),
+    NotificationType.IN_APP: (1, 500),
+}
+
+
+@dataclass
+class ChannelPool:
+    """Delivery limits of one channel."""
+
+    channel: NotificationType
+    concurrency: int
+    batch_size: int
+
+
+def channel_pools() -> List[ChannelPool]:
+    """Pools from settings (``NOTIFICATION_<CHANNEL>_CONCURRENCY`` / ``_BATCH``)."""
+    return [
+        ChannelPool(
+            channel,
+            getattr(settings, f"NOTIFICATION_{channel.name}_CONCURRENCY", concurrency),
+            getattr(settings, f"NOTIFICATION_{channel.name}_BATCH", batch_size),
+        )
+        for channel, (concurrency, batch_size) in DEFAULT_POOLS.items()
+    ]
+
+
+class NotificationWorker:
+    """Per-channel delivery loops over the notification queue."""
+
+    def __init__(
+        self,
+        pools: Optional[List[ChannelPool]] = None,
+        queue: Optional[NotificationQueue] = None,
+        poll_interval: Optional[float] = None,
+        metrics_interval: float = 15.0,
+        cache_service: Optional[CacheService] = None,
+    ) -> None:
+        self.pools = pools or channel_pools()
+        self.queue = queue or notification_queue
+        self.cache_service = cache_service or CacheService()
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else getattr(settings, "NOTIFICATION_WORKER_POLL_INTERVAL", 1.0)
+        )
+        self.metrics_interval = metrics_interval
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        """Deliver until ``stop`` is called."""
+        self._stopping.clear()
+        logger.info(
+            "Notification worker started",
+            pools={pool.channel.value: pool.concurrency for pool in self.pools},
+        )
+        await asyncio.gather(
+            *(self._run_channel(pool) for pool in self.pools),
+            self._report_depth(),
+        )
+        await self.cache_service.close()
+        logger.info("Notification worker stopped")
+
+    def stop(self) -> None:
+        """Finish the batches in hand and exit."""
+        self._stopping.set()
+
+    async def process_batch(self, pool: ChannelPool) -> int:
+        """
+        Claim, deliver and complete one batch of a channel.
+
+        Returns:
+            Number of notifications claimed
+        """
+        from app.core import database
+
+        async with database.async_session_maker() as session:
+            claims = await self.queue.claim(session, pool.channel, pool.batch_size)
+            if not claims:
+                return 0
+
+            service = NotificationService(session, cache_service=self.cache_service)
+            notifications = [notification for notification, _ in claims]
+            # One pipeline for the rate limits of the whole batch
+            allowed = await service._consume_rate_limits(
+                [(n.user_id, n.type, n.category) for n in notifications]
+            )
+            limited = [n.id for n, ok in zip(notifications, allowed) if not ok]
+            if limited:
+                await self.queue.defer(
+                    session, limited, datetime.utcnow() + RATE_LIMIT_DELAY
+                )
+
+            outcomes = await self._deliver(
+                service, pool, [n for n, ok in zip(notifications, allowed) if ok]
+            )
+            await self.queue.complete(session, outcomes)
+            return len(claims)
+
+    async def _deliver(
+        self,
+        service: NotificationService,
+        pool: ChannelPool,
+        notifications: List[Notification],
+    ) -> List[Tuple[Notification, Optional[str]]]:
+        """Send a batch through the channel's provider."""
+        provider = service._providers.get(pool.channel)
+        send_batch = getattr(provider, "send_notification_batch", None)
+        if send_batch is not None:
+            try:
+                results = await send_batch(notifications)
+            except Exception as e:
+                logger.error(
+                    "Batch delivery failed",
+                    channel=pool.channel.value,
+                    count=len(notifications),
+                    error=str(e),
+                )
+                results = [False] * len(notifications)
+        else:
+            semaphore = asyncio.Semaphore(pool.concurrency)
+
+            async def deliver(notification: Notification) -> bool:
+                async with semaphore:
+                    return await service._deliver_notification(notification)
+
+            results = await asyncio.gather(*(deliver(n) for n in notifications))
+
+        return [
+            (notification, None if ok else f"Delivery via {pool.channel.value} failed")
+            for notification, ok in zip(notifications, results)
+        ]
+
+    async def _run_channel(self, pool: ChannelPool) -> None:
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.process_batch(pool)
+            except Exception as e:
+                logger.error(
+                    "Notification batch failed",
+                    channel=pool.channel.value,
+                    error=str(e),
+                )
+                claimed = 0
+            # A full batch means more is waiting; otherwise poll
+            if claimed < pool.batch_size:
+                await self._wait(self.poll_interval)
+
+    async def _report_depth(self) -> None:
+        from app.core import database
+
+        while not self._stopping.is_set():
+            try:
+                async with database.async_session_maker() as session:
+                    await self.queue.depth(session)
+            except Exception as e:
+                logger.error("Failed to measure notification queue", error=str(e))
+            await self._wait(self.metrics_interval)
+
+    async def _wait(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_worker() -> None:
+    """Run a worker with its own database engine until SIGINT/SIGTERM."""
+    from app.core.database import close_db, init_db
+    from app.core.http_clients import http_clients
+
+    await init_db()
+    worker = NotificationWorker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    metrics_port = getattr(settings, "NOTIFICATION_WORKER_METRICS_PORT", 9102)
+    if metrics_port:
+        from prometheus_client import start_http_server
+
+        start_http_server(metrics_port)
+
+    try:
+        await worker.run()
+    finally:
+        await http_clients.aclose()
+        await close_db()
+
+
+def main() -> None:
+    from app.core.log_config import setup_logging
+
+    setup_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = [
+    "ChannelPool",
+    "NotificationWorker",
+    "channel_pools",
+    "run_worker",
+]
@@ -10,7 +10,6 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, Tuple
 
-import httpx
 import structlog
 from authlib.integrations.starlette_client import OAuth, OAuthError
 from fastapi import HTTPException, status
@@ -18,6 +17,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.http_clients import http_clients
 from app.core.security import create_access_token, create_refresh_token
 from app.models.user import User
 from app.schemas.auth import OAuthProvider, OAuthUserInfo
@@ -25,6 +25,7 @@ from app.schemas.auth import OAuthProvider, OAuthUserInfo
 # Import new refactored services
 from app.services.auth.authentication_service import AuthenticationService
 from app.services.auth.registration_service import RegistrationService
+from app.services.oidc_verifier import OIDCVerificationError, get_oidc_provider
 from app.repositories.user_repository import UserRepository
 from app.repositories.session_repository import SessionRepository
 from app.repositories.role_repository import RoleRepository
@@ -55,6 +56,7 @@ class OAuthConfig:
         "api_base_url": "https://www.googleapis.com/",
         "client_kwargs": {"scope": "openid email profile"},
         "userinfo_endpoint": "https://openidconnect.googleapis.com/v1/userinfo",
+        "issuer": "https://accounts.google.com",
     }
 
     GITHUB = {
@@ -356,97 +358,145 @@ class OAuthService:
         """
         config = getattr(OAuthConfig, provider.upper())
 
-        async with httpx.AsyncClient() as client:
-            # Exchange code for access token
-            token_response = await client.post(
-                config["access_token_url"],
-                data={
-                    "client_id": config["client_id"],
-                    "client_secret": config["client_secret"],
-                    "code": code,
-                    "redirect_uri": f"{self.redirect_uri}/{provider}",
-                    "grant_type": "authorization_code",
-                },
-                headers={"Accept": "application/json"},
-            )
+        # Exchange code for access token
+        token_response = await http_clients.post(
+            config["access_token_url"],
+            data={
+                "client_id": config["client_id"],
+                "client_secret": config["client_secret"],
+                "code": code,
+                "redirect_uri": f"{self.redirect_uri}/{provider}",
+                "grant_type": "authorization_code",
+            },
+            headers={"Accept": "application/json"},
+        )
 
-            if token_response.status_code != 200:
-                raise OAuthError(
-                    f"Failed to exchange code for token: {token_response.text}"
-                )
+        if token_response.status_code != 200:
+            raise OAuthError(
+                f"Failed to exchange code for token: {token_response.text}"
+            )
 
-            token_data = token_response.json()
-            access_token = token_data.get("access_token")
+        token_data = token_response.json()
+        access_token = token_data.get("access_token")
 
-            if not access_token:
-                raise OAuthError("No access token in response")
+        if not access_token:
+            raise OAuthError("No access token in response")
 
-            # Get user info
-            userinfo_response = await client.get(
-                config["userinfo_endpoint"],
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json",
-                },
+        # OpenID Connect providers: a verified ID token already carries the
+        # identity, so the userinfo round trip can be skipped
+        id_token = token_data.get("id_token")
+        if id_token and config.get("issuer"):
+            user_info = await self._get_id_token_user_info(
+                provider, config, id_token, access_token
             )
+            if user_info is not None:
+                return user_info
+
+        # Get user info
+        userinfo_response = await http_clients.get(
+            config["userinfo_endpoint"],
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json",
+            },
+        )
 
-            if userinfo_response.status_code != 200:
-                raise OAuthError(f"Failed to get user info: {userinfo_response.text}")
+        if userinfo_response.status_code != 200:
+            raise OAuthError(f"Failed to get user info: {userinfo_response.text}")
 
-            user_data = userinfo_response.json()
+        user_data = userinfo_response.json()
 
-            # Parse user info based on provider
-            if provider == "google":
-                return OAuthUserInfo(
-                    id=user_data["sub"],
-                    email=user_data["email"],
-                    name=user_data.get("name", ""),
-                    picture=user_data.get("picture"),
-                    email_verified=user_data.get("email_verified", False),
-                    provider=OAuthProvider.GOOGLE,
+        # Parse user info based on provider
+        if provider == "google":
+            return OAuthUserInfo(
+                id=user_data["sub"],
+                email=user_data["email"],
+                name=user_data.get("name", ""),
+                picture=user_data.get("picture"),
+                email_verified=user_data.get("email_verified", False),
+                provider=OAuthProvider.GOOGLE,
+            )
+        elif provider == "github":
+            # GitHub may need additional API call for email
+            email = user_data.get("email")
+            if not email:
+                email_response = await http_clients.get(
+                    "https://api.github.com/user/emails",
+                    headers={
+                        "Authorization": f"Bearer {access_token}",
+                        "Accept": "application/json",
+                    },
                 )
-            elif provider == "github":
-                # GitHub may need additional API call for email
-                email = user_data.get("email")
-                if not email:
-                    email_response = await client.get(
-                        "https://api.github.com/user/emails",
-                        headers={
-                            "Authorization": f"Bearer {access_token}",
-                            "Accept": "application/json",
-                        },
+                if email_response.status_code == 200:
+                    emails = email_response.json()
+                    primary_email = next(
+                        (e["email"] for e in emails if e.get("primary")),
+                        None,
                     )
-                    if email_response.status_code == 200:
-                        emails = email_response.json()
-                        primary_email = next(
-                            (e["email"] for e in emails if e.get("primary")),
-                            None,
-                        )
-                        email = primary_email
-
-                return OAuthUserInfo(
-                    id=str(user_data["id"]),
-                    email=email or f"{user_data['login']}@users.noreply.github.com",
-                    name=user_data.get("name") or user_data["login"],
-                    picture=user_data.get("avatar_url"),
-                    email_verified=True,  # GitHub requires email verification
-                    provider=OAuthProvider.GITHUB,
-                )
-            elif provider == "discord":
-                return OAuthUserInfo(
-                    id=user_data["id"],
-                    email=user_data.get("email"),
-                    name=user_data.get("username", ""),
-                    picture=(
-                        f"https://cdn.discordapp.com/avatars/{user_data['id']}/{user_data.get('avatar')}.png"
-                        if user_data.get("avatar")
-                        else None
-                    ),
-                    email_verified=user_data.get("verified", False),
-                    provider=OAuthProvider.DISCORD,
-                )
-            else:
-                raise OAuthError(f"Unknown provider: {provider}")
+                    email = primary_email
+
+            return OAuthUserInfo(
+                id=str(user_data["id"]),
+                email=email or f"{user_data['login']}@users.noreply.github.com",
+                name=user_data.get("name") or user_data["login"],
+                picture=user_data.get("avatar_url"),
+                email_verified=True,  # GitHub requires email verification
+                provider=OAuthProvider.GITHUB,
+            )
+        elif provider == "discord":
+            return OAuthUserInfo(
+                id=user_data["id"],
+                email=user_data.get("email"),
+                name=user_data.get("username", ""),
+                picture=(
+                    f"https://cdn.discordapp.com/avatars/{user_data['id']}/{user_data.get('avatar')}.png"
+                    if user_data.get("avatar")
+                    else None
+                ),
+                email_verified=user_data.get("verified", False),
+                provider=OAuthProvider.DISCORD,
+            )
+        else:
+            raise OAuthError(f"Unknown provider: {provider}")
+
+    async def _get_id_token_user_info(
+        self, provider: str, config: dict, id_token: str, access_token: str
+    ) -> Optional[OAuthUserInfo]:
+        """
+        Get user information from a locally verified ID token.
+
+        Args:
+            provider: OAuth provider name
+            config: Provider configuration
+            id_token: ID token from the token response
+            access_token: Access token from the same response
+
+        Returns:
+            OAuthUserInfo, or None to fall back to the userinfo endpoint
+        """
+        try:
+            claims = await get_oidc_provider(config["issuer"]).verify_id_token(
+                id_token, config["client_id"], access_token=access_token
+            )
+        except OIDCVerificationError as e:
+            logger.warning(
+                "ID token verification failed, using userinfo",
+                provider=provider,
+                error=str(e),
+            )
+            return None
+
+        if not claims.get("email"):
+            return None
+
+        return OAuthUserInfo(
+            id=claims["sub"],
+            email=claims["email"],
+            name=claims.get("name", ""),
+            picture=claims.get("picture"),
+            email_verified=claims.get("email_verified", False),
+            provider=OAuthProvider(provider),
+        )
 
     async def _find_or_create_oauth_user(
         self, provider: str, user_info: OAuthUserInfo
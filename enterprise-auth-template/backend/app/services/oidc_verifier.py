@@ -0,0 +1,291 @@
+"""
+OIDC ID Token Verification
+
+Verifies OpenID Connect ID tokens locally against the provider's
+published signing keys, so an OAuth login can take the user's identity
+from the ID token instead of a separate userinfo request.
+
+The discovery document and the JWKS are cached in-process. Shortly before
+a document expires it is refreshed in the background while callers keep
+getting the cached copy; concurrent fetches of the same document are
+coalesced into one request. A token signed with an unknown key id forces
+one JWKS refresh (key rotation), at most once a minute. If the provider
+cannot be reached, a stale document is used until it can be.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+from jose import JWTError, jwt
+
+from app.core.config import get_settings
+from app.core.http_clients import HttpClientRegistry, http_clients
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+DISCOVERY_TTL = getattr(settings, "OIDC_DISCOVERY_TTL", 86400)
+JWKS_TTL = getattr(settings, "OIDC_JWKS_TTL", 3600)
+JWKS_MIN_REFRESH_INTERVAL = 60
+CLOCK_SKEW_SECONDS = 60
+# Share of a document's lifetime after which it is refreshed in the background
+REFRESH_AHEAD = 0.2
+
+# Only asymmetric signatures; never "none" or HMAC with a public key
+SIGNING_ALGORITHMS = frozenset(
+    {"RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512"}
+)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class OIDCVerificationError(Exception):
+    """Raised when an ID token cannot be verified."""
+
+    pass
+
+
+@dataclass
+class _CachedDocument:
+    value: Dict[str, Any]
+    expires_at: float
+    refresh_at: float
+
+
+class OIDCProvider:
+    """Cached discovery document and signing keys of one OIDC issuer."""
+
+    def __init__(
+        self,
+        issuer: str,
+        http: Optional[HttpClientRegistry] = None,
+        discovery_ttl: float = DISCOVERY_TTL,
+        jwks_ttl: float = JWKS_TTL,
+    ) -> None:
+        self.issuer = issuer.rstrip("/")
+        self.http = http or http_clients
+        self.discovery_ttl = discovery_ttl
+        self.jwks_ttl = jwks_ttl
+        self._documents: Dict[str, _CachedDocument] = {}
+        self._fetches: Dict[str, asyncio.Task] = {}
+        self._forced_jwks_at = float("-inf")
+
+    async def metadata(self) -> Dict[str, Any]:
+        """The issuer's discovery document."""
+        return await self._get("discovery", self._fetch_discovery)
+
+    async def jwks(self, force: bool = False) -> Dict[str, Any]:
+        """The issuer's signing keys."""
+        if not force:
+            return await self._get("jwks", self._fetch_jwks)
+        try:
+            return await self._fetch_once("jwks", self._fetch_jwks)
+        except OIDCVerificationError:
+            raise
+        except Exception as e:
+            raise OIDCVerificationError(
+                f"Failed to fetch OIDC jwks for {self.issuer}: {e}"
+            )
+
+    async def verify_id_token(
+        self,
+        id_token: str,
+        client_id: str,
+        access_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Verify an ID token's signature and claims.
+
+        Args:
+            id_token: Compact JWS from the token response
+            client_id: Expected audience
+            access_token: Access token from the same response, checked
+                against ``at_hash`` when the token carries one
+
+        Returns:
+            Dict[str, Any]: Verified claims
+
+        Raises:
+            OIDCVerificationError: If the token is invalid or the
+                provider's keys are unavailable
+        """
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except JWTError as e:
+            raise OIDCVerificationError(f"Malformed ID token: {e}")
+
+        algorithm = header.get("alg")
+        if algorithm not in SIGNING_ALGORITHMS:
+            raise OIDCVerificationError(f"Unsupported ID token algorithm: {algorithm}")
+
+        metadata = await self.metadata()
+        supported = metadata.get("id_token_signing_alg_values_supported")
+        if supported and algorithm not in supported:
+            raise OIDCVerificationError(f"Algorithm {algorithm} not used by issuer")
+
+        kid = header.get("kid")
+        key = _find_key(await self.jwks(), kid, algorithm)
+        if key is None and self._may_force_jwks_refresh():
+            # Unknown key id: the provider may have rotated its keys
+            key = _find_key(await self.jwks(force=True), kid, algorithm)
+        if key is None:
+            raise OIDCVerificationError(f"No signing key matches kid {kid}")
+
+        try:
+            claims = jwt.decode(
+                id_token,
+                key,
+                algorithms=[algorithm],
+                audience=client_id,
+                issuer=metadata["issuer"],
+                access_token=access_token,
+                options={"leeway": CLOCK_SKEW_SECONDS},
+            )
+        except JWTError as e:
+            raise OIDCVerificationError(f"Invalid ID token: {e}")
+
+        azp = claims.get("azp")
+        if azp is not None and azp != client_id:
+            raise OIDCVerificationError("ID token was issued to another client")
+
+        return claims
+
+    def _may_force_jwks_refresh(self) -> bool:
+        now = time.monotonic()
+        if now - self._forced_jwks_at < JWKS_MIN_REFRESH_INTERVAL:
+            return False
+        self._forced_jwks_at = now
+        return True
+
+    async def _get(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Tuple[Dict[str, Any], float]]],
+    ) -> Dict[str, Any]:
+        cached = self._documents.get(name)
+        now = time.monotonic()
+
+        if cached is not None and now < cached.expires_at:
+            if now >= cached.refresh_at:
+                self._start_fetch(name, fetch)
+            return cached.value
+
+        try:
+            return await self._fetch_once(name, fetch)
+        except Exception as e:
+            if cached is not None:
+                logger.warning(
+                    "Using stale OIDC document",
+                    issuer=self.issuer,
+                    document=name,
+                    error=str(e),
+                )
+                return cached.value
+            raise OIDCVerificationError(
+                f"Failed to fetch OIDC {name} for {self.issuer}: {e}"
+            )
+
+    async def _fetch_once(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Tuple[Dict[str, Any], float]]],
+    ) -> Dict[str, Any]:
+        # Shielded so a caller that gives up does not cancel a shared fetch
+        return await asyncio.shield(self._start_fetch(name, fetch))
+
+    def _start_fetch(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Tuple[Dict[str, Any], float]]],
+    ) -> asyncio.Task:
+        task = self._fetches.get(name)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(name, fetch))
+            task.add_done_callback(_consume_exception)
+            self._fetches[name] = task
+        return task
+
+    async def _refresh(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Tuple[Dict[str, Any], float]]],
+    ) -> Dict[str, Any]:
+        value, ttl = await fetch()
+        now = time.monotonic()
+        self._documents[name] = _CachedDocument(
+            value=value,
+            expires_at=now + ttl,
+            refresh_at=now + ttl * (1 - REFRESH_AHEAD),
+        )
+        logger.debug("OIDC document refreshed", issuer=self.issuer, document=name)
+        return value
+
+    async def _fetch_discovery(self) -> Tuple[Dict[str, Any], float]:
+        response = await self.http.get(
+            f"{self.issuer}/.well-known/openid-configuration",
+            headers={"Accept": "application/json"},
+        )
+        response.raise_for_status()
+        document = response.json()
+        if document.get("issuer", "").rstrip("/") != self.issuer:
+            raise OIDCVerificationError("Discovery document issuer mismatch")
+        if not document.get("jwks_uri"):
+            raise OIDCVerificationError("Discovery document has no jwks_uri")
+        return document, _max_age(response, self.discovery_ttl)
+
+    async def _fetch_jwks(self) -> Tuple[Dict[str, Any], float]:
+        metadata = await self.metadata()
+        response = await self.http.get(
+            metadata["jwks_uri"], headers={"Accept": "application/json"}
+        )
+        response.raise_for_status()
+        return response.json(), _max_age(response, self.jwks_ttl)
+
+
+def _find_key(
+    jwks: Dict[str, Any], kid: Optional[str], algorithm: str
+) -> Optional[Dict[str, Any]]:
+    """Signing key for ``kid``, or the only usable key if the token has none."""
+    keys = [
+        key
+        for key in jwks.get("keys", [])
+        if key.get("use", "sig") == "sig" and key.get("alg", algorithm) == algorithm
+    ]
+    if kid is None:
+        return keys[0] if len(keys) == 1 else None
+    return next((key for key in keys if key.get("kid") == kid), None)
+
+
+def _max_age(response: Any, default: float) -> float:
+    """Lifetime from Cache-Control, capped at ``default``."""
+    match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+    if match:
+        return max(min(float(match.group(1)), default), JWKS_MIN_REFRESH_INTERVAL)
+    return default
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("OIDC document refresh failed", error=str(task.exception()))
+
+
+_providers: Dict[str, OIDCProvider] = {}
+
+
+def get_oidc_provider(issuer: str) -> OIDCProvider:
+    """Process-wide cache for an issuer."""
+    provider = _providers.get(issuer)
+    if provider is None:
+        provider = _providers[issuer] = OIDCProvider(issuer)
+    return provider
+
+
+__all__ = [
+    "OIDCProvider",
+    "OIDCVerificationError",
+    "get_oidc_provider",
+]
@@ -5,10 +5,15 @@ Provides comprehensive search capabilities across all application data with
 full-text search, filtering, faceting, and analytics.
 """
 
+import asyncio
+import copy
+import hashlib
+import heapq
 import json
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Union
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 from uuid import uuid4
 from enum import Enum
 
@@ -25,23 +30,67 @@ from sqlalchemy import (
     String,
     Integer,
     DateTime,
+    literal_column,
 )
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core import database
 from app.core.config import get_settings
 from app.core.events import EventEmitter, Event
+from app.core.pagination import (
+    COUNT_CACHED,
+    COUNT_ESTIMATED,
+    COUNT_EXACT,
+    COUNT_NONE,
+    InvalidCursorError,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    paginate_keyset,
+)
 from app.models.user import User
 from app.models.role import Role
 from app.models.audit import AuditLog
 from app.models.session import UserSession
 from app.models.notification import Notification
 from app.models.webhook import WebhookDelivery
+from app.services.autocomplete_index import autocomplete_index
 from app.services.cache_service import CacheService
 
 settings = get_settings()
 logger = structlog.get_logger(__name__)
 
+# Text search configuration used by the generated search_vector columns
+TS_CONFIG = literal_column("'simple'::regconfig")
+
+_TSQUERY_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """
+    Build a ``to_tsquery`` expression matching every term as a prefix.
+
+    Only word characters are kept, so user input can never produce tsquery
+    syntax errors: ``"john smi"`` becomes ``"john:* & smi:*"``.
+
+    Args:
+        query: Raw search query
+
+    Returns:
+        Optional[str]: tsquery text, or None if the query has no words
+    """
+    terms = _TSQUERY_TERM.findall(query.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _is_nullable(attribute: Any) -> bool:
+    """Whether a mapped attribute may be NULL (non-columns count as nullable)."""
+    return getattr(getattr(attribute, "expression", None), "nullable", True)
+
 
 class SearchScope(str, Enum):
     """Available search scopes."""
@@ -54,6 +103,21 @@ class SearchScope(str, Enum):
     ALL = "all"
 
 
+def _merge_key(key: Tuple[Any, Any], scope: SearchScope) -> Tuple:
+    """
+    Comparable cross-scope ordering key for a (sort value, id) pair.
+
+    NULLs sort after all values, as in PostgreSQL, naive datetimes are
+    taken as UTC, and scope plus id break ties deterministically.
+    """
+    value, row_id = key
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    if value is None:
+        return (1, 0, scope.value, str(row_id))
+    return (0, value, scope.value, str(row_id))
+
+
 class SearchOperator(str, Enum):
     """Search operators for query building."""
 
@@ -115,6 +179,7 @@ class SearchService:
         session: AsyncSession,
         cache_service: Optional[CacheService] = None,
         event_emitter: Optional[EventEmitter] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
     ) -> None:
         """
         Initialize search service.
@@ -123,15 +188,22 @@ class SearchService:
             session: Database session
             cache_service: Cache service for performance optimization
             event_emitter: Event emitter for audit logging
+            session_factory: Factory for the extra sessions used to query
+                scopes concurrently (defaults to the application's pool)
         """
         self.session = session
+        self.session_factory = session_factory
         self.cache_service = cache_service or CacheService()
         self.event_emitter = event_emitter or EventEmitter()
 
         # Search configuration
         self.max_results = getattr(settings, "MAX_SEARCH_RESULTS", 1000)
+        self.max_parallel_scopes = getattr(settings, "SEARCH_MAX_PARALLEL_SCOPES", 5)
         self.default_page_size = getattr(settings, "DEFAULT_SEARCH_PAGE_SIZE", 20)
         self.cache_ttl = getattr(settings, "SEARCH_CACHE_TTL", 300)  # 5 minutes
+        self.facet_cache_ttl = getattr(settings, "SEARCH_FACET_CACHE_TTL", 60)
+        self.facet_limit = getattr(settings, "SEARCH_FACET_LIMIT", 20)
+        self.autocomplete_index = autocomplete_index
 
         # Model mappings for search scopes
         self.scope_models = {
@@ -190,6 +262,14 @@ class SearchService:
             ],
         }
 
+        # Scopes with an indexed search_vector column and the pg_trgm indexed
+        # fields used for fuzzy matching (migration 010_add_search_indexes)
+        self.full_text_enabled = getattr(settings, "SEARCH_FULL_TEXT_ENABLED", True)
+        self.trigram_fields = {
+            SearchScope.USERS: ["email", "full_name"],
+            SearchScope.AUDIT_LOGS: ["user_email", "ip_address"],
+        }
+
     async def search(
         self,
         query: str,
@@ -202,6 +282,8 @@ class SearchService:
         facets: Optional[List[str]] = None,
         user_id: Optional[str] = None,
         include_analytics: bool = False,
+        cursor: Optional[str] = None,
+        count_mode: str = COUNT_EXACT,
     ) -> Dict[str, Any]:
         """
         Perform comprehensive search across specified scopes.
@@ -217,6 +299,9 @@ class SearchService:
             facets: Fields to generate facets for
             user_id: User ID for permission checking and analytics
             include_analytics: Whether to include search analytics
+            cursor: ``next_cursor`` of the previous page; replaces ``page``
+                for keyset pagination of single-scope searches
+            count_mode: ``exact``, ``estimated``, ``cached`` or ``none``
 
         Returns:
             Dict: Search results with metadata
@@ -244,52 +329,71 @@ class SearchService:
             cache_key = self._generate_cache_key(
                 query, scope, filters, sort, page, page_size
             )
-
-            # Try to get cached results
-            cached_results = await self.cache_service.get(cache_key)
-            if cached_results and not include_analytics:
-                results = json.loads(cached_results)
-                await self._log_search_event(
-                    query, scope, user_id, len(results.get("items", [])), True
+            if cursor or count_mode != COUNT_EXACT:
+                cache_key += f":c:{cursor or ''}:{count_mode}"
+
+            computed = False
+
+            async def run_search() -> Dict[str, Any]:
+                nonlocal computed
+                computed = True
+                search_results = await self._execute_search(
+                    query,
+                    scope,
+                    filters,
+                    sort,
+                    offset,
+                    page_size,
+                    highlight,
+                    facets,
+                    cursor=cursor,
+                    count_mode=count_mode,
                 )
-                return results
-
-            # Execute search
-            search_results = await self._execute_search(
-                query, scope, filters, sort, offset, page_size, highlight, facets
-            )
-
-            # Build response
-            response = {
-                "query": query,
-                "scope": scope.value,
-                "page": page,
-                "page_size": page_size,
-                "total_results": search_results["total_count"],
-                "total_pages": (search_results["total_count"] + page_size - 1)
-                // page_size,
-                "items": search_results["items"],
-                "facets": search_results.get("facets", {}),
-                "suggestions": search_results.get("suggestions", []),
-                "search_time_ms": search_results["search_time_ms"],
-                "cached": False,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
+                total_count = search_results["total_count"]
+
+                response = {
+                    "query": query,
+                    "scope": scope.value,
+                    "page": page,
+                    "page_size": page_size,
+                    "total_results": total_count,
+                    "total_is_estimate": count_mode in (COUNT_ESTIMATED, COUNT_CACHED),
+                    "total_pages": (
+                        (total_count + page_size - 1) // page_size
+                        if total_count is not None
+                        else None
+                    ),
+                    "next_cursor": search_results.get("next_cursor"),
+                    "items": search_results["items"],
+                    "facets": search_results.get("facets", {}),
+                    "suggestions": search_results.get("suggestions", []),
+                    "search_time_ms": search_results["search_time_ms"],
+                    "cached": False,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+                # Same shape a cache hit returns
+                return json.loads(json.dumps(response, default=str))
 
-            # Add analytics if requested
             if include_analytics:
+                response = await run_search()
                 response["analytics"] = await self._get_search_analytics(
                     query, scope, user_id
                 )
-
-            # Cache results
-            await self.cache_service.set(
-                cache_key, json.dumps(response, default=str), ttl=self.cache_ttl
-            )
+                await self.cache_service.set(
+                    cache_key, json.dumps(response, default=str), ttl=self.cache_ttl
+                )
+            else:
+                # Identical concurrent searches share one execution
+                response = await self.cache_service.get_or_compute(
+                    cache_key, run_search, ttl=self.cache_ttl
+                )
 
             # Log search event
+            result_count = len(response["items"])
+            if computed:
+                result_count = response["total_results"] or result_count
             await self._log_search_event(
-                query, scope, user_id, search_results["total_count"], False
+                query, scope, user_id, result_count, not computed
             )
 
             return response
@@ -338,30 +442,34 @@ class SearchService:
             if user_id:
                 await self._check_search_permissions(user_id, scope)
 
-            # Generate cache key
-            cache_key = f"autocomplete:{scope.value}:{field}:{query.lower()}:{limit}"
-
-            # Try cached suggestions
-            cached_suggestions = await self.cache_service.get(cache_key)
-            if cached_suggestions:
-                return json.loads(cached_suggestions)
-
             # Get model for scope
             model = self.scope_models.get(scope)
             if not model:
                 raise SearchError(f"No model found for scope {scope}")
 
-            # Build autocomplete query
-            suggestions = await self._get_autocomplete_suggestions(
-                model, field, query, limit
+            # Hot values are answered from the in-memory prefix index
+            await self.autocomplete_index.schedule_refresh(
+                self.session, self._get_session_factory(), scope.value, model, field
             )
-
-            # Cache suggestions
-            await self.cache_service.set(
-                cache_key, json.dumps(suggestions, default=str), ttl=self.cache_ttl
+            suggestions = self.autocomplete_index.suggest(
+                scope.value, field, query, limit
             )
+            if suggestions is not None:
+                return suggestions
 
-            return suggestions
+            # Generate cache key
+            cache_key = f"autocomplete:{scope.value}:{field}:{query.lower()}:{limit}"
+
+            async def load_suggestions() -> List[Dict[str, Any]]:
+                suggestions = await self._get_autocomplete_suggestions(
+                    model, field, query, limit
+                )
+                return json.loads(json.dumps(suggestions, default=str))
+
+            # Keystrokes from many users for the same prefix share one query
+            return await self.cache_service.get_or_compute(
+                cache_key, load_suggestions, ttl=self.cache_ttl
+            )
 
         except (SearchValidationError, SearchError):
             raise
@@ -706,6 +814,8 @@ class SearchService:
         limit: int,
         highlight: bool,
         facets: Optional[List[str]],
+        cursor: Optional[str] = None,
+        count_mode: str = COUNT_EXACT,
     ) -> Dict[str, Any]:
         """Execute the actual search query."""
         start_time = datetime.utcnow()
@@ -714,12 +824,27 @@ class SearchService:
             if scope == SearchScope.ALL:
                 # Search across all scopes
                 results = await self._search_all_scopes(
-                    query, filters, sort, offset, limit
+                    query,
+                    filters,
+                    sort,
+                    offset,
+                    limit,
+                    cursor=cursor,
+                    count_mode=count_mode,
                 )
             else:
                 # Search specific scope
                 results = await self._search_single_scope(
-                    query, scope, filters, sort, offset, limit, highlight, facets
+                    query,
+                    scope,
+                    filters,
+                    sort,
+                    offset,
+                    limit,
+                    highlight,
+                    facets,
+                    cursor=cursor,
+                    count_mode=count_mode,
                 )
 
             search_time = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -727,6 +852,10 @@ class SearchService:
 
             return results
 
+        except SearchValidationError:
+            raise
+        except InvalidCursorError as e:
+            raise SearchValidationError(e.message)
         except Exception as e:
             logger.error(
                 "Search execution error", query=query, scope=scope.value, error=str(e)
@@ -743,12 +872,24 @@ class SearchService:
         limit: int,
         highlight: bool,
         facets: Optional[List[str]],
+        cursor: Optional[str] = None,
+        count_mode: str = COUNT_EXACT,
+        merge_field: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Search within a single scope."""
+        """
+        Search within a single scope.
+
+        The first page and cursor-addressed pages use keyset pagination on
+        the sort key (relevance rank when none is given) plus the primary
+        key; ``offset`` is only used for legacy page numbers > 1.
+        """
         model = self.scope_models.get(scope)
         if not model:
             raise SearchError(f"No model found for scope {scope}")
 
+        full_text = self._uses_full_text(model, scope)
+        rank = self._build_rank_expression(model, query, scope) if full_text else None
+
         # Build base query
         query_obj = select(model)
 
@@ -765,30 +906,43 @@ class SearchService:
             if filter_conditions:
                 query_obj = query_obj.where(and_(*filter_conditions))
 
-        # Get total count
-        count_query = select(func.count()).select_from(query_obj.subquery())
-        count_result = await self.session.execute(count_query)
-        total_count = count_result.scalar()
-
-        # Add sorting
-        if sort:
-            for sort_item in sort:
-                field = sort_item["field"]
-                direction = sort_item.get("direction", SortOrder.ASC)
-
-                if hasattr(model, field):
-                    model_field = getattr(model, field)
-                    if direction == SortOrder.DESC:
-                        query_obj = query_obj.order_by(desc(model_field))
-                    else:
-                        query_obj = query_obj.order_by(asc(model_field))
+        keyset = self._keyset_for(model, scope, sort, rank)
+        if cursor and keyset is None:
+            raise SearchValidationError(
+                "Cursor pagination requires sort fields with a single direction"
+            )
 
-        # Add pagination
-        query_obj = query_obj.offset(offset).limit(limit)
+        count_cache_key = ":".join(
+            [
+                "search",
+                scope.value,
+                query.lower(),
+                _stable_hash(json.dumps(filters, sort_keys=True, default=str)),
+            ]
+        )
 
-        # Execute query
-        result = await self.session.execute(query_obj)
-        items = result.scalars().all()
+        next_cursor = None
+        if keyset and (cursor or not offset):
+            columns, descending, key = keyset
+            page = await paginate_keyset(
+                self.session,
+                query_obj,
+                columns,
+                limit,
+                cursor=cursor,
+                descending=descending,
+                count_mode=count_mode,
+                count_cache_key=count_cache_key,
+                cache_service=self.cache_service,
+                key=key,
+            )
+            items = page.items
+            total_count = page.total
+            next_cursor = page.next_cursor
+        else:
+            items, total_count = await self._search_offset_page(
+                model, query_obj, sort, rank, offset, limit, count_mode, count_cache_key
+            )
 
         # Convert to dictionaries
         items_data = []
@@ -807,16 +961,103 @@ class SearchService:
         facets_data = {}
         if facets:
             facets_data = await self._generate_facets(
-                model, facets, search_conditions, filters
+                model, facets, query_obj.whereclause, count_cache_key
             )
 
-        return {
+        results = {
             "items": items_data,
             "total_count": total_count,
+            "next_cursor": next_cursor,
             "facets": facets_data,
             "suggestions": await self._generate_suggestions(query, scope),
         }
 
+        # Raw ordering keys for merging with other scopes
+        if merge_field:
+            results["merge_keys"] = [
+                (getattr(item, merge_field), item.id) for item in items
+            ]
+
+        return results
+
+    def _keyset_for(
+        self,
+        model,
+        scope: SearchScope,
+        sort: Optional[List[Dict[str, str]]],
+        rank,
+    ) -> Optional[Tuple[List[Any], bool, str]]:
+        """
+        Keyset columns, direction and cursor key for a search ordering.
+
+        Returns None when the requested sort mixes directions or includes
+        nullable columns, neither of which a single row comparison can
+        page through correctly.
+        """
+        if sort:
+            fields = [item for item in sort if hasattr(model, item["field"])]
+            directions = {
+                item.get("direction", SortOrder.ASC) == SortOrder.DESC
+                for item in fields
+            }
+            if len(directions) > 1 or any(
+                _is_nullable(getattr(model, item["field"])) for item in fields
+            ):
+                return None
+            descending = directions.pop() if directions else True
+            names = [item["field"] for item in fields if item["field"] != "id"]
+            columns = [getattr(model, name) for name in names]
+        elif rank is not None:
+            descending = True
+            names = ["_rank"]
+            columns = [rank]
+        else:
+            descending = True
+            names = [
+                name for name in ("created_at", "timestamp") if hasattr(model, name)
+            ][:1]
+            columns = [getattr(model, name) for name in names]
+
+        return columns + [model.id], descending, ",".join([scope.value] + names)
+
+    async def _search_offset_page(
+        self,
+        model,
+        query_obj,
+        sort: Optional[List[Dict[str, str]]],
+        rank,
+        offset: int,
+        limit: int,
+        count_mode: str,
+        count_cache_key: str,
+    ) -> Tuple[List[Any], Optional[int]]:
+        """Legacy OFFSET/LIMIT page for page numbers without a cursor."""
+        if sort:
+            for sort_item in sort:
+                field = sort_item["field"]
+                direction = sort_item.get("direction", SortOrder.ASC)
+
+                if hasattr(model, field):
+                    model_field = getattr(model, field)
+                    if direction == SortOrder.DESC:
+                        query_obj = query_obj.order_by(desc(model_field))
+                    else:
+                        query_obj = query_obj.order_by(asc(model_field))
+        elif rank is not None:
+            query_obj = query_obj.order_by(desc(rank))
+
+        result = await self.session.execute(query_obj.offset(offset).limit(limit))
+        items = result.scalars().all()
+
+        total_count = await count_rows(
+            self.session,
+            query_obj,
+            count_mode,
+            cache_key=count_cache_key,
+            cache_service=self.cache_service,
+        )
+        return items, total_count
+
     async def _search_all_scopes(
         self,
         query: str,
@@ -824,59 +1065,273 @@ class SearchService:
         sort: Optional[List[Dict[str, str]]],
         offset: int,
         limit: int,
+        cursor: Optional[str] = None,
+        count_mode: str = COUNT_EXACT,
     ) -> Dict[str, Any]:
-        """Search across all scopes."""
-        all_results = []
-        total_count = 0
-
-        # Search each scope
-        for scope in [
-            SearchScope.USERS,
-            SearchScope.AUDIT_LOGS,
-            SearchScope.SESSIONS,
-            SearchScope.NOTIFICATIONS,
-            SearchScope.WEBHOOKS,
-        ]:
-            try:
-                scope_results = await self._search_single_scope(
-                    query, scope, filters, sort, 0, limit, False, None
-                )
+        """
+        Search across all scopes.
+
+        Scopes are queried concurrently, each on its own session, as ordered
+        streams on a common key (the first sort field, or recency). The
+        streams are combined with a k-way heap merge and the page is cut
+        from the merged order. The returned cursor records how far each
+        scope was consumed, so every page costs at most ``limit`` rows per
+        scope; legacy offsets fetch ``offset + limit`` rows per scope.
+        """
+        sort_field = sort[0]["field"] if sort else None
+        descending = (
+            sort[0].get("direction", SortOrder.ASC) == SortOrder.DESC if sort else True
+        )
+        direction = SortOrder.DESC if descending else SortOrder.ASC
 
-                # Add scope information to each item
-                for item in scope_results["items"]:
-                    item["_scope"] = scope.value
+        # Per-scope ordering field; scopes without the sort field are skipped
+        scope_fields = {}
+        for scope, model in self.scope_models.items():
+            field = sort_field or (
+                "timestamp" if hasattr(model, "timestamp") else "created_at"
+            )
+            if hasattr(model, field):
+                scope_fields[scope] = field
+
+        # Nullable or otherwise unkeyable sort fields page by offset only
+        pageable = all(
+            self._keyset_for(
+                self.scope_models[scope],
+                scope,
+                [{"field": field, "direction": direction}],
+                None,
+            )
+            is not None
+            for scope, field in scope_fields.items()
+        )
+        if cursor and not pageable:
+            raise SearchValidationError(
+                "Cursor pagination requires sort fields with a single direction"
+            )
 
-                all_results.extend(scope_results["items"])
-                total_count += scope_results["total_count"]
+        positions, finished_total = self._decode_all_scopes_cursor(
+            cursor, sort_field, direction
+        )
+        if positions is None:
+            positions = {scope: None for scope in scope_fields}
+        fetch = limit if cursor else min(offset + limit, self.max_results)
 
-            except Exception as e:
-                logger.warning(f"Failed to search scope {scope}: {str(e)}")
-                continue
+        async def search_scope(scope: SearchScope) -> Optional[Dict[str, Any]]:
+            scope_sort = [{"field": scope_fields[scope], "direction": direction}]
+            async with self._scope_service() as service:
+                try:
+                    return await service._search_single_scope(
+                        query,
+                        scope,
+                        filters,
+                        scope_sort,
+                        0,
+                        fetch,
+                        False,
+                        None,
+                        cursor=positions[scope],
+                        count_mode=count_mode,
+                        merge_field=scope_fields[scope],
+                    )
+                except (SearchValidationError, InvalidCursorError):
+                    raise
+                except Exception as e:
+                    logger.warning(f"Failed to search scope {scope}: {str(e)}")
+                    return None
 
-        # Sort combined results if specified
-        if sort and all_results:
-            sort_field = sort[0]["field"]
-            sort_direction = sort[0].get("direction", SortOrder.ASC)
-            reverse = sort_direction == SortOrder.DESC
+        scopes = [scope for scope in scope_fields if scope in positions]
+        scope_results = dict(
+            zip(scopes, await self._gather_scopes(search_scope, scopes))
+        )
 
-            try:
-                all_results.sort(key=lambda x: x.get(sort_field, ""), reverse=reverse)
-            except Exception:
-                # If sorting fails, keep original order
-                pass
+        # k-way merge of the per-scope ordered streams
+        streams = []
+        for scope, results in scope_results.items():
+            if not results:
+                continue
+            streams.append(
+                [
+                    (_merge_key(key, scope), scope, key, item)
+                    for key, item in zip(results["merge_keys"], results["items"])
+                ]
+            )
+        merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=descending)
+
+        skip = 0 if cursor else offset
+        page_items = []
+        last_consumed: Dict[SearchScope, Tuple[Any, Any]] = {}
+        consumed = {scope: 0 for scope in scope_results}
+        for index, (_, scope, key, item) in enumerate(merged):
+            if index >= skip + limit:
+                break
+            last_consumed[scope] = key
+            consumed[scope] += 1
+            if index >= skip:
+                item["_scope"] = scope.value
+                page_items.append(item)
+
+        # Cursor: position after the last consumed row of each scope
+        next_positions = {}
+        for scope, results in scope_results.items():
+            if not results:
+                continue
+            if consumed[scope] < len(results["items"]) or results.get("next_cursor"):
+                if scope in last_consumed and pageable:
+                    next_positions[scope] = self._scope_cursor(
+                        scope, scope_fields[scope], last_consumed[scope], direction
+                    )
+                else:
+                    next_positions[scope] = positions[scope]
+
+        # Totals of exhausted scopes are carried forward in the cursor
+        totals = {
+            scope: results["total_count"]
+            for scope, results in scope_results.items()
+            if results and results["total_count"] is not None
+        }
+        finished_total += sum(
+            total for scope, total in totals.items() if scope not in next_positions
+        )
+
+        next_cursor = None
+        if next_positions and pageable:
+            entries = [
+                [scope.value, position] for scope, position in next_positions.items()
+            ]
+            next_cursor = encode_cursor(
+                self._all_scopes_cursor_key(sort_field, direction),
+                [entries, finished_total],
+            )
 
-        # Apply pagination
-        paginated_results = all_results[offset : offset + limit]
+        total_count = None
+        if count_mode != COUNT_NONE and (totals or finished_total):
+            total_count = finished_total + sum(
+                total for scope, total in totals.items() if scope in next_positions
+            )
 
         return {
-            "items": paginated_results,
+            "items": page_items,
             "total_count": total_count,
+            "next_cursor": next_cursor,
             "facets": {},
             "suggestions": [],
         }
 
+    async def _gather_scopes(self, search_scope, scopes: List[SearchScope]) -> List:
+        """Run per-scope searches concurrently when separate sessions exist."""
+        if self._get_session_factory() is None:
+            # A single AsyncSession cannot run queries concurrently
+            return [await search_scope(scope) for scope in scopes]
+
+        semaphore = asyncio.Semaphore(self.max_parallel_scopes)
+
+        async def bounded(scope: SearchScope):
+            async with semaphore:
+                return await search_scope(scope)
+
+        return await asyncio.gather(*(bounded(scope) for scope in scopes))
+
+    def _get_session_factory(self) -> Optional[Callable[[], AsyncSession]]:
+        if self.session_factory is not None:
+            return self.session_factory
+        if isinstance(self.session, AsyncSession):
+            return database.async_session_maker
+        return None
+
+    @asynccontextmanager
+    async def _scope_service(self):
+        """Yield a copy of this service bound to its own pooled session."""
+        factory = self._get_session_factory()
+        if factory is None:
+            yield self
+            return
+
+        async with factory() as session:
+            scoped = copy.copy(self)
+            scoped.session = session
+            yield scoped
+
+    def _scope_cursor(
+        self,
+        scope: SearchScope,
+        field: str,
+        merge_key: Tuple[Any, Any],
+        direction: SortOrder,
+    ) -> str:
+        """Single-scope cursor positioned after the given row."""
+        model = self.scope_models[scope]
+        _, _, key = self._keyset_for(
+            model, scope, [{"field": field, "direction": direction}], None
+        )
+        value, row_id = merge_key
+        values = [row_id] if field == "id" else [value, row_id]
+        return encode_cursor(key, values)
+
+    @staticmethod
+    def _all_scopes_cursor_key(sort_field: Optional[str], direction: SortOrder) -> str:
+        return f"all:{sort_field or '_recency'}:{direction.value}"
+
+    def _decode_all_scopes_cursor(
+        self, cursor: Optional[str], sort_field: Optional[str], direction: SortOrder
+    ) -> Tuple[Optional[Dict[SearchScope, Optional[str]]], int]:
+        """
+        Per-scope cursors of a cross-scope cursor (absent scopes are done)
+        and the carried total of the exhausted scopes.
+        """
+        if not cursor:
+            return None, 0
+        try:
+            entries, finished_total = decode_cursor(
+                cursor, self._all_scopes_cursor_key(sort_field, direction), 2
+            )
+            positions = {SearchScope(scope): position for scope, position in entries}
+            return positions, int(finished_total)
+        except InvalidCursorError:
+            raise
+        except Exception:
+            raise InvalidCursorError("Invalid pagination cursor")
+
+    def _dialect_name(self) -> Optional[str]:
+        """Name of the database dialect behind the session, if known."""
+        try:
+            return self.session.get_bind().dialect.name
+        except Exception:
+            return None
+
+    def _uses_full_text(self, model, scope: SearchScope) -> bool:
+        """Check whether a scope can be served by the PostgreSQL search indexes."""
+        if not self.full_text_enabled or not hasattr(model, "search_vector"):
+            return False
+
+        return self._dialect_name() == "postgresql"
+
     async def _build_search_conditions(self, model, query: str, scope: SearchScope):
-        """Build search conditions for full-text search."""
+        """
+        Build search conditions for full-text search.
+
+        Scopes with a ``search_vector`` column match prefix terms against
+        its GIN index and fall back to pg_trgm similarity and substring
+        matches (also GIN indexed) for typos and partial emails. Other
+        scopes use ILIKE per string field.
+        """
+        if self._uses_full_text(model, scope):
+            conditions = []
+            tsquery = build_prefix_tsquery(query)
+            if tsquery:
+                conditions.append(
+                    model.search_vector.bool_op("@@")(
+                        func.to_tsquery(TS_CONFIG, tsquery)
+                    )
+                )
+
+            term = query.strip()
+            for field_name in self.trigram_fields.get(scope, []):
+                field = getattr(model, field_name)
+                conditions.append(field.bool_op("%")(term))
+                conditions.append(field.ilike(f"%{term}%"))
+
+            return conditions
+
         conditions = []
         search_fields = self.searchable_fields.get(scope, [])
 
@@ -894,6 +1349,28 @@ class SearchService:
 
         return conditions
 
+    def _build_rank_expression(self, model, query: str, scope: SearchScope):
+        """Relevance score: weighted tsvector rank plus best trigram similarity."""
+        term = query.strip()
+        similarities = [
+            func.similarity(getattr(model, field_name), term)
+            for field_name in self.trigram_fields.get(scope, [])
+        ]
+        similarity = (
+            func.coalesce(func.greatest(*similarities), 0)
+            if similarities
+            else literal_column("0")
+        )
+
+        tsquery = build_prefix_tsquery(query)
+        if not tsquery:
+            return similarity
+
+        return (
+            func.ts_rank_cd(model.search_vector, func.to_tsquery(TS_CONFIG, tsquery))
+            + similarity
+        )
+
     async def _build_filter_conditions(
         self, model, filters: List[Dict[str, Any]], scope: SearchScope
     ):
@@ -948,8 +1425,13 @@ class SearchService:
     async def _model_to_dict(self, model_instance) -> Dict[str, Any]:
         """Convert SQLAlchemy model instance to dictionary."""
         result = {}
+        # Deferred columns such as search_vector would lazy-load here
+        unloaded = sa_inspect(model_instance).unloaded
 
         for column in model_instance.__table__.columns:
+            if column.key in unloaded:
+                continue
+
             value = getattr(model_instance, column.name)
 
             # Convert datetime to ISO format
@@ -990,54 +1472,129 @@ class SearchService:
         self,
         model,
         facet_fields: List[str],
-        search_conditions,
-        filters: Optional[List[Dict[str, Any]]],
+        whereclause,
+        cache_key: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Generate facets for search results."""
-        facets = {}
+        """
+        Generate facets for search results.
 
-        for field_name in facet_fields:
-            if hasattr(model, field_name):
-                field = getattr(model, field_name)
+        On PostgreSQL all facet fields are counted in one scan with
+        ``GROUP BY GROUPING SETS``; results are cached briefly per search.
+        """
+        fields = [name for name in facet_fields if hasattr(model, name)]
+        if not fields:
+            return {}
 
-                # Build facet query
-                facet_query = select(field, func.count().label("count")).group_by(field)
+        if cache_key:
+            cache_key = f"facets:{cache_key}:{','.join(fields)}"
+            try:
+                cached = await self.cache_service.get(cache_key)
+                if cached:
+                    return json.loads(cached)
+            except Exception as e:
+                logger.debug("Facet cache read failed", error=str(e))
 
-                # Apply search conditions
-                if search_conditions:
-                    facet_query = facet_query.where(or_(*search_conditions))
+        if self._dialect_name() == "postgresql":
+            try:
+                facets = await self._grouped_facets(model, fields, whereclause)
+            except Exception as e:
+                logger.warning("Failed to generate facets", error=str(e))
+                facets = {name: [] for name in fields}
+        else:
+            facets = {}
+            for field_name in fields:
+                facets[field_name] = await self._single_facet(
+                    model, field_name, whereclause
+                )
 
-                # Apply existing filters (except for the faceted field)
-                if filters:
-                    filter_conditions = []
-                    for filter_item in filters:
-                        if filter_item["field"] != field_name:
-                            # Add other filters
-                            pass  # Simplified for now
+        if cache_key:
+            try:
+                await self.cache_service.set(
+                    cache_key,
+                    json.dumps(facets, default=str),
+                    ttl=self.facet_cache_ttl,
+                )
+            except Exception as e:
+                logger.debug("Facet cache write failed", error=str(e))
 
-                    if filter_conditions:
-                        facet_query = facet_query.where(and_(*filter_conditions))
+        return facets
 
-                # Execute facet query
-                try:
-                    result = await self.session.execute(facet_query.limit(20))
-                    facet_values = []
+    def _build_grouped_facet_query(self, model, fields: List[str], whereclause):
+        """
+        One ``GROUPING SETS`` query counting every facet field.
 
-                    for row in result:
-                        facet_values.append({"value": row[0], "count": row[1]})
+        ``GROUPING(f1, ..., fn)`` tells the sets apart and a window rank keeps
+        the top ``facet_limit`` values of each.
+        """
+        columns = [
+            getattr(model, name).label(f"_f{i}") for i, name in enumerate(fields)
+        ]
+        expressions = [getattr(model, name) for name in fields]
+
+        counts = select(
+            *columns,
+            func.grouping(*expressions).label("_set"),
+            func.count().label("count"),
+        ).group_by(func.grouping_sets(*expressions))
+        if whereclause is not None:
+            counts = counts.where(whereclause)
+        counts = counts.subquery()
+
+        ranked = select(
+            counts,
+            func.row_number()
+            .over(partition_by=counts.c._set, order_by=counts.c["count"].desc())
+            .label("_rank"),
+        ).subquery()
+
+        return select(ranked).where(ranked.c._rank <= self.facet_limit)
+
+    async def _grouped_facets(
+        self, model, fields: List[str], whereclause
+    ) -> Dict[str, Any]:
+        """Run the grouped facet query and split rows back into fields."""
+        result = await self.session.execute(
+            self._build_grouped_facet_query(model, fields, whereclause)
+        )
 
-                    facets[field_name] = sorted(
-                        facet_values, key=lambda x: x["count"], reverse=True
-                    )
+        # GROUPING() sets a bit for every column not grouped in the row, with
+        # the first argument as the most significant bit
+        all_bits = (1 << len(fields)) - 1
+        set_fields = {
+            all_bits ^ (1 << (len(fields) - 1 - i)): i for i in range(len(fields))
+        }
 
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to generate facet for {field_name}: {str(e)}"
-                    )
-                    facets[field_name] = []
+        facets = {name: [] for name in fields}
+        for row in result.mappings():
+            i = set_fields.get(row["_set"])
+            if i is not None:
+                facets[fields[i]].append(
+                    {"value": row[f"_f{i}"], "count": row["count"]}
+                )
 
+        for values in facets.values():
+            values.sort(key=lambda x: x["count"], reverse=True)
         return facets
 
+    async def _single_facet(self, model, field_name: str, whereclause) -> List:
+        """Count one facet field (databases without GROUPING SETS)."""
+        field = getattr(model, field_name)
+        facet_query = (
+            select(field, func.count().label("count"))
+            .group_by(field)
+            .order_by(desc("count"))
+            .limit(self.facet_limit)
+        )
+        if whereclause is not None:
+            facet_query = facet_query.where(whereclause)
+
+        try:
+            result = await self.session.execute(facet_query)
+            return [{"value": row[0], "count": row[1]} for row in result]
+        except Exception as e:
+            logger.warning(f"Failed to generate facet for {field_name}: {str(e)}")
+            return []
+
     async def _generate_suggestions(self, query: str, scope: SearchScope) -> List[str]:
         """Generate search suggestions."""
         # In production, this would use sophisticated suggestion algorithms
@@ -1168,14 +1725,19 @@ class SearchService:
 
         if filters:
             filters_str = json.dumps(filters, sort_keys=True)
-            key_parts.append(f"f:{hash(filters_str)}")
+            key_parts.append(f"f:{_stable_hash(filters_str)}")
 
         if sort:
             sort_str = json.dumps(sort, sort_keys=True)
-            key_parts.append(f"sort:{hash(sort_str)}")
+            key_parts.append(f"sort:{_stable_hash(sort_str)}")
 
         return ":".join(key_parts)
 
 
+def _stable_hash(value: str) -> str:
+    """Digest for cache keys shared across workers (``hash`` is salted)."""
+    return hashlib.sha1(value.encode()).hexdigest()
+
+
 # Global instance
 search_service = SearchService
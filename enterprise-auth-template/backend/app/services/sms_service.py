@@ -5,16 +5,18 @@ Handles SMS-based authentication including OTP generation,
 verification, and integration with SMS providers.
 """
 
+import asyncio
 import secrets
 import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-import httpx
+from typing import Optional, Dict, Any, List, Tuple
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
 from app.core.config import get_settings
+from app.core.http_clients import http_clients
 from app.core.exceptions import ValidationError
 from app.models.user import User
 from app.services.audit_service import AuditService
@@ -29,6 +31,9 @@ class ServiceError(Exception):
 logger = structlog.get_logger(__name__)
 settings = get_settings()
 
+SMS_BATCH_CONCURRENCY = getattr(settings, "SMS_BATCH_CONCURRENCY", 10)
+SNS_MAX_WORKERS = getattr(settings, "SNS_MAX_WORKERS", 10)
+
 
 class SMSProvider:
     """Base class for SMS providers"""
@@ -36,6 +41,20 @@ class SMSProvider:
     async def send_sms(self, phone_number: str, message: str) -> bool:
         raise NotImplementedError
 
+    async def send_sms_batch(self, messages: List[Tuple[str, str]]) -> List[bool]:
+        """Send many (phone number, message) pairs concurrently, in order."""
+        semaphore = asyncio.Semaphore(SMS_BATCH_CONCURRENCY)
+
+        async def send(phone_number: str, message: str) -> bool:
+            async with semaphore:
+                return await self.send_sms(phone_number, message)
+
+        return list(await asyncio.gather(*(send(p, m) for p, m in messages)))
+
+    def close(self) -> None:
+        """Release provider resources."""
+        pass
+
 
 class TwilioProvider(SMSProvider):
     """Twilio SMS provider implementation"""
@@ -49,37 +68,74 @@ class TwilioProvider(SMSProvider):
     async def send_sms(self, phone_number: str, message: str) -> bool:
         """Send SMS via Twilio"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/Accounts/{self.account_sid}/Messages.json",
-                    auth=(self.account_sid, self.auth_token),
-                    data={
-                        "From": self.from_number,
-                        "To": phone_number,
-                        "Body": message,
-                    },
-                )
-                return response.status_code == 201
+            response = await http_clients.post(
+                f"{self.base_url}/Accounts/{self.account_sid}/Messages.json",
+                auth=(self.account_sid, self.auth_token),
+                data={
+                    "From": self.from_number,
+                    "To": phone_number,
+                    "Body": message,
+                },
+            )
+            return response.status_code == 201
         except Exception as e:
             logger.error("Failed to send SMS via Twilio", error=str(e))
             return False
 
 
 class AWSProvider(SMSProvider):
-    """AWS SNS SMS provider implementation"""
+    """
+    AWS SNS SMS provider implementation
 
-    def __init__(self):
+    boto3 is blocking, so publishes run on a dedicated thread pool instead
+    of the event loop. The pool is sized to the client's HTTP connection
+    pool, so each thread reuses a kept-alive connection and a burst of
+    sends queues on the pool rather than on the loop's default executor.
+    """
+
+    def __init__(self, max_workers: int = SNS_MAX_WORKERS):
         import boto3
+        from botocore.config import Config
 
         self.client = boto3.client(
             "sns",
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_REGION,
+            config=Config(max_pool_connections=max_workers),
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sns-publish"
         )
 
     async def send_sms(self, phone_number: str, message: str) -> bool:
         """Send SMS via AWS SNS"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._publish, phone_number, message
+        )
+
+    async def send_sms_batch(self, messages: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Publish many SMS at once.
+
+        SNS has no batch publish for phone numbers, so each message is its
+        own request; the thread pool bounds how many are in flight.
+        """
+        loop = asyncio.get_running_loop()
+        return list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor, self._publish, p, m)
+                    for p, m in messages
+                )
+            )
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _publish(self, phone_number: str, message: str) -> bool:
         try:
             response = self.client.publish(
                 PhoneNumber=phone_number,
@@ -97,6 +153,34 @@ class AWSProvider(SMSProvider):
             return False
 
 
+_providers: Dict[str, SMSProvider] = {}
+
+
+def get_sms_provider() -> Optional[SMSProvider]:
+    """
+    Process-wide provider for the configured ``SMS_PROVIDER``.
+
+    Shared so clients, connection pools and threads are set up once rather
+    than per request.
+    """
+    name = getattr(settings, "SMS_PROVIDER", None)
+    if name not in _providers:
+        if name == "twilio":
+            _providers[name] = TwilioProvider()
+        elif name == "aws":
+            _providers[name] = AWSProvider()
+        else:
+            return None
+    return _providers[name]
+
+
+def close_sms_providers() -> None:
+    """Release shared providers on shutdown."""
+    for provider in _providers.values():
+        provider.close()
+    _providers.clear()
+
+
 class SMSService:
     """Service for handling SMS-based authentication"""
 
@@ -106,12 +190,7 @@ class SMSService:
         self.redis_client = get_redis_client()
 
         # Select SMS provider based on configuration
-        if settings.SMS_PROVIDER == "twilio":
-            self.provider = TwilioProvider()
-        elif settings.SMS_PROVIDER == "aws":
-            self.provider = AWSProvider()
-        else:
-            self.provider = None
+        self.provider = get_sms_provider()
 
     def generate_otp(self, length: int = 6) -> str:
         """Generate a random OTP"""
@@ -188,6 +267,26 @@ class SMSService:
         else:
             raise ServiceError("Failed to send OTP")
 
+    async def send_bulk_sms(self, messages: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        Send many SMS messages at once
+
+        Args:
+            messages: (phone number, message) pairs
+
+        Returns:
+            Dictionary with sent and failed counts and per-message results
+        """
+        if not self.provider:
+            raise ServiceError("SMS provider not configured")
+
+        results = await self.provider.send_sms_batch(messages)
+        sent = sum(results)
+
+        logger.info("Bulk SMS sent", sent=sent, failed=len(results) - sent)
+
+        return {"sent": sent, "failed": len(results) - sent, "results": results}
+
     async def verify_otp(
         self, phone_number: str, otp: str, purpose: str = "authentication"
     ) -> Dict[str, Any]:
@@ -0,0 +1,479 @@
+"""
+Stats Counters
+
+Materialized row counts for the admin dashboard. Statement-level triggers
+(migration ``012_add_stats_counters``) add each insert, update and delete
+to small counter rows in ``stats_counters``, so the dashboard reads every
+count in one grouped query whose cost does not depend on table sizes.
+
+Counters are spread over a few shards per name (by backend pid) so
+concurrent writers rarely touch the same row; readers sum the shards.
+Time-windowed counts ("registrations in the last 7 days") are kept as
+per-hour or per-day buckets, ``<name>@<UTC bucket>``, and summed over the
+window.
+
+Triggers do not see TRUNCATE or bulk loads that bypass them, and start
+from zero when installed, so a periodic ``reconcile`` recounts the tables
+in one snapshot and writes the difference. Counters are only served once
+a first reconcile has run. Snapshots are cached in Redis for a few
+seconds; without PostgreSQL or the counters table callers fall back to
+live counts.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.services.cache_service import CacheService
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+CACHE_KEY = "stats:counters"
+
+# Marker row written by reconcile; counters are incomplete until it exists
+RECONCILED_AT = "_reconciled_at"
+
+# Bucketed counters are kept (and reconciled) for this long
+BUCKET_RETENTION = timedelta(days=8)
+
+# pg_advisory_lock key so only one process reconciles at a time
+RECONCILE_LOCK_KEY = 0x5354415453  # "STATS"
+
+BUCKET_FORMATS = {"hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d"}
+PG_BUCKET_FORMATS = {"hour": 'YYYY-MM-DD"T"HH24', "day": "YYYY-MM-DD"}
+
+
+@dataclass(frozen=True)
+class CounterSpec:
+    """A counted subset of a table, optionally bucketed by a time column."""
+
+    name: str
+    table: str
+    condition: Optional[str] = None
+    bucket: Optional[str] = None
+    time_columns: Tuple[str, ...] = ("created_at",)
+
+
+# Kept in step with the trigger definitions in migration 012
+COUNTERS = [
+    CounterSpec("users.total", "users"),
+    CounterSpec("users.active", "users", "is_active"),
+    CounterSpec("users.verified", "users", "email_verified"),
+    CounterSpec("users.with_2fa", "users", "two_factor_enabled"),
+    CounterSpec("users.created", "users", bucket="hour"),
+    CounterSpec("sessions.active", "user_sessions", "is_active"),
+    CounterSpec("sessions.created", "user_sessions", bucket="day"),
+    CounterSpec("organizations.total", "organizations"),
+    CounterSpec("organizations.active", "organizations", "is_active"),
+    CounterSpec("api_keys.total", "api_keys"),
+    CounterSpec("api_keys.active", "api_keys", "is_active"),
+    CounterSpec("audit_logs.total", "audit_logs"),
+    CounterSpec(
+        "audit_logs.created",
+        "audit_logs",
+        bucket="day",
+        time_columns=("timestamp", "created_at"),
+    ),
+    CounterSpec("login_attempts.failed", "login_attempts", "NOT success", "hour"),
+]
+
+SPECS = {spec.name: spec for spec in COUNTERS}
+
+
+def bucket_start(moment: datetime, bucket: str) -> datetime:
+    """Truncate a time to the start of its hour or day bucket, in UTC."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if bucket == "day" else moment
+
+
+def bucket_key(name: str, moment: datetime) -> str:
+    """Counter name of the bucket holding ``moment``, e.g. ``x@2024-01-31T09``."""
+    bucket = SPECS[name].bucket
+    return f"{name}@{bucket_start(moment, bucket).strftime(BUCKET_FORMATS[bucket])}"
+
+
+@dataclass
+class CounterSnapshot:
+    """Counter values as of one read."""
+
+    values: Dict[str, int]
+
+    def get(self, name: str) -> int:
+        return self.values.get(name, 0)
+
+    def window(
+        self, name: str, since: datetime, until: Optional[datetime] = None
+    ) -> int:
+        """
+        Sum a bucketed counter over the buckets overlapping ``[since, until)``.
+
+        The first bucket is counted whole, so a window is exact at the
+        bucket granularity (an hour or a day).
+        """
+        first = bucket_key(name, since)
+        last = bucket_key(name, until) if until is not None else None
+        prefix = f"{name}@"
+        return sum(
+            value
+            for key, value in self.values.items()
+            if key.startswith(prefix) and key >= first and (last is None or key < last)
+        )
+
+
+def corrections(
+    live: Dict[str, int], stored: Dict[str, int], expired_before: Dict[str, str]
+) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Compare live counts with stored counters.
+
+    Args:
+        live: Counts recomputed from the tables
+        stored: Counter values summed over shards
+        expired_before: Oldest retained bucket key per bucketed counter
+
+    Returns:
+        Tuple of deltas to add, and bucket names past retention to delete
+    """
+    deltas: Dict[str, int] = {}
+    expired: List[str] = []
+
+    for name in set(live) | set(stored):
+        if name == RECONCILED_AT:
+            continue
+        base = name.split("@", 1)[0]
+        if "@" in name and name < expired_before.get(base, ""):
+            expired.append(name)
+            continue
+        delta = live.get(name, 0) - stored.get(name, 0)
+        if delta:
+            deltas[name] = delta
+
+    return deltas, sorted(expired)
+
+
+class StatsCounters:
+    """Reads, caches and reconciles the materialized counters."""
+
+    def __init__(
+        self,
+        cache_service: Optional[CacheService] = None,
+        cache_ttl: int = 10,
+        reconcile_interval: int = 3600,
+    ):
+        self.cache_service = cache_service or CacheService()
+        self.cache_ttl = cache_ttl
+        self.reconcile_interval = reconcile_interval
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+        self._table_exists: Optional[bool] = None
+
+    async def snapshot(self, session: Any) -> Optional[CounterSnapshot]:
+        """
+        Current counter values in one round trip.
+
+        Returns:
+            CounterSnapshot, or None when counters are unavailable and the
+            caller should count live
+        """
+        if _dialect(session) != "postgresql":
+            return None
+
+        cached = await self.cache_service.get(CACHE_KEY)
+        if isinstance(cached, dict):
+            return CounterSnapshot({k: int(v) for k, v in cached.items()})
+
+        try:
+            if self._table_exists is None:
+                self._table_exists = bool(
+                    await _scalar(
+                        session, text("SELECT to_regclass('stats_counters')::text")
+                    )
+                )
+            if not self._table_exists:
+                return None
+
+            result = await _execute(
+                session,
+                text("SELECT name, sum(value) FROM stats_counters GROUP BY name"),
+            )
+            values = {name: int(value) for name, value in result.all()}
+        except Exception as e:
+            logger.warning("Failed to read stats counters", error=str(e))
+            return None
+
+        if RECONCILED_AT not in values:
+            return None
+
+        await self.cache_service.set(CACHE_KEY, values, ttl=self.cache_ttl)
+        return CounterSnapshot(values)
+
+    async def reconcile(self, engine: Any = None) -> Optional[Dict[str, int]]:
+        """
+        Recount every counter and correct drift.
+
+        Live counts and stored counters are read in one REPEATABLE READ
+        snapshot, so increments committed meanwhile are in neither and the
+        difference is exact. Only one process reconciles at a time.
+
+        Returns:
+            Number of corrected and purged counters, or None if skipped
+        """
+        if engine is None:
+            from app.core import database
+
+            engine = database.engine
+        if engine is None or engine.dialect.name != "postgresql":
+            return None
+
+        async with engine.connect() as conn:
+            locked = await conn.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+            )
+            await conn.commit()
+            if not locked:
+                return None
+
+            try:
+                await conn.execution_options(isolation_level="REPEATABLE READ")
+                specs = await _resolve_specs(conn)
+                now = datetime.now(timezone.utc)
+                since = now - BUCKET_RETENTION
+                live = await _live_counts(conn, specs, since)
+                stored = dict(
+                    (
+                        await conn.execute(
+                            text(
+                                "SELECT name, sum(value) FROM stats_counters "
+                                "GROUP BY name"
+                            )
+                        )
+                    ).all()
+                )
+                await conn.commit()
+
+                expired_before = {
+                    spec.name: bucket_key(spec.name, since)
+                    for spec, _ in specs
+                    if spec.bucket
+                }
+                deltas, expired = corrections(
+                    live, {k: int(v) for k, v in stored.items()}, expired_before
+                )
+
+                await conn.execution_options(isolation_level="READ COMMITTED")
+                await _apply(conn, deltas, expired, int(time.time()))
+                await conn.commit()
+            finally:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": RECONCILE_LOCK_KEY},
+                )
+                await conn.commit()
+
+        await self.cache_service.delete(CACHE_KEY)
+        if deltas:
+            logger.info("Corrected stats counter drift", deltas=deltas)
+        return {"corrected": len(deltas), "purged": len(expired)}
+
+    async def start(self) -> None:
+        """Start the periodic reconcile loop; the first pass runs immediately."""
+        if self.is_running:
+            logger.warning("Stats counter reconcile is already running")
+            return
+
+        self.is_running = True
+        self._task = asyncio.create_task(self._reconcile_loop())
+        logger.info("Stats counter reconcile started", interval=self.reconcile_interval)
+
+    async def stop(self) -> None:
+        """Stop the reconcile loop."""
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        logger.info("Stats counter reconcile stopped")
+
+    async def _reconcile_loop(self) -> None:
+        while self.is_running:
+            try:
+                await self.reconcile()
+                await asyncio.sleep(self.reconcile_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Error in stats counter reconcile", error=str(e))
+                await asyncio.sleep(60)
+
+
+async def _resolve_specs(conn: Any) -> List[Tuple[CounterSpec, Dict[str, Any]]]:
+    """Counters whose table and columns exist, with their time column."""
+    tables = sorted({spec.table for spec in COUNTERS})
+    rows = (
+        await conn.execute(
+            text(
+                "SELECT table_name, column_name, data_type "
+                "FROM information_schema.columns "
+                "WHERE table_schema = current_schema() "
+                "AND table_name = ANY(:tables)"
+            ),
+            {"tables": tables},
+        )
+    ).all()
+    columns: Dict[str, Dict[str, str]] = {}
+    for table, column, data_type in rows:
+        columns.setdefault(table, {})[column] = data_type
+
+    resolved = []
+    for spec in COUNTERS:
+        existing = columns.get(spec.table)
+        if not existing:
+            continue
+        if spec.condition and spec.condition.split()[-1] not in existing:
+            continue
+        info: Dict[str, Any] = {}
+        if spec.bucket:
+            column = next((c for c in spec.time_columns if c in existing), None)
+            if column is None:
+                continue
+            info = {
+                "column": column,
+                "with_tz": existing[column] == "timestamp with time zone",
+            }
+        resolved.append((spec, info))
+    return resolved
+
+
+def _bucket_sql(spec: CounterSpec, column: str, with_tz: bool) -> str:
+    utc = f'"{column}"' + (" AT TIME ZONE 'UTC'" if with_tz else "")
+    return (
+        f"'{spec.name}@' || to_char(date_trunc('{spec.bucket}', {utc}), "
+        f"'{PG_BUCKET_FORMATS[spec.bucket]}')"
+    )
+
+
+async def _live_counts(
+    conn: Any, specs: List[Tuple[CounterSpec, Dict[str, Any]]], since: datetime
+) -> Dict[str, int]:
+    """Count every counter from its table in one statement."""
+    parts = []
+    by_table: Dict[str, List[CounterSpec]] = {}
+    for spec, info in specs:
+        if spec.bucket:
+            column = info["column"]
+            where = f'"{column}" >= :since'
+            if spec.condition:
+                where += f" AND {spec.condition}"
+            parts.append(
+                f"SELECT {_bucket_sql(spec, column, info['with_tz'])}, "
+                f"count(*) FROM {spec.table} WHERE {where} GROUP BY 1"
+            )
+        else:
+            by_table.setdefault(spec.table, []).append(spec)
+
+    for table, table_specs in by_table.items():
+        aggregates = ", ".join(
+            (
+                f"count(*) FILTER (WHERE {spec.condition}) AS c{i}"
+                if spec.condition
+                else f"count(*) AS c{i}"
+            )
+            for i, spec in enumerate(table_specs)
+        )
+        values = ", ".join(
+            f"('{spec.name}', s.c{i})" for i, spec in enumerate(table_specs)
+        )
+        parts.append(
+            f"SELECT v.name, v.value FROM (SELECT {aggregates} FROM {table}) s "
+            f"CROSS JOIN LATERAL (VALUES {values}) AS v(name, value)"
+        )
+
+    if not parts:
+        return {}
+    # Bucket boundaries are UTC; ``since`` is truncated to the first bucket
+    earliest = min(
+        (bucket_start(since, spec.bucket) for spec, _ in specs if spec.bucket),
+        default=bucket_start(since, "day"),
+    )
+    result = await conn.execute(
+        text(" UNION ALL ".join(parts)),
+        {"since": earliest.replace(tzinfo=timezone.utc)},
+    )
+    return {name: int(value) for name, value in result.all()}
+
+
+async def _apply(
+    conn: Any, deltas: Dict[str, int], expired: List[str], reconciled_at: int
+) -> None:
+    if expired:
+        await conn.execute(
+            text("DELETE FROM stats_counters WHERE name = ANY(:names)"),
+            {"names": expired},
+        )
+    names = sorted(deltas)
+    await conn.execute(
+        text(
+            "INSERT INTO stats_counters (name, shard, value) "
+            "SELECT name, 0, value FROM unnest(CAST(:names AS text[]), "
+            "CAST(:values AS bigint[])) AS d(name, value) "
+            "ON CONFLICT (name, shard) "
+            "DO UPDATE SET value = stats_counters.value + EXCLUDED.value"
+        ),
+        {"names": names, "values": [deltas[name] for name in names]},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO stats_counters (name, shard, value) "
+            "VALUES (:name, 0, :value) "
+            "ON CONFLICT (name, shard) DO UPDATE SET value = EXCLUDED.value"
+        ),
+        {"name": RECONCILED_AT, "value": reconciled_at},
+    )
+
+
+def _dialect(session: Any) -> Optional[str]:
+    try:
+        return session.get_bind().dialect.name
+    except Exception:
+        return None
+
+
+async def _execute(session: Any, stmt: Any) -> Any:
+    """Execute on either an AsyncSession or a sync Session."""
+    result = session.execute(stmt)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _scalar(session: Any, stmt: Any) -> Any:
+    return (await _execute(session, stmt)).scalar()
+
+
+stats_counters = StatsCounters(
+    cache_ttl=getattr(settings, "STATS_COUNTERS_CACHE_TTL", 10),
+    reconcile_interval=getattr(settings, "STATS_COUNTERS_RECONCILE_INTERVAL", 3600),
+)
+
+
+__all__ = [
+    "COUNTERS",
+    "CounterSnapshot",
+    "CounterSpec",
+    "StatsCounters",
+    "bucket_key",
+    "corrections",
+    "stats_counters",
+]
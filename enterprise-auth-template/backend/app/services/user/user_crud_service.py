@@ -11,7 +11,16 @@ from typing import Any, Dict, Optional
 import structlog
 from sqlalchemy import select, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
-
+from sqlalchemy.orm import selectinload
+
+from app.core.pagination import (
+    COUNT_CACHED,
+    COUNT_ESTIMATED,
+    COUNT_EXACT,
+    InvalidCursorError,
+    count_rows,
+    paginate_keyset,
+)
 from app.core.security import get_password_hash, is_password_strong
 from app.models.user import User, UserRole
 from app.models.role import Role
@@ -253,53 +262,69 @@ class UserCRUDService:
         limit: int = 100,
         active_only: bool = True,
         include_roles: bool = False,
+        cursor: Optional[str] = None,
+        count_mode: str = COUNT_EXACT,
     ) -> Dict[str, Any]:
         """
         Get paginated list of users.
 
+        The first page and any page requested with a ``cursor`` use keyset
+        pagination on ``(created_at, id)``; ``page`` > 1 without a cursor
+        keeps the legacy OFFSET behaviour.
+
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when ``cursor`` is given
             limit: Number of users per page
             active_only: Whether to include only active users
             include_roles: Whether to include user roles
+            cursor: Continuation token from a previous page's ``next_cursor``
+            count_mode: ``exact``, ``estimated``, ``cached`` or ``none``
 
         Returns:
-            Dict: Paginated user data with total count
+            Dict: Paginated user data with total count and next cursor
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
         """
         try:
-            offset = (page - 1) * limit
-
-            if active_only and include_roles:
-                users = await User.get_active_users_with_roles(
-                    self.session, limit=limit, offset=offset
-                )
-                # Count total active users
-                count_stmt = select(func.count(User.id)).where(User.is_active == True)
-            elif active_only:
-                stmt = (
-                    select(User)
-                    .where(User.is_active == True)
-                    .offset(offset)
-                    .limit(limit)
-                    .order_by(User.created_at.desc())
+            stmt = select(User)
+            if include_roles:
+                stmt = stmt.options(selectinload(User.roles))
+            if active_only:
+                stmt = stmt.where(User.is_active == True)
+
+            count_cache_key = f"users:{'active' if active_only else 'all'}"
+
+            if cursor or page == 1:
+                user_page = await paginate_keyset(
+                    self.session,
+                    stmt,
+                    [User.created_at, User.id],
+                    limit,
+                    cursor=cursor,
+                    count_mode=count_mode,
+                    count_cache_key=count_cache_key,
+                    cache_service=self.cache_service,
                 )
-                result = await self.session.execute(stmt)
-                users = result.scalars().all()
-                count_stmt = select(func.count(User.id)).where(User.is_active == True)
+                users = user_page.items
+                total_count = user_page.total
+                next_cursor = user_page.next_cursor
             else:
-                stmt = (
-                    select(User)
+                offset = (page - 1) * limit
+                result = await self.session.execute(
+                    stmt.order_by(User.created_at.desc(), User.id.desc())
                     .offset(offset)
                     .limit(limit)
-                    .order_by(User.created_at.desc())
                 )
-                result = await self.session.execute(stmt)
                 users = result.scalars().all()
-                count_stmt = select(func.count(User.id))
-
-            # Get total count
-            count_result = await self.session.execute(count_stmt)
-            total_count = count_result.scalar()
+                total_count = await count_rows(
+                    self.session,
+                    stmt,
+                    count_mode,
+                    cache_key=count_cache_key,
+                    cache_service=self.cache_service,
+                )
+                next_cursor = None
 
             return {
                 "users": [
@@ -323,11 +348,19 @@ class UserCRUDService:
                     for user in users
                 ],
                 "total": total_count,
+                "total_is_estimate": count_mode in (COUNT_ESTIMATED, COUNT_CACHED),
                 "page": page,
                 "limit": limit,
-                "total_pages": (total_count + limit - 1) // limit,
+                "total_pages": (
+                    (total_count + limit - 1) // limit
+                    if total_count is not None
+                    else None
+                ),
+                "next_cursor": next_cursor,
             }
 
+        except InvalidCursorError:
+            raise
         except Exception as e:
             logger.error(
                 "Failed to get paginated users", page=page, limit=limit, error=str(e)
@@ -335,9 +368,11 @@ class UserCRUDService:
             return {
                 "users": [],
                 "total": 0,
+                "total_is_estimate": False,
                 "page": page,
                 "limit": limit,
                 "total_pages": 0,
+                "next_cursor": None,
             }
 
     async def deactivate_user(self, user_id: str, reason: str = "") -> bool:
@@ -17,6 +17,9 @@ from app.services.cache_service import CacheService
 
 logger = structlog.get_logger(__name__)
 
+# Matches CacheService.cache_user_permissions
+PERMISSIONS_TTL = 300
+
 
 class UserPermissionService:
     """
@@ -53,36 +56,20 @@ class UserPermissionService:
             bool: True if user has permission
         """
         try:
-            # First try to get permissions from cache
-            permissions = await self.cache_service.get_user_permissions(user_id)
+            # Concurrent misses for the same user share one database load
+            permissions = await self.cache_service.get_or_compute(
+                f"user_permissions:{user_id}",
+                lambda: self._load_permissions(user_id, require_active=True),
+                ttl=PERMISSIONS_TTL,
+            )
 
             if permissions is None:
-                # Cache miss - load user with roles and permissions
-                user = await User.get_with_roles_and_permissions(self.session, user_id)
-
-                if not user or not user.is_active:
-                    logger.warning(
-                        "Permission check failed - user not found or inactive",
-                        user_id=user_id,
-                        permission=required_permission,
-                    )
-                    return False
-
-                permissions = user.get_permissions()
-                # Cache the permissions for future use
-                await self.cache_service.cache_user_permissions(user_id, permissions)
-
-                logger.debug(
-                    "User permissions computed and cached for permission check",
+                logger.warning(
+                    "Permission check failed - user not found or inactive",
                     user_id=user_id,
-                    permission_count=len(permissions),
-                )
-            else:
-                logger.debug(
-                    "User permissions loaded from cache for permission check",
-                    user_id=user_id,
-                    permission_count=len(permissions),
+                    permission=required_permission,
                 )
+                return False
 
             has_permission = check_permission(permissions, required_permission)
 
@@ -119,34 +106,18 @@ class UserPermissionService:
         """
         try:
             if use_cache:
-                # Try cache first
-                permissions = await self.cache_service.get_user_permissions(user_id)
-                if permissions is not None:
-                    logger.debug(
-                        "User permissions loaded from cache",
-                        user_id=user_id,
-                        permission_count=len(permissions),
-                    )
-                    return permissions
-
-            # Cache miss or cache disabled - load from database
-            user = await User.get_with_roles_and_permissions(self.session, user_id)
+                permissions = await self.cache_service.get_or_compute(
+                    f"user_permissions:{user_id}",
+                    lambda: self._load_permissions(user_id),
+                    ttl=PERMISSIONS_TTL,
+                )
+            else:
+                permissions = await self._load_permissions(user_id)
 
-            if not user:
+            if permissions is None:
                 logger.warning("User not found for permissions", user_id=user_id)
                 return []
 
-            permissions = user.get_permissions()
-
-            if use_cache:
-                # Cache for future use
-                await self.cache_service.cache_user_permissions(user_id, permissions)
-                logger.debug(
-                    "User permissions computed and cached",
-                    user_id=user_id,
-                    permission_count=len(permissions),
-                )
-
             return permissions
 
         except Exception as e:
@@ -155,6 +126,23 @@ class UserPermissionService:
             )
             return []
 
+    async def _load_permissions(
+        self, user_id: str, require_active: bool = False
+    ) -> Optional[List[str]]:
+        """Permissions from the database, or None if the user does not qualify."""
+        user = await User.get_with_roles_and_permissions(self.session, user_id)
+
+        if not user or (require_active and not user.is_active):
+            return None
+
+        permissions = user.get_permissions()
+        logger.debug(
+            "User permissions loaded from database",
+            user_id=user_id,
+            permission_count=len(permissions),
+        )
+        return permissions
+
     async def get_user_roles(self, user_id: str, use_cache: bool = True) -> List[str]:
         """
         Get all role names for a user.
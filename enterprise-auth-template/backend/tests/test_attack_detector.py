@@ -0,0 +1,141 @@
+"""
+Tests for Attack Detector
+
+Tests sliding-window count-min sketches, heavy-hitter tracking, real-time
+brute-force and takeover alerts, and anomaly listing without the database.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.attack_detector import (
+    BRUTE_FORCE_EVENT,
+    AttackDetector,
+    HeavyHitters,
+    SlidingWindowSketch,
+    network_prefix,
+)
+from app.services.monitoring_service import MonitoringService
+
+
+class TestSketches:
+    """Test suite for the streaming counting structures."""
+
+    def test_estimates_never_undercount(self):
+        """Estimates are at least the true count, even with many keys."""
+        sketch = SlidingWindowSketch(window_seconds=300, width=256, depth=4)
+        for i in range(5000):
+            sketch.add(f"10.0.{i % 250}.{i % 7}", now=1000.0)
+
+        assert sketch.estimate("10.0.0.0", now=1000.0) >= 1
+        for _ in range(30):
+            sketch.add("203.0.113.9", now=1000.0)
+        assert sketch.estimate("203.0.113.9", now=1000.0) >= 30
+
+    def test_window_slides(self):
+        """Counts expire once they leave the window."""
+        sketch = SlidingWindowSketch(window_seconds=100, slots=10)
+        sketch.add("key", now=1000.0, count=5)
+        sketch.add("key", now=1050.0, count=3)
+
+        assert sketch.estimate("key", now=1095.0) == 8
+        assert sketch.estimate("key", now=1105.0) == 3
+        assert sketch.estimate("key", now=5000.0) == 0
+
+    def test_heavy_hitters_keep_the_largest(self):
+        """Only the top ``k`` keys are kept."""
+        top = HeavyHitters(k=2)
+        for key, estimate in [("a", 1), ("b", 5), ("c", 3), ("a", 2)]:
+            top.offer(key, estimate)
+
+        assert top.items() == [("b", 5), ("c", 3)]
+
+    def test_network_prefix(self):
+        """Addresses are grouped by /24 or /48 network."""
+        assert network_prefix("198.51.100.23") == "198.51.100.0/24"
+        assert network_prefix("2001:db8:1:2::5") == "2001:db8:1::/48"
+        assert network_prefix("not-an-ip") is None
+
+
+class TestAttackDetector:
+    """Test suite for brute-force and takeover detection."""
+
+    def test_alert_once_when_ip_crosses_threshold(self):
+        """An IP alerts on its threshold-th failure and not again in the window."""
+        detector = AttackDetector(thresholds={"ip": 5, "account": 100})
+        alerts = [
+            detector.record(False, "203.0.113.9", f"user{i}@example.com", now=1000.0)
+            for i in range(8)
+        ]
+
+        assert [len(a) for a in alerts] == [0, 0, 0, 0, 1, 0, 0, 0]
+        assert alerts[4][0]["dimension"] == "ip"
+        assert alerts[4][0]["ip_address"] == "203.0.113.9"
+        assert alerts[4][0]["attempts"] == 5
+
+    def test_distributed_attack_caught_by_network(self):
+        """Failures spread over one /24 trip the network threshold."""
+        detector = AttackDetector(thresholds={"ip": 5, "account": 100, "network": 20})
+        raised = []
+        for i in range(20):
+            raised += detector.record(False, f"198.51.100.{i}", "victim@example.com")
+
+        assert [a["dimension"] for a in raised] == ["network"]
+        assert raised[0]["key"] == "198.51.100.0/24"
+
+    def test_success_after_failures_flags_takeover(self):
+        """Logging in to an account under attack raises a takeover alert."""
+        detector = AttackDetector(thresholds={"account": 3})
+        for _ in range(3):
+            detector.record(False, "203.0.113.9", "Victim@Example.com", now=1000.0)
+
+        alerts = detector.record(
+            True, "192.0.2.1", "victim@example.com", user_id="u1", now=1001.0
+        )
+
+        assert alerts[0]["type"] == "account_takeover"
+        assert alerts[0]["user_id"] == "u1"
+
+    def test_anomalies_list_current_offenders(self):
+        """Anomalies come from heavy hitters and age out with the window."""
+        detector = AttackDetector(window_seconds=60, thresholds={"ip": 3})
+        for _ in range(4):
+            detector.record(False, "203.0.113.9", now=1000.0)
+        detector.record(False, "192.0.2.1", now=1000.0)
+
+        anomalies = detector.anomalies(now=1010.0)
+        assert [(a["dimension"], a["key"]) for a in anomalies] == [
+            ("ip", "203.0.113.9")
+        ]
+        assert detector.anomalies(now=2000.0) == []
+
+    @pytest.mark.asyncio
+    async def test_observe_login_emits_events(self):
+        """Alerts are emitted to listeners as they are raised."""
+        detector = AttackDetector(thresholds={"ip": 2})
+        listener = MagicMock()
+        detector.events.on(BRUTE_FORCE_EVENT, listener)
+
+        await detector.observe_login(False, "203.0.113.9", "a@example.com")
+        await detector.observe_login(False, "203.0.113.9", "b@example.com")
+
+        listener.assert_called_once()
+        assert listener.call_args.args[0].data["key"] == "203.0.113.9"
+
+    @pytest.mark.asyncio
+    async def test_monitoring_anomalies_do_not_query_audit_logs(self):
+        """detect_anomalies reads the detector instead of the audit table."""
+        detector = AttackDetector(thresholds={"ip": 2})
+        detector.record(False, "203.0.113.9")
+        detector.record(False, "203.0.113.9")
+        db = MagicMock(execute=AsyncMock())
+
+        with (
+            patch("app.services.monitoring_service.get_redis_client"),
+            patch("app.services.monitoring_service.attack_detector", detector),
+        ):
+            anomalies = await MonitoringService(db).detect_anomalies()
+
+        assert anomalies[0]["ip_address"] == "203.0.113.9"
+        db.execute.assert_not_awaited()
@@ -0,0 +1,153 @@
+"""
+Tests for Autocomplete Index
+
+Tests the prefix trie and the incremental refresh of the in-memory
+autocomplete index against an in-memory SQLite database.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.services.autocomplete_index import AutocompleteIndex, PrefixTrie
+
+Base = declarative_base()
+
+
+class Event(Base):
+    __tablename__ = "events"
+
+    id = Column(Integer, primary_key=True)
+    action = Column(String(50))
+    created_at = Column(DateTime, nullable=False)
+
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        actions = ["login"] * 3 + ["logout"] * 2 + ["login_failed", None]
+        db.add_all(
+            Event(action=action, created_at=START + timedelta(minutes=i))
+            for i, action in enumerate(actions)
+        )
+        db.commit()
+        yield db
+
+
+class TestPrefixTrie:
+    """Test suite for the prefix trie."""
+
+    def test_suggestions_are_ranked_by_count(self):
+        """Matches come back most frequent first."""
+        trie = PrefixTrie(top_k=5)
+        trie.add("Login", 3)
+        trie.add("logout", 5)
+        trie.add("lock", 1)
+        trie.add("admin", 9)
+
+        assert trie.suggest("LO", 10) == [("logout", 5), ("Login", 3), ("lock", 1)]
+        assert trie.suggest("log", 1) == [("logout", 5)]
+        assert trie.suggest("x", 10) == []
+
+    def test_increments_can_promote_values(self):
+        """Growing counts move values into a full top-k list."""
+        trie = PrefixTrie(top_k=2)
+        trie.add("aa", 5)
+        trie.add("ab", 4)
+        trie.add("ac", 1)
+        trie.add("ac", 9)
+
+        assert trie.suggest("a", 2) == [("ac", 10), ("aa", 5)]
+
+
+class TestAutocompleteIndex:
+    """Test suite for the autocomplete index."""
+
+    @pytest.mark.asyncio
+    async def test_build_then_incremental_refresh(self, session):
+        """A refresh only adds rows past the watermark."""
+        index = AutocompleteIndex(top_k=5)
+
+        await index.schedule_refresh(session, None, "events", Event, "action")
+        assert index.suggest("events", "action", "log", 5) == [
+            {"value": "login", "count": 3},
+            {"value": "logout", "count": 2},
+            {"value": "login_failed", "count": 1},
+        ]
+
+        session.add_all(
+            Event(action="logout", created_at=START + timedelta(hours=1, minutes=i))
+            for i in range(3)
+        )
+        session.commit()
+        await index.refresh(session, "events", Event, "action")
+
+        assert index.suggest("events", "action", "logo", 5) == [
+            {"value": "logout", "count": 5}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_late_rows_at_the_watermark_are_counted_once(self, session):
+        """Rows committed after the refresh with older stamps still count."""
+        index = AutocompleteIndex(top_k=5, lookback=60)
+        await index.refresh(session, "events", Event, "action")
+        watermark = index._indexes[("events", "action")].watermark
+
+        # Same timestamp as the watermark, and one a little below it
+        session.add_all(
+            [
+                Event(action="logout", created_at=watermark),
+                Event(action="logout", created_at=watermark - timedelta(seconds=30)),
+            ]
+        )
+        session.commit()
+        await index.refresh(session, "events", Event, "action")
+        await index.refresh(session, "events", Event, "action")
+
+        assert index.suggest("events", "action", "logo", 5) == [
+            {"value": "logout", "count": 4}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_seen_ids_leave_with_the_lookback_window(self, session):
+        """Advancing the watermark drops ids older than the window."""
+        index = AutocompleteIndex(top_k=5, lookback=60)
+        await index.refresh(session, "events", Event, "action")
+        field_index = index._indexes[("events", "action")]
+
+        for hour in range(1, 4):
+            session.add_all(
+                Event(
+                    action="logout",
+                    created_at=START + timedelta(hours=hour, seconds=i),
+                )
+                for i in range(5)
+            )
+            session.commit()
+            await index.refresh(session, "events", Event, "action")
+
+        cutoff = field_index.watermark - timedelta(seconds=60)
+        assert len(field_index.seen) == 5
+        assert all(stamp > cutoff for stamp in field_index.seen.values())
+        assert index.suggest("events", "action", "logo", 5) == [
+            {"value": "logout", "count": 17}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_incomplete_index_defers_to_database(self, session):
+        """Too few hot matches on a truncated index return None."""
+        index = AutocompleteIndex(max_values=1, top_k=5)
+        await index.refresh(session, "events", Event, "action")
+
+        assert index.suggest("events", "action", "login", 1) == [
+            {"value": "login", "count": 3}
+        ]
+        assert index.suggest("events", "action", "logout", 1) is None
+        assert index.suggest("events", "action", "log", 10) is None
@@ -0,0 +1,349 @@
+"""
+Tests for Backup Pipeline
+
+Tests single-pass backup encoding (compression, checksum, atomic
+placement), decoding of new and legacy backups, streaming of pg_dump/psql
+through BackupService, and parallel directory-format dumps and restores.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.backup_pipeline import (
+    BackupWriter,
+    Compression,
+    backup_filename,
+    read_backup,
+    resolve_compression,
+)
+from app.services.backup_service import (
+    BackupFormat,
+    BackupService,
+    BackupStatus,
+    BackupValidationError,
+)
+
+SQL = b"".join(
+    b"INSERT INTO users VALUES (%d, 'user%d@example.com');\n" % (i, i)
+    for i in range(20000)
+)
+
+
+def _write(path, data, **kwargs):
+    writer = BackupWriter(path, **kwargs)
+    for start in range(0, len(data), 65536):
+        writer.write(data[start : start + 65536])
+    return writer, writer.close()
+
+
+class TestBackupWriter:
+    """Test suite for single-pass backup encoding."""
+
+    def test_gzip_round_trip(self, tmp_path):
+        """A gzip backup decodes back to the original dump."""
+        path = tmp_path / "backup.sql.gz"
+        writer, _ = _write(path, SQL, compression=Compression.GZIP)
+
+        assert gzip.decompress(path.read_bytes()) == SQL
+        assert b"".join(read_backup(path)) == SQL
+        assert writer.bytes_in == len(SQL)
+        assert writer.bytes_written == path.stat().st_size < len(SQL)
+
+    def test_zstd_round_trip(self, tmp_path):
+        """A zstd backup decodes back to the original dump."""
+        pytest.importorskip("zstandard")
+        path = tmp_path / "backup.sql.zst"
+        _write(path, SQL, compression=Compression.ZSTD, threads=2)
+
+        assert b"".join(read_backup(path, chunk_size=4096)) == SQL
+
+    def test_checksum_matches_file(self, tmp_path):
+        """The incremental checksum covers exactly the bytes on disk."""
+        path = tmp_path / "backup.sql.gz"
+        _, checksum = _write(path, SQL, compression=Compression.GZIP)
+
+        assert checksum == hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def test_uncompressed_backup(self, tmp_path):
+        """Without compression the dump is stored verbatim."""
+        path = tmp_path / "backup.sql"
+        _write(path, SQL, compression=Compression.NONE)
+
+        assert path.read_bytes() == SQL
+        assert b"".join(read_backup(path)) == SQL
+
+    def test_abort_discards_partial_file(self, tmp_path):
+        """Aborted backups leave nothing behind."""
+        path = tmp_path / "backup.sql.gz"
+        writer = BackupWriter(path, compression=Compression.GZIP)
+        writer.write(SQL[:1000])
+        writer.abort()
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_legacy_gzip_backup_is_readable(self, tmp_path):
+        """Backups written by gzip.open before the pipeline still restore."""
+        path = tmp_path / "old.sql.gz.enc"
+        path.write_bytes(gzip.compress(SQL))
+
+        assert b"".join(read_backup(path, encrypted=True)) == SQL
+
+    def test_names_and_fallback(self):
+        """File names reflect the format; zstd needs its package."""
+        assert (
+            backup_filename("full_backup_x", Compression.GZIP, True)
+            == "full_backup_x.sql.gz.enc"
+        )
+        with patch("app.services.backup_pipeline._zstandard", return_value=None):
+            assert resolve_compression(Compression.ZSTD) == Compression.GZIP
+
+
+@pytest.fixture
+def service(tmp_path):
+    with patch("app.services.backup_service.settings") as settings:
+        settings.BACKUP_DIR = str(tmp_path / "backups")
+        settings.BACKUP_COMPRESSION = Compression.GZIP
+        settings.BACKUP_COMPRESSION_LEVEL = 6
+        settings.BACKUP_COMPRESSION_THREADS = 0
+        settings.ENABLE_BACKUP_ENCRYPTION = False
+        settings.MAX_BACKUP_AGE_DAYS = 30
+        settings.BACKUP_FORMAT = BackupFormat.PLAIN
+        settings.BACKUP_PARALLEL_JOBS = 4
+        yield BackupService(
+            MagicMock(), cache_service=AsyncMock(get=AsyncMock(return_value=None))
+        )
+
+
+def _fake_tool(script):
+    """Run a Python one-liner in place of pg_dump/psql, passing its arguments."""
+    real_exec = asyncio.create_subprocess_exec
+
+    async def fake_exec(*args, **kwargs):
+        fake_exec.args = args
+        fake_exec.calls.append(args)
+        return await real_exec(sys.executable, "-c", script, *args[1:], **kwargs)
+
+    fake_exec.calls = []
+    return fake_exec
+
+
+class TestBackupStreaming:
+    """Test suite for pg_dump/psql streaming in BackupService."""
+
+    @pytest.mark.asyncio
+    async def test_dump_streams_into_final_file(self, service, tmp_path):
+        """pg_dump stdout lands compressed and checksummed in one file."""
+        service._update_backup_job_data = AsyncMock()
+        dump = tmp_path / "dump.sql"
+        dump.write_bytes(SQL)
+        script = (
+            "import sys, shutil; sys.stderr.write('pg_dump: dumping\\n' * 20000); "
+            f"shutil.copyfileobj(open({str(dump)!r}, 'rb'), sys.stdout.buffer)"
+        )
+
+        with patch("asyncio.create_subprocess_exec", _fake_tool(script)):
+            await service._execute_full_backup("backup-1", {"tables": ["users"]})
+
+        data = service._update_backup_job_data.await_args.args[1]
+        path = tmp_path / "backups" / data["file_path"].rsplit("/", 1)[-1]
+        assert path.name.endswith(".sql.gz")
+        assert gzip.decompress(path.read_bytes()) == SQL
+        assert data["checksum"] == hashlib.sha256(path.read_bytes()).hexdigest()
+        assert data["size_bytes"] == path.stat().st_size
+        assert data["compression"] == Compression.GZIP
+        assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+    @pytest.mark.asyncio
+    async def test_failed_dump_leaves_no_file(self, service, tmp_path):
+        """A failing pg_dump removes the partial output."""
+        script = "import sys; sys.stdout.write('BEGIN;'); sys.exit(1)"
+
+        with patch("asyncio.create_subprocess_exec", _fake_tool(script)):
+            with pytest.raises(Exception, match="Full backup failed"):
+                await service._execute_full_backup("backup-1", {})
+
+        assert list((tmp_path / "backups").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_restore_streams_into_psql(self, service, tmp_path):
+        """The decoded dump is piped into psql's stdin."""
+        backup = tmp_path / "backup.sql.gz"
+        _write(backup, SQL, compression=Compression.GZIP)
+        received = tmp_path / "received.sql"
+        service.get_backup_info = AsyncMock(return_value={"file_path": str(backup)})
+        script = (
+            "import sys, shutil; "
+            f"shutil.copyfileobj(sys.stdin.buffer, open({str(received)!r}, 'wb'))"
+        )
+        fake_exec = _fake_tool(script)
+
+        with patch("asyncio.create_subprocess_exec", fake_exec):
+            await service._execute_restore(
+                "restore-1",
+                {"backup_id": "backup-1", "target_database": "restored"},
+            )
+
+        assert received.read_bytes() == SQL
+        assert fake_exec.args[-2:] == ("-f", "-")
+
+    @pytest.mark.asyncio
+    async def test_restore_reports_psql_errors(self, service, tmp_path):
+        """psql exiting early surfaces its stderr."""
+        backup = tmp_path / "backup.sql.gz"
+        _write(backup, SQL, compression=Compression.GZIP)
+        service.get_backup_info = AsyncMock(return_value={"file_path": str(backup)})
+        script = "import sys; sys.stderr.write('syntax error'); sys.exit(3)"
+
+        with patch("asyncio.create_subprocess_exec", _fake_tool(script)):
+            with pytest.raises(Exception, match="syntax error"):
+                await service._execute_restore(
+                    "restore-1",
+                    {"backup_id": "backup-1", "target_database": "restored"},
+                )
+
+
+class TestDirectoryBackups:
+    """Test suite for parallel directory-format dumps and restores."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_dump_reports_tables(self, service, tmp_path):
+        """pg_dump runs with --jobs and reports progress per table."""
+        service._update_backup_job_data = AsyncMock()
+        service._update_backup_status = AsyncMock()
+        script = (
+            "import sys, pathlib; "
+            "out = pathlib.Path(sys.argv[sys.argv.index('--file') + 1]); "
+            "out.mkdir(); (out / 'toc.dat').write_bytes(b'x' * 100); "
+            "sys.stderr.write('pg_dump: reading schemas\\n'); "
+            "line = 'pg_dump: dumping contents of table \"public.%s\"\\n'; "
+            "sys.stderr.write(line % 'users' + line % 'roles')"
+        )
+        fake_exec = _fake_tool(script)
+
+        with patch("asyncio.create_subprocess_exec", fake_exec):
+            await service._execute_full_backup(
+                "backup-1",
+                {"format": BackupFormat.DIRECTORY, "tables": ["users", "roles"]},
+            )
+
+        assert "--format=directory" in fake_exec.args
+        assert "--jobs=4" in fake_exec.args
+        data = service._update_backup_job_data.await_args.args[1]
+        assert data["file_path"].endswith(".dir")
+        assert data["size_bytes"] == 100
+        assert [p.name for p in (tmp_path / "backups").iterdir()] == [
+            data["file_path"].rsplit("/", 1)[-1]
+        ]
+
+        table_updates = [
+            call.kwargs
+            for call in service._update_backup_status.await_args_list
+            if call.kwargs.get("table_progress")
+        ]
+        assert [u["table_progress"]["current_table"] for u in table_updates] == [
+            "public.users",
+            "public.roles",
+        ]
+        assert [u["progress"] for u in table_updates] == [10, 45]
+
+    @pytest.mark.asyncio
+    async def test_selective_parallel_restore(self, service, tmp_path):
+        """pg_restore restores only the requested tables with --jobs."""
+        backup = tmp_path / "full_backup.dir"
+        backup.mkdir()
+        service.get_backup_info = AsyncMock(
+            return_value={"file_path": str(backup), "format": BackupFormat.DIRECTORY}
+        )
+        service._update_restore_status = AsyncMock()
+        script = (
+            "import sys; "
+            "sys.stdout.write('1; 0 0 TABLE DATA public users app\\n') "
+            "if '--list' in sys.argv else "
+            "sys.stderr.write('pg_restore: processing data for table \"public.users\"')"
+        )
+        fake_exec = _fake_tool(script)
+
+        with patch("asyncio.create_subprocess_exec", fake_exec):
+            await service._execute_restore(
+                "restore-1",
+                {
+                    "backup_id": "backup-1",
+                    "target_database": "restored",
+                    "tables": ["users"],
+                },
+            )
+
+        list_call, restore_call = fake_exec.calls
+        assert list_call == ("pg_restore", "--list", str(backup))
+        assert "--jobs=4" in restore_call
+        assert restore_call[-3:] == ("-t", "users", str(backup))
+        table_updates = [
+            call.kwargs["table_progress"]
+            for call in service._update_restore_status.await_args_list
+            if call.kwargs.get("table_progress")
+        ]
+        assert table_updates == [
+            {"current_table": "public.users", "completed": 0, "total": 1}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_selective_restore_needs_directory_format(self, service, tmp_path):
+        """Plain SQL backups cannot be restored table by table."""
+        backup = tmp_path / "backup.sql.gz"
+        backup.write_bytes(b"")
+        service.get_backup_info = AsyncMock(
+            return_value={
+                "file_path": str(backup),
+                "status": BackupStatus.COMPLETED,
+                "format": BackupFormat.PLAIN,
+            }
+        )
+
+        with pytest.raises(BackupValidationError, match="directory-format"):
+            await service.restore_backup("backup-1", tables=["users"])
+
+
+class TestBackupDownloads:
+    """Test suite for backup download resolution and pre-signed URLs."""
+
+    @pytest.fixture
+    def completed(self, service):
+        path = service.backup_dir / "full_backup_1.sql.gz"
+        path.write_bytes(b"backup")
+        service._validate_backup_permissions = AsyncMock()
+        service.get_backup_info = AsyncMock(
+            return_value={
+                "status": BackupStatus.COMPLETED,
+                "file_exists": True,
+                "format": BackupFormat.PLAIN,
+                "file_path": str(path),
+                "checksum": "abc123",
+            }
+        )
+        return service
+
+    @pytest.mark.asyncio
+    async def test_download_emits_audit_event(self, completed):
+        """Downloads resolve the file and emit through the real emitter."""
+        completed.event_emitter.emit = AsyncMock(wraps=completed.event_emitter.emit)
+
+        path, filename, etag = await completed.get_backup_download("b-1", "admin")
+
+        assert filename == path.name == "full_backup_1.sql.gz"
+        assert etag == '"abc123"'
+        event = completed.event_emitter.emit.await_args.args[0]
+        assert event.event_type == "backup.downloaded"
+
+    @pytest.mark.asyncio
+    async def test_download_url_is_signed(self, completed):
+        """Pre-signed URLs point at the backup's file."""
+        result = await completed.create_download_url("b-1", "admin", 60)
+
+        assert result["download_url"].startswith(
+            "/downloads/backups/full_backup_1.sql.gz?"
+        )
@@ -0,0 +1,237 @@
+"""
+Tests for Deduplicating Backup Store
+
+Tests content-defined chunking, chunk deduplication, manifests, parallel
+verification and chunk garbage collection, and their use by BackupService.
+"""
+
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.backup_pipeline import Compression
+from app.services.backup_service import BackupFormat, BackupService, BackupType
+from app.services.backup_store import (
+    ChunkCorruptError,
+    ChunkStore,
+    ContentDefinedChunker,
+    DedupWriter,
+    iter_manifests,
+    load_manifest,
+)
+
+LINES = [
+    b"%d\tuser%d@example.com\t2024-01-01 00:00:00\tt\n" % (i, i) for i in range(60000)
+]
+
+
+def _chunk(data, **kwargs):
+    chunker = ContentDefinedChunker(**kwargs)
+    chunks = []
+    for start in range(0, len(data), 100000):
+        chunks.extend(chunker.feed(data[start : start + 100000]))
+    chunks.extend(chunker.finish())
+    return chunks
+
+
+def _backup(store, path, data):
+    writer = DedupWriter(
+        store, path, ContentDefinedChunker(min_size=4096, mask_bits=8), workers=2
+    )
+    for start in range(0, len(data), 65536):
+        writer.write(data[start : start + 65536])
+    writer.close()
+    return writer
+
+
+class TestContentDefinedChunker:
+    """Test suite for content-defined chunking."""
+
+    def test_chunks_reassemble_and_respect_bounds(self):
+        """Chunks cover the stream exactly and stay within size bounds."""
+        data = b"".join(LINES)
+        chunks = _chunk(data, min_size=4096, max_size=65536, mask_bits=6)
+
+        assert b"".join(chunks) == data
+        assert len(chunks) > 10
+        assert all(4096 <= len(c) <= 65536 for c in chunks[:-1])
+        assert all(c.endswith(b"\n") for c in chunks[:-1])
+
+    def test_boundaries_resynchronize_after_an_edit(self):
+        """An inserted line only changes the chunks around it."""
+        original = _chunk(b"".join(LINES), min_size=4096, mask_bits=8)
+        edited_lines = list(LINES)
+        edited_lines.insert(30000, b"inserted row\n")
+        edited = _chunk(b"".join(edited_lines), min_size=4096, mask_bits=8)
+
+        changed = set(edited) - set(original)
+        assert 1 <= len(changed) <= 2
+
+    def test_data_without_newlines_is_cut_at_max_size(self):
+        """Binary input falls back to fixed-size chunks."""
+        data = os.urandom(300000).replace(b"\n", b" ")
+        chunks = _chunk(data, min_size=1024, max_size=65536)
+
+        assert [len(c) for c in chunks] == [65536] * 4 + [300000 - 4 * 65536]
+
+
+class TestChunkStore:
+    """Test suite for the chunk store and deduplicated backups."""
+
+    def test_unchanged_backup_stores_nothing_new(self, tmp_path):
+        """A second identical backup only writes its manifest."""
+        store = ChunkStore(tmp_path / "chunks", compression=Compression.GZIP)
+        data = b"".join(LINES)
+
+        first = _backup(store, tmp_path / "a.manifest.json", data)
+        second = _backup(store, tmp_path / "b.manifest.json", data)
+
+        assert first.bytes_written > 0
+        assert first.new_chunks == len(first.chunks)
+        assert second.bytes_written == 0
+        assert second.new_chunks == 0
+
+    def test_small_change_stores_few_chunks(self, tmp_path):
+        """Changing a few rows adds a small fraction of the backup."""
+        store = ChunkStore(tmp_path / "chunks", compression=Compression.GZIP)
+        first = _backup(store, tmp_path / "a.manifest.json", b"".join(LINES))
+        edited = list(LINES)
+        edited[100] = b"100\tchanged@example.com\t2024-01-02 00:00:00\tf\n"
+
+        second = _backup(store, tmp_path / "b.manifest.json", b"".join(edited))
+
+        assert second.new_chunks == 1
+        assert second.bytes_written < first.bytes_written / 10
+
+    def test_manifest_restores_stream(self, tmp_path):
+        """Reading a manifest yields the original dump."""
+        store = ChunkStore(tmp_path / "chunks", compression=Compression.GZIP)
+        data = b"".join(LINES)
+        writer = _backup(store, tmp_path / "a.manifest.json", data)
+
+        manifest = load_manifest(tmp_path / "a.manifest.json")
+        assert b"".join(store.read(manifest)) == data
+        assert manifest["size"] == len(data)
+        assert manifest["sha256"] == writer._sha256.hexdigest()
+
+    def test_verify_reports_corrupt_and_missing_chunks(self, tmp_path):
+        """Verification flags damaged chunks."""
+        store = ChunkStore(tmp_path / "chunks", compression=Compression.GZIP)
+        _backup(store, tmp_path / "a.manifest.json", b"".join(LINES))
+        manifest = load_manifest(tmp_path / "a.manifest.json")
+        (missing, _), (damaged, _) = manifest["chunks"][:2]
+
+        assert store.verify(manifest, workers=4) == []
+
+        store.path_for(missing).unlink()
+        store.path_for(damaged).write_bytes(b"garbage")
+
+        assert sorted(store.verify(manifest, workers=4)) == sorted([missing, damaged])
+        with pytest.raises(ChunkCorruptError):
+            store.get(damaged)
+
+    def test_garbage_collection_keeps_live_and_recent_chunks(self, tmp_path):
+        """Only old chunks no manifest references are removed."""
+        store = ChunkStore(tmp_path / "chunks", compression=Compression.GZIP)
+        _backup(store, tmp_path / "a.manifest.json", b"".join(LINES[:30000]))
+        _backup(store, tmp_path / "b.manifest.json", b"".join(LINES[30000:]))
+        (tmp_path / "b.manifest.json").unlink()
+        old = time.time() - 7200
+        for path in store.root.glob("*/*"):
+            os.utime(path, (old, old))
+
+        live = {d for d, _ in load_manifest(tmp_path / "a.manifest.json")["chunks"]}
+        unreferenced = {p.name for p in store.root.glob("*/*")} - live
+        recent = next(iter(unreferenced))
+        os.utime(store.path_for(recent))
+
+        result = store.collect_garbage(iter_manifests(tmp_path), grace_seconds=3600)
+
+        remaining = {p.name for p in store.root.glob("*/*")}
+        assert remaining == live | {recent}
+        assert result["chunks_removed"] == len(unreferenced) - 1
+
+
+@pytest.fixture
+def service(tmp_path):
+    with patch("app.services.backup_service.settings") as settings:
+        settings.BACKUP_DIR = str(tmp_path)
+        settings.BACKUP_COMPRESSION = Compression.GZIP
+        settings.BACKUP_COMPRESSION_LEVEL = 6
+        settings.BACKUP_FORMAT = BackupFormat.PLAIN
+        settings.BACKUP_PARALLEL_JOBS = 2
+        settings.BACKUP_CHUNK_GC_GRACE_SECONDS = 0
+        settings.MAX_BACKUP_AGE_DAYS = 30
+        yield BackupService(
+            MagicMock(),
+            cache_service=AsyncMock(get=AsyncMock(return_value=None)),
+            event_emitter=AsyncMock(),
+        )
+
+
+class TestDeduplicatedBackups:
+    """Test suite for deduplicated backups in BackupService."""
+
+    @pytest.mark.asyncio
+    async def test_incremental_backups_default_to_deduplicated(self, service):
+        """Incremental backups are stored in the chunk store."""
+        with (
+            patch("asyncio.create_task") as create_task,
+            patch("app.services.backup_service.Event"),
+        ):
+            await service.create_backup(backup_type=BackupType.INCREMENTAL)
+        create_task.call_args.args[0].close()
+
+        job = service.cache_service.set.await_args.args[1]
+        assert '"format": "deduplicated"' in job
+
+    @pytest.mark.asyncio
+    async def test_verify_checks_chunks(self, service, tmp_path):
+        """verify_backup reports corrupt chunks of deduplicated backups."""
+        manifest_path = tmp_path / "full_backup.manifest.json"
+        _backup(service.chunk_store, manifest_path, b"".join(LINES))
+        service.get_backup_info = AsyncMock(
+            return_value={
+                "status": "completed",
+                "file_path": str(manifest_path),
+                "format": BackupFormat.DEDUPLICATED,
+            }
+        )
+
+        result = await service.verify_backup("backup-1")
+        assert result["status"] == "valid"
+        assert result["chunks_checked"] > 1
+
+        digest, _ = load_manifest(manifest_path)["chunks"][0]
+        service.chunk_store.path_for(digest).write_bytes(b"garbage")
+
+        result = await service.verify_backup("backup-1")
+        assert result["status"] == "corrupt"
+        assert result["corrupt_chunks"] == [digest]
+
+    @pytest.mark.asyncio
+    async def test_delete_collects_unreferenced_chunks(self, service, tmp_path):
+        """Deleting a deduplicated backup frees only its unshared chunks."""
+        shared = b"".join(LINES[:30000])
+        _backup(service.chunk_store, tmp_path / "a.manifest.json", shared)
+        _backup(
+            service.chunk_store,
+            tmp_path / "b.manifest.json",
+            shared + b"".join(LINES[30000:]),
+        )
+        service.get_backup_info = AsyncMock(
+            return_value={
+                "created_at": "2024-01-01T00:00:00",
+                "file_path": str(tmp_path / "b.manifest.json"),
+                "format": BackupFormat.DEDUPLICATED,
+            }
+        )
+        with patch("app.services.backup_service.Event"):
+            await service.delete_backup("backup-b", force=True)
+
+        manifest = load_manifest(tmp_path / "a.manifest.json")
+        assert b"".join(service.chunk_store.read(manifest)) == shared
+        stored = {p.name for p in service.chunk_store.root.glob("*/*")}
+        assert stored == {d for d, _ in manifest["chunks"]}
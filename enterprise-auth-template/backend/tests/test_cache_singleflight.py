@@ -0,0 +1,191 @@
+"""
+Tests for Cache Miss Coalescing
+
+Tests CacheService.get_or_compute: one computation per key for concurrent
+misses, waiting on another process's lock, probabilistic early refresh
+and falling back to computing when Redis is unavailable.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.cache_service import CacheService
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands get_or_compute uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.pttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self.commands.append(lambda: self.redis.values.get(key))
+
+    def pttl(self, key):
+        self.commands.append(lambda: self.redis.pttls.get(key, -2))
+
+    def setex(self, key, ttl, value):
+        def run():
+            self.redis.values[key] = value
+            self.redis.pttls[key] = ttl * 1000
+            return True
+
+        self.commands.append(run)
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+def _cache(redis):
+    cache = CacheService()
+    cache.get_redis = AsyncMock(return_value=redis)
+    return cache
+
+
+class TestGetOrCompute:
+    """Test suite for CacheService.get_or_compute."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        """Callers missing the same key share one computation."""
+        redis = FakeRedis()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["users:read"]
+
+        results = await asyncio.gather(
+            *(
+                _cache(redis).get_or_compute("user_permissions:1", compute, ttl=300)
+                for _ in range(10)
+            )
+        )
+
+        assert calls == 1
+        assert results == [["users:read"]] * 10
+        assert json.loads(redis.values["user_permissions:1"]) == ["users:read"]
+        assert "lock:user_permissions:1" not in redis.values
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """A follower whose leader is cancelled computes the value itself."""
+        redis = FakeRedis()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        leader = asyncio.create_task(
+            _cache(redis).get_or_compute("user_permissions:2", slow, ttl=300)
+        )
+        await started.wait()
+        follower = asyncio.create_task(
+            _cache(redis).get_or_compute(
+                "user_permissions:2", AsyncMock(return_value=["users:read"]), 300
+            )
+        )
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == ["users:read"]
+        assert leader.cancelled()
+        assert "lock:user_permissions:2" not in redis.values
+
+    @pytest.mark.asyncio
+    async def test_waits_for_lock_holder(self):
+        """Another process holding the lock is waited for, not duplicated."""
+        redis = FakeRedis()
+        redis.values["lock:search:q"] = "other-process"
+        compute = AsyncMock(return_value={"items": []})
+
+        async def other_process():
+            await asyncio.sleep(0.05)
+            redis.values["search:q"] = json.dumps({"items": [1]})
+
+        result, _ = await asyncio.gather(
+            _cache(redis).get_or_compute("search:q", compute, ttl=60),
+            other_process(),
+        )
+
+        assert result == {"items": [1]}
+        compute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refreshes_early_near_expiry(self):
+        """A hit close to expiry is recomputed by one caller ahead of time."""
+        redis = FakeRedis()
+        redis.values["key"] = json.dumps("old")
+        redis.values["key:delta"] = "0.5"
+        redis.pttls["key"] = 100
+        compute = AsyncMock(return_value="new")
+
+        with patch("app.services.cache_service.random.random", return_value=0.5):
+            result = await _cache(redis).get_or_compute("key", compute, ttl=60)
+
+        assert result == "new"
+        assert redis.pttls["key"] == 60000
+
+        # Far from expiry the cached value is served untouched
+        compute.reset_mock()
+        with patch("app.services.cache_service.random.random", return_value=0.5):
+            assert await _cache(redis).get_or_compute("key", compute, ttl=60) == "new"
+        compute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_compute(self):
+        """Without Redis the value is computed and errors reach the caller."""
+        cache = CacheService()
+        cache.get_redis = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert await cache.get_or_compute("key", AsyncMock(return_value=1), 60) == 1
+        with pytest.raises(ValueError):
+            await cache.get_or_compute(
+                "key", AsyncMock(side_effect=ValueError("bad")), 60
+            )
+
+    @pytest.mark.asyncio
+    async def test_none_is_not_cached(self):
+        """A missing result is returned to every waiter but never stored."""
+        redis = FakeRedis()
+        compute = AsyncMock(return_value=None)
+
+        assert await _cache(redis).get_or_compute("user:9", compute, ttl=60) is None
+        assert "user:9" not in redis.values
@@ -0,0 +1,127 @@
+"""
+Tests for File Downloads
+
+Tests Range/ETag handling of RangeFileResponse and the pre-signed URL
+handler.
+"""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+from app.core.downloads import (
+    RangeFileResponse,
+    RangeNotSatisfiable,
+    SignedDownloadApp,
+    create_signed_url,
+    parse_range,
+)
+
+CONTENT = bytes(range(256)) * 16
+
+
+@pytest.fixture
+def export_dir(tmp_path):
+    (tmp_path / "job.zip").write_bytes(CONTENT)
+    return tmp_path
+
+
+@pytest.fixture
+def client(export_dir):
+    async def download(request):
+        return RangeFileResponse(export_dir / "job.zip", filename="job.zip")
+
+    app = Starlette(
+        routes=[
+            Route("/file", download, methods=["GET", "HEAD"]),
+            Mount("/downloads", SignedDownloadApp({"exports": export_dir})),
+        ]
+    )
+    return TestClient(app)
+
+
+class TestParseRange:
+    """Test suite for Range header parsing."""
+
+    def test_range_forms(self):
+        """Closed, open-ended and suffix ranges are inclusive offsets."""
+        assert parse_range("bytes=0-99", 1000) == (0, 99)
+        assert parse_range("bytes=900-", 1000) == (900, 999)
+        assert parse_range("bytes=-100", 1000) == (900, 999)
+        assert parse_range("bytes=990-2000", 1000) == (990, 999)
+
+    def test_unsupported_ranges_serve_whole_file(self):
+        """Multiple or malformed ranges are ignored."""
+        assert parse_range("bytes=0-1,5-6", 1000) is None
+        assert parse_range("items=0-1", 1000) is None
+
+    def test_range_past_end_is_unsatisfiable(self):
+        """Ranges starting beyond the file raise."""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=1000-", 1000)
+
+
+class TestRangeFileResponse:
+    """Test suite for file responses."""
+
+    def test_full_download_has_validators(self, client):
+        """A plain GET returns the file with ETag and Accept-Ranges."""
+        response = client.get("/file")
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"]
+        assert "job.zip" in response.headers["content-disposition"]
+
+    def test_resumed_download_gets_partial_content(self, client):
+        """Range requests return 206 with the requested slice."""
+        etag = client.head("/file").headers["etag"]
+
+        response = client.get(
+            "/file", headers={"Range": "bytes=100-199", "If-Range": etag}
+        )
+
+        assert response.status_code == 206
+        assert response.content == CONTENT[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+
+    def test_stale_if_range_gets_whole_file(self, client):
+        """A changed file ignores the Range and restarts the download."""
+        response = client.get(
+            "/file", headers={"Range": "bytes=100-199", "If-Range": '"old"'}
+        )
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+
+    def test_conditional_requests(self, client):
+        """Matching If-None-Match is 304; out-of-range Range is 416."""
+        etag = client.get("/file").headers["etag"]
+
+        assert client.get("/file", headers={"If-None-Match": etag}).status_code == 304
+        response = client.get("/file", headers={"Range": "bytes=999999-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+class TestSignedDownloads:
+    """Test suite for pre-signed URLs."""
+
+    def test_signed_url_serves_file(self, client):
+        """A valid signature grants access to the file."""
+        url, _ = create_signed_url("exports", "job.zip", 60)
+
+        response = client.get(url, headers={"Range": "bytes=0-9"})
+
+        assert response.status_code == 206
+        assert response.content == CONTENT[:10]
+
+    def test_tampered_or_expired_urls_are_rejected(self, client):
+        """Changed names and past expiries fail the signature check."""
+        url, _ = create_signed_url("exports", "job.zip", 60)
+        expired, _ = create_signed_url("exports", "job.zip", -1)
+
+        assert client.get(url.replace("job.zip", "other.zip")).status_code == 403
+        assert client.get(expired).status_code == 403
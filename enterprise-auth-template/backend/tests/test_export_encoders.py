@@ -0,0 +1,154 @@
+"""
+Tests for Export Encoders
+
+Tests the incremental row encoders and the streaming export file writer
+used by ExportService.
+"""
+
+import csv
+import io
+import json
+import zipfile
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import select
+
+from app.models.user import User
+from app.services.export_encoders import CsvEncoder, JsonEncoder, ParquetEncoder
+from app.services.export_service import ExportFormat, ExportService
+
+ROWS = [
+    {"id": 1, "email": "a@example.com", "note": None},
+    {"id": 2, "email": "b@example.com", "note": "x"},
+]
+
+
+@pytest.fixture
+def service(tmp_path):
+    with patch("app.services.export_service.settings") as settings:
+        settings.EXPORT_DIR = str(tmp_path)
+        yield ExportService(MagicMock(), cache_service=MagicMock())
+
+
+class TestRowEncoders:
+    """Test suite for the incremental encoders."""
+
+    def test_csv_batches_share_one_header(self):
+        """Rows written across batches form one CSV document."""
+        sink = io.BytesIO()
+        encoder = CsvEncoder(sink)
+        encoder.write_rows(ROWS[:1])
+        encoder.write_rows(ROWS[1:])
+        encoder.close()
+
+        rows = list(csv.DictReader(io.StringIO(sink.getvalue().decode())))
+        assert [row["email"] for row in rows] == ["a@example.com", "b@example.com"]
+        assert not sink.closed
+
+    def test_json_is_a_single_array(self):
+        """Batches are joined into one JSON array."""
+        sink = io.BytesIO()
+        encoder = JsonEncoder(sink)
+        encoder.write_rows(ROWS[:1])
+        encoder.write_rows(ROWS[1:])
+        encoder.close()
+
+        assert json.loads(sink.getvalue()) == ROWS
+
+    def test_parquet_writes_a_row_group_per_batch(self):
+        """Each batch becomes a row group; all-NULL columns stay typed."""
+        sink = io.BytesIO()
+        encoder = ParquetEncoder(sink, {"id": int, "email": str, "note": str})
+        encoder.write_rows(ROWS[:1])
+        encoder.write_rows(ROWS[1:])
+        encoder.close()
+
+        parquet = pq.ParquetFile(io.BytesIO(sink.getvalue()))
+        assert parquet.num_row_groups == 2
+        assert parquet.read().to_pylist() == ROWS
+
+    def test_parquet_schema_comes_from_column_types(self):
+        """Later batches never conflict with types guessed from the first."""
+        sink = io.BytesIO()
+        encoder = ParquetEncoder(
+            sink, {"id": int, "score": float, "amount": Decimal, "login": str}
+        )
+        encoder.write_rows([{"id": None, "score": 1, "amount": None, "login": None}])
+        encoder.write_rows(
+            [
+                {
+                    "id": 7,
+                    "score": 2.5,
+                    "amount": Decimal("9.99"),
+                    "login": "2024-03-10T12:00:00",
+                }
+            ]
+        )
+        encoder.close()
+
+        table = pq.read_table(io.BytesIO(sink.getvalue()))
+        assert [str(field.type) for field in table.schema] == [
+            "int64",
+            "double",
+            "double",
+            "string",
+        ]
+        assert table.to_pylist()[1] == {
+            "id": 7,
+            "score": 2.5,
+            "amount": 9.99,
+            "login": "2024-03-10T12:00:00",
+        }
+
+
+class TestStreamingExportFile:
+    """Test suite for the streaming export writer."""
+
+    @pytest.mark.asyncio
+    async def test_compressed_export_is_written_to_disk(self, service):
+        """Encoded rows stream into a zip entry and the file is renamed."""
+
+        async def write(sink):
+            encoder = service._create_encoder(
+                ExportFormat.PARQUET,
+                sink,
+                "users",
+                {"id": int, "email": str, "note": str},
+            )
+            encoder.write_rows(ROWS)
+            encoder.close()
+
+        path = await service._write_export_file(
+            "job-1", ExportFormat.PARQUET, True, False, write
+        )
+
+        with zipfile.ZipFile(path) as archive:
+            data = archive.read("export.parquet")
+        assert pq.read_table(io.BytesIO(data)).to_pylist() == ROWS
+        assert not (service.export_dir / "job-1.zip.part").exists()
+
+    def test_column_types_follow_the_mapped_columns(self, service):
+        """Dates and sensitive fields are typed as the text they export as."""
+        column_types = service._export_column_types(select(User))
+
+        assert column_types["is_active"] is bool
+        assert column_types["created_at"] is str
+        assert column_types["hashed_password"] is str
+
+    @pytest.mark.asyncio
+    async def test_failed_export_leaves_no_file(self, service):
+        """A failure midway removes the partial file."""
+
+        async def write(sink):
+            sink.write(b"partial")
+            raise RuntimeError("database went away")
+
+        with pytest.raises(RuntimeError):
+            await service._write_export_file(
+                "job-2", ExportFormat.CSV, False, True, write
+            )
+
+        assert list(service.export_dir.iterdir()) == []
@@ -0,0 +1,137 @@
+"""
+Tests for Export Service
+
+Tests background job dispatch to the worker pool and the Redis hash
+progress counters.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.export_service import ExportService, ExportStatus
+
+
+@pytest.fixture
+def service(tmp_path):
+    with patch("app.services.export_service.settings") as settings:
+        settings.EXPORT_DIR = str(tmp_path)
+        settings.EXPORT_PROGRESS_INTERVAL = 100
+        yield ExportService(MagicMock(), cache_service=AsyncMock())
+
+
+class TestExportDispatch:
+    """Test suite for background job dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_go_to_the_worker_pool(self, service):
+        """Background exports are queued on the process pool."""
+        loop = asyncio.get_running_loop()
+        service.worker_pool = MagicMock(enabled=True)
+        service.worker_pool.submit.return_value = loop.create_future()
+
+        service._dispatch_export_job("job-1")
+
+        service.worker_pool.submit.assert_called_once_with("job-1")
+
+    @pytest.mark.asyncio
+    async def test_crashed_worker_marks_job_failed(self, service):
+        """A worker that dies without reporting fails the job."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        service.worker_pool = MagicMock(enabled=True)
+        service.worker_pool.submit.return_value = future
+        service._update_export_status = AsyncMock()
+
+        service._dispatch_export_job("job-1")
+        future.set_exception(RuntimeError("worker died"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        service._update_export_status.assert_awaited_once_with(
+            "job-1", ExportStatus.FAILED, error_message="worker died"
+        )
+
+
+class TestExportProgress:
+    """Test suite for progress counters."""
+
+    @pytest.mark.asyncio
+    async def test_rows_are_reported_at_a_coarse_cadence(self, service):
+        """Progress is one HINCRBY per interval plus the remainder."""
+
+        class Stream:
+            async def partitions(self):
+                for start in range(0, 250, 50):
+                    yield [{"id": i} for i in range(start, start + 50)]
+
+        service.session.stream_scalars = AsyncMock(return_value=Stream())
+        service._sanitize_row_data = AsyncMock(side_effect=lambda row, _: row)
+        query = MagicMock()
+
+        await service._stream_query_export(
+            "job-1", query, "csv", None, "users", False, False
+        )
+
+        increments = [
+            call.args[1]["rows"]
+            for call in service.cache_service.increment_hash.await_args_list
+        ]
+        assert increments == [100, 100, 50]
+        service.cache_service.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_status_merges_row_counter(self, service):
+        """Status reads derive progress from the counter hash."""
+        service.cache_service.get.return_value = json.dumps(
+            {"status": ExportStatus.PROCESSING, "total_rows": 400, "progress": 0}
+        )
+        service.cache_service.get_hash.return_value = {"rows": "100"}
+
+        status = await service.get_export_status("job-1")
+
+        assert status["rows_processed"] == 100
+        assert status["progress"] == 25
+
+
+class TestExportDownloads:
+    """Test suite for download resolution and pre-signed URLs."""
+
+    @pytest.fixture
+    def completed(self, service):
+        (service.export_dir / "job-1.zip").write_bytes(b"PK")
+        service.get_export_status = AsyncMock(
+            return_value={
+                "requester_id": "user-1",
+                "type": "users",
+                "status": ExportStatus.COMPLETED,
+                "compress": True,
+                "created_at": "2024-03-10T12:00:00",
+            }
+        )
+        return service
+
+    @pytest.mark.asyncio
+    async def test_download_emits_audit_event(self, completed):
+        """Downloads resolve the file and emit through the real emitter."""
+        completed.event_emitter.emit = AsyncMock(wraps=completed.event_emitter.emit)
+
+        path, filename, content_type = await completed.download_export(
+            "job-1", "user-1"
+        )
+
+        assert path.name == "job-1.zip"
+        assert filename == "users_20240310_120000_job-1.zip"
+        assert content_type == "application/zip"
+        event = completed.event_emitter.emit.await_args.args[0]
+        assert event.event_type == "export.downloaded"
+
+    @pytest.mark.asyncio
+    async def test_download_url_is_signed(self, completed):
+        """Pre-signed URLs point at the export's file."""
+        result = await completed.create_download_url("job-1", "user-1", 60)
+
+        assert result["download_url"].startswith("/downloads/exports/job-1.zip?")
+        assert result["expires_at"]
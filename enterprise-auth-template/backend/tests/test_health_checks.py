@@ -0,0 +1,173 @@
+"""
+Tests for Health Checks
+
+Tests concurrent checks with per-check timeouts, single-flight caching of
+evaluations, the liveness probe, and the monitoring and admin health
+reports built on them.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.health import liveness_check
+from app.services.admin_service import AdminService
+from app.services.health_checks import SingleFlightCache, health_cache, run_checks
+from app.services.monitoring_service import MonitoringService
+
+
+def _check(delay, result=None, error=None):
+    async def check():
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return result or {"status": "healthy"}
+
+    return check
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    health_cache.invalidate()
+    yield
+    health_cache.invalidate()
+
+
+class TestRunChecks:
+    """Test suite for concurrent checks."""
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self):
+        """Total time is the slowest check, not the sum."""
+        start = time.perf_counter()
+        results = await run_checks(
+            {"a": _check(0.2), "b": _check(0.2), "c": _check(0.2)}, timeout=1
+        )
+
+        assert time.perf_counter() - start < 0.4
+        assert {r["status"] for r in results.values()} == {"healthy"}
+
+    @pytest.mark.asyncio
+    async def test_slow_and_failing_checks_are_isolated(self):
+        """A hung or raising check is reported without affecting the others."""
+        results = await run_checks(
+            {
+                "hung": _check(5),
+                "broken": _check(0, error=RuntimeError("connection refused")),
+                "ok": _check(0),
+            },
+            timeout=0.1,
+        )
+
+        assert results["hung"] == {
+            "status": "unhealthy",
+            "error": "Timed out after 0.1s",
+        }
+        assert results["broken"] == {
+            "status": "unhealthy",
+            "error": "connection refused",
+        }
+        assert results["ok"]["status"] == "healthy"
+
+
+class TestSingleFlightCache:
+    """Test suite for cached, single-flight evaluations."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_evaluation(self):
+        """Simultaneous misses run the computation once."""
+        cache = SingleFlightCache(ttl=60)
+        compute = AsyncMock(side_effect=_check(0.05, {"n": 1}))
+
+        results = await asyncio.gather(*(cache.get("k", compute) for _ in range(20)))
+
+        assert compute.await_count == 1
+        assert all(r == {"n": 1} for r in results)
+        assert await cache.get("k", compute) == {"n": 1}
+        assert compute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_and_failed_results_are_recomputed(self):
+        """Values expire after the TTL and errors are never cached."""
+        cache = SingleFlightCache(ttl=0)
+        compute = AsyncMock(side_effect=[RuntimeError("down"), {"n": 1}, {"n": 2}])
+
+        with pytest.raises(RuntimeError):
+            await cache.get("k", compute)
+        assert await cache.get("k", compute) == {"n": 1}
+        assert await cache.get("k", compute) == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """A poller that goes away leaves the shared evaluation running."""
+        cache = SingleFlightCache(ttl=60)
+        compute = _check(0.1, {"n": 1})
+        first = asyncio.create_task(cache.get("k", compute))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(cache.get("k", compute))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+
+        assert await second == {"n": 1}
+
+
+class TestHealthReports:
+    """Test suite for the health endpoints and service reports."""
+
+    @pytest.mark.asyncio
+    async def test_liveness_never_checks_dependencies(self):
+        """The liveness probe answers without database or Redis."""
+        with (
+            patch("app.services.health_checks.check_session") as session,
+            patch("app.services.health_checks._cache_service") as cache,
+        ):
+            assert (await liveness_check())["status"] == "alive"
+
+        session.assert_not_called()
+        cache.get_redis.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_monitoring_health_runs_checks_concurrently_and_caches(self):
+        """Components and metrics are gathered at once and shared."""
+        with patch("app.services.monitoring_service.get_redis_client"):
+            service = MonitoringService(MagicMock())
+        service._check_auth_service_health = _check(0.2)
+        service._collect_metrics_in_own_session = AsyncMock(
+            side_effect=_check(0.2, {"total_users": 3})
+        )
+
+        with (
+            patch("app.services.monitoring_service.check_database", _check(0.2)),
+            patch("app.services.monitoring_service.check_redis", _check(0.2)),
+        ):
+            start = time.perf_counter()
+            reports = await asyncio.gather(
+                *(service.get_system_health() for _ in range(5))
+            )
+
+        assert time.perf_counter() - start < 0.4
+        assert service._collect_metrics_in_own_session.await_count == 1
+        assert reports[0]["status"] == "healthy"
+        assert reports[0]["metrics"] == {"total_users": 3}
+        assert set(reports[0]["components"]) == {"database", "redis", "authentication"}
+
+    @pytest.mark.asyncio
+    async def test_admin_health_reports_timed_out_database(self):
+        """A hung database check makes the admin report unhealthy on time."""
+        service = AdminService(MagicMock(spec=AsyncSession))
+        service._check_cache_health = _check(0)
+
+        with (
+            patch("app.services.admin_service.check_database", _check(5)),
+            patch("app.services.health_checks.settings") as settings,
+        ):
+            settings.HEALTH_CHECK_TIMEOUT = 0.1
+            health = await service.check_system_health()
+
+        assert health.status == "unhealthy"
+        assert health.components["database"]["error"] == "Timed out after 0.1s"
+        assert health.components["cache"]["status"] == "healthy"
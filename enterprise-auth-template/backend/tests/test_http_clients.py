@@ -0,0 +1,92 @@
+"""
+Tests for Outbound HTTP Clients
+
+Tests the shared per-origin client registry: client reuse, the retry
+policy and the pool statistics exported as metrics.
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core.http_clients import HttpClientRegistry
+
+
+def _registry(handler, **kwargs):
+    """Registry whose clients answer from ``handler`` instead of the network."""
+    registry = HttpClientRegistry(retry_backoff=0, **kwargs)
+    transport = patch(
+        "app.core.http_clients.httpx.AsyncHTTPTransport",
+        lambda **_: httpx.MockTransport(handler),
+    )
+    return registry, transport
+
+
+class TestHttpClientRegistry:
+    """Test suite for HttpClientRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_one_client_per_origin(self):
+        """Requests to the same origin share a client; other hosts do not."""
+        registry, transport = _registry(lambda request: httpx.Response(200))
+
+        with transport:
+            first = registry.client("https://api.twilio.com/2010-04-01/Accounts")
+            again = registry.client("https://api.twilio.com:443/other")
+            other = registry.client("https://hooks.slack.com/services/x")
+
+        assert first is again
+        assert first is not other
+        await registry.aclose()
+        assert first.is_closed and other.is_closed
+
+    @pytest.mark.asyncio
+    async def test_idempotent_requests_retry_on_unavailable(self):
+        """GETs are retried on 503; the last response is returned."""
+        statuses = iter([503, 503, 200])
+        registry, transport = _registry(
+            lambda request: httpx.Response(next(statuses)), retries=2
+        )
+
+        with transport:
+            response = await registry.get("https://oauth2.googleapis.com/userinfo")
+
+        assert response.status_code == 200
+        stats = registry.stats()["https://oauth2.googleapis.com:443"]
+        assert stats["requests"] == 3
+        assert stats["retries"] == 2
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_posts_are_not_resent(self):
+        """A POST the server may have seen is never sent twice."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        registry, transport = _registry(handler, retries=3)
+
+        with transport:
+            response = await registry.post("https://api.twilio.com/Messages.json")
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_transport_errors_raise_after_retries(self):
+        """Persistent transport errors surface once retries are spent."""
+
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        registry, transport = _registry(handler, retries=1)
+
+        with transport, pytest.raises(httpx.ReadTimeout):
+            await registry.get("https://api.github.com/user")
+
+        stats = registry.stats()["https://api.github.com:443"]
+        assert stats["errors"] == 2
+        assert stats["max_connections"] == 20
@@ -0,0 +1,139 @@
+"""
+Tests for Queued Logging
+
+Tests the bounded log queue overflow policies and the background
+writer used to keep log I/O off the request path.
+"""
+
+import io
+import json
+import logging
+import threading
+
+import pytest
+
+from app.core.log_queue import (
+    OVERFLOW_DROP,
+    OVERFLOW_SAMPLE,
+    BoundedLogQueue,
+    QueuedLogHandler,
+)
+from app.core.logging_config import (
+    DeferredEventFormatter,
+    defer_rendering,
+    request_id_var,
+)
+
+
+def _make_record(msg="message", level=logging.INFO):
+    return logging.LogRecord("app.test", level, __file__, 1, msg, (), None)
+
+
+class TestBoundedLogQueue:
+    """Test suite for BoundedLogQueue."""
+
+    def test_drop_policy_counts_overflow(self):
+        """Records beyond the bound are dropped and counted."""
+        queue = BoundedLogQueue(max_size=2, overflow_policy=OVERFLOW_DROP)
+
+        results = [queue.put(_make_record()) for _ in range(5)]
+
+        assert results == [True, True, False, False, False]
+        assert len(queue) == 2
+        assert queue.dropped == 3
+
+    def test_sample_policy_keeps_warnings(self):
+        """Low-severity records are sampled above the high-water mark."""
+        queue = BoundedLogQueue(
+            max_size=100,
+            overflow_policy=OVERFLOW_SAMPLE,
+            sample_rate=5,
+            high_water_ratio=0.0,
+        )
+
+        for _ in range(10):
+            queue.put(_make_record())
+        queue.put(_make_record(level=logging.ERROR))
+
+        assert queue.sampled_out == 8
+        assert len(queue) == 3
+
+    def test_get_batch_respects_max_batch(self):
+        """Batches are bounded and preserve order."""
+        queue = BoundedLogQueue(max_size=10)
+        for i in range(5):
+            queue.put(_make_record(f"m{i}"))
+
+        batch = queue.get_batch(3, timeout=0)
+
+        assert [r.msg for r in batch] == ["m0", "m1", "m2"]
+        assert len(queue) == 2
+
+    def test_unknown_policy_rejected(self):
+        """Invalid overflow policies raise ValueError."""
+        with pytest.raises(ValueError):
+            BoundedLogQueue(overflow_policy="block")
+
+
+class TestQueuedLogHandler:
+    """Test suite for QueuedLogHandler."""
+
+    def test_writes_batches_from_background_thread(self):
+        """Records reach the target stream once the writer drains."""
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(logging.Formatter("%(message)s"))
+        handler = QueuedLogHandler([target], flush_interval=0.01)
+
+        handler.start()
+        for i in range(3):
+            handler.emit(_make_record(f"line {i}"))
+        handler.stop()
+
+        assert stream.getvalue().splitlines() == ["line 0", "line 1", "line 2"]
+        assert handler.get_stats()["written"] == 3
+
+    def test_emit_snapshots_request_context(self):
+        """Request context is captured on the calling thread."""
+        handler = QueuedLogHandler([])
+        token = request_id_var.set("req-123")
+        try:
+            handler.emit(_make_record())
+        finally:
+            request_id_var.reset(token)
+
+        record = handler.queue.get_batch(1, timeout=0)[0]
+        assert record.request_id == "req-123"
+
+    def test_deferred_events_render_on_writer_thread(self):
+        """Lazy values and redaction run off the logging thread."""
+        rendered_on = []
+
+        class LazyBody:
+            def __structlog__(self):
+                rendered_on.append(threading.current_thread().name)
+                return {"name": "test"}
+
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(DeferredEventFormatter("%(message)s"))
+        handler = QueuedLogHandler([target], flush_interval=0.01)
+
+        args, kwargs = defer_rendering(
+            None,
+            "info",
+            {"event": "request by eve.black@example.com", "body": LazyBody()},
+        )
+        record = _make_record(args[0])
+        record.__dict__.update(kwargs["extra"])
+
+        handler.start()
+        handler.emit(record)
+        assert rendered_on == []
+        handler.stop()
+
+        assert rendered_on == ["log-writer"]
+        assert json.loads(stream.getvalue()) == {
+            "event": "request by eve***@example.com",
+            "body": {"name": "test"},
+        }
@@ -0,0 +1,136 @@
+"""
+Tests for Logging Configuration
+
+Tests the log redaction engine used by the structlog processor chain,
+deferred rendering of structlog events and the stdlib SecurityFilter.
+"""
+
+import json
+import logging
+
+from app.core.logging_config import (
+    REDACTED_MARKER,
+    DeferredEventFormatter,
+    JSONFormatter,
+    SecurityFilter,
+    SensitiveDataRedactor,
+    defer_rendering,
+    redact_sensitive_data,
+)
+
+
+def _make_record(msg, args=(), level=logging.INFO, **extra):
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestSensitiveDataRedactor:
+    """Test suite for the single-pass redaction engine."""
+
+    def test_redacts_all_patterns_in_one_string(self):
+        """Emails, JWTs and API keys are redacted together."""
+        redactor = SensitiveDataRedactor()
+        text = (
+            "user john.doe@example.com sent "
+            "eyJhbGciOi.eyJzdWIiOi.c2lnbmF0dXJl with api_key=abc123"
+        )
+
+        result = redactor.redact_text(text)
+
+        assert "joh***@example.com" in result
+        assert "[REDACTED_JWT]" in result
+        assert "api_key=[REDACTED]" in result
+        assert "abc123" not in result
+
+    def test_redacts_nested_mapping_keys(self):
+        """Sensitive keys are masked and nested values scanned."""
+        redactor = SensitiveDataRedactor()
+
+        result = redactor.redact(
+            {"Password": "hunter2", "profile": {"email": "alice@example.com"}}
+        )
+
+        assert result["Password"] == "[REDACTED]"
+        assert result["profile"]["email"] == "ali***@example.com"
+
+    def test_leaves_clean_text_untouched(self):
+        """Text without sensitive data is returned unchanged."""
+        assert SensitiveDataRedactor().redact_text("plain message") == "plain message"
+
+
+class TestStructlogProcessors:
+    """Test suite for the structlog redaction processors."""
+
+    def test_redact_sensitive_data_skips_internal_keys(self):
+        """Only user-supplied event fields are redacted."""
+        event = {
+            "event": "login for bob.smith@example.com",
+            "token": "secret-value",
+            "timestamp": "2024-01-01T00:00:00Z",
+            "attempts": 3,
+        }
+
+        result = redact_sensitive_data(None, "info", event)
+
+        assert result["event"] == "login for bob***@example.com"
+        assert result["token"] == "[REDACTED]"
+        assert result["timestamp"] == "2024-01-01T00:00:00Z"
+        assert result["attempts"] == 3
+
+    def test_defer_rendering_hands_event_to_formatter(self):
+        """Events reach the record unrendered and render redacted once formatted."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            args, kwargs = defer_rendering(
+                None, "error", {"event": "x", "password": "p", "exc_info": True}
+            )
+
+        assert kwargs["extra"][REDACTED_MARKER] is True
+        record = _make_record(args[0], level=logging.ERROR, **kwargs["extra"])
+
+        # Each handler's formatter renders from the original event
+        for line in (
+            json.loads(JSONFormatter().format(record))["message"],
+            DeferredEventFormatter("%(message)s").format(record),
+        ):
+            event = json.loads(line)
+            assert event["password"] == "[REDACTED]"
+            assert event["exception"][0]["exc_type"] == "ValueError"
+
+    def test_plain_records_keep_their_format(self):
+        """Records not coming from structlog use the configured format."""
+        formatter = DeferredEventFormatter("%(levelname)s %(message)s")
+
+        assert formatter.format(_make_record("hello")) == "INFO hello"
+
+
+class TestSecurityFilter:
+    """Test suite for the stdlib SecurityFilter."""
+
+    def test_filter_redacts_message_args_and_extras(self):
+        """Message, string args and extra fields are redacted."""
+        record = _make_record(
+            "login %s (%d)",
+            ("carol.jones@example.com", 5),
+            level=logging.WARNING,
+            api_key="abc",
+            detail="secret_key: xyz",
+        )
+
+        assert SecurityFilter().filter(record) is True
+
+        assert record.getMessage() == "login car***@example.com (5)"
+        assert record.api_key == "[REDACTED]"
+        assert record.detail == "secret_key: [REDACTED]"
+
+    def test_filter_skips_already_redacted_records(self):
+        """Records redacted in the structlog chain are not scanned again."""
+        record = _make_record(
+            "dave.brown@example.com", level=logging.WARNING, **{REDACTED_MARKER: True}
+        )
+
+        SecurityFilter().filter(record)
+
+        assert record.msg == "dave.brown@example.com"
@@ -0,0 +1,145 @@
+"""
+Tests for Logging Middleware
+
+Tests streaming request-body capture: the body is teed while the
+endpoint reads it, and parsed/sanitized only when the log is rendered.
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.logging_middleware import (
+    BODY_CAPTURE_STATE_KEY,
+    CapturedRequestBody,
+    LoggingMiddleware,
+    RequestBodyTee,
+)
+
+
+def _receive_from(chunks):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    return receive
+
+
+class TestRequestBodyTee:
+    """Test suite for RequestBodyTee."""
+
+    @pytest.mark.asyncio
+    async def test_passes_messages_through_and_keeps_prefix(self):
+        """Messages are unchanged; only the first bytes are retained."""
+        tee = RequestBodyTee(_receive_from([b"abcdef", b"ghij"]), limit=8)
+
+        first = await tee()
+        second = await tee()
+
+        assert first["body"] == b"abcdef"
+        assert second["body"] == b"ghij"
+        assert b"".join(tee.chunks) == b"abcdefgh"
+        assert tee.total_size == 10
+        assert tee.truncated is True
+
+
+class TestCapturedRequestBody:
+    """Test suite for CapturedRequestBody."""
+
+    @pytest.mark.asyncio
+    async def test_renders_sanitized_json(self):
+        """JSON bodies are sanitized when rendered."""
+        body = json.dumps({"email": "a@b.com", "password": "hunter2"}).encode()
+        tee = RequestBodyTee(_receive_from([body]))
+        await tee()
+
+        rendered = CapturedRequestBody(tee, "application/json").render()
+
+        assert rendered == {"email": "a@b.com", "password": "***SANITIZED***"}
+
+    @pytest.mark.asyncio
+    async def test_truncated_body_is_not_rendered(self):
+        """Partial payloads are reported by size only."""
+        tee = RequestBodyTee(_receive_from([b'{"password": "hunter2"}']), limit=5)
+        await tee()
+
+        rendered = CapturedRequestBody(tee, "application/json").render()
+
+        assert rendered == {"truncated": True, "size_bytes": 23}
+
+
+class TestLoggingMiddlewareBodyCapture:
+    """Test suite for body capture in LoggingMiddleware."""
+
+    @pytest.fixture
+    def app(self):
+        app = FastAPI()
+        app.add_middleware(LoggingMiddleware, enable_body_logging=True)
+
+        @app.post("/echo")
+        async def echo(request: Request):
+            payload = await request.json()
+            capture = getattr(request.state, BODY_CAPTURE_STATE_KEY, None)
+            return {"payload": payload, "captured": capture is not None}
+
+        @app.post("/upload")
+        async def upload(request: Request):
+            body = await request.body()
+            capture = getattr(request.state, BODY_CAPTURE_STATE_KEY, None)
+            return {"size": len(body), "captured": capture is not None}
+
+        return app
+
+    def test_json_body_reaches_endpoint_and_is_captured(self, app):
+        """The endpoint reads the body normally while it is teed."""
+        client = TestClient(app)
+
+        response = client.post("/echo", json={"name": "test"})
+
+        assert response.json() == {"payload": {"name": "test"}, "captured": True}
+
+    def test_binary_upload_is_not_captured(self, app):
+        """Unloggable content types are not wrapped at all."""
+        client = TestClient(app)
+
+        response = client.post(
+            "/upload",
+            content=b"\x00" * 1024,
+            headers={"content-type": "application/octet-stream"},
+        )
+
+        assert response.json() == {"size": 1024, "captured": False}
+
+
+class TestShouldLogBody:
+    """Test suite for RequestLogger._should_log_body."""
+
+    @staticmethod
+    def _request(headers):
+        return Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "path": "/echo",
+                "headers": [
+                    (name.encode(), value.encode()) for name, value in headers.items()
+                ],
+            }
+        )
+
+    def test_malformed_content_length_skips_body_logging(self):
+        """A non-numeric Content-Length disables capture instead of raising."""
+        middleware = LoggingMiddleware(FastAPI(), enable_body_logging=True)
+
+        assert not middleware.request_logger._should_log_body(
+            self._request({"content-type": "application/json", "content-length": "abc"})
+        )
+        assert middleware.request_logger._should_log_body(
+            self._request({"content-type": "application/json", "content-length": "2"})
+        )
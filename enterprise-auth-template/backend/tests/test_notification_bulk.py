@@ -0,0 +1,157 @@
+"""
+Tests for Bulk Notifications
+
+Tests the chunked bulk-insert path: one recipient query, one preference
+MGET and one multi-row INSERT per chunk, and pipelined rate limits.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.notification import (
+    NotificationCategory,
+    NotificationPriority,
+    NotificationStatus,
+    NotificationType,
+)
+from app.services.notification_service import RATE_LIMITS, NotificationService
+
+
+def _service(active_ids, preferences=None, counters=None):
+    session = MagicMock(spec=AsyncSession)
+    users = MagicMock()
+    users.scalars.return_value.all.return_value = list(active_ids)
+    session.execute = AsyncMock(return_value=users)
+
+    cache = MagicMock()
+    cache.get_many = AsyncMock(
+        side_effect=lambda keys: [
+            (preferences or {}).get(key.split(":")[1]) for key in keys
+        ]
+    )
+    cache.increment_counters = AsyncMock(
+        side_effect=lambda increments, ttl=None: {
+            key: (counters or {}).get(key, 0) + amount
+            for key, amount in increments.items()
+        }
+    )
+
+    with patch.object(NotificationService, "_initialize_providers"):
+        return NotificationService(session, cache_service=cache)
+
+
+def _inserted_rows(service):
+    """Rows of the bulk INSERT (the second statement of a chunk)."""
+    call = service.session.execute.await_args_list[1]
+    assert call.args[0].is_insert
+    return call.args[1]
+
+
+def _request(user_id, **overrides):
+    return {
+        "user_id": str(user_id),
+        "title": "Security notice",
+        "message": "Please review your sessions",
+        "notification_type": NotificationType.EMAIL,
+        "priority": NotificationPriority.HIGH,
+        "category": NotificationCategory.SECURITY,
+        **overrides,
+    }
+
+
+class TestBulkNotifications:
+    """Test suite for NotificationService.send_bulk_notifications."""
+
+    @pytest.mark.asyncio
+    async def test_one_insert_per_chunk(self):
+        """Each chunk costs one user query, one MGET and one INSERT."""
+        user_ids = [uuid4() for _ in range(5)]
+        service = _service(user_ids)
+        service.create_notification = AsyncMock()
+
+        result = await service.send_bulk_notifications(
+            [_request(user_id) for user_id in user_ids], batch_size=3
+        )
+
+        assert result["success"] == 5
+        assert result["failed"] == 0
+        assert len(result["created_notifications"]) == 5
+        assert service.session.execute.await_count == 4
+        assert service.session.commit.await_count == 2
+        assert service.cache_service.get_many.await_count == 2
+        service.create_notification.assert_not_awaited()
+
+        rows = _inserted_rows(service)
+        assert len(rows) == 3
+        assert {row["status"] for row in rows} == {NotificationStatus.PENDING}
+        assert {row["scheduled_for"] for row in rows} == {None}
+
+    @pytest.mark.asyncio
+    async def test_invalid_and_inactive_recipients_fail(self):
+        """Unknown users and malformed entries are counted as failures."""
+        active = uuid4()
+        service = _service([active])
+
+        result = await service.send_bulk_notifications(
+            [
+                _request(active),
+                _request(uuid4()),
+                _request("not-a-uuid"),
+                _request(active, title=""),
+            ]
+        )
+
+        assert result["success"] == 1
+        assert result["failed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_bad_enum_fails_only_its_item(self):
+        """An unknown priority fails its row; other chunks still insert."""
+        user_ids = [uuid4() for _ in range(4)]
+        service = _service(user_ids)
+        requests = [_request(user_id) for user_id in user_ids]
+        requests[2]["priority"] = "urgent-ish"
+
+        result = await service.send_bulk_notifications(requests, batch_size=2)
+
+        assert result["success"] == 3
+        assert result["failed"] == 1
+        assert len(result["created_notifications"]) == 3
+        assert service.session.commit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_preferences_apply_per_recipient(self):
+        """Opted-out channels fall back to a low-priority in-app notification."""
+        opted_out, opted_in = uuid4(), uuid4()
+        service = _service(
+            [opted_out, opted_in],
+            preferences={str(opted_out): {"email_enabled": False}},
+        )
+
+        await service.send_bulk_notifications([_request(opted_out), _request(opted_in)])
+
+        rows = {row["user_id"]: row for row in _inserted_rows(service)}
+        assert rows[opted_out]["type"] == NotificationType.IN_APP
+        assert rows[opted_out]["priority"] == NotificationPriority.LOW
+        assert rows[opted_in]["type"] == NotificationType.EMAIL
+        service.cache_service.get_many.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_shared_counter_refuses_overflow_in_order(self):
+        """Deliveries sharing a counter are allowed up to the limit only."""
+        user_id = uuid4()
+        limit = RATE_LIMITS[NotificationType.SMS]
+        service = _service(
+            [user_id],
+            counters={f"notification_rate:{user_id}:sms:security": limit - 2},
+        )
+
+        allowed = await service._consume_rate_limits(
+            [(user_id, NotificationType.SMS, NotificationCategory.SECURITY)] * 4
+        )
+
+        assert allowed == [True, True, False, False]
+        service.cache_service.increment_counters.assert_awaited_once()
@@ -0,0 +1,185 @@
+"""
+Tests for Notification Inbox Cache
+
+Tests the Redis-backed unread counters and recent-id lists, and how
+NotificationService keeps them current and serves badges and the first
+inbox page from them.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import COUNT_NONE
+from app.models.notification import NotificationStatus
+from app.services.notification_inbox import NotificationInbox, counts_key, inbox_key
+from app.services.notification_service import NotificationService
+
+NOW = datetime(2024, 3, 10, 12, 0)
+
+
+def _service(*results):
+    session = MagicMock(spec=AsyncSession)
+    session.execute = AsyncMock(side_effect=list(results))
+    with patch.object(NotificationService, "_initialize_providers"):
+        service = NotificationService(session, cache_service=MagicMock())
+    service.inbox = MagicMock(
+        size=50,
+        get_counts=AsyncMock(return_value=None),
+        store_counts=AsyncMock(),
+        get_recent_ids=AsyncMock(return_value=None),
+        store_recent_ids=AsyncMock(),
+        record_read=AsyncMock(),
+        record_deleted=AsyncMock(),
+    )
+    return service
+
+
+def _result(first=None, scalars=(), one=None):
+    result = MagicMock()
+    result.first.return_value = first
+    result.one.return_value = one
+    result.scalar_one_or_none.return_value = first
+    result.scalars.return_value.all.return_value = list(scalars)
+    return result
+
+
+class TestNotificationInbox:
+    """Test suite for the Redis side of the inbox cache."""
+
+    @pytest.mark.asyncio
+    async def test_record_created_pushes_per_user_in_order(self):
+        """New ids are counted and pushed oldest first in one pipeline."""
+        pipe = MagicMock(execute=AsyncMock())
+        client = MagicMock(pipeline=MagicMock(return_value=pipe))
+        inbox = NotificationInbox(
+            MagicMock(get_redis=AsyncMock(return_value=client)), size=10
+        )
+        user = uuid4()
+        older, newer = sorted([uuid4(), uuid4()])
+
+        await inbox.record_created(
+            [(user, newer, NOW), (user, older, NOW - timedelta(seconds=1))]
+        )
+
+        count_call, push_call = pipe.eval.call_args_list
+        assert count_call.args[2:] == (counts_key(user), "total", 2, "unread", 2)
+        assert push_call.args[2:] == (inbox_key(user), 10, str(older), str(newer))
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_drop_cached_state(self):
+        """A failed update invalidates the user's keys instead of raising."""
+        client = MagicMock(
+            eval=AsyncMock(side_effect=ConnectionError("down")), delete=AsyncMock()
+        )
+        inbox = NotificationInbox(MagicMock(get_redis=AsyncMock(return_value=client)))
+        user = uuid4()
+
+        await inbox.record_read(user)
+
+        client.delete.assert_awaited_once_with(counts_key(user), inbox_key(user))
+
+
+class TestNotificationServiceInbox:
+    """Test suite for the service paths that use the inbox cache."""
+
+    @pytest.mark.asyncio
+    async def test_unread_count_from_cache_skips_database(self):
+        """Cached counters answer badge polls without a query."""
+        service = _service()
+        service.inbox.get_counts.return_value = {"total": 9, "unread": 4}
+
+        assert await service.get_unread_count(str(uuid4())) == 4
+        service.session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unread_count_miss_loads_once(self):
+        """A miss costs one COUNT query and warms the cache."""
+        user_id = str(uuid4())
+        service = _service(_result(one=(7, 3)))
+
+        assert await service.get_unread_count(user_id) == 3
+        service.inbox.store_counts.assert_awaited_once_with(user_id, 7, 3)
+
+    @pytest.mark.asyncio
+    async def test_first_page_served_from_cached_ids(self):
+        """The first page fetches rows by id in cached order."""
+        ids = [uuid4() for _ in range(5)]
+        rows = [MagicMock(id=i, created_at=NOW) for i in ids[:3]]
+        service = _service(_result(scalars=reversed(rows)))
+        service.inbox.get_counts.return_value = {"total": 5, "unread": 2}
+        service.inbox.get_recent_ids.return_value = ids
+
+        page = await service.get_user_notifications_page(str(uuid4()), limit=3)
+
+        assert page.items == rows
+        assert page.total == 5
+        assert page.next_cursor is not None
+        service.session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_inbox_needs_no_query(self):
+        """A user with no notifications is answered from the counters."""
+        service = _service()
+        service.inbox.get_counts.return_value = {"total": 0, "unread": 0}
+
+        page = await service.get_user_notifications_page(
+            str(uuid4()), count_mode=COUNT_NONE
+        )
+
+        assert page.items == [] and page.total is None
+        service.session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_read_and_delete_adjust_counters_once(self):
+        """Only the write that changes state adjusts the counters."""
+        user_id, notification_id = str(uuid4()), str(uuid4())
+        service = _service(
+            _result(first=MagicMock(status=NotificationStatus.SENT)),
+            _result(first=None),
+            _result(first=notification_id),
+            _result(first=MagicMock(read_at=None)),
+        )
+
+        assert await service.mark_notification_read(notification_id, user_id)
+        # Already read: still a success, but not counted twice
+        assert await service.mark_notification_read(notification_id, user_id)
+        assert await service.delete_notification(notification_id, user_id)
+
+        service.inbox.record_read.assert_awaited_once_with(user_id)
+        service.inbox.record_deleted.assert_awaited_once_with(user_id, was_unread=True)
+
+    @pytest.mark.asyncio
+    async def test_badge_endpoint_authenticates_from_token_only(self):
+        """Badge polls resolve the user from the JWT without loading it."""
+        from app.api.v1.notifications import get_unread_count
+        from app.dependencies.auth import get_current_user_id
+
+        user_id = str(uuid4())
+        request = MagicMock(cookies={"access_token": "token"})
+        session = MagicMock(spec=AsyncSession)
+        session.execute = AsyncMock()
+
+        with patch(
+            "app.dependencies.auth.verify_token",
+            return_value=MagicMock(sub=user_id),
+        ):
+            resolved = await get_current_user_id(request, None)
+
+        with (
+            patch.object(NotificationService, "_initialize_providers"),
+            patch.object(
+                NotificationService,
+                "get_notification_counts",
+                AsyncMock(return_value={"total": 3, "unread": 2}),
+            ),
+        ):
+            response = await get_unread_count(user_id=resolved, db=session)
+
+        assert resolved == user_id
+        assert response.unread_count == 2
+        session.execute.assert_not_awaited()
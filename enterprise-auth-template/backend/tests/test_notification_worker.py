@@ -0,0 +1,244 @@
+"""
+Tests for Notification Worker
+
+Tests the durable notification queue (claims, leases, backoff and
+outcome write-back) and the per-channel worker that drains it.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.notification import (
+    NotificationCategory,
+    NotificationStatus,
+    NotificationType,
+)
+from app.services.notification_queue import NotificationQueue, retry_delay
+from app.services.notification_worker import ChannelPool, NotificationWorker
+
+NOW = datetime(2024, 3, 10, 12, 0)
+
+
+def _notification(channel=NotificationType.EMAIL, attempts=0, **overrides):
+    values = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "type": channel,
+        "category": NotificationCategory.SECURITY,
+        "status": NotificationStatus.PENDING,
+        "delivery_attempts": attempts,
+        "scheduled_for": None,
+        "created_at": NOW - timedelta(seconds=30),
+        "expires_at": None,
+        **overrides,
+    }
+    return MagicMock(**values)
+
+
+def _session(*notifications):
+    session = MagicMock(spec=AsyncSession)
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(notifications)
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+def _updates(session):
+    """Compiled UPDATE statements executed on a mock session."""
+    return [
+        call.args[0].compile(dialect=postgresql.dialect())
+        for call in session.execute.await_args_list
+        if call.args[0].is_update
+    ]
+
+
+class TestNotificationQueue:
+    """Test suite for claiming and completing queued notifications."""
+
+    def test_retry_delay_backs_off_exponentially(self):
+        """Delays double per attempt up to the maximum."""
+        assert retry_delay(1) == timedelta(minutes=1)
+        assert retry_delay(3) == timedelta(minutes=4)
+        assert retry_delay(20) == timedelta(hours=1)
+
+    @pytest.mark.asyncio
+    async def test_claim_leases_due_rows_and_cancels_expired(self):
+        """Claims skip locked rows, lease live ones and drop expired ones."""
+        live = _notification()
+        expired = _notification(expires_at=NOW - timedelta(minutes=1))
+        session = _session(live, expired)
+        inbox = MagicMock(invalidate=AsyncMock())
+
+        claims = await NotificationQueue(lease_seconds=60, inbox=inbox).claim(
+            session, NotificationType.EMAIL, 10, now=NOW
+        )
+
+        assert claims == [(live, live.created_at)]
+        select_sql = str(
+            session.execute.await_args_list[0]
+            .args[0]
+            .compile(dialect=postgresql.dialect())
+        )
+        assert "FOR UPDATE OF notifications SKIP LOCKED" in select_sql
+
+        lease, cancel = _updates(session)
+        assert lease.params["scheduled_for"] == NOW + timedelta(seconds=60)
+        assert cancel.params["status"] == NotificationStatus.CANCELLED
+        session.commit.assert_awaited_once()
+        inbox.invalidate.assert_awaited_once_with({expired.user_id})
+
+    @pytest.mark.asyncio
+    async def test_complete_groups_outcomes(self):
+        """Successes and failures are written back in a few UPDATEs."""
+        sent = [_notification(), _notification()]
+        retry = [_notification(attempts=1), _notification(attempts=1)]
+        final = _notification(attempts=2)
+        session = _session()
+
+        await NotificationQueue(max_attempts=3).complete(
+            session,
+            [(n, None) for n in sent]
+            + [(n, "timeout") for n in retry]
+            + [(final, "timeout")],
+            now=NOW,
+        )
+
+        sent_update, retry_update, final_update = _updates(session)
+        assert sent_update.params["status"] == NotificationStatus.SENT
+        assert retry_update.params["delivery_attempts"] == 2
+        assert retry_update.params["scheduled_for"] == NOW + retry_delay(2)
+        assert "status" not in retry_update.params
+        assert final_update.params["status"] == NotificationStatus.FAILED
+        session.commit.assert_awaited_once()
+
+
+class TestNotificationWorker:
+    """Test suite for per-channel batch delivery."""
+
+    def _worker(self, queue, claims, allowed=None):
+        queue.claim = AsyncMock(return_value=claims)
+        cache = MagicMock(
+            increment_counters=AsyncMock(
+                side_effect=lambda increments, ttl=None: {
+                    key: (0 if allowed is None else allowed.get(key, 0)) + amount
+                    for key, amount in increments.items()
+                }
+            )
+        )
+        return NotificationWorker(queue=queue, cache_service=cache)
+
+    @pytest.mark.asyncio
+    async def test_batch_delivered_within_channel_concurrency(self):
+        """Provider calls of one batch never exceed the pool's concurrency."""
+        notifications = [_notification() for _ in range(6)]
+        queue = MagicMock(complete=AsyncMock(), defer=AsyncMock())
+        worker = self._worker(queue, [(n, NOW) for n in notifications])
+        in_flight = peak = 0
+
+        async def deliver(notification):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return notification is not notifications[0]
+
+        with (
+            patch("app.core.database.async_session_maker", MagicMock()),
+            patch(
+                "app.services.notification_service.NotificationService."
+                "_deliver_notification",
+                side_effect=deliver,
+            ),
+        ):
+            claimed = await worker.process_batch(
+                ChannelPool(NotificationType.EMAIL, concurrency=2, batch_size=10)
+            )
+
+        assert claimed == 6
+        assert peak == 2
+        outcomes = queue.complete.await_args.args[1]
+        assert [error is None for _, error in outcomes] == [False] + [True] * 5
+        queue.defer.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_provider_and_rate_limits(self):
+        """Batch-capable providers get one call; limited rows are deferred."""
+        limited = _notification(NotificationType.PUSH)
+        ok = _notification(NotificationType.PUSH)
+        queue = MagicMock(complete=AsyncMock(), defer=AsyncMock())
+        worker = self._worker(
+            queue,
+            [(limited, NOW), (ok, NOW)],
+            allowed={f"notification_rate:{limited.user_id}:push:security": 10**6},
+        )
+        provider = MagicMock(send_notification_batch=AsyncMock(return_value=[True]))
+
+        with (
+            patch("app.core.database.async_session_maker", MagicMock()),
+            patch(
+                "app.services.notification_service.NotificationService."
+                "_initialize_providers",
+                lambda self: self._providers.update({NotificationType.PUSH: provider}),
+            ),
+        ):
+            await worker.process_batch(
+                ChannelPool(NotificationType.PUSH, concurrency=5, batch_size=10)
+            )
+
+        provider.send_notification_batch.assert_awaited_once_with([ok])
+        assert queue.defer.await_args.args[1] == [limited.id]
+        assert queue.complete.await_args.args[1] == [(ok, None)]
+
+    @pytest.mark.asyncio
+    async def test_email_reaches_provider(self):
+        """Claimed emails are sent with the template kept in channel_data."""
+        email = _notification(channel_data={"template_id": "welcome"})
+        # Notification has no template_id column
+        del email.template_id
+        queue = MagicMock(complete=AsyncMock(), defer=AsyncMock())
+        worker = self._worker(queue, [(email, NOW)])
+        provider = MagicMock(send_notification_email=AsyncMock())
+        del provider.send_notification_batch
+
+        with (
+            patch("app.core.database.async_session_maker", MagicMock()),
+            patch(
+                "app.services.notification_service.NotificationService."
+                "_initialize_providers",
+                lambda self: self._providers.update({NotificationType.EMAIL: provider}),
+            ),
+        ):
+            await worker.process_batch(
+                ChannelPool(NotificationType.EMAIL, concurrency=2, batch_size=10)
+            )
+
+        provider.send_notification_email.assert_awaited_once()
+        kwargs = provider.send_notification_email.await_args.kwargs
+        assert kwargs["template_id"] == "welcome"
+        assert queue.complete.await_args.args[1] == [(email, None)]
+
+    @pytest.mark.asyncio
+    async def test_idle_channel_polls_until_stopped(self):
+        """An empty queue is polled at the interval and stop exits promptly."""
+        worker = NotificationWorker(
+            pools=[ChannelPool(NotificationType.SMS, 1, 10)],
+            queue=MagicMock(depth=AsyncMock()),
+            poll_interval=0.01,
+            cache_service=MagicMock(close=AsyncMock()),
+        )
+        worker.process_batch = AsyncMock(return_value=0)
+
+        with patch("app.core.database.async_session_maker", MagicMock()):
+            task = asyncio.create_task(worker.run())
+            await asyncio.sleep(0.1)
+            worker.stop()
+            await asyncio.wait_for(task, timeout=1)
+
+        assert 3 <= worker.process_batch.await_count <= 15
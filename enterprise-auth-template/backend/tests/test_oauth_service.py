@@ -416,13 +416,9 @@ class TestGetOAuthUserInfo:
             "email_verified": True,
         }
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("app.services.oauth_service.http_clients") as mock_client:
             mock_client.post = AsyncMock(return_value=mock_token_response)
             mock_client.get = AsyncMock(return_value=mock_userinfo_response)
-            mock_client_class.return_value = mock_client
 
             user_info = await oauth_service._get_oauth_user_info("google", "auth_code")
 
@@ -450,13 +446,9 @@ class TestGetOAuthUserInfo:
             "avatar_url": "https://github.com/avatar.jpg",
         }
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("app.services.oauth_service.http_clients") as mock_client:
             mock_client.post = AsyncMock(return_value=mock_token_response)
             mock_client.get = AsyncMock(return_value=mock_userinfo_response)
-            mock_client_class.return_value = mock_client
 
             user_info = await oauth_service._get_oauth_user_info("github", "auth_code")
 
@@ -491,15 +483,11 @@ class TestGetOAuthUserInfo:
             {"email": "other@example.com", "primary": False, "verified": True},
         ]
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("app.services.oauth_service.http_clients") as mock_client:
             mock_client.post = AsyncMock(return_value=mock_token_response)
             mock_client.get = AsyncMock(
                 side_effect=[mock_userinfo_response, mock_emails_response]
             )
-            mock_client_class.return_value = mock_client
 
             user_info = await oauth_service._get_oauth_user_info("github", "auth_code")
 
@@ -522,13 +510,9 @@ class TestGetOAuthUserInfo:
             "avatar": "abc123",
         }
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("app.services.oauth_service.http_clients") as mock_client:
             mock_client.post = AsyncMock(return_value=mock_token_response)
             mock_client.get = AsyncMock(return_value=mock_userinfo_response)
-            mock_client_class.return_value = mock_client
 
             user_info = await oauth_service._get_oauth_user_info("discord", "auth_code")
 
@@ -545,12 +529,8 @@ class TestGetOAuthUserInfo:
         mock_token_response.status_code = 400
         mock_token_response.text = "Invalid request"
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("app.services.oauth_service.http_clients") as mock_client:
             mock_client.post = AsyncMock(return_value=mock_token_response)
-            mock_client_class.return_value = mock_client
 
             with pytest.raises(OAuthError) as exc_info:
                 await oauth_service._get_oauth_user_info("google", "bad_code")
@@ -566,12 +546,8 @@ class TestGetOAuthUserInfo:
             "token_type": "bearer"
         }  # No access_token
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("app.services.oauth_service.http_clients") as mock_client:
             mock_client.post = AsyncMock(return_value=mock_token_response)
-            mock_client_class.return_value = mock_client
 
             with pytest.raises(OAuthError) as exc_info:
                 await oauth_service._get_oauth_user_info("google", "auth_code")
@@ -589,13 +565,9 @@ class TestGetOAuthUserInfo:
         mock_userinfo_response.status_code = 401
         mock_userinfo_response.text = "Unauthorized"
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = MagicMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
+        with patch("app.services.oauth_service.http_clients") as mock_client:
             mock_client.post = AsyncMock(return_value=mock_token_response)
             mock_client.get = AsyncMock(return_value=mock_userinfo_response)
-            mock_client_class.return_value = mock_client
 
             with pytest.raises(OAuthError) as exc_info:
                 await oauth_service._get_oauth_user_info("google", "auth_code")
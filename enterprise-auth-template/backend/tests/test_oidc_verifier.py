@@ -0,0 +1,194 @@
+"""
+Tests for OIDC ID Token Verification
+
+Tests local ID token verification against cached discovery documents
+and JWKS, key rotation, background refresh and the OAuth login path
+that skips the userinfo request.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.services.oidc_verifier import OIDCProvider, OIDCVerificationError
+
+ISSUER = "https://accounts.example.com"
+CLIENT_ID = "client-123"
+
+
+def _key_pair(kid):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public = jwk.construct(public_pem, "RS256").to_dict()
+    public.update({"kid": kid, "use": "sig"})
+    return private_pem, public
+
+
+def _token(private_pem, kid, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": ISSUER,
+        "aud": CLIENT_ID,
+        "sub": "user-1",
+        "email": "user@example.com",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 300,
+        **claims,
+    }
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def _response(body, cache_control=""):
+    response = MagicMock()
+    response.json.return_value = body
+    response.headers = {"cache-control": cache_control}
+    return response
+
+
+def _http(*jwks_documents):
+    """Registry mock serving discovery and successive JWKS documents."""
+    documents = iter(jwks_documents)
+
+    async def get(url, **kwargs):
+        if url.endswith("/.well-known/openid-configuration"):
+            return _response(
+                {
+                    "issuer": ISSUER,
+                    "jwks_uri": f"{ISSUER}/jwks",
+                    "id_token_signing_alg_values_supported": ["RS256"],
+                }
+            )
+        return _response(next(documents), "public, max-age=3600")
+
+    return MagicMock(get=AsyncMock(side_effect=get))
+
+
+class TestOIDCProvider:
+    """Test suite for ID token verification."""
+
+    @pytest.mark.asyncio
+    async def test_verifies_with_cached_keys(self):
+        """Discovery and JWKS are fetched once for many verifications."""
+        private_pem, public = _key_pair("k1")
+        http = _http({"keys": [public]})
+        provider = OIDCProvider(ISSUER, http=http)
+
+        for _ in range(3):
+            claims = await provider.verify_id_token(
+                _token(private_pem, "k1"), CLIENT_ID
+            )
+
+        assert claims["email"] == "user@example.com"
+        assert http.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_wrong_audience_and_symmetric_tokens(self):
+        """Tokens for other clients or signed with HMAC are refused."""
+        private_pem, public = _key_pair("k1")
+        provider = OIDCProvider(ISSUER, http=_http({"keys": [public]}))
+
+        with pytest.raises(OIDCVerificationError):
+            await provider.verify_id_token(
+                _token(private_pem, "k1", aud="someone-else"), CLIENT_ID
+            )
+        hmac_token = jwt.encode(
+            {"iss": ISSUER, "aud": CLIENT_ID}, "secret", algorithm="HS256"
+        )
+        with pytest.raises(OIDCVerificationError):
+            await provider.verify_id_token(hmac_token, CLIENT_ID)
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refreshes_keys_once(self):
+        """A rotated key is picked up by one forced JWKS refresh."""
+        old_pem, old_public = _key_pair("old")
+        new_pem, new_public = _key_pair("new")
+        http = _http({"keys": [old_public]}, {"keys": [old_public, new_public]})
+        provider = OIDCProvider(ISSUER, http=http)
+
+        await provider.verify_id_token(_token(old_pem, "old"), CLIENT_ID)
+        claims = await provider.verify_id_token(_token(new_pem, "new"), CLIENT_ID)
+
+        assert claims["sub"] == "user-1"
+        # A second unknown key inside the interval does not refetch
+        other_pem, _ = _key_pair("other")
+        with pytest.raises(OIDCVerificationError):
+            await provider.verify_id_token(_token(other_pem, "other"), CLIENT_ID)
+        assert http.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_forced_refresh_is_a_verification_error(self):
+        """An unreachable JWKS endpoint during rotation is not a raw error."""
+        private_pem, public = _key_pair("k1")
+        http = _http({"keys": [public]})
+        provider = OIDCProvider(ISSUER, http=http)
+        await provider.verify_id_token(_token(private_pem, "k1"), CLIENT_ID)
+
+        http.get.side_effect = httpx.ConnectError("connection refused")
+        new_pem, _ = _key_pair("new")
+        with pytest.raises(OIDCVerificationError):
+            await provider.verify_id_token(_token(new_pem, "new"), CLIENT_ID)
+
+    @pytest.mark.asyncio
+    async def test_expiring_keys_refresh_in_background(self):
+        """Callers get cached keys while a refresh runs behind them."""
+        private_pem, public = _key_pair("k1")
+        http = _http({"keys": [public]}, {"keys": [public]})
+        provider = OIDCProvider(ISSUER, http=http)
+        await provider.verify_id_token(_token(private_pem, "k1"), CLIENT_ID)
+
+        provider._documents["jwks"].refresh_at = time.monotonic() - 1
+        await provider.verify_id_token(_token(private_pem, "k1"), CLIENT_ID)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert http.get.await_count == 3
+        assert provider._documents["jwks"].refresh_at > time.monotonic()
+
+
+class TestOAuthIdTokenLogin:
+    """Test suite for OAuth logins that use the ID token."""
+
+    @pytest.mark.asyncio
+    async def test_google_login_skips_userinfo(self):
+        """A verified ID token replaces the userinfo request."""
+        from app.services.oauth_service import OAuthConfig, OAuthService
+
+        private_pem, public = _key_pair("k1")
+        token_response = MagicMock(status_code=200)
+        token_response.json.return_value = {
+            "access_token": "token123",
+            "id_token": _token(private_pem, "k1", name="Test User"),
+        }
+        config = {**OAuthConfig.GOOGLE, "issuer": ISSUER, "client_id": CLIENT_ID}
+        service = OAuthService(MagicMock())
+
+        with (
+            patch.object(OAuthConfig, "GOOGLE", config),
+            patch("app.services.oauth_service.http_clients") as http,
+            patch(
+                "app.services.oauth_service.get_oidc_provider",
+                return_value=OIDCProvider(ISSUER, http=_http({"keys": [public]})),
+            ),
+        ):
+            http.post = AsyncMock(return_value=token_response)
+            http.get = AsyncMock()
+            user_info = await service._get_oauth_user_info("google", "auth_code")
+
+        assert user_info.id == "user-1"
+        assert user_info.name == "Test User"
+        assert user_info.email_verified is True
+        http.get.assert_not_awaited()
@@ -0,0 +1,147 @@
+"""
+Tests for Keyset Pagination
+
+Tests cursor encoding and keyset paging against an in-memory SQLite
+database through a synchronous session.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from app.core.pagination import (
+    COUNT_CACHED,
+    COUNT_ESTIMATED,
+    COUNT_NONE,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    paginate_keyset,
+)
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as db:
+        # Pairs of rows share a timestamp so the id tie-breaker matters
+        db.add_all(
+            Item(id=i, created_at=start + timedelta(minutes=i // 2))
+            for i in range(1, 26)
+        )
+        db.commit()
+        yield db
+
+
+class TestCursorEncoding:
+    """Test suite for cursor tokens."""
+
+    def test_round_trip_preserves_types(self):
+        """Datetimes and UUIDs survive encoding."""
+        values = [datetime(2024, 5, 1, 12, 30), UUID(int=7), 3.5]
+
+        cursor = encode_cursor("created_at,id", values)
+
+        assert decode_cursor(cursor, "created_at,id", 3) == values
+
+    def test_cursor_for_other_ordering_is_rejected(self):
+        """Cursors are bound to the ordering that produced them."""
+        cursor = encode_cursor("created_at,id", [1, 2])
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "timestamp,id", 2)
+
+    def test_garbage_cursor_is_rejected(self):
+        """Malformed tokens raise InvalidCursorError."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor", "created_at,id", 2)
+
+
+class TestPaginateKeyset:
+    """Test suite for keyset paging."""
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_all_rows_once(self, session):
+        """Following cursors visits every row exactly once, newest first."""
+        seen = []
+        cursor = None
+        while True:
+            page = await paginate_keyset(
+                session,
+                select(Item),
+                [Item.created_at, Item.id],
+                limit=10,
+                cursor=cursor,
+            )
+            seen.extend(item.id for item in page.items)
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        assert seen == list(range(25, 0, -1))
+
+    @pytest.mark.asyncio
+    async def test_first_page_exact_total_from_window(self, session):
+        """The first page reports the exact total."""
+        page = await paginate_keyset(
+            session,
+            select(Item).where(Item.id > 5),
+            [Item.created_at, Item.id],
+            limit=10,
+            count_mode="exact",
+        )
+
+        assert page.total == 20
+        assert page.has_more
+        assert not page.total_is_estimate
+
+    @pytest.mark.asyncio
+    async def test_count_modes(self, session):
+        """Estimated counts fall back to exact off PostgreSQL; none skips it."""
+        stmt = select(Item)
+        columns = [Item.created_at, Item.id]
+
+        estimated = await paginate_keyset(
+            session, stmt, columns, 5, count_mode=COUNT_ESTIMATED
+        )
+        skipped = await paginate_keyset(
+            session, stmt, columns, 5, count_mode=COUNT_NONE
+        )
+
+        assert estimated.total == 25
+        assert estimated.total_is_estimate
+        assert skipped.total is None
+
+    @pytest.mark.asyncio
+    async def test_cached_count_reuses_stored_total(self, session):
+        """Cached counts are served from the cache when present."""
+        cache = AsyncMock()
+        cache.get.return_value = "1000"
+
+        page = await paginate_keyset(
+            session,
+            select(Item),
+            [Item.created_at, Item.id],
+            5,
+            count_mode=COUNT_CACHED,
+            count_cache_key="items",
+            cache_service=cache,
+        )
+
+        assert page.total == 1000
+        cache.get.assert_awaited_once_with("count:items")
@@ -0,0 +1,90 @@
+"""
+Tests for Query Statistics
+
+Tests statement fingerprinting and per-fingerprint aggregation used by
+the admin query statistics endpoint.
+"""
+
+from app.core.query_stats import QueryStatsCollector, fingerprint_statement
+
+
+class TestFingerprintStatement:
+    """Test suite for statement normalization."""
+
+    def test_literals_and_params_normalize_to_same_fingerprint(self):
+        """Queries differing only in values share a fingerprint."""
+        first = fingerprint_statement("SELECT * FROM users WHERE id = 5 AND name = 'a'")
+        second = fingerprint_statement(
+            "SELECT *   FROM users WHERE id = $1 AND name = $2"
+        )
+
+        assert first == second
+        assert first[1] == "SELECT * FROM users WHERE id = ? AND name = ?"
+
+    def test_in_lists_collapse(self):
+        """IN-lists of different lengths share a fingerprint."""
+        short = fingerprint_statement("SELECT 1 FROM t WHERE id IN ($1, $2)")
+        long = fingerprint_statement("SELECT 1 FROM t WHERE id IN ($1, $2, $3, $4)")
+
+        assert short[0] == long[0]
+
+    def test_casts_and_identifiers_are_preserved(self):
+        """Type casts and numbered identifiers are not treated as params."""
+        _, normalized = fingerprint_statement(
+            "SELECT users_1.id FROM users AS users_1 WHERE users_1.id = $1::UUID"
+        )
+
+        assert normalized == (
+            "SELECT users_1.id FROM users AS users_1 WHERE users_1.id = ?::UUID"
+        )
+
+
+class TestQueryStatsCollector:
+    """Test suite for QueryStatsCollector."""
+
+    def test_aggregates_calls_latency_rows_and_endpoints(self):
+        """Executions of one shape aggregate into one entry."""
+        collector = QueryStatsCollector()
+        for i, duration in enumerate([0.010, 0.020, 0.030]):
+            collector.record(
+                f"SELECT * FROM users WHERE id = {i}",
+                None,
+                duration,
+                rows=1,
+                endpoint="GET /api/v1/users/{id}",
+            )
+
+        [stats] = collector.top()
+        data = stats.to_dict()
+
+        assert data["calls"] == 3
+        assert data["total_time_ms"] == 60.0
+        assert data["mean_time_ms"] == 20.0
+        assert data["max_time_ms"] == 30.0
+        assert data["p99_time_ms"] == 30.0
+        assert data["rows"] == 3
+        assert data["endpoints"] == {"GET /api/v1/users/{id}": 3}
+        assert stats.slowest_statement == "SELECT * FROM users WHERE id = 2"
+
+    def test_top_orders_by_requested_statistic(self):
+        """Fingerprints are ranked by the chosen statistic."""
+        collector = QueryStatsCollector()
+        for _ in range(5):
+            collector.record("SELECT 1 FROM a", None, 0.001)
+        collector.record("SELECT 1 FROM b", None, 0.5)
+
+        assert collector.top(sort_by="calls")[0].query == "SELECT ? FROM a"
+        assert collector.top(sort_by="total_time")[0].query == "SELECT ? FROM b"
+
+    def test_evicts_least_called_when_full(self):
+        """The collector stays bounded."""
+        collector = QueryStatsCollector(max_fingerprints=20)
+        collector.record("SELECT 1 FROM hot", None, 0.001)
+        collector.record("SELECT 1 FROM hot", None, 0.001)
+        for i in range(30):
+            collector.record(f"SELECT 1 FROM t{i}", None, 0.001)
+
+        summary = collector.summary()
+        assert summary["fingerprints"] <= 20
+        assert summary["evicted"] > 0
+        assert any(s.query == "SELECT ? FROM hot" for s in collector.top(limit=20))
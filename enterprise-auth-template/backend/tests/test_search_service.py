@@ -0,0 +1,278 @@
+"""
+Tests for Search Service
+
+Tests the PostgreSQL full-text/trigram query building, the ILIKE
+fallback used on other databases, and the cross-scope merge.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
+
+import pytest
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import decode_cursor
+from app.models.audit import AuditLog
+from app.models.user import User
+from app.services.search_service import (
+    SearchScope,
+    SearchService,
+    SearchValidationError,
+    build_prefix_tsquery,
+)
+
+
+def _service(dialect_name: str) -> SearchService:
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = dialect_name
+    return SearchService(session, cache_service=MagicMock(), event_emitter=MagicMock())
+
+
+def _compile(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+class TestBuildPrefixTsquery:
+    """Test suite for tsquery construction."""
+
+    def test_terms_become_prefix_matches(self):
+        """Every word is AND-ed as a prefix term."""
+        assert build_prefix_tsquery("John Smi") == "john:* & smi:*"
+
+    def test_tsquery_syntax_is_stripped(self):
+        """Operators in user input cannot break to_tsquery."""
+        assert build_prefix_tsquery("a & !b | (c:*)") == "a:* & b:* & c:*"
+
+    def test_query_without_words(self):
+        """Punctuation-only queries produce no tsquery."""
+        assert build_prefix_tsquery("&& !!") is None
+
+
+class TestCacheKeys:
+    """Test suite for search cache keys."""
+
+    def test_keys_do_not_depend_on_hash_seed(self):
+        """Filter digests are stable so workers share cached entries."""
+        filters = [{"field": "is_active", "operator": "eq", "value": True}]
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+
+        key = _service("postgresql")._generate_cache_key(
+            "Ann", SearchScope.USERS, filters, None, 1, 20
+        )
+
+        assert key == f"search:users:q:ann:p:1:s:20:f:{digest}"
+
+
+class TestSearchConditions:
+    """Test suite for search condition building."""
+
+    @pytest.mark.asyncio
+    async def test_postgresql_uses_search_vector_and_trigrams(self):
+        """Indexed scopes match the tsvector column and pg_trgm fields."""
+        service = _service("postgresql")
+
+        conditions = await service._build_search_conditions(
+            User, "alice", SearchScope.USERS
+        )
+        sql = _compile(or_(*conditions))
+
+        assert "users.search_vector @@ to_tsquery('simple'::regconfig" in sql
+        assert "users.email %" in sql
+        assert "users.full_name ILIKE" in sql
+        assert "users.phone_number" not in sql
+
+    @pytest.mark.asyncio
+    async def test_other_dialects_fall_back_to_ilike(self):
+        """Without PostgreSQL every string field is matched with ILIKE."""
+        service = _service("sqlite")
+
+        conditions = await service._build_search_conditions(
+            AuditLog, "login failed", SearchScope.AUDIT_LOGS
+        )
+        sql = _compile(or_(*conditions))
+
+        assert "search_vector" not in sql
+        assert "audit_logs.action ILIKE" in sql
+        assert len(conditions) == 2 * 6
+
+    def test_rank_combines_text_rank_and_similarity(self):
+        """Default ordering uses ts_rank_cd plus the best trigram similarity."""
+        service = _service("postgresql")
+
+        rank = service._build_rank_expression(AuditLog, "admin", SearchScope.AUDIT_LOGS)
+        sql = _compile(select(rank))
+
+        assert "ts_rank_cd(audit_logs.search_vector" in sql
+        assert "greatest(similarity(audit_logs.user_email" in sql
+
+
+def _rows(*minutes):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [(start + timedelta(minutes=m), UUID(int=m)) for m in minutes]
+
+
+def _fake_scope_search(data, sessions_seen):
+    """Stand-in for _search_single_scope doing keyset paging over lists."""
+
+    async def fake(
+        self, query, scope, filters, sort, offset, limit, highlight, facets, **kwargs
+    ):
+        sessions_seen.append(self.session)
+        rows = sorted(data.get(scope, []), reverse=True)
+        if kwargs.get("cursor"):
+            model = self.scope_models[scope]
+            _, _, key = self._keyset_for(model, scope, sort, None)
+            position = tuple(decode_cursor(kwargs["cursor"], key, 2))
+            rows = [row for row in rows if row < position]
+        page = rows[offset : offset + limit]
+        return {
+            "items": [{"minute": row[1].int} for row in page],
+            "merge_keys": page,
+            "total_count": len(data.get(scope, [])),
+            "next_cursor": "more" if len(rows) > offset + limit else None,
+        }
+
+    return fake
+
+
+class TestSearchAllScopes:
+    """Test suite for the cross-scope merge."""
+
+    DATA = {
+        SearchScope.USERS: _rows(10, 7, 4, 1),
+        SearchScope.AUDIT_LOGS: _rows(9, 8, 3),
+        SearchScope.SESSIONS: _rows(6, 5, 2),
+    }
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_follow_merged_order(self):
+        """Walking cursors yields every row once in global recency order."""
+        service = _service("sqlite")
+        seen = []
+        fake = _fake_scope_search(self.DATA, [])
+
+        with patch.object(SearchService, "_search_single_scope", fake):
+            cursor = None
+            pages = 0
+            while True:
+                results = await service._search_all_scopes(
+                    "q", None, None, 0, 3, cursor=cursor
+                )
+                seen.extend(item["minute"] for item in results["items"])
+                pages += 1
+                cursor = results["next_cursor"]
+                if not cursor:
+                    break
+
+        assert seen == [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+        assert pages == 4
+        assert results["total_count"] == 10
+
+    @pytest.mark.asyncio
+    async def test_offset_page_is_globally_correct(self):
+        """Legacy offsets slice the merged order, not the first scope."""
+        service = _service("sqlite")
+        fake = _fake_scope_search(self.DATA, [])
+
+        with patch.object(SearchService, "_search_single_scope", fake):
+            results = await service._search_all_scopes("q", None, None, 3, 3)
+
+        assert [item["minute"] for item in results["items"]] == [7, 6, 5]
+        assert {item["_scope"] for item in results["items"]} == {
+            "users",
+            "sessions",
+        }
+
+    @pytest.mark.asyncio
+    async def test_scopes_use_separate_sessions(self):
+        """Each scope runs on its own session from the factory."""
+        sessions_seen = []
+
+        def factory():
+            session = MagicMock()
+            session.__aenter__ = AsyncMock(return_value=session)
+            session.__aexit__ = AsyncMock(return_value=False)
+            return session
+
+        service = _service("sqlite")
+        service.session_factory = factory
+        fake = _fake_scope_search(self.DATA, sessions_seen)
+
+        with patch.object(SearchService, "_search_single_scope", fake):
+            await service._search_all_scopes("q", None, None, 0, 3)
+
+        assert len(sessions_seen) == len(service.scope_models)
+        assert len({id(session) for session in sessions_seen}) == len(sessions_seen)
+        assert service.session not in sessions_seen
+
+    @pytest.mark.asyncio
+    async def test_nullable_sort_pages_by_offset(self):
+        """Nullable sort fields get offset pages and no cursor."""
+        service = _service("sqlite")
+        data = {
+            SearchScope.AUDIT_LOGS: [
+                ("10.0.0.3", UUID(int=3)),
+                ("10.0.0.1", UUID(int=1)),
+            ],
+            SearchScope.SESSIONS: [("10.0.0.2", UUID(int=2))],
+        }
+        sort = [{"field": "ip_address", "direction": "desc"}]
+
+        with patch.object(
+            SearchService, "_search_single_scope", _fake_scope_search(data, [])
+        ):
+            results = await service._search_all_scopes("q", None, sort, 0, 2)
+
+            assert [item["minute"] for item in results["items"]] == [3, 2]
+            assert results["next_cursor"] is None
+            with pytest.raises(SearchValidationError):
+                await service._search_all_scopes("q", None, sort, 0, 2, cursor="stale")
+
+
+class TestFacets:
+    """Test suite for single-pass faceting."""
+
+    def test_facets_use_one_grouping_sets_query(self):
+        """All facet fields are counted by one GROUPING SETS scan."""
+        service = _service("postgresql")
+
+        stmt = service._build_grouped_facet_query(
+            AuditLog, ["action", "result"], AuditLog.user_email == "a@b.c"
+        )
+        sql = _compile(stmt)
+
+        assert "GROUP BY GROUPING SETS(audit_logs.action, audit_logs.result)" in sql
+        assert "grouping(audit_logs.action, audit_logs.result)" in sql
+        assert "row_number() OVER (PARTITION BY" in sql
+
+    @pytest.mark.asyncio
+    async def test_grouped_rows_are_split_per_field(self):
+        """GROUPING() bits route each row to its facet field."""
+        service = _service("postgresql")
+        result = MagicMock()
+        result.mappings.return_value = [
+            {"_f0": "login", "_f1": None, "_set": 1, "count": 3},
+            {"_f0": "logout", "_f1": None, "_set": 1, "count": 5},
+            {"_f0": None, "_f1": "success", "_set": 2, "count": 8},
+        ]
+        service.session.execute = AsyncMock(return_value=result)
+        service.cache_service.get = AsyncMock(return_value=None)
+        service.cache_service.set = AsyncMock()
+
+        facets = await service._generate_facets(
+            AuditLog, ["action", "result", "missing"], None, "search:audit_logs:q"
+        )
+
+        assert facets == {
+            "action": [
+                {"value": "logout", "count": 5},
+                {"value": "login", "count": 3},
+            ],
+            "result": [{"value": "success", "count": 8}],
+        }
+        service.session.execute.assert_awaited_once()
+        service.cache_service.set.assert_awaited_once()
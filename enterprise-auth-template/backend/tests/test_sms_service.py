@@ -0,0 +1,106 @@
+"""
+Tests for SMS Service
+
+Tests that SNS publishes run off the event loop on a bounded pool, the
+batched send API and the shared provider instances.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import sms_service
+from app.services.sms_service import AWSProvider, SMSProvider
+
+
+def _aws_provider(max_workers=2, delay=0.05, fail_for=()):
+    """AWSProvider whose SNS client sleeps like a blocking HTTPS call."""
+    client = MagicMock()
+    state = {"in_flight": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def publish(PhoneNumber, **kwargs):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(delay)
+        with lock:
+            state["in_flight"] -= 1
+        if PhoneNumber in fail_for:
+            raise RuntimeError("throttled")
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+    client.publish.side_effect = publish
+    with patch("boto3.client", return_value=client):
+        provider = AWSProvider(max_workers=max_workers)
+    return provider, state
+
+
+class TestAWSProvider:
+    """Test suite for the SNS transport."""
+
+    @pytest.mark.asyncio
+    async def test_publish_does_not_block_event_loop(self):
+        """The loop keeps running while a publish is in flight."""
+        provider, _ = _aws_provider(delay=0.2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        try:
+            assert await provider.send_sms("+15550001", "code 123456")
+        finally:
+            task.cancel()
+            provider.close()
+
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_batch_is_bounded_and_ordered(self):
+        """Batches run on the pool's threads and keep per-message results."""
+        provider, state = _aws_provider(max_workers=3, fail_for={"+15550004"})
+        messages = [(f"+1555000{i}", "hello") for i in range(8)]
+
+        try:
+            results = await provider.send_sms_batch(messages)
+        finally:
+            provider.close()
+
+        assert results == [True] * 4 + [False] + [True] * 3
+        assert state["peak"] == 3
+
+
+class TestSMSProviders:
+    """Test suite for provider selection and the default batch API."""
+
+    @pytest.mark.asyncio
+    async def test_default_batch_uses_send_sms(self):
+        """Providers without a native batch send per message, in order."""
+
+        class EchoProvider(SMSProvider):
+            async def send_sms(self, phone_number, message):
+                await asyncio.sleep(0)
+                return phone_number.endswith("1")
+
+        results = await EchoProvider().send_sms_batch(
+            [("+1", "a"), ("+2", "b"), ("+31", "c")]
+        )
+
+        assert results == [True, False, True]
+
+    def test_provider_is_shared_per_process(self):
+        """Providers are built once, not per request."""
+        with (
+            patch.object(sms_service, "settings", MagicMock(SMS_PROVIDER="twilio")),
+            patch.dict(sms_service._providers, clear=True),
+        ):
+            first = sms_service.get_sms_provider()
+            assert sms_service.get_sms_provider() is first
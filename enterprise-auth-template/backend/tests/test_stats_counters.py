@@ -0,0 +1,214 @@
+"""
+Tests for Stats Counters
+
+Tests bucketed counter windows, drift correction, snapshot caching and
+fallbacks, and the admin dashboard's use of materialized counters.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.services.admin_service import AdminService
+from app.services.stats_counters import (
+    CACHE_KEY,
+    RECONCILED_AT,
+    CounterSnapshot,
+    StatsCounters,
+    bucket_key,
+    corrections,
+)
+
+NOW = datetime(2024, 3, 10, 15, 30)
+
+
+class TestCounterSnapshot:
+    """Test suite for counter values and bucket windows."""
+
+    def test_bucket_keys(self):
+        """Hourly and daily counters use UTC bucket names."""
+        assert bucket_key("users.created", NOW) == "users.created@2024-03-10T15"
+        assert bucket_key("sessions.created", NOW) == "sessions.created@2024-03-10"
+
+    def test_window_sums_buckets_from_since(self):
+        """A window sums every bucket from the one holding ``since``."""
+        snapshot = CounterSnapshot(
+            {
+                "users.total": 50,
+                "users.created@2024-03-09T14": 1,
+                "users.created@2024-03-09T15": 2,
+                "users.created@2024-03-10T15": 4,
+                "login_attempts.failed@2024-03-10T15": 8,
+            }
+        )
+
+        assert snapshot.window("users.created", NOW - timedelta(hours=24)) == 6
+        assert snapshot.window("users.created", NOW - timedelta(days=7)) == 7
+        assert (
+            snapshot.window(
+                "users.created", NOW - timedelta(days=7), NOW - timedelta(hours=1)
+            )
+            == 3
+        )
+        assert snapshot.get("users.total") == 50
+        assert snapshot.get("api_keys.total") == 0
+
+
+class TestCorrections:
+    """Test suite for reconcile drift correction."""
+
+    def test_deltas_and_expired_buckets(self):
+        """Drifted counters get a delta and buckets past retention are purged."""
+        live = {"users.total": 10, "users.created@2024-03-10T15": 2}
+        stored = {
+            "users.total": 12,
+            "users.active": 3,
+            "users.created@2024-03-10T15": 2,
+            "users.created@2024-03-01T00": 5,
+            RECONCILED_AT: 1,
+        }
+
+        deltas, expired = corrections(
+            live, stored, {"users.created": "users.created@2024-03-02T15"}
+        )
+
+        assert deltas == {"users.total": -2, "users.active": -3}
+        assert expired == ["users.created@2024-03-01T00"]
+
+
+def _session(*results):
+    session = MagicMock(spec=AsyncSession)
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.execute = AsyncMock(side_effect=list(results))
+    return session
+
+
+class TestStatsCounters:
+    """Test suite for reading counter snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reads_once_and_caches(self):
+        """Counters are summed in one query and cached in Redis."""
+        cache = AsyncMock(get=AsyncMock(return_value=None))
+        counters = StatsCounters(cache_service=cache, cache_ttl=5)
+        rows = MagicMock()
+        rows.all.return_value = [("users.total", 7), (RECONCILED_AT, 1)]
+        session = _session(MagicMock(scalar=MagicMock(return_value="x")), rows)
+
+        snapshot = await counters.snapshot(session)
+
+        assert snapshot.get("users.total") == 7
+        assert session.execute.await_count == 2
+        cache.set.assert_awaited_once_with(
+            CACHE_KEY, {"users.total": 7, RECONCILED_AT: 1}, ttl=5
+        )
+
+    @pytest.mark.asyncio
+    async def test_cached_snapshot_skips_database(self):
+        """A cached snapshot needs no query."""
+        cache = AsyncMock(get=AsyncMock(return_value={"users.total": 3}))
+        session = _session()
+
+        snapshot = await StatsCounters(cache_service=cache).snapshot(session)
+
+        assert snapshot.get("users.total") == 3
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unreconciled_counters_are_not_served(self):
+        """Counters are unavailable until the first reconcile has run."""
+        rows = MagicMock()
+        rows.all.return_value = [("users.total", 2)]
+        session = _session(MagicMock(scalar=MagicMock(return_value="x")), rows)
+        counters = StatsCounters(
+            cache_service=AsyncMock(get=AsyncMock(return_value=None))
+        )
+
+        assert await counters.snapshot(session) is None
+
+    @pytest.mark.asyncio
+    async def test_unavailable_without_postgresql(self):
+        """Other databases fall back to live counts."""
+        session = Session(create_engine("sqlite://"))
+        counters = StatsCounters(cache_service=AsyncMock())
+
+        assert await counters.snapshot(session) is None
+        assert await counters.reconcile(create_engine("sqlite://")) is None
+
+
+class TestAdminDashboardCounters:
+    """Test suite for the admin dashboard's counter reads."""
+
+    def _service(self, snapshot):
+        db = MagicMock(spec=AsyncSession)
+        rows = MagicMock()
+        rows.all.return_value = [("admin", 2)]
+        rows.scalars.return_value.all.return_value = []
+        db.execute = AsyncMock(return_value=rows)
+        service = AdminService(db)
+        service.stats_counters = MagicMock(snapshot=AsyncMock(return_value=snapshot))
+        service.check_system_health = AsyncMock(return_value={})
+        service._count_records = AsyncMock(return_value=1)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_dashboard_reads_counters(self):
+        """With counters available no table is counted."""
+        now = datetime.utcnow()
+        service = self._service(
+            CounterSnapshot(
+                {
+                    "users.total": 100,
+                    "users.active": 90,
+                    "sessions.active": 12,
+                    bucket_key("users.created", now): 3,
+                    bucket_key("login_attempts.failed", now): 4,
+                }
+            )
+        )
+
+        data = await service.get_dashboard_data()
+
+        assert data.total_users == 100
+        assert data.suspended_users == 10
+        assert data.recent_registrations == 3
+        assert data.failed_login_attempts == 4
+        assert data.role_distribution == {"admin": 2}
+        service._count_records.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_dashboard_falls_back_to_live_counts(self):
+        """Without counters the dashboard counts tables directly."""
+        service = self._service(None)
+
+        data = await service.get_dashboard_data()
+
+        assert data.total_users == 1
+        assert service._count_records.await_count == 6
+
+    @pytest.mark.asyncio
+    async def test_system_stats_read_counters(self):
+        """System stats come from counters in one read."""
+        now = datetime.utcnow()
+        service = self._service(
+            CounterSnapshot(
+                {
+                    "users.total": 5,
+                    "users.with_2fa": 2,
+                    "api_keys.active": 1,
+                    bucket_key("audit_logs.created", now): 9,
+                }
+            )
+        )
+
+        stats = await service.get_system_stats()
+
+        assert stats.users["total"] == 5
+        assert stats.users["with_2fa"] == 2
+        assert stats.api_keys["active"] == 1
+        assert stats.audit_logs["today"] == 9
+        service.db.execute.assert_not_awaited()